@@ -0,0 +1,219 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Base classes and utility functions used by the benchmarks.
+
+Each benchmark is timed in a number of rounds. In each round, the benchmark "run" method is
+called "iterations" times and the duration of a single operation is calculated as the round
+duration divided by the number of iterations.
+"""
+
+import copy
+import json
+import time
+import socket
+import platform
+
+import six
+
+import st2common
+from st2common.util import date as date_utils
+from st2common.util import isotime
+
+__all__ = [
+    'Benchmark',
+
+    'run_benchmark',
+    'get_results_document',
+    'compare_results',
+    'load_results_document',
+    'write_results_document'
+]
+
+# Version of the results document format
+RESULTS_FORMAT_VERSION = 1
+
+
+class Benchmark(object):
+    """
+    Base class for the benchmarks.
+    """
+
+    # Unique name of the benchmark
+    name = None
+
+    # Short description of what the benchmark measures
+    description = None
+
+    # True if the benchmark needs a MongoDB server
+    requires_database = False
+
+    # Default number of "run" calls in each round
+    iterations = 1000
+
+    def setup(self):
+        """
+        Called once before the benchmark is timed.
+        """
+        pass
+
+    def run(self):
+        """
+        Perform a single timed operation.
+        """
+        raise NotImplementedError()
+
+    def teardown(self):
+        """
+        Called once after the benchmark has finished (even if it failed).
+        """
+        pass
+
+
+def run_benchmark(benchmark, rounds=5, iterations=None, warmup=True):
+    """
+    Run the provided benchmark and return a dictionary with the timing statistics.
+
+    :param benchmark: Benchmark to run.
+    :type benchmark: :class:`Benchmark`
+
+    :param rounds: Number of timed rounds.
+    :type rounds: ``int``
+
+    :param iterations: Number of operations in each round. Defaults to benchmark.iterations.
+    :type iterations: ``int``
+
+    :param warmup: True to run an untimed round first (populates caches, etc.).
+    :type warmup: ``bool``
+
+    :rtype: ``dict``
+    """
+    iterations = iterations or benchmark.iterations
+    durations = []
+
+    benchmark.setup()
+
+    try:
+        if warmup:
+            _run_round(benchmark=benchmark, iterations=iterations)
+
+        for _ in range(0, rounds):
+            duration = _run_round(benchmark=benchmark, iterations=iterations)
+            durations.append(duration / iterations)
+    finally:
+        benchmark.teardown()
+
+    durations = sorted(durations)
+    mean = sum(durations) / len(durations)
+    variance = sum([(value - mean) ** 2 for value in durations]) / len(durations)
+    median = _get_median(durations)
+
+    return {
+        'description': benchmark.description,
+        'rounds': rounds,
+        'iterations': iterations,
+        'min': durations[0],
+        'max': durations[-1],
+        'mean': mean,
+        'median': median,
+        'stddev': variance ** 0.5,
+        'ops_per_second': (1.0 / median) if median else None
+    }
+
+
+def get_results_document(results):
+    """
+    Return a results document which can be serialized as JSON and compared with the results of
+    another run using "compare_results".
+
+    :param results: Results of the benchmarks keyed by the benchmark name.
+    :type results: ``dict``
+
+    :rtype: ``dict``
+    """
+    return {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'metadata': {
+            'st2_version': st2common.__version__,
+            'python_version': platform.python_version(),
+            'platform': platform.platform(),
+            'hostname': socket.gethostname(),
+            'timestamp': isotime.format(date_utils.get_datetime_utc_now(), offset=False)
+        },
+        'results': copy.deepcopy(results)
+    }
+
+
+def compare_results(baseline, results, threshold=0.1):
+    """
+    Compare median operation durations with the baseline results document.
+
+    :param baseline: Baseline results document (e.g. results from the previous release).
+    :type baseline: ``dict``
+
+    :param results: Results document to compare.
+    :type results: ``dict``
+
+    :param threshold: Relative slow down which is considered a regression.
+    :type threshold: ``float``
+
+    :return: List of (name, baseline median, median, ratio, is_regression) tuples for all the
+             benchmarks which are present in both documents.
+    :rtype: ``list`` of ``tuple``
+    """
+    comparison = []
+
+    for name, result in sorted(six.iteritems(results['results'])):
+        baseline_result = baseline['results'].get(name, None)
+
+        if not baseline_result or not baseline_result['median']:
+            continue
+
+        ratio = result['median'] / baseline_result['median']
+        is_regression = ratio > (1 + threshold)
+        comparison.append((name, baseline_result['median'], result['median'], ratio,
+                           is_regression))
+
+    return comparison
+
+
+def load_results_document(file_path):
+    with open(file_path, 'r') as fp:
+        return json.load(fp)
+
+
+def write_results_document(document, file_path):
+    with open(file_path, 'w') as fp:
+        json.dump(document, fp, indent=4, sort_keys=True)
+
+
+def _run_round(benchmark, iterations):
+    run = benchmark.run
+    start_time = time.time()
+
+    for _ in range(0, iterations):
+        run()
+
+    return time.time() - start_time
+
+
+def _get_median(values):
+    middle = len(values) // 2
+
+    if len(values) % 2:
+        return values[middle]
+
+    return (values[middle - 1] + values[middle]) / 2.0
@@ -0,0 +1,218 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Data used by the benchmarks. It's intentionally defined in code (and not loaded from the st2tests
+fixtures) so the workload stays the same between releases.
+"""
+
+import copy
+
+from st2common.constants.rules import RULE_TYPE_BACKSTOP
+from st2common.constants.rules import RULE_TYPE_STANDARD
+from st2common.models.db.rule import ActionExecutionSpecDB
+from st2common.models.db.rule import RuleDB
+from st2common.models.db.rule import RuleTypeSpecDB
+from st2common.models.db.trigger import TriggerDB
+from st2common.models.db.trigger import TriggerInstanceDB
+from st2common.models.db.trigger import TriggerTypeDB
+from st2common.util import date as date_utils
+
+__all__ = [
+    'PACK',
+    'RUNNER_TYPE',
+    'ACTION',
+    'ACTION_REF',
+    'TRIGGER_REF',
+    'TRIGGER_PAYLOAD',
+    'EXECUTION',
+
+    'get_trigger_type_db',
+    'get_trigger_db',
+    'get_trigger_instance_db',
+    'get_rule_dbs'
+]
+
+PACK = 'benchmark'
+
+RUNNER_TYPE = {
+    'name': 'benchmark-runner',
+    'description': 'Runner used by the benchmarks.',
+    'enabled': True,
+    'runner_parameters': {
+        'cmd': {
+            'type': 'string'
+        },
+        'timeout': {
+            'type': 'integer',
+            'default': 60
+        },
+        'sudo': {
+            'type': 'boolean',
+            'default': False
+        },
+        'env': {
+            'type': 'object'
+        }
+    },
+    'runner_module': 'benchmark'
+}
+
+ACTION = {
+    'name': 'noop',
+    'description': 'Action used by the benchmarks.',
+    'enabled': True,
+    'entry_point': '',
+    'pack': PACK,
+    'runner_type': 'benchmark-runner',
+    'parameters': {
+        'hosts': {
+            'type': 'string',
+            'default': 'localhost'
+        },
+        'message': {
+            'type': 'string',
+            'required': True
+        },
+        'retries': {
+            'type': 'integer',
+            'default': 2
+        },
+        'attempts': {
+            'type': 'string',
+            'default': '{{retries * 2}}'
+        },
+        'path': {
+            'type': 'string',
+            'default': '/tmp/{{hosts}}/{{message}}.log'
+        },
+        'cmd': {
+            'type': 'string',
+            'default': 'echo "{{message}}" >> {{path}}'
+        }
+    }
+}
+
+ACTION_REF = '%s.%s' % (PACK, ACTION['name'])
+
+TRIGGER_REF = '%s.event' % (PACK)
+
+TRIGGER_PAYLOAD = {
+    'source': 'monitoring',
+    'severity': 3,
+    'host': {
+        'name': 'web-01.example.com',
+        'ip': '10.0.0.11',
+        'tags': ['web', 'production', 'eu-west']
+    },
+    'check': {
+        'name': 'disk.usage',
+        'output': 'DISK WARNING - free space: / 3326 MB (5%)',
+        'duration': 0.134
+    },
+    'metrics': dict([('disk.sd%s.used' % (chr(ord('a') + index)), index * 10)
+                     for index in range(0, 10)])
+}
+
+# Representative action execution as stored in the database (result includes keys which need
+# escaping)
+EXECUTION = {
+    'action': copy.deepcopy(ACTION),
+    'runner': copy.deepcopy(RUNNER_TYPE),
+    'liveaction': {
+        'action': ACTION_REF,
+        'parameters': {
+            'message': 'disk.usage'
+        },
+        'callback': {},
+        'runner_info': {
+            'hostname': 'worker-01',
+            'pid': 1234
+        }
+    },
+    'status': 'succeeded',
+    'parameters': {
+        'message': 'disk.usage',
+        'hosts': 'web-01.example.com'
+    },
+    'context': {
+        'user': 'stanley',
+        'rule': {
+            'id': '5732b4b26ad7e40a8cbd4f3b',
+            'name': 'rule-1'
+        }
+    },
+    'result': {
+        'failed': False,
+        'succeeded': True,
+        'return_code': 0,
+        'stderr': '',
+        'stdout': '\n'.join(['line %s' % (index) for index in range(0, 100)]),
+        'hosts': dict([('web-%02d.example.com' % (index), {'succeeded': True, '$exit': 0})
+                       for index in range(0, 20)])
+    }
+}
+
+# Criteria used by the generated rules. Each tuple is (payload key, operator, pattern)
+CRITERIA = [
+    ('trigger.source', 'equals', 'monitoring'),
+    ('trigger.severity', 'greaterthan', 2),
+    ('trigger.host.name', 'regex', '^web-[0-9]+\\.example\\.com$'),
+    ('trigger.check.name', 'startswith', 'disk.'),
+    ('trigger.check.output', 'contains', 'WARNING'),
+    ('trigger.host.ip', 'equals', '{{"10.0.0." ~ 11}}'),
+    ('trigger.check.name', 'equals', 'cpu.usage')
+]
+
+
+def get_trigger_type_db():
+    return TriggerTypeDB(name='event', pack=PACK, payload_schema={}, parameters_schema={})
+
+
+def get_trigger_db():
+    return TriggerDB(name='event', pack=PACK, type=TRIGGER_REF, parameters={})
+
+
+def get_trigger_instance_db():
+    return TriggerInstanceDB(trigger=TRIGGER_REF, payload=copy.deepcopy(TRIGGER_PAYLOAD),
+                             occurrence_time=date_utils.get_datetime_utc_now())
+
+
+def get_rule_dbs(count=50, criteria_count=3):
+    """
+    Return a list of rules for the benchmark trigger.
+
+    Rules use a different combination of criteria so some of them match the trigger payload and
+    some don't. The last rule is a backstop rule.
+    """
+    rules = []
+
+    for index in range(0, count):
+        criteria = {}
+        for criteria_index in range(0, criteria_count):
+            key, operator, pattern = CRITERIA[(index + criteria_index) % len(CRITERIA)]
+            criteria[key] = {'type': operator, 'pattern': pattern}
+
+        is_backstop = (index == count - 1)
+        rule_type = RULE_TYPE_BACKSTOP if is_backstop else RULE_TYPE_STANDARD
+        action = ActionExecutionSpecDB(ref=ACTION_REF, parameters={
+            'message': '{{trigger.check.name}} on {{trigger.host.name}}'
+        })
+        rule = RuleDB(name='rule-%s' % (index), pack=PACK, trigger=TRIGGER_REF,
+                      criteria=criteria, action=action, enabled=True,
+                      type=RuleTypeSpecDB(ref=rule_type))
+        rules.append(rule)
+
+    return rules
@@ -0,0 +1,145 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmarks for the hot code paths which don't need a database or a message bus.
+"""
+
+import copy
+
+from st2common.models.api.execution import ActionExecutionAPI
+from st2common.models.api.rule import RuleAPI
+from st2common.models.db.execution import ActionExecutionDB
+from st2common.util import mongoescape
+from st2common.util import param as param_utils
+from st2reactor.rules.matcher import RulesMatcher
+
+from benchmarks import fixtures
+from benchmarks.base import Benchmark
+
+__all__ = [
+    'RulesMatcherBenchmark',
+    'ParamRenderingBenchmark',
+    'MongoEscapeBenchmark',
+    'MongoUnescapeBenchmark',
+    'APIFromModelBenchmark',
+    'ExecutionAPIValidationBenchmark',
+    'RuleAPIValidationBenchmark'
+]
+
+
+class RulesMatcherBenchmark(Benchmark):
+    name = 'rules_matcher.get_matching_rules'
+    description = 'Match a trigger instance against 50 rules with 3 criteria each.'
+    iterations = 100
+
+    def setup(self):
+        self.trigger = fixtures.get_trigger_db()
+        self.trigger_instance = fixtures.get_trigger_instance_db()
+        self.rules = fixtures.get_rule_dbs(count=50, criteria_count=3)
+
+    def run(self):
+        matcher = RulesMatcher(trigger_instance=self.trigger_instance, trigger=self.trigger,
+                               rules=self.rules)
+        matcher.get_matching_rules()
+
+
+class ParamRenderingBenchmark(Benchmark):
+    name = 'param.get_finalized_params'
+    description = 'Render runner and action parameters with defaults which use templates.'
+    iterations = 500
+
+    def setup(self):
+        self.runner_parameters = fixtures.RUNNER_TYPE['runner_parameters']
+        self.action_parameters = fixtures.ACTION['parameters']
+        self.liveaction_parameters = {
+            'message': 'disk.usage on {{action_context.host}}',
+            'timeout': '{{retries * 30}}'
+        }
+        self.action_context = {
+            'host': 'web-01.example.com',
+            'user': 'stanley'
+        }
+
+    def run(self):
+        param_utils.get_finalized_params(self.runner_parameters, self.action_parameters,
+                                         self.liveaction_parameters, self.action_context)
+
+
+class MongoEscapeBenchmark(Benchmark):
+    name = 'mongoescape.escape_chars'
+    description = 'Escape keys of a typical action execution result.'
+    iterations = 1000
+
+    def setup(self):
+        self.value = copy.deepcopy(fixtures.EXECUTION['result'])
+
+    def run(self):
+        mongoescape.escape_chars(self.value)
+
+
+class MongoUnescapeBenchmark(Benchmark):
+    name = 'mongoescape.unescape_chars'
+    description = 'Unescape keys of a typical (escaped) action execution result.'
+    iterations = 1000
+
+    def setup(self):
+        self.value = mongoescape.escape_chars(fixtures.EXECUTION['result'])
+
+    def run(self):
+        mongoescape.unescape_chars(self.value)
+
+
+class APIFromModelBenchmark(Benchmark):
+    name = 'api.execution_from_model'
+    description = 'Serialize an action execution DB object to an API object.'
+    iterations = 1000
+
+    def setup(self):
+        self.execution_db = ActionExecutionDB(**copy.deepcopy(fixtures.EXECUTION))
+
+    def run(self):
+        ActionExecutionAPI.from_model(self.execution_db, mask_secrets=True)
+
+
+class ExecutionAPIValidationBenchmark(Benchmark):
+    name = 'api.execution_validate'
+    description = 'Validate an action execution API object against the JSON schema.'
+    iterations = 1000
+
+    def setup(self):
+        execution_db = ActionExecutionDB(**copy.deepcopy(fixtures.EXECUTION))
+        self.execution_api = ActionExecutionAPI.from_model(execution_db)
+
+    def run(self):
+        self.execution_api.validate()
+
+
+class RuleAPIValidationBenchmark(Benchmark):
+    name = 'api.rule_validate'
+    description = 'Validate a rule API object against the JSON schema.'
+    iterations = 1000
+
+    def setup(self):
+        rule_db = fixtures.get_rule_dbs(count=1)[0]
+        self.rule_api = RuleAPI(name=rule_db.name, pack=rule_db.pack,
+                                trigger={'type': fixtures.TRIGGER_REF, 'parameters': {}},
+                                criteria=rule_db.criteria,
+                                action={'ref': rule_db.action.ref,
+                                        'parameters': rule_db.action.parameters},
+                                enabled=True)
+
+    def run(self):
+        self.rule_api.validate()
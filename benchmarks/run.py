@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run the benchmarks and optionally write the results to a JSON file and compare them with the
+results of a previous run.
+
+Usage:
+
+    python -m benchmarks.run --config-file /etc/st2/st2.conf --output results.json
+    python -m benchmarks.run --config-file /etc/st2/st2.conf --baseline 1.3.json
+
+Benchmarks which need a database are skipped when --skip-database flag is used.
+"""
+
+import sys
+import fnmatch
+
+from oslo_config import cfg
+
+from st2common import config
+
+from benchmarks import base
+from benchmarks import micro
+from benchmarks import throughput
+
+BENCHMARKS = [
+    micro.RulesMatcherBenchmark,
+    micro.ParamRenderingBenchmark,
+    micro.MongoEscapeBenchmark,
+    micro.MongoUnescapeBenchmark,
+    micro.APIFromModelBenchmark,
+    micro.ExecutionAPIValidationBenchmark,
+    micro.RuleAPIValidationBenchmark,
+    throughput.TriggerInstanceThroughputBenchmark
+]
+
+
+def _register_cli_opts():
+    cli_opts = [
+        cfg.ListOpt('benchmarks', default=[],
+                    help='Names (or glob patterns) of the benchmarks to run. Defaults to all.'),
+        cfg.IntOpt('rounds', default=5, help='Number of timed rounds for each benchmark.'),
+        cfg.IntOpt('iterations', default=None,
+                   help='Number of operations in each round. Defaults to a benchmark '
+                        'specific value.'),
+        cfg.BoolOpt('skip-database', default=False,
+                    help='Skip benchmarks which need a database.'),
+        cfg.StrOpt('output', default=None, help='Path to a file to write JSON results to.'),
+        cfg.StrOpt('baseline', default=None,
+                   help='Path to a results file (e.g. from a previous release) to compare '
+                        'the results with.'),
+        cfg.FloatOpt('threshold', default=0.1,
+                     help='Relative slow down compared to the baseline which is considered a '
+                          'regression.')
+    ]
+    cfg.CONF.register_cli_opts(cli_opts)
+
+
+def _get_benchmarks(patterns, skip_database):
+    result = []
+
+    for benchmark_cls in BENCHMARKS:
+        if skip_database and benchmark_cls.requires_database:
+            continue
+
+        if patterns and not any([fnmatch.fnmatch(benchmark_cls.name, pattern)
+                                 for pattern in patterns]):
+            continue
+
+        result.append(benchmark_cls())
+
+    return result
+
+
+def _print_results(results):
+    print('%-45s %14s %14s %14s %14s' % ('benchmark', 'median (us)', 'min (us)',
+                                         'stddev (us)', 'ops/sec'))
+    for name, result in sorted(results.items()):
+        print('%-45s %14.2f %14.2f %14.2f %14.1f' % (name, result['median'] * 1000000,
+                                                     result['min'] * 1000000,
+                                                     result['stddev'] * 1000000,
+                                                     result['ops_per_second'] or 0))
+
+
+def _print_comparison(comparison):
+    print('%-45s %14s %14s %10s' % ('benchmark', 'baseline (us)', 'median (us)', 'ratio'))
+    for name, baseline_median, median, ratio, is_regression in comparison:
+        print('%-45s %14.2f %14.2f %9.2fx%s' % (name, baseline_median * 1000000,
+                                                median * 1000000, ratio,
+                                                ' REGRESSION' if is_regression else ''))
+
+
+def main():
+    _register_cli_opts()
+    config.parse_args()
+
+    benchmarks = _get_benchmarks(patterns=cfg.CONF.benchmarks,
+                                 skip_database=cfg.CONF.skip_database)
+
+    results = {}
+    for benchmark in benchmarks:
+        print('Running %s...' % (benchmark.name))
+        results[benchmark.name] = base.run_benchmark(benchmark=benchmark,
+                                                     rounds=cfg.CONF.rounds,
+                                                     iterations=cfg.CONF.iterations)
+
+    document = base.get_results_document(results=results)
+
+    print('')
+    _print_results(results=results)
+
+    if cfg.CONF.output:
+        base.write_results_document(document=document, file_path=cfg.CONF.output)
+        print('')
+        print('Results written to %s' % (cfg.CONF.output))
+
+    if cfg.CONF.baseline:
+        baseline = base.load_results_document(file_path=cfg.CONF.baseline)
+        comparison = base.compare_results(baseline=baseline, results=document,
+                                          threshold=cfg.CONF.threshold)
+
+        print('')
+        print('Comparison with %s (st2 %s):' % (cfg.CONF.baseline,
+                                                baseline['metadata']['st2_version']))
+        _print_comparison(comparison=comparison)
+
+        if any([is_regression for _, _, _, _, is_regression in comparison]):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
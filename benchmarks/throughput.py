@@ -0,0 +1,129 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+End-to-end throughput benchmarks. They need a MongoDB server, the message bus is replaced with
+the in-memory kombu transport.
+"""
+
+import copy
+
+from kombu import Connection
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.models.api.action import ActionAPI
+from st2common.models.api.action import RunnerTypeAPI
+from st2common.models.db import db_ensure_indexes
+from st2common.models.db import db_setup
+from st2common.models.db import db_teardown
+from st2common.persistence.action import Action
+from st2common.persistence.execution import ActionExecution
+from st2common.persistence.rule import Rule
+from st2common.persistence.runner import RunnerType
+from st2common.persistence.trigger import Trigger
+from st2common.persistence.trigger import TriggerType
+from st2common.transport.reactor import TriggerDispatcher
+from st2reactor.rules.matcher import RulesMatcher
+from st2reactor.rules.worker import RULESENGINE_WORK_Q
+from st2reactor.rules.worker import TriggerInstanceDispatcher
+
+from benchmarks import fixtures
+from benchmarks.base import Benchmark
+
+__all__ = [
+    'TriggerInstanceThroughputBenchmark'
+]
+
+LOG = logging.getLogger(__name__)
+
+DB_NAME = 'st2-benchmark'
+
+MESSAGING_URL = 'memory://'
+
+
+class TriggerInstanceThroughputBenchmark(Benchmark):
+    """
+    Dispatch a trigger instance and process it the same way as the rules engine does - create
+    the trigger instance and the trace, match the rules and request an execution for each of
+    the matched rules.
+
+    Note: The benchmark uses a separate "st2-benchmark" database which is dropped at the end.
+    """
+
+    name = 'throughput.trigger_instance_to_execution'
+    description = ('Dispatch a trigger instance over the in-memory message bus and process it '
+                   'in the rules engine (5 rules, 4 of which match).')
+    requires_database = True
+    iterations = 100
+
+    def setup(self):
+        cfg.CONF.set_override(name='url', override=MESSAGING_URL, group='messaging')
+        cfg.CONF.set_override(name='cluster_urls', override=[], group='messaging')
+
+        self._db_connection = db_setup(db_name=DB_NAME, db_host=cfg.CONF.database.host,
+                                       db_port=cfg.CONF.database.port)
+        self._db_connection.drop_database(DB_NAME)
+        db_ensure_indexes()
+
+        rule_dbs = fixtures.get_rule_dbs(count=5)
+        self._register_resources(rule_dbs=rule_dbs)
+
+        matcher = RulesMatcher(trigger_instance=fixtures.get_trigger_instance_db(),
+                               trigger=fixtures.get_trigger_db(), rules=rule_dbs)
+        self._matching_rules_count = len(matcher.get_matching_rules())
+        self._dispatched_count = 0
+
+        # Queue needs to be declared before the trigger instances are dispatched, otherwise
+        # the messages are dropped
+        self._connection = Connection(MESSAGING_URL)
+        self._queue = self._connection.SimpleQueue(RULESENGINE_WORK_Q)
+        self._trigger_dispatcher = TriggerDispatcher(LOG)
+        self._worker = TriggerInstanceDispatcher(self._connection, [RULESENGINE_WORK_Q])
+
+    def run(self):
+        self._trigger_dispatcher.dispatch(fixtures.TRIGGER_REF,
+                                          payload=copy.deepcopy(fixtures.TRIGGER_PAYLOAD))
+
+        message = self._queue.get(block=False)
+        self._worker.process(message.payload)
+        message.ack()
+
+        self._dispatched_count += 1
+
+    def teardown(self):
+        try:
+            # Worker logs and ignores the errors so we verify that all the executions have
+            # actually been created
+            executions_count = ActionExecution.count()
+            expected_count = self._dispatched_count * self._matching_rules_count
+
+            if executions_count != expected_count:
+                raise Exception('Expected %s executions to be created, but %s were created' %
+                                (expected_count, executions_count))
+        finally:
+            self._queue.close()
+            self._connection.release()
+            self._db_connection.drop_database(DB_NAME)
+            db_teardown()
+
+    def _register_resources(self, rule_dbs):
+        RunnerType.add_or_update(RunnerTypeAPI.to_model(RunnerTypeAPI(**fixtures.RUNNER_TYPE)))
+        Action.add_or_update(ActionAPI.to_model(ActionAPI(**fixtures.ACTION)))
+        TriggerType.add_or_update(fixtures.get_trigger_type_db())
+        Trigger.add_or_update(fixtures.get_trigger_db())
+
+        for rule_db in rule_dbs:
+            Rule.add_or_update(rule_db)
@@ -18,6 +18,7 @@ import sys
 import traceback
 
 from st2common import log as logging
+from st2common.metrics import base as metrics
 from st2common.util import date as date_utils
 from st2common.constants import action as action_constants
 from st2common.exceptions import actionrunner
@@ -59,12 +60,13 @@ class RunnerContainer(object):
         LOG.debug('Runner instance for RunnerType "%s" is: %s', runnertype_db.name, runner)
 
         # Process the request.
-        if liveaction_db.status == action_constants.LIVEACTION_STATUS_CANCELING:
-            liveaction_db = self._do_cancel(runner=runner, runnertype_db=runnertype_db,
-                                            action_db=action_db, liveaction_db=liveaction_db)
-        else:
-            liveaction_db = self._do_run(runner=runner, runnertype_db=runnertype_db,
-                                         action_db=action_db, liveaction_db=liveaction_db)
+        with metrics.Timer('runner_container.%s.dispatch_time' % (runnertype_db.name)):
+            if liveaction_db.status == action_constants.LIVEACTION_STATUS_CANCELING:
+                liveaction_db = self._do_cancel(runner=runner, runnertype_db=runnertype_db,
+                                                action_db=action_db, liveaction_db=liveaction_db)
+            else:
+                liveaction_db = self._do_run(runner=runner, runnertype_db=runnertype_db,
+                                             action_db=action_db, liveaction_db=liveaction_db)
 
         return liveaction_db.result
 
@@ -26,12 +26,12 @@ from st2common.constants.triggers import INTERNAL_TRIGGER_TYPES
 from st2common.models.api.trace import TraceContext
 from st2common.models.db.liveaction import LiveActionDB
 from st2common.persistence.action import Action
-from st2common.persistence.policy import Policy
-from st2common import policies
 from st2common.models.system.common import ResourceReference
 from st2common.persistence.execution import ActionExecution
+from st2common.services import action_results
 from st2common.services import trace as trace_service
-from st2common.transport import consumers, liveaction, publishers
+from st2common.services.policies import PolicyCache
+from st2common.transport import consumers, liveaction
 from st2common.transport import utils as transport_utils
 from st2common.transport.reactor import TriggerDispatcher
 from st2common.util import isotime
@@ -49,8 +49,14 @@ __all__ = [
 
 LOG = logging.getLogger(__name__)
 
-ACTIONUPDATE_WORK_Q = liveaction.get_queue('st2.notifiers.work',
-                                           routing_key=publishers.UPDATE_RK)
+# Only completed executions are of interest to the notifier so the queue is only bound to the
+# completed states on the status management exchange.
+ACTIONUPDATE_WORK_Q = liveaction.get_status_management_queue_for_states(
+    'st2.notifiers.completed.work', states=LIVEACTION_COMPLETED_STATES)
+
+# Execution fields which are not used by the notifier and therefore not retrieved.
+EXECUTION_EXCLUDE_FIELDS = ['trigger', 'trigger_type', 'trigger_instance', 'rule', 'action',
+                            'liveaction', 'parameters', 'context', 'children']
 
 ACTION_SENSOR_ENABLED = cfg.CONF.action_sensor.enable
 # XXX: Fix this nasty positional dependency.
@@ -72,6 +78,15 @@ class Notifier(consumers.MessageHandler):
         self._action_trigger = ResourceReference.to_string_reference(
             pack=ACTION_TRIGGER_TYPE['pack'],
             name=ACTION_TRIGGER_TYPE['name'])
+        self._policy_cache = PolicyCache(queue_suffix='notifier')
+
+    def start(self, wait=False):
+        self._policy_cache.start()
+        super(Notifier, self).start(wait=wait)
+
+    def shutdown(self):
+        super(Notifier, self).shutdown()
+        self._policy_cache.stop()
 
     def process(self, liveaction):
         live_action_id = str(liveaction.id)
@@ -92,102 +107,145 @@ class Notifier(consumers.MessageHandler):
 
         self._apply_post_run_policies(liveaction=liveaction)
 
+        # Trace context and runner are the same for all the triggers dispatched for this
+        # execution so they are only retrieved once.
+        execution_id = str(execution.id)
+        trace_context = self._get_trace_context(execution_id=execution_id)
+        runner_ref = self._get_runner_ref(liveaction.action, execution=execution)
+
         if liveaction.notify is not None:
-            self._post_notify_triggers(liveaction=liveaction, execution=execution)
+            self._post_notify_triggers(liveaction=liveaction, execution=execution,
+                                       runner_ref=runner_ref, trace_context=trace_context)
 
-        self._post_generic_trigger(liveaction=liveaction, execution=execution)
+        self._post_generic_trigger(liveaction=liveaction, execution=execution,
+                                   runner_ref=runner_ref, trace_context=trace_context)
 
     def _get_execution_for_liveaction(self, liveaction):
-        execution = ActionExecution.get(liveaction__id=str(liveaction.id))
+        execution = ActionExecution.get(liveaction__id=str(liveaction.id),
+                                        exclude_fields=EXECUTION_EXCLUDE_FIELDS)
 
         if not execution:
             return None
 
         return execution
 
-    def _post_notify_triggers(self, liveaction=None, execution=None):
+    def _post_notify_triggers(self, liveaction=None, execution=None, runner_ref=None,
+                              trace_context=None):
         notify = getattr(liveaction, 'notify', None)
 
         if not notify:
             return
 
+        subsections = []
         if notify.on_complete:
-            self._post_notify_subsection_triggers(
-                liveaction=liveaction, execution=execution,
-                notify_subsection=notify.on_complete,
-                default_message_suffix='completed.')
+            subsections.append((notify.on_complete, 'completed.'))
         if liveaction.status == LIVEACTION_STATUS_SUCCEEDED and notify.on_success:
-            self._post_notify_subsection_triggers(
-                liveaction=liveaction, execution=execution,
-                notify_subsection=notify.on_success,
-                default_message_suffix='succeeded.')
+            subsections.append((notify.on_success, 'succeeded.'))
         if liveaction.status in LIVEACTION_FAILED_STATES and notify.on_failure:
-            self._post_notify_subsection_triggers(
-                liveaction=liveaction, execution=execution,
-                notify_subsection=notify.on_failure,
-                default_message_suffix='failed.')
-
-    def _post_notify_subsection_triggers(self, liveaction=None, execution=None,
-                                         notify_subsection=None,
-                                         default_message_suffix=None):
-        routes = (getattr(notify_subsection, 'routes') or
-                  getattr(notify_subsection, 'channels', None))
-
-        execution_id = str(execution.id)
-
-        if routes and len(routes) >= 1:
-            payload = {}
-            message = notify_subsection.message or (
-                'Action ' + liveaction.action + ' ' + default_message_suffix)
-            data = notify_subsection.data or {}
-
-            jinja_context = self._build_jinja_context(liveaction=liveaction, execution=execution)
-
+            subsections.append((notify.on_failure, 'failed.'))
+
+        # Payloads for all the routes of all the matching subsections are built first and then
+        # dispatched in one go. Jinja context is shared between the subsections.
+        jinja_context = None
+        result_data = None
+        route_payloads = []
+
+        for notify_subsection, default_message_suffix in subsections:
+            routes = (getattr(notify_subsection, 'routes') or
+                      getattr(notify_subsection, 'channels', None))
+
+            if not routes:
+                continue
+
+            if jinja_context is None:
+                jinja_context = self._build_jinja_context(liveaction=liveaction,
+                                                          execution=execution)
+                result_data = self._get_notify_result_data(liveaction=liveaction,
+                                                           execution=execution)
+
+            payload = self._get_notify_payload(liveaction=liveaction, execution=execution,
+                                               notify_subsection=notify_subsection,
+                                               default_message_suffix=default_message_suffix,
+                                               runner_ref=runner_ref,
+                                               jinja_context=jinja_context,
+                                               result_data=result_data)
+            route_payloads.extend([(route, payload) for route in routes])
+
+        self._dispatch_notify_triggers(liveaction=liveaction, route_payloads=route_payloads,
+                                       trace_context=trace_context)
+
+    def _get_notify_payload(self, liveaction, execution, notify_subsection,
+                            default_message_suffix, runner_ref, jinja_context, result_data):
+        payload = {}
+        message = notify_subsection.message or (
+            'Action ' + liveaction.action + ' ' + default_message_suffix)
+        data = notify_subsection.data or {}
+
+        try:
+            message = self._transform_message(message=message,
+                                              context=jinja_context)
+        except:
+            LOG.exception('Failed (Jinja) transforming `message`.')
+
+        try:
+            data = self._transform_data(data=data, context=jinja_context)
+        except:
+            LOG.exception('Failed (Jinja) transforming `data`.')
+
+        data.update(result_data)
+
+        payload['message'] = message
+        payload['data'] = data
+        payload['execution_id'] = str(execution.id)
+        payload['status'] = liveaction.status
+        payload['start_timestamp'] = isotime.format(liveaction.start_timestamp)
+        payload['end_timestamp'] = isotime.format(liveaction.end_timestamp)
+        payload['action_ref'] = liveaction.action
+        payload['runner_ref'] = runner_ref
+        return payload
+
+    def _get_notify_result_data(self, liveaction, execution):
+        # At this point convert result to a string. This restricts the rulesengines
+        # ability to introspect the result. On the other handle atleast a json usable
+        # result is sent as part of the notification. If jinja is required to convert
+        # to a string representation it uses str(...) which make it impossible to
+        # parse the result as json any longer.
+        # TODO: Use to_serializable_dict
+        serialized_result = json.dumps(liveaction.result)
+        result_payload = action_results.get_result_payload(result=liveaction.result,
+                                                           execution_id=str(execution.id),
+                                                           serialized_result=serialized_result)
+
+        if result_payload.get(action_results.RESULT_TRUNCATED_KEY, False):
+            # Result is too large, only a preview and a reference to the execution is sent. The
+            # preview is wrapped so the result is still a valid JSON document.
+            preview = result_payload.pop(action_results.RESULT_PREVIEW_KEY)
+            result_payload['result'] = json.dumps({
+                'truncated': True,
+                'preview': preview,
+                action_results.RESULT_REF_KEY: result_payload[action_results.RESULT_REF_KEY]
+            })
+            return result_payload
+
+        return {'result': serialized_result}
+
+    def _dispatch_notify_triggers(self, liveaction, route_payloads, trace_context=None):
+        failed_routes = []
+        for route, payload in route_payloads:
             try:
-                message = self._transform_message(message=message,
-                                                  context=jinja_context)
+                payload = dict(payload)
+                payload['route'] = route
+                # Deprecated. Only for backward compatibility reasons.
+                payload['channel'] = route
+                LOG.debug('POSTing %s for %s. Payload - %s.', NOTIFY_TRIGGER_TYPE['name'],
+                          liveaction.id, payload)
+                self._trigger_dispatcher.dispatch(self._notify_trigger, payload=payload,
+                                                  trace_context=trace_context)
             except:
-                LOG.exception('Failed (Jinja) transforming `message`.')
+                failed_routes.append(route)
 
-            try:
-                data = self._transform_data(data=data, context=jinja_context)
-            except:
-                LOG.exception('Failed (Jinja) transforming `data`.')
-
-            # At this point convert result to a string. This restricts the rulesengines
-            # ability to introspect the result. On the other handle atleast a json usable
-            # result is sent as part of the notification. If jinja is required to convert
-            # to a string representation it uses str(...) which make it impossible to
-            # parse the result as json any longer.
-            # TODO: Use to_serializable_dict
-            data['result'] = json.dumps(liveaction.result)
-
-            payload['message'] = message
-            payload['data'] = data
-            payload['execution_id'] = execution_id
-            payload['status'] = liveaction.status
-            payload['start_timestamp'] = isotime.format(liveaction.start_timestamp)
-            payload['end_timestamp'] = isotime.format(liveaction.end_timestamp)
-            payload['action_ref'] = liveaction.action
-            payload['runner_ref'] = self._get_runner_ref(liveaction.action)
-
-            trace_context = self._get_trace_context(execution_id=execution_id)
-
-            failed_routes = []
-            for route in routes:
-                try:
-                    payload['route'] = route
-                    # Deprecated. Only for backward compatibility reasons.
-                    payload['channel'] = route
-                    LOG.debug('POSTing %s for %s. Payload - %s.', NOTIFY_TRIGGER_TYPE['name'],
-                              liveaction.id, payload)
-                    self._trigger_dispatcher.dispatch(self._notify_trigger, payload=payload,
-                                                      trace_context=trace_context)
-                except:
-                    failed_routes.append(route)
-
-            if len(failed_routes) > 0:
-                raise Exception('Failed notifications to routes: %s' % ', '.join(failed_routes))
+        if len(failed_routes) > 0:
+            raise Exception('Failed notifications to routes: %s' % ', '.join(failed_routes))
 
     def _build_jinja_context(self, liveaction, execution):
         context = {SYSTEM_KV_PREFIX: KeyValueLookup()}
@@ -206,6 +264,9 @@ class Notifier(consumers.MessageHandler):
         return jinja_utils.render_values(mapping=data, context=context)
 
     def _get_trace_context(self, execution_id):
+        # Use execution_id to extract trace rather than liveaction. execution_id
+        # will look-up an exact TraceDB while liveaction depending on context
+        # may not end up going to the DB.
         trace_db = trace_service.get_trace_db_by_action_execution(
             action_execution_id=execution_id)
         if trace_db:
@@ -214,7 +275,8 @@ class Notifier(consumers.MessageHandler):
         # it shall be created downstream. Sure this is impl leakage of some sort.
         return None
 
-    def _post_generic_trigger(self, liveaction=None, execution=None):
+    def _post_generic_trigger(self, liveaction=None, execution=None, runner_ref=None,
+                              trace_context=None):
         if not ACTION_SENSOR_ENABLED:
             LOG.debug('Action trigger is disabled, skipping trigger dispatch...')
             return
@@ -226,13 +288,11 @@ class Notifier(consumers.MessageHandler):
                    # deprecate 'action_name' at some point and switch to 'action_ref'
                    'action_name': liveaction.action,
                    'action_ref': liveaction.action,
-                   'runner_ref': self._get_runner_ref(liveaction.action),
-                   'parameters': liveaction.get_masked_parameters(),
-                   'result': liveaction.result}
-        # Use execution_id to extract trace rather than liveaction. execution_id
-        # will look-up an exact TraceDB while liveaction depending on context
-        # may not end up going to the DB.
-        trace_context = self._get_trace_context(execution_id=execution_id)
+                   'runner_ref': runner_ref,
+                   'parameters': liveaction.get_masked_parameters()}
+        # Large results are replaced with a reference to the execution and a preview.
+        payload.update(action_results.get_result_payload(result=liveaction.result,
+                                                         execution_id=execution_id))
         LOG.debug('POSTing %s for %s. Payload - %s. TraceContext - %s',
                   ACTION_TRIGGER_TYPE['name'], liveaction.id, payload, trace_context)
         self._trigger_dispatcher.dispatch(self._action_trigger, payload=payload,
@@ -240,14 +300,10 @@ class Notifier(consumers.MessageHandler):
 
     def _apply_post_run_policies(self, liveaction=None):
         # Apply policies defined for the action.
-        policy_dbs = Policy.query(resource_ref=liveaction.action)
-        LOG.debug('Applying %s post_run policies' % (len(policy_dbs)))
-
-        for policy_db in policy_dbs:
-            driver = policies.get_driver(policy_db.ref,
-                                         policy_db.policy_type,
-                                         **policy_db.parameters)
+        policy_drivers = self._policy_cache.get_drivers(liveaction.action)
+        LOG.debug('Applying %s post_run policies' % (len(policy_drivers)))
 
+        for policy_db, driver in policy_drivers:
             try:
                 LOG.debug('Applying post_run policy "%s" (%s) for liveaction %s' %
                           (policy_db.ref, policy_db.policy_type, str(liveaction.id)))
@@ -255,12 +311,19 @@ class Notifier(consumers.MessageHandler):
             except:
                 LOG.exception('An exception occurred while applying policy "%s".', policy_db.ref)
 
-    def _get_runner_ref(self, action_ref):
+    def _get_runner_ref(self, action_ref, execution=None):
         """
         Retrieve a runner reference for the provided action.
 
+        The runner stored on the execution is used when available which avoids an action
+        lookup.
+
         :rtype: ``str``
         """
+        runner = getattr(execution, 'runner', None) or {}
+        if runner.get('name', None):
+            return runner['name']
+
         action = Action.get_by_ref(action_ref)
         return action['runner_type']['name']
 
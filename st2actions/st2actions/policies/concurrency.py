@@ -17,6 +17,7 @@ from st2common.constants import action as action_constants
 from st2common import log as logging
 from st2common.persistence import action as action_access
 from st2common.policies import base
+from st2common.policies import concurrency as concurrency_counters
 from st2common.services import action as action_service
 from st2common.services import coordination
 
@@ -35,16 +36,14 @@ class ConcurrencyApplicator(base.ResourcePolicyApplicator):
         values = {'policy_type': self._policy_type, 'action': target.action}
         return self._get_lock_name(values=values)
 
-    def _apply_before(self, target):
-        # Get the count of scheduled instances of the action.
-        scheduled = action_access.LiveAction.count(
-            action=target.action, status=action_constants.LIVEACTION_STATUS_SCHEDULED)
-
-        # Get the count of running instances of the action.
-        running = action_access.LiveAction.count(
-            action=target.action, status=action_constants.LIVEACTION_STATUS_RUNNING)
+    def _get_counter_key(self, target):
+        return self._get_lock_uid(target)
 
-        count = scheduled + running
+    def _apply_before(self, target):
+        # Get the count of scheduled and running instances of the action.
+        counter_key = self._get_counter_key(target)
+        count = concurrency_counters.get_in_flight_count(key=counter_key,
+                                                         filters={'action': target.action})
 
         # Mark the execution as scheduled if threshold is not reached or delayed otherwise.
         if count < self.threshold:
@@ -61,6 +60,9 @@ class ConcurrencyApplicator(base.ResourcePolicyApplicator):
         # Update the status in the database but do not publish.
         target = action_service.update_status(target, status, publish=False)
 
+        if status == action_constants.LIVEACTION_STATUS_SCHEDULED:
+            concurrency_counters.add_in_flight(key=counter_key, liveaction_db=target)
+
         return target
 
     def apply_before(self, target):
@@ -84,6 +86,10 @@ class ConcurrencyApplicator(base.ResourcePolicyApplicator):
         return target
 
     def _apply_after(self, target):
+        # The target is no longer in-flight.
+        concurrency_counters.remove_in_flight(key=self._get_counter_key(target),
+                                              liveaction_db=target)
+
         # Schedule the oldest delayed executions.
         requests = action_access.LiveAction.query(action=target.action,
                                                   status=action_constants.LIVEACTION_STATUS_DELAYED,
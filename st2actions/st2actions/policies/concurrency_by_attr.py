@@ -20,6 +20,7 @@ from st2common.constants import action as action_constants
 from st2common import log as logging
 from st2common.persistence import action as action_access
 from st2common.policies import base
+from st2common.policies import concurrency as concurrency_counters
 from st2common.services import action as action_service
 from st2common.services import coordination
 
@@ -55,19 +56,23 @@ class ConcurrencyByAttributeApplicator(base.ResourcePolicyApplicator):
 
         return filters
 
+    def _get_counter_key(self, target):
+        meta = {
+            'policy_type': self._policy_type,
+            'action': target.action,
+            'attributes': {k: v for k, v in six.iteritems(target.parameters)
+                           if k in self.attributes}
+        }
+
+        return json.dumps(meta, sort_keys=True)
+
     def _apply_before(self, target):
         # Get the count of scheduled and running instances of the action.
         filters = self._get_filters(target)
+        del filters['status']
 
-        # Get the count of scheduled instances of the action.
-        filters['status'] = action_constants.LIVEACTION_STATUS_SCHEDULED
-        scheduled = action_access.LiveAction.count(**filters)
-
-        # Get the count of running instances of the action.
-        filters['status'] = action_constants.LIVEACTION_STATUS_RUNNING
-        running = action_access.LiveAction.count(**filters)
-
-        count = scheduled + running
+        counter_key = self._get_counter_key(target)
+        count = concurrency_counters.get_in_flight_count(key=counter_key, filters=filters)
 
         # Mark the execution as scheduled if threshold is not reached or delayed otherwise.
         if count < self.threshold:
@@ -84,6 +89,9 @@ class ConcurrencyByAttributeApplicator(base.ResourcePolicyApplicator):
         # Update the status in the database but do not publish.
         target = action_service.update_status(target, status, publish=False)
 
+        if status == action_constants.LIVEACTION_STATUS_SCHEDULED:
+            concurrency_counters.add_in_flight(key=counter_key, liveaction_db=target)
+
         return target
 
     def apply_before(self, target):
@@ -109,6 +117,10 @@ class ConcurrencyByAttributeApplicator(base.ResourcePolicyApplicator):
         return target
 
     def _apply_after(self, target):
+        # The target is no longer in-flight.
+        concurrency_counters.remove_in_flight(key=self._get_counter_key(target),
+                                              liveaction_db=target)
+
         # Schedule the oldest delayed executions.
         filters = self._get_filters(target)
         filters['status'] = action_constants.LIVEACTION_STATUS_DELAYED
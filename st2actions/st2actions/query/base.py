@@ -14,10 +14,14 @@
 # limitations under the License.
 
 import abc
+import heapq
+import itertools
+import time
+
 import eventlet
-import Queue
 import six
-import time
+from eventlet import event
+from oslo_config import cfg
 
 from st2actions.container.service import RunnerContainerService
 from st2actions.runners import get_runner
@@ -39,14 +43,36 @@ __all__ = [
 
 @six.add_metaclass(abc.ABCMeta)
 class Querier(object):
-    def __init__(self, threads_pool_size=10, query_interval=1, empty_q_sleep_time=5,
-                 no_workers_sleep_time=1, container_service=None):
-        self._query_threads_pool_size = threads_pool_size
-        self._query_contexts = Queue.Queue()
+    """
+    Base class for the queriers which poll external systems for the results of asynchronous
+    actions.
+
+    Query contexts are kept in a heap ordered by the time of their next query. The interval
+    between two queries of the same context starts at query_interval and grows exponentially
+    (up to query_interval_max) for as long as the results reported by the external system don't
+    change. As soon as the results change, the interval is reset back to query_interval.
+    """
+
+    def __init__(self, threads_pool_size=None, query_interval=None, empty_q_sleep_time=5,
+                 no_workers_sleep_time=1, container_service=None, query_interval_max=None,
+                 query_interval_backoff=None):
+        conf = cfg.CONF.resultstracker
+        self._query_threads_pool_size = threads_pool_size or conf.thread_pool_size
+        self._query_interval = query_interval or conf.query_interval
+        self._query_interval_max = max(query_interval_max or conf.query_interval_max,
+                                       self._query_interval)
+        self._query_interval_backoff = query_interval_backoff or conf.query_interval_backoff
+
+        # Heap of (next_query_time, sequence, query_context) tuples. Sequence is used to keep
+        # ordering stable for the contexts which are due at the same time.
+        self._query_contexts = []
+        self._query_contexts_sequence = itertools.count()
+        self._query_context_intervals = {}
+
         self._thread_pool = eventlet.GreenPool(self._query_threads_pool_size)
         self._empty_q_sleep_time = empty_q_sleep_time
         self._no_workers_sleep_time = no_workers_sleep_time
-        self._query_interval = query_interval
+        self._new_queries_event = event.Event()
         if not container_service:
             container_service = RunnerContainerService()
         self.container_service = container_service
@@ -55,32 +81,97 @@ class Querier(object):
     def start(self):
         self._started = True
         while True:
-            while self._query_contexts.empty():
-                eventlet.greenthread.sleep(self._empty_q_sleep_time)
+            while not self._query_contexts:
+                self._wait_for_queries(timeout=self._empty_q_sleep_time)
             while self._thread_pool.free() <= 0:
                 eventlet.greenthread.sleep(self._no_workers_sleep_time)
             self._fire_queries()
+            self._wait_for_queries(timeout=self._get_time_until_next_query())
 
     def add_queries(self, query_contexts=None):
         if query_contexts is None:
             query_contexts = []
         LOG.debug('Adding queries to querier: %s' % query_contexts)
         for query_context in query_contexts:
-            self._query_contexts.put((time.time(), query_context))
+            if query_context.id in self._query_context_intervals:
+                LOG.debug('Skipping already tracked query context: %s', query_context)
+                continue
+
+            self._query_context_intervals[query_context.id] = self._query_interval
+            self._schedule_query(query_context, delay=self._query_interval)
+
+    def remove_queries(self, query_context_ids=None):
+        """
+        Stop tracking the query contexts with the provided ids.
+        """
+        query_context_ids = set(query_context_ids or [])
+        LOG.debug('Removing queries from querier: %s' % query_context_ids)
+        for query_context_id in query_context_ids:
+            self._query_context_intervals.pop(query_context_id, None)
+
+        self._query_contexts = [item for item in self._query_contexts
+                                if item[2].id not in query_context_ids]
+        heapq.heapify(self._query_contexts)
 
     def is_started(self):
         return self._started
 
-    def _fire_queries(self):
-        if self._thread_pool.free() <= 0:
+    def _wait_for_queries(self, timeout):
+        """
+        Sleep until timeout has elapsed or until a query has been (re)scheduled.
+        """
+        if timeout <= 0:
+            eventlet.greenthread.sleep(0)
             return
-        while not self._query_contexts.empty() and self._thread_pool.free() > 0:
-            (last_query_time, query_context) = self._query_contexts.get_nowait()
-            if time.time() - last_query_time < self._query_interval:
-                self._query_contexts.put((last_query_time, query_context))
-                continue
-            else:
-                self._thread_pool.spawn(self._query_and_save_results, query_context)
+
+        with eventlet.Timeout(timeout, False):
+            self._new_queries_event.wait()
+
+        if self._new_queries_event.ready():
+            self._new_queries_event = event.Event()
+
+    def _get_time_until_next_query(self):
+        if not self._query_contexts:
+            return self._empty_q_sleep_time
+
+        next_query_time = self._query_contexts[0][0]
+        return min(max(next_query_time - time.time(), 0), self._empty_q_sleep_time)
+
+    def _schedule_query(self, query_context, delay):
+        next_query_time = time.time() + delay
+        heapq.heappush(self._query_contexts,
+                       (next_query_time, next(self._query_contexts_sequence), query_context))
+
+        if not self._new_queries_event.ready():
+            self._new_queries_event.send()
+
+    def _reschedule_query(self, query_context, changed):
+        """
+        Schedule the next query for the provided context. The interval is reset if the results
+        have changed since the last query and backed off exponentially otherwise.
+        """
+        if query_context.id not in self._query_context_intervals:
+            # Query context has been removed while the query was in progress
+            return
+
+        if changed:
+            interval = self._query_interval
+        else:
+            interval = self._query_context_intervals[query_context.id]
+            interval = min(interval * self._query_interval_backoff, self._query_interval_max)
+
+        self._query_context_intervals[query_context.id] = interval
+        self._schedule_query(query_context, delay=interval)
+
+    def _fire_queries(self):
+        now = time.time()
+        while self._query_contexts and self._thread_pool.free() > 0:
+            next_query_time, _, query_context = self._query_contexts[0]
+            if next_query_time > now:
+                break
+
+            heapq.heappop(self._query_contexts)
+            self._thread_pool.spawn(self._query_and_save_results, query_context)
 
     def _query_and_save_results(self, query_context):
         execution_id = query_context.execution_id
@@ -97,7 +188,7 @@ class Querier(object):
 
         liveaction_db = None
         try:
-            liveaction_db = self._update_action_results(execution_id, status, results)
+            liveaction_db, changed = self._update_action_results(execution_id, status, results)
         except Exception:
             LOG.exception('Failed updating action results for liveaction_id %s', execution_id)
             self._delete_state_object(query_context)
@@ -115,13 +206,27 @@ class Querier(object):
             self._delete_state_object(query_context)
             return
 
-        self._query_contexts.put((time.time(), query_context))
+        self._reschedule_query(query_context, changed=changed)
 
     def _update_action_results(self, execution_id, status, results):
+        """
+        Update the liveaction and the execution with the provided status and results.
+
+        :return: Tuple of (liveaction_db, changed) where changed indicates if status or results
+                 differed from the stored ones. Nothing is written if an incomplete action
+                 reported no change.
+        :rtype: ``tuple``
+        """
         liveaction_db = LiveAction.get_by_id(execution_id)
         if not liveaction_db:
             raise Exception('No DB model for liveaction_id: %s' % execution_id)
 
+        if (status not in action_constants.LIVEACTION_COMPLETED_STATES and
+                liveaction_db.status == status and liveaction_db.result == results):
+            return (liveaction_db, False)
+
+        old_status = liveaction_db.status
+
         if liveaction_db.status != action_constants.LIVEACTION_STATUS_CANCELED:
             liveaction_db.status = status
 
@@ -137,7 +242,13 @@ class Querier(object):
         executions.update_execution(updated_liveaction)
         LiveAction.publish_update(updated_liveaction)
 
-        return updated_liveaction
+        # Completion is published on the status exchange as well since that is what the
+        # notifier consumes.
+        if (updated_liveaction.status != old_status and
+                updated_liveaction.status in action_constants.LIVEACTION_COMPLETED_STATES):
+            LiveAction.publish_status(updated_liveaction)
+
+        return (updated_liveaction, True)
 
     def _invoke_post_run(self, actionexec_db, action_db):
         LOG.info('Invoking post run for action execution %s. Action=%s; Runner=%s',
@@ -163,6 +274,7 @@ class Querier(object):
         runner.post_run(actionexec_db.status, actionexec_db.result)
 
     def _delete_state_object(self, query_context):
+        self._query_context_intervals.pop(query_context.id, None)
         state_db = ActionExecutionState.get_by_id(query_context.id)
         if state_db is not None:
             try:
@@ -183,7 +295,7 @@ class Querier(object):
 
     def print_stats(self):
         LOG.info('\t --- Name: %s, pending queuries: %d', self.__class__.__name__,
-                 self._query_contexts.qsize())
+                 len(self._query_contexts))
 
 
 class QueryContext(object):
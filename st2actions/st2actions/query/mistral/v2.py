@@ -40,6 +40,10 @@ class MistralResultsQuerier(Querier):
             cacert=cfg.CONF.mistral.cacert,
             insecure=cfg.CONF.mistral.insecure)
 
+        # Tasks of the running workflows keyed by mistral execution id. Tasks are only fetched
+        # again once the state of the workflow execution changes.
+        self._workflow_tasks_cache = {}
+
     @retrying.retry(
         retry_on_exception=utils.retry_on_exceptions,
         wait_exponential_multiplier=cfg.CONF.mistral.retry_exp_msec,
@@ -61,16 +65,21 @@ class MistralResultsQuerier(Querier):
                             execution_id, query_context)
 
         try:
-            result = self._get_workflow_result(mistral_exec_id)
-            result['tasks'] = self._get_workflow_tasks(mistral_exec_id)
+            wf_ex = executions.ExecutionManager(self._client).get(mistral_exec_id)
+            result = self._format_workflow_result(wf_ex)
+            result['tasks'] = self._get_workflow_tasks_if_changed(mistral_exec_id, wf_ex)
         except Exception:
             LOG.exception('[%s] Unable to fetch mistral workflow result and tasks. %s',
                           execution_id, query_context)
+            self._workflow_tasks_cache.pop(mistral_exec_id, None)
             raise
 
         status = self._determine_execution_status(
             execution_id, result['extra']['state'], result['tasks'])
 
+        if status in action_constants.LIVEACTION_COMPLETED_STATES:
+            self._workflow_tasks_cache.pop(mistral_exec_id, None)
+
         LOG.debug('[%s] mistral workflow execution status: %s' % (execution_id, status))
         LOG.debug('[%s] mistral workflow execution result: %s' % (execution_id, result))
 
@@ -85,7 +94,12 @@ class MistralResultsQuerier(Querier):
         :rtype: (``str``, ``dict``)
         """
         execution = executions.ExecutionManager(self._client).get(exec_id)
+        return self._format_workflow_result(execution)
 
+    def _format_workflow_result(self, execution):
+        """
+        Format mistral workflow execution status and output.
+        """
         result = jsonify.try_loads(execution.output) if execution.state in DONE_STATES else {}
 
         result['extra'] = {
@@ -106,6 +120,27 @@ class MistralResultsQuerier(Querier):
 
         return [self._format_task_result(task=wf_task.to_dict()) for wf_task in wf_tasks]
 
+    def _get_workflow_tasks_if_changed(self, exec_id, execution):
+        """
+        Returns the list of tasks for a workflow execution. The tasks are only retrieved from
+        mistral if the state of the workflow execution has changed since the last query or if
+        the workflow execution is done.
+        :param exec_id: Mistral execution ID
+        :type exec_id: ``str``
+        :param execution: Mistral workflow execution
+        :type execution: :class:`mistralclient.api.v2.executions.Execution`
+        :rtype: ``list``
+        """
+        state = (execution.state, getattr(execution, 'updated_at', None))
+        cached_state, cached_tasks = self._workflow_tasks_cache.get(exec_id, (None, None))
+
+        if execution.state not in DONE_STATES and cached_state == state:
+            return cached_tasks
+
+        wf_tasks = self._get_workflow_tasks(exec_id)
+        self._workflow_tasks_cache[exec_id] = (state, wf_tasks)
+        return wf_tasks
+
     def _format_task_result(self, task):
         """
         Format task result to follow the unified workflow result format.
@@ -42,7 +42,24 @@ def _register_common_opts():
 def _register_results_tracker_opts():
     resultstracker_opts = [
         cfg.StrOpt('logging', default='conf/logging.resultstracker.conf',
-                   help='Location of the logging configuration file.')
+                   help='Location of the logging configuration file.'),
+        cfg.IntOpt('thread_pool_size', default=10,
+                   help='Number of threads each querier uses to query the external services.'),
+        cfg.FloatOpt('query_interval', default=1,
+                     help='Initial time interval (in seconds) between two queries for the same '
+                          'execution.'),
+        cfg.FloatOpt('query_interval_max', default=20,
+                     help='Maximum time interval (in seconds) between two queries for the same '
+                          'execution.'),
+        cfg.FloatOpt('query_interval_backoff', default=2,
+                     help='Factor by which the query interval is multiplied each time the '
+                          'results of an execution have not changed since the last query.'),
+        cfg.BoolOpt('enable_partitioning', default=False,
+                    help='Partition executions across all the running results tracker '
+                         'instances. Requires the coordination service to be configured.'),
+        cfg.IntOpt('partition_refresh_interval', default=10,
+                   help='How often (in seconds) to check for results tracker group '
+                        'membership changes.')
     ]
     CONF.register_opts(resultstracker_opts, group='resultstracker')
 
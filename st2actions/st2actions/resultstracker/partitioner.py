@@ -0,0 +1,42 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from oslo_config import cfg
+
+from st2common.services.partitioner import GroupPartitioner
+
+__all__ = [
+    'ResultsTrackerPartitioner'
+]
+
+GROUP_ID = 'st2.resultstracker'
+
+
+class ResultsTrackerPartitioner(GroupPartitioner):
+    """
+    Partitions pending execution states across all the running results tracker instances.
+
+    Each execution is owned by exactly one member of the results tracker group.
+    """
+
+    def __init__(self, on_rebalance=None, coordinator=None, member_id=None,
+                 refresh_interval=None):
+        refresh_interval = (refresh_interval or
+                            cfg.CONF.resultstracker.partition_refresh_interval)
+        super(ResultsTrackerPartitioner, self).__init__(group_id=GROUP_ID,
+                                                        refresh_interval=refresh_interval,
+                                                        coordinator=coordinator,
+                                                        member_id=member_id,
+                                                        on_rebalance=on_rebalance)
@@ -19,11 +19,14 @@ import six
 
 from collections import defaultdict
 from kombu import Connection
+from oslo_config import cfg
 
 from st2actions.query.base import QueryContext
+from st2actions.resultstracker.partitioner import ResultsTrackerPartitioner
 from st2common import log as logging
 from st2common.models.db.executionstate import ActionExecutionStateDB
 from st2common.persistence.executionstate import ActionExecutionState
+from st2common.services import coordination
 from st2common.transport import actionexecutionstate, consumers, publishers
 from st2common.transport import utils as transport_utils
 
@@ -37,13 +40,19 @@ ACTIONSTATE_WORK_Q = actionexecutionstate.get_queue('st2.resultstracker.work',
 class ResultsTracker(consumers.MessageHandler):
     message_type = ActionExecutionStateDB
 
-    def __init__(self, connection, queues):
+    def __init__(self, connection, queues, partitioner=None):
         super(ResultsTracker, self).__init__(connection, queues)
         self._queriers = {}
         self._query_threads = []
         self._failed_imports = set()
+        self._partitioner = partitioner
+
+        if self._partitioner:
+            self._partitioner.on_rebalance = self._rebalance
 
     def start(self, wait=False):
+        if self._partitioner:
+            self._partitioner.start()
         self._bootstrap()
         super(ResultsTracker, self).start(wait=wait)
 
@@ -54,6 +63,8 @@ class ResultsTracker(consumers.MessageHandler):
 
     def shutdown(self):
         super(ResultsTracker, self).shutdown()
+        if self._partitioner:
+            self._partitioner.stop()
         LOG.info('Stats from queriers:')
         self._print_stats()
 
@@ -68,6 +79,9 @@ class ResultsTracker(consumers.MessageHandler):
 
         query_contexts_dict = defaultdict(list)
         for state_db in all_states:
+            if not self._is_owner(state_db):
+                continue
+
             try:
                 context = QueryContext.from_model(state_db)
             except:
@@ -83,7 +97,34 @@ class ResultsTracker(consumers.MessageHandler):
             LOG.info('Found %d pending actions for query module %s', len(contexts), querier)
             querier.add_queries(query_contexts=contexts)
 
+    def _rebalance(self):
+        """
+        Start tracking the newly owned states and stop tracking the states which are now owned
+        by other results tracker instances.
+        """
+        not_owned_ids = defaultdict(list)
+        for state_db in ActionExecutionState.get_all():
+            if not self._is_owner(state_db):
+                not_owned_ids[state_db.query_module].append(str(state_db.id))
+
+        for query_module_name, state_ids in six.iteritems(not_owned_ids):
+            querier = self._queriers.get(query_module_name, None)
+            if querier is not None:
+                querier.remove_queries(query_context_ids=state_ids)
+
+        self._bootstrap()
+
+    def _is_owner(self, state_db):
+        if not self._partitioner:
+            return True
+
+        return self._partitioner.is_owner(state_db.execution_id)
+
     def process(self, query_context):
+        if not self._is_owner(query_context):
+            LOG.debug('Skipping state %s owned by a different results tracker.', query_context)
+            return
+
         querier = self.get_querier(query_context.query_module)
         context = QueryContext.from_model(query_context)
         querier.add_queries(query_contexts=[context])
@@ -110,5 +151,19 @@ class ResultsTracker(consumers.MessageHandler):
 
 
 def get_tracker():
+    if not cfg.CONF.resultstracker.enable_partitioning:
+        with Connection(transport_utils.get_messaging_urls()) as conn:
+            return ResultsTracker(conn, [ACTIONSTATE_WORK_Q])
+
+    # Each partitioned tracker needs to see all the new states so it uses its own queue and
+    # filters out the states it doesn't own.
+    member_id = coordination.get_member_id()
+    queue = actionexecutionstate.get_queue('st2.resultstracker.work.%s' % (member_id),
+                                           routing_key=publishers.CREATE_RK,
+                                           exclusive=True)
+    partitioner = ResultsTrackerPartitioner(member_id=member_id)
+
     with Connection(transport_utils.get_messaging_urls()) as conn:
-        return ResultsTracker(conn, [ACTIONSTATE_WORK_Q])
+        tracker = ResultsTracker(conn, [queue], partitioner=partitioner)
+
+    return tracker
@@ -21,8 +21,7 @@ from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.models.db.liveaction import LiveActionDB
 from st2common.services import action as action_service
 from st2common.persistence.liveaction import LiveAction
-from st2common.persistence.policy import Policy
-from st2common import policies
+from st2common.services.policies import PolicyCache
 from st2common.transport import consumers, liveaction
 from st2common.transport import utils as transport_utils
 from st2common.util import action_db as action_utils
@@ -41,6 +40,18 @@ ACTIONRUNNER_REQUEST_Q = liveaction.get_status_management_queue(
 class ActionExecutionScheduler(consumers.MessageHandler):
     message_type = LiveActionDB
 
+    def __init__(self, connection, queues):
+        super(ActionExecutionScheduler, self).__init__(connection, queues)
+        self._policy_cache = PolicyCache(queue_suffix='scheduler')
+
+    def start(self, wait=False):
+        self._policy_cache.start()
+        super(ActionExecutionScheduler, self).start(wait=wait)
+
+    def shutdown(self):
+        super(ActionExecutionScheduler, self).shutdown()
+        self._policy_cache.stop()
+
     def process(self, request):
         """Schedules the LiveAction and publishes the request
         to the appropriate action runner(s).
@@ -63,11 +74,7 @@ class ActionExecutionScheduler(consumers.MessageHandler):
             raise
 
         # Apply policies defined for the action.
-        for policy_db in Policy.query(resource_ref=liveaction_db.action):
-            driver = policies.get_driver(policy_db.ref,
-                                         policy_db.policy_type,
-                                         **policy_db.parameters)
-
+        for policy_db, driver in self._policy_cache.get_drivers(liveaction_db.action):
             try:
                 liveaction_db = driver.apply_before(liveaction_db)
             except:
@@ -65,15 +65,14 @@ class MockLiveActionPublisher(object):
                     scheduler.get_scheduler().process(payload)
                 else:
                     worker.get_worker().process(payload)
+
+                if state in action_constants.LIVEACTION_COMPLETED_STATES:
+                    notifier.get_notifier().process(payload)
         except Exception:
             traceback.print_exc()
             print(payload)
 
     @classmethod
     def publish_update(cls, payload):
-        try:
-            if isinstance(payload, LiveActionDB):
-                notifier.get_notifier().process(payload)
-        except Exception:
-            traceback.print_exc()
-            print(payload)
+        # Notifier only consumes completed states from the status exchange.
+        pass
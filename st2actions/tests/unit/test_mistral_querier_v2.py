@@ -64,6 +64,12 @@ MOCK_WF_EX_DATA = {
 
 MOCK_WF_EX = executions.Execution(None, MOCK_WF_EX_DATA)
 
+MOCK_WF_EX_RUNNING_DATA = copy.deepcopy(MOCK_WF_EX_DATA)
+MOCK_WF_EX_RUNNING_DATA['state'] = 'RUNNING'
+MOCK_WF_EX_RUNNING_DATA['updated_at'] = str(datetime.datetime.utcnow())
+
+MOCK_WF_EX_RUNNING = executions.Execution(None, MOCK_WF_EX_RUNNING_DATA)
+
 MOCK_WF_EX_TASKS_DATA = [
     {
         'id': uuid.uuid4().hex,
@@ -371,3 +377,43 @@ class MistralQuerierTest(DbTestCase):
 
     def test_query_missing_mistral_execution_id(self):
         self.assertRaises(Exception, self.querier.query, uuid.uuid4().hex, {'mistral': {}})
+
+    @mock.patch.object(
+        executions.ExecutionManager, 'get',
+        mock.MagicMock(return_value=MOCK_WF_EX_RUNNING))
+    @mock.patch.object(
+        tasks.TaskManager, 'list',
+        mock.MagicMock(return_value=MOCK_WF_EX_TASKS))
+    @mock.patch.object(
+        action_service, 'is_action_canceled_or_canceling',
+        mock.MagicMock(return_value=False))
+    def test_query_tasks_not_fetched_if_workflow_unchanged(self):
+        (status, result) = self.querier.query(uuid.uuid4().hex, MOCK_QRY_CONTEXT)
+        self.assertEqual(action_constants.LIVEACTION_STATUS_RUNNING, status)
+        self.assertEqual(len(result['tasks']), 2)
+
+        (status, result) = self.querier.query(uuid.uuid4().hex, MOCK_QRY_CONTEXT)
+        self.assertEqual(action_constants.LIVEACTION_STATUS_RUNNING, status)
+        self.assertEqual(len(result['tasks']), 2)
+
+        self.assertEqual(executions.ExecutionManager.get.call_count, 2)
+        self.assertEqual(tasks.TaskManager.list.call_count, 1)
+
+    @mock.patch.object(
+        executions.ExecutionManager, 'get',
+        mock.MagicMock(side_effect=[MOCK_WF_EX_RUNNING, MOCK_WF_EX]))
+    @mock.patch.object(
+        tasks.TaskManager, 'list',
+        mock.MagicMock(return_value=MOCK_WF_EX_TASKS))
+    @mock.patch.object(
+        action_service, 'is_action_canceled_or_canceling',
+        mock.MagicMock(return_value=False))
+    def test_query_tasks_fetched_if_workflow_changed(self):
+        (status, _) = self.querier.query(uuid.uuid4().hex, MOCK_QRY_CONTEXT)
+        self.assertEqual(action_constants.LIVEACTION_STATUS_RUNNING, status)
+
+        (status, _) = self.querier.query(uuid.uuid4().hex, MOCK_QRY_CONTEXT)
+        self.assertEqual(action_constants.LIVEACTION_STATUS_SUCCEEDED, status)
+
+        self.assertEqual(tasks.TaskManager.list.call_count, 2)
+        self.assertDictEqual(self.querier._workflow_tasks_cache, {})
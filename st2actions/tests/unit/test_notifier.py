@@ -14,10 +14,12 @@
 # limitations under the License.
 
 import datetime
+import json
 
 import bson
 import mock
 import unittest2
+from oslo_config import cfg
 
 import st2tests.config as tests_config
 tests_config.parse_args()
@@ -150,3 +152,76 @@ class NotifierTestCase(unittest2.TestCase):
         dispatch.assert_called_once_with('core.st2.generic.notifytrigger', payload=exp,
                                          trace_context={})
         notifier.process(liveaction)
+
+    @mock.patch.object(Action, 'get_by_ref', mock.MagicMock())
+    @mock.patch.object(Policy, 'query', mock.MagicMock(
+        return_value=[]))
+    @mock.patch.object(Notifier, '_get_execution_for_liveaction', mock.MagicMock(
+        return_value=ActionExecutionDB(id=MOCK_EXECUTION.id, runner={'name': 'run-local-cmd'},
+                                       result={})))
+    @mock.patch.object(Notifier, '_get_trace_context', mock.MagicMock(return_value={}))
+    @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch')
+    def test_notify_triggers_share_lookups(self, dispatch):
+        liveaction = LiveActionDB(action='core.local')
+        liveaction.status = 'succeeded'
+        liveaction.parameters = {}
+        on_complete = NotificationSubSchema(message='Action completed.',
+                                            routes=['slack', 'email'])
+        on_success = NotificationSubSchema(message='Action succeeded.', routes=['hubot'])
+        liveaction.notify = NotificationSchema(on_complete=on_complete, on_success=on_success)
+        liveaction.start_timestamp = date_utils.get_datetime_utc_now()
+        liveaction.end_timestamp = liveaction.start_timestamp + datetime.timedelta(seconds=50)
+
+        notifier = Notifier(connection=None, queues=[])
+        notifier.process(liveaction)
+
+        # 3 notify routes and the generic action trigger
+        self.assertEqual(dispatch.call_count, 4)
+        routes = [call[1]['payload'].get('route') for call in dispatch.call_args_list]
+        self.assertEqual(routes, ['slack', 'email', 'hubot', None])
+        for call in dispatch.call_args_list:
+            self.assertEqual(call[1]['payload']['runner_ref'], 'run-local-cmd')
+
+        # Runner is read from the execution and trace is only looked up once
+        self.assertEqual(Action.get_by_ref.call_count, 0)
+        self.assertEqual(Notifier._get_trace_context.call_count, 1)
+
+    @mock.patch.object(Policy, 'query', mock.MagicMock(
+        return_value=[]))
+    @mock.patch.object(Notifier, '_get_execution_for_liveaction', mock.MagicMock(
+        return_value=ActionExecutionDB(id=MOCK_EXECUTION.id, runner={'name': 'run-local-cmd'},
+                                       result={})))
+    @mock.patch.object(Notifier, '_get_trace_context', mock.MagicMock(return_value={}))
+    @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch')
+    def test_large_result_is_referenced(self, dispatch):
+        cfg.CONF.set_override(name='max_result_size', override=100, group='action_sensor')
+        cfg.CONF.set_override(name='result_preview_size', override=10, group='action_sensor')
+        self.addCleanup(cfg.CONF.clear_override, name='max_result_size', group='action_sensor')
+        self.addCleanup(cfg.CONF.clear_override, name='result_preview_size',
+                        group='action_sensor')
+
+        liveaction = LiveActionDB(action='core.local')
+        liveaction.status = 'succeeded'
+        liveaction.parameters = {}
+        liveaction.result = {'stdout': 'a' * 200}
+        liveaction.notify = NotificationSchema(on_success=NotificationSubSchema())
+        liveaction.start_timestamp = date_utils.get_datetime_utc_now()
+        liveaction.end_timestamp = liveaction.start_timestamp + datetime.timedelta(seconds=50)
+
+        notifier = Notifier(connection=None, queues=[])
+        notifier.process(liveaction)
+
+        self.assertEqual(dispatch.call_count, 2)
+        notify_payload = dispatch.call_args_list[0][1]['payload']
+        self.assertEqual(json.loads(notify_payload['data']['result']), {
+            'truncated': True,
+            'preview': '{"stdout":',
+            'result_ref': str(MOCK_EXECUTION.id)
+        })
+        self.assertEqual(notify_payload['data']['result_ref'], str(MOCK_EXECUTION.id))
+
+        action_payload = dispatch.call_args_list[1][1]['payload']
+        self.assertNotIn('result', action_payload)
+        self.assertEqual(action_payload['result_ref'], str(MOCK_EXECUTION.id))
+        self.assertEqual(action_payload['result_preview'], '{"stdout":')
+        self.assertTrue(action_payload['result_truncated'])
@@ -0,0 +1,119 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import mock
+import unittest2
+
+from st2tests import config as test_config
+test_config.parse_args()
+
+from st2actions.query.base import QueryContext
+from st2common.constants import action as action_constants
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.persistence.liveaction import LiveAction
+from tests.resources.test_querymodule import TestQuerier
+
+
+class QuerierSchedulingTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(QuerierSchedulingTestCase, self).setUp()
+        self.querier = TestQuerier(query_interval=1, query_interval_max=8,
+                                   query_interval_backoff=2, container_service=mock.Mock())
+
+    def _get_query_context(self, obj_id):
+        return QueryContext(obj_id, 'execution-%s' % (obj_id), {}, 'tests.resources')
+
+    def test_queries_are_ordered_by_next_query_time(self):
+        context_1 = self._get_query_context('1')
+        context_2 = self._get_query_context('2')
+        self.querier._schedule_query(context_1, delay=10)
+        self.querier._schedule_query(context_2, delay=5)
+
+        self.assertEqual(self.querier._query_contexts[0][2], context_2)
+
+    def test_query_interval_backoff(self):
+        context = self._get_query_context('1')
+        self.querier.add_queries(query_contexts=[context])
+        self.assertEqual(self.querier._query_context_intervals['1'], 1)
+
+        expected_intervals = [2, 4, 8, 8]
+        for expected_interval in expected_intervals:
+            self.querier._reschedule_query(context, changed=False)
+            self.assertEqual(self.querier._query_context_intervals['1'], expected_interval)
+
+        self.querier._reschedule_query(context, changed=True)
+        self.assertEqual(self.querier._query_context_intervals['1'], 1)
+
+    def test_fire_queries_only_due_contexts(self):
+        context_1 = self._get_query_context('1')
+        context_2 = self._get_query_context('2')
+        self.querier._schedule_query(context_1, delay=-1)
+        self.querier._schedule_query(context_2, delay=60)
+
+        with mock.patch.object(self.querier, '_thread_pool') as thread_pool:
+            thread_pool.free.return_value = 10
+            self.querier._fire_queries()
+
+        thread_pool.spawn.assert_called_once_with(self.querier._query_and_save_results,
+                                                  context_1)
+        self.assertEqual(len(self.querier._query_contexts), 1)
+        self.assertEqual(self.querier._query_contexts[0][2], context_2)
+
+    def test_time_until_next_query(self):
+        self.assertEqual(self.querier._get_time_until_next_query(),
+                         self.querier._empty_q_sleep_time)
+
+        self.querier._schedule_query(self._get_query_context('1'), delay=2)
+        time_until_next_query = self.querier._get_time_until_next_query()
+        self.assertTrue(0 < time_until_next_query <= 2)
+
+        self.querier._schedule_query(self._get_query_context('2'), delay=-(time.time()))
+        self.assertEqual(self.querier._get_time_until_next_query(), 0)
+
+
+@mock.patch('st2common.services.executions.update_execution', mock.MagicMock())
+@mock.patch.object(LiveAction, 'publish_update', mock.MagicMock())
+@mock.patch.object(LiveAction, 'publish_status', mock.MagicMock())
+@mock.patch.object(LiveAction, 'add_or_update', mock.MagicMock(side_effect=lambda obj, **kw: obj))
+class QuerierResultsTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(QuerierResultsTestCase, self).setUp()
+        self.querier = TestQuerier(container_service=mock.Mock())
+        LiveAction.publish_update.reset_mock()
+        LiveAction.publish_status.reset_mock()
+
+    def _update_action_results(self, old_status, status):
+        liveaction_db = LiveActionDB(action='core.local', status=old_status, result={})
+        with mock.patch.object(LiveAction, 'get_by_id', mock.MagicMock(return_value=liveaction_db)):
+            return self.querier._update_action_results('1', status, {'a': 1})
+
+    def test_completion_is_published_on_status_exchange(self):
+        self._update_action_results(action_constants.LIVEACTION_STATUS_RUNNING,
+                                    action_constants.LIVEACTION_STATUS_SUCCEEDED)
+        self.assertEqual(LiveAction.publish_update.call_count, 1)
+        self.assertEqual(LiveAction.publish_status.call_count, 1)
+
+    def test_running_update_is_not_published_on_status_exchange(self):
+        self._update_action_results(action_constants.LIVEACTION_STATUS_RUNNING,
+                                    action_constants.LIVEACTION_STATUS_RUNNING)
+        self.assertEqual(LiveAction.publish_update.call_count, 1)
+        self.assertEqual(LiveAction.publish_status.call_count, 0)
+
+    def test_canceled_action_is_not_published_again(self):
+        self._update_action_results(action_constants.LIVEACTION_STATUS_CANCELED,
+                                    action_constants.LIVEACTION_STATUS_SUCCEEDED)
+        self.assertEqual(LiveAction.publish_status.call_count, 0)
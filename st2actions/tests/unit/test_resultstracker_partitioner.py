@@ -0,0 +1,84 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest2
+
+from st2tests import config as test_config
+test_config.parse_args()
+
+from st2actions.resultstracker.partitioner import ResultsTrackerPartitioner
+from st2common.services import coordination
+
+
+class ResultsTrackerPartitionerTestCase(unittest2.TestCase):
+    def _get_partitioner(self, member_id, on_rebalance=None):
+        return ResultsTrackerPartitioner(on_rebalance=on_rebalance, coordinator=mock.Mock(),
+                                         member_id=member_id, refresh_interval=1)
+
+    def test_owns_everything_when_alone(self):
+        partitioner = self._get_partitioner('tracker1')
+
+        for index in range(100):
+            self.assertTrue(partitioner.is_owner('execution-%s' % (index)))
+
+    @mock.patch.object(coordination, 'get_group_members',
+                       mock.MagicMock(return_value=['tracker1', 'tracker2']))
+    def test_executions_are_partitioned_between_members(self):
+        partitioner_1 = self._get_partitioner('tracker1')
+        partitioner_2 = self._get_partitioner('tracker2')
+        partitioner_1.refresh()
+        partitioner_2.refresh()
+
+        owned_by_1 = 0
+        for index in range(100):
+            execution_id = 'execution-%s' % (index)
+            is_owner_1 = partitioner_1.is_owner(execution_id)
+            is_owner_2 = partitioner_2.is_owner(execution_id)
+
+            # Each execution is owned by exactly one tracker
+            self.assertNotEqual(is_owner_1, is_owner_2)
+            owned_by_1 += int(is_owner_1)
+
+        self.assertTrue(0 < owned_by_1 < 100)
+
+    def test_rebalance_callback_on_membership_change(self):
+        on_rebalance = mock.Mock()
+        partitioner = self._get_partitioner('tracker1', on_rebalance=on_rebalance)
+
+        with mock.patch.object(coordination, 'get_group_members',
+                               mock.MagicMock(return_value=['tracker1', 'tracker2'])):
+            self.assertTrue(partitioner.refresh())
+            self.assertFalse(partitioner.refresh())
+
+        self.assertEqual(on_rebalance.call_count, 1)
+        self.assertEqual(partitioner.members, ['tracker1', 'tracker2'])
+
+        # Member left
+        with mock.patch.object(coordination, 'get_group_members',
+                               mock.MagicMock(return_value=['tracker1'])):
+            self.assertTrue(partitioner.refresh())
+
+        self.assertEqual(on_rebalance.call_count, 2)
+        self.assertEqual(partitioner.members, ['tracker1'])
+
+    def test_member_always_included(self):
+        partitioner = self._get_partitioner('tracker1')
+
+        with mock.patch.object(coordination, 'get_group_members',
+                               mock.MagicMock(return_value=['tracker2'])):
+            partitioner.refresh()
+
+        self.assertEqual(partitioner.members, ['tracker1', 'tracker2'])
@@ -68,3 +68,31 @@ def _register_app_opts():
                    help='location of the logging.conf file')
     ]
     CONF.register_opts(logging_opts, group='api')
+
+    execution_opts = [
+        cfg.IntOpt('max_bulk_executions', default=10000,
+                   help='Maximum number of executions which can be scheduled with a single '
+                        'request to the bulk executions API endpoint.')
+    ]
+    CONF.register_opts(execution_opts, group='api')
+
+    webhook_opts = [
+        cfg.BoolOpt('enable_async_ingestion', default=False,
+                    help='Return right after the request body has been parsed and publish the '
+                         'triggers in batches from an in-memory buffer.'),
+        cfg.IntOpt('buffer_size', default=10000,
+                   help='Maximum number of buffered webhook triggers. Requests are rejected '
+                        'with 503 when the buffer is full.'),
+        cfg.IntOpt('batch_size', default=100,
+                   help='Maximum number of buffered webhook triggers published in a single '
+                        'batch.'),
+        cfg.FloatOpt('linger_time', default=0.05,
+                     help='How long (in seconds) to wait for more webhook triggers before '
+                          'publishing a batch.'),
+        cfg.IntOpt('stats_interval', default=60,
+                   help='How often (in seconds) to log webhook buffer stats.'),
+        cfg.IntOpt('max_response_body_size', default=0,
+                   help='Request bodies larger than this size (in bytes) are not echoed back '
+                        'in the response. 0 means no limit.')
+    ]
+    CONF.register_opts(webhook_opts, group='webhook')
@@ -34,6 +34,7 @@ from st2common.constants.action import LIVEACTION_STATUS_CANCELED, LIVEACTION_ST
 from st2common.constants.action import LIVEACTION_CANCELABLE_STATES
 from st2common.exceptions.param import ParamException
 from st2common.exceptions.apivalidation import ValueValidationException
+from st2common.exceptions.rbac import AccessDeniedError
 from st2common.exceptions.trace import TraceNotFoundException
 from st2common.models.api.action import LiveActionAPI
 from st2common.models.api.base import jsexpose
@@ -139,11 +140,7 @@ class ActionExecutionsControllerMixin(BaseRestControllerMixin):
         LOG.debug('User is: %s' % liveaction.context['user'])
 
         # Retrieve other st2 context from request header.
-        if 'st2-context' in pecan.request.headers and pecan.request.headers['st2-context']:
-            context = jsonify.try_loads(pecan.request.headers['st2-context'])
-            if not isinstance(context, dict):
-                raise ValueError('Unable to convert st2-context from the headers into JSON.')
-            liveaction.context.update(context)
+        liveaction.context.update(self._get_st2_context_from_request())
 
         # Schedule the action execution.
         liveaction_db = LiveActionAPI.to_model(liveaction)
@@ -173,6 +170,105 @@ class ActionExecutionsControllerMixin(BaseRestControllerMixin):
         from_model_kwargs = self._get_from_model_kwargs_for_request(request=pecan.request)
         return ActionExecutionAPI.from_model(actionexecution_db, from_model_kwargs)
 
+    def _schedule_executions(self, executions):
+        """
+        Schedule multiple executions at once.
+
+        :param executions: List of dicts with LiveActionAPI attributes.
+        :type executions: ``list``
+
+        :return: Result for each of the provided executions (in the same order). Result contains
+                 "status" (HTTP status code) and either "execution" or "faultstring" attribute.
+        :rtype: ``list``
+        """
+        results = [None] * len(executions)
+        user = get_requester()
+        st2_context = self._get_st2_context_from_request()
+
+        # Permissions are checked only once per action
+        action_dbs = {}
+
+        indexes = []
+        liveaction_dbs = []
+        for index, execution in enumerate(executions):
+            try:
+                if not isinstance(execution, dict):
+                    raise ValueError('Execution needs to be an object.')
+
+                liveaction = LiveActionAPI(**execution).validate()
+
+                action_ref = liveaction.action
+                if action_ref not in action_dbs:
+                    action_dbs[action_ref] = action_utils.get_action_by_ref(action_ref)
+
+                    if action_dbs[action_ref]:
+                        assert_request_user_has_resource_db_permission(
+                            request=pecan.request, resource_db=action_dbs[action_ref],
+                            permission_type=PermissionType.ACTION_EXECUTE)
+
+                if not hasattr(liveaction, 'context'):
+                    liveaction.context = dict()
+
+                liveaction.context['user'] = user
+                liveaction.context.update(st2_context)
+
+                liveaction_dbs.append(LiveActionAPI.to_model(liveaction))
+                indexes.append(index)
+            except Exception as e:
+                results[index] = self._get_schedule_error_result(e)
+
+        scheduled = []
+        for index, result in zip(indexes, action_service.create_requests(liveaction_dbs)):
+            if isinstance(result, Exception):
+                results[index] = self._get_schedule_error_result(result)
+            else:
+                scheduled.append((index, result))
+
+        action_service.publish_requests([result for _, result in scheduled])
+
+        from_model_kwargs = self._get_from_model_kwargs_for_request(request=pecan.request)
+        for index, (_, execution_db) in scheduled:
+            results[index] = {
+                'status': http_client.CREATED,
+                'execution': ActionExecutionAPI.from_model(execution_db, from_model_kwargs)
+            }
+
+        LOG.info('Scheduled %s out of %s requested executions.', len(scheduled), len(executions))
+        return results
+
+    def _get_schedule_error_result(self, e):
+        """
+        Return per-execution result for the provided exception. Status codes match the ones
+        returned by the single execution API endpoint.
+        """
+        if isinstance(e, AccessDeniedError):
+            status, message = http_client.FORBIDDEN, str(e)
+        elif isinstance(e, jsonschema.ValidationError):
+            status, message = http_client.BAD_REQUEST, re.sub("u'([^']*)'", r"'\1'", e.message)
+        elif isinstance(e, (ValueError, TraceNotFoundException, ParamException,
+                            ValueValidationException)):
+            status, message = http_client.BAD_REQUEST, str(e)
+        else:
+            LOG.error('Unable to execute action. Unexpected error encountered: %s', e,
+                      exc_info=True)
+            status, message = http_client.INTERNAL_SERVER_ERROR, str(e)
+
+        return {'status': status, 'faultstring': message}
+
+    def _get_st2_context_from_request(self):
+        """
+        Retrieve st2 context provided in the request header.
+
+        :rtype: ``dict``
+        """
+        if 'st2-context' in pecan.request.headers and pecan.request.headers['st2-context']:
+            context = jsonify.try_loads(pecan.request.headers['st2-context'])
+            if not isinstance(context, dict):
+                raise ValueError('Unable to convert st2-context from the headers into JSON.')
+            return context
+
+        return {}
+
     def _get_result_object(self, id):
         """
         Retrieve result object for the provided action execution.
@@ -341,6 +437,38 @@ class ActionExecutionReRunController(ActionExecutionsControllerMixin, ResourceCo
         return self._handle_schedule_execution(liveaction=new_liveaction)
 
 
+class ActionExecutionsBulkController(BaseActionExecutionNestedController):
+    class BulkExecutionsAPI(object):
+        def __init__(self, executions=None):
+            self.executions = executions
+
+        def validate(self):
+            if not isinstance(self.executions, list) or not self.executions:
+                raise ValueError('"executions" attribute needs to be a non-empty list.')
+
+            max_executions = cfg.CONF.api.max_bulk_executions
+            if len(self.executions) > max_executions:
+                raise ValueError('Too many executions requested (%s). Maximum number of '
+                                 'executions per request is %s.' % (len(self.executions),
+                                                                    max_executions))
+
+            return self
+
+    @jsexpose(body_cls=BulkExecutionsAPI, status_code=http_client.OK)
+    def post(self, spec):
+        """
+        Schedule multiple action executions with a single request.
+
+        Requests are validated, persisted and published in bulk. A result is returned for each of
+        the requested executions so failure of a single execution doesn't affect the others.
+
+        Handles requests:
+
+            POST /executions/bulk
+        """
+        return self._schedule_executions(executions=spec.executions)
+
+
 class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceController):
     """
         Implements the RESTful web endpoint that handles
@@ -353,6 +481,7 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
     children = ActionExecutionChildrenController()
     attribute = ActionExecutionAttributeController()
     re_run = ActionExecutionReRunController()
+    bulk = ActionExecutionsBulkController()
 
     # ResourceController attributes
     query_options = {
@@ -13,14 +13,78 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pecan
+from pecan import abort
+from six.moves import http_client
+
 from st2api.controllers.resource import ResourceController
+from st2common import log as logging
+from st2common.constants.trace import TRACE_COMPONENT_TYPES
+from st2common.models.api.base import jsexpose
 from st2common.models.api.trace import TraceAPI
 from st2common.persistence.trace import Trace
 
 __all__ = [
-    'TracesController'
+    'TracesController',
+    'TraceComponentsController'
 ]
 
+LOG = logging.getLogger(__name__)
+
+
+class TraceComponentsController(ResourceController):
+    model = TraceAPI
+    access = Trace
+
+    # Note: Nested controller doesn't implement "get_one" and "get_all" methods
+    query_options = {}
+    supported_filters = {}
+
+    def get_all(self):
+        abort(http_client.NOT_FOUND)
+
+    def get_one(self, id):
+        abort(http_client.NOT_FOUND)
+
+    @jsexpose(arg_types=[str])
+    def get(self, id, component_type='action_executions', offset=0, limit=None, **kwargs):
+        """
+        Retrieve a page of the components of the provided type for the provided trace.
+
+        Handles requests:
+
+            GET /traces/<id>/components?component_type=rules&offset=0&limit=50
+
+        :rtype: ``list``
+        """
+        if component_type not in TRACE_COMPONENT_TYPES:
+            msg = ('Invalid component type "%s". Valid types are: %s' %
+                   (component_type, ', '.join(TRACE_COMPONENT_TYPES)))
+            abort(http_client.BAD_REQUEST, msg)
+
+        trace_db = self._get_by_id(resource_id=id)
+
+        if not trace_db:
+            msg = 'Unable to identify resource with id "%s".' % id
+            abort(http_client.NOT_FOUND, msg)
+
+        offset = int(offset)
+
+        if limit and int(limit) > self.max_limit:
+            limit = self.max_limit
+
+        LOG.info('GET %s with id=%s, component_type=%s, offset=%s, limit=%s',
+                 pecan.request.path, id, component_type, offset, limit)
+
+        components, total = Trace.get_components(trace_db, component_type=component_type,
+                                                 offset=offset, limit=limit)
+
+        if limit:
+            pecan.response.headers['X-Limit'] = str(limit)
+        pecan.response.headers['X-Total-Count'] = str(total)
+
+        return [TraceAPI.from_component_model(component) for component in components]
+
 
 class TracesController(ResourceController):
     model = TraceAPI
@@ -35,3 +99,5 @@ class TracesController(ResourceController):
     query_options = {
         'sort': ['trace_tag']
     }
+
+    components = TraceComponentsController()
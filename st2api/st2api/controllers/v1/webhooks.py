@@ -21,6 +21,7 @@ except ImportError:
 import six
 import pecan
 import uuid
+from oslo_config import cfg
 from pecan import abort
 from pecan.rest import RestController
 from six.moves.urllib import parse as urlparse  # pylint: disable=import-error
@@ -28,11 +29,13 @@ urljoin = urlparse.urljoin
 
 from st2common import log as logging
 from st2common.constants.triggers import WEBHOOK_TRIGGER_TYPES
+from st2common.exceptions.triggers import TriggerDispatchBufferFullException
 from st2common.models.api.base import jsexpose
 from st2common.models.api.trace import TraceContext
 import st2common.services.triggers as trigger_service
 from st2common.services.triggerwatcher import TriggerWatcher
 from st2common.transport.reactor import TriggerDispatcher
+from st2common.transport.reactor import BufferedTriggerDispatcher
 from st2common.util.http import parse_content_type_header
 from st2common.rbac.types import PermissionType
 from st2common.rbac.decorators import request_user_has_webhook_permission
@@ -91,7 +94,7 @@ class WebhooksController(RestController):
         self._base_url = '/webhooks/'
         self._trigger_types = WEBHOOK_TRIGGER_TYPES.keys()
 
-        self._trigger_dispatcher = TriggerDispatcher(LOG)
+        self._trigger_dispatcher = self._get_trigger_dispatcher()
         queue_suffix = self.__class__.__name__
         self._trigger_watcher = TriggerWatcher(create_handler=self._handle_create_trigger,
                                                update_handler=self._handle_update_trigger,
@@ -156,10 +159,9 @@ class WebhooksController(RestController):
         payload['body'] = body
         # Dispatch trigger instance for each of the trigger found
         for trigger in triggers:
-            self._trigger_dispatcher.dispatch(trigger, payload=payload,
-                trace_context=trace_context)
+            self._dispatch_trigger(trigger, payload=payload, trace_context=trace_context)
 
-        return body
+        return self._get_response_body(body)
 
     def _parse_request_body(self, content_type, body):
         if content_type == 'application/json':
@@ -179,7 +181,39 @@ class WebhooksController(RestController):
         if not trigger:
             msg = 'Trigger not specified.'
             return pecan.abort(http_client.BAD_REQUEST, msg)
-        self._trigger_dispatcher.dispatch(trigger, payload=payload, trace_context=trace_context)
+        self._dispatch_trigger(trigger, payload=payload, trace_context=trace_context)
+
+        return self._get_response_body(body)
+
+    def _get_trigger_dispatcher(self):
+        if not cfg.CONF.webhook.enable_async_ingestion:
+            return TriggerDispatcher(LOG)
+
+        # Requests should never wait for the buffer so full buffer is reported right away
+        trigger_dispatcher = BufferedTriggerDispatcher(
+            LOG,
+            batch_size=cfg.CONF.webhook.batch_size,
+            linger_time=cfg.CONF.webhook.linger_time,
+            buffer_size=cfg.CONF.webhook.buffer_size,
+            buffer_timeout=0,
+            stats_interval=cfg.CONF.webhook.stats_interval)
+        trigger_dispatcher.start()
+        return trigger_dispatcher
+
+    def _dispatch_trigger(self, trigger, payload, trace_context):
+        try:
+            self._trigger_dispatcher.dispatch(trigger, payload=payload,
+                                              trace_context=trace_context)
+        except TriggerDispatchBufferFullException as e:
+            self._log_request('Failed to dispatch trigger: %s.' % (str(e)), pecan.request)
+            msg = 'Webhook is overloaded, please retry later.'
+            return pecan.abort(http_client.SERVICE_UNAVAILABLE, msg)
+
+    def _get_response_body(self, body):
+        max_response_body_size = cfg.CONF.webhook.max_response_body_size
+
+        if max_response_body_size and len(pecan.request.body) > max_response_body_size:
+            return None
 
         return body
 
@@ -26,6 +26,7 @@ except ImportError:
     import json
 import st2common.validators.api.action as action_validator
 
+from oslo_config import cfg
 from six.moves import filter
 from st2common.util import isotime
 from st2common.util import date as date_utils
@@ -163,6 +164,7 @@ class FakeResponse(object):
 
 
 @mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+@mock.patch.object(PoolPublisher, 'publish_many', mock.MagicMock())
 class TestActionExecutionController(FunctionalTest):
 
     @classmethod
@@ -367,6 +369,93 @@ class TestActionExecutionController(FunctionalTest):
         self.assertEqual(resp.status_int, 400)
         self.assertIn('Unable to convert st2-context', resp.json['faultstring'])
 
+    def test_post_bulk(self):
+        executions = [copy.deepcopy(LIVE_ACTION_1), copy.deepcopy(LIVE_ACTION_2),
+                      copy.deepcopy(LIVE_ACTION_1)]
+        resp = self._do_post_bulk(executions)
+        self.assertEqual(resp.status_int, 200)
+        self.assertEqual(len(resp.json), 3)
+
+        for index, result in enumerate(resp.json):
+            self.assertEqual(result['status'], 201)
+            self.assertEqual(result['execution']['action']['ref'], executions[index]['action'])
+            self.assertEqual(result['execution']['status'], 'requested')
+
+            # Executions are persisted and can be retrieved using the regular API
+            get_resp = self._do_get_one(result['execution']['id'])
+            self.assertEqual(get_resp.status_int, 200)
+            parameters = get_resp.json['liveaction']['parameters']
+            self.assertEqual(parameters['hosts'], executions[index]['parameters']['hosts'])
+            self.assertEqual(parameters['cmd'], executions[index]['parameters']['cmd'])
+
+        # Each execution gets its own trace
+        trace_ids = set()
+        for result in resp.json:
+            trace = trace_service.get_trace_db_by_action_execution(
+                action_execution_id=result['execution']['id'])
+            trace_ids.add(str(trace.id))
+        self.assertEqual(len(trace_ids), 3)
+
+    def test_post_bulk_partial_failure(self):
+        valid = copy.deepcopy(LIVE_ACTION_1)
+
+        invalid_parameters = copy.deepcopy(LIVE_ACTION_1)
+        invalid_parameters['parameters']['foo'] = 'bar'
+
+        render_failed = copy.deepcopy(LIVE_ACTION_1)
+        render_failed['parameters']['hosts'] = '{{ABSENT}}'
+
+        nonexistent_action = copy.deepcopy(LIVE_ACTION_1)
+        nonexistent_action['action'] = 'sixpack.doesntexist'
+
+        invalid_trace = copy.deepcopy(LIVE_ACTION_1)
+        invalid_trace['context'] = {'trace_context': {'id_': str(bson.ObjectId())}}
+
+        executions = [valid, invalid_parameters, render_failed, nonexistent_action,
+                      invalid_trace, 'foo']
+        resp = self._do_post_bulk(executions)
+        self.assertEqual(resp.status_int, 200)
+        self.assertEqual([result['status'] for result in resp.json],
+                         [201, 400, 400, 400, 400, 400])
+        self.assertEqual(resp.json[1]['faultstring'],
+                         "Additional properties are not allowed ('foo' was unexpected)")
+        self.assertEqual(resp.json[2]['faultstring'], 'Dependecy unsatisfied in ABSENT')
+
+        get_resp = self._do_get_one(resp.json[0]['execution']['id'])
+        self.assertEqual(get_resp.status_int, 200)
+
+    def test_post_bulk_with_st2_context_in_headers(self):
+        context = {'other': {'k1': 'v1'}}
+        headers = {'content-type': 'application/json', 'st2-context': json.dumps(context)}
+        resp = self._do_post_bulk([copy.deepcopy(LIVE_ACTION_1), copy.deepcopy(LIVE_ACTION_1)],
+                                  headers=headers)
+        self.assertEqual(resp.status_int, 200)
+
+        for result in resp.json:
+            self.assertEqual(result['status'], 201)
+            self.assertEqual(result['execution']['context']['other'], {'k1': 'v1'})
+            self.assertEqual(result['execution']['context']['user'], 'stanley')
+
+    def test_post_bulk_invalid_body(self):
+        resp = self.app.post_json('/v1/executions/bulk', {'executions': []}, expect_errors=True)
+        self.assertEqual(resp.status_int, 400)
+        self.assertIn('needs to be a non-empty list', resp.json['faultstring'])
+
+        resp = self.app.post_json('/v1/executions/bulk', {'executions': 'foo'},
+                                  expect_errors=True)
+        self.assertEqual(resp.status_int, 400)
+
+    def test_post_bulk_too_many_executions(self):
+        cfg.CONF.set_override(name='max_bulk_executions', override=2, group='api')
+
+        try:
+            executions = [copy.deepcopy(LIVE_ACTION_1) for _ in range(0, 3)]
+            resp = self._do_post_bulk(executions, expect_errors=True)
+            self.assertEqual(resp.status_int, 400)
+            self.assertIn('Too many executions requested (3)', resp.json['faultstring'])
+        finally:
+            cfg.CONF.clear_override(name='max_bulk_executions', group='api')
+
     def test_re_run_success(self):
         # Create a new execution
         post_resp = self._do_post(LIVE_ACTION_1)
@@ -593,6 +682,10 @@ class TestActionExecutionController(FunctionalTest):
     def _do_post(self, liveaction, *args, **kwargs):
         return self.app.post_json('/v1/executions', liveaction, *args, **kwargs)
 
+    def _do_post_bulk(self, liveactions, *args, **kwargs):
+        return self.app.post_json('/v1/executions/bulk', {'executions': liveactions},
+                                  *args, **kwargs)
+
     def _do_delete(self, actionexecution_id, expect_errors=False):
         return self.app.delete('/v1/executions/%s' % actionexecution_id,
                                expect_errors=expect_errors)
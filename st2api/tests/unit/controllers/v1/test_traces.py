@@ -96,3 +96,33 @@ class TestTraces(FunctionalTest):
                          '/v1/traces?trigger_instance=x did not return correct trace.')
         self.assertEqual(resp.json[0]['trace_tag'], self.trace3['trace_tag'],
                          'Correct trace not returned.')
+
+    def test_get_components(self):
+        resp = self.app.get('/v1/traces/%s/components?component_type=trigger_instances'
+                            '&offset=1&limit=2' % self.trace3.id)
+
+        self.assertEqual(resp.status_int, 200)
+        self.assertEqual(resp.headers['X-Total-Count'], '4')
+        self.assertEqual(resp.headers['X-Limit'], '2')
+        self.assertEqual([component['object_id'] for component in resp.json],
+                         [component.object_id for component in
+                          self.trace3['trigger_instances'][1:3]])
+
+    def test_get_components_default_component_type(self):
+        resp = self.app.get('/v1/traces/%s/components' % self.trace3.id)
+
+        self.assertEqual(resp.status_int, 200)
+        self.assertEqual(resp.headers['X-Total-Count'], '3')
+        self.assertEqual([component['object_id'] for component in resp.json],
+                         [component.object_id for component in
+                          self.trace3['action_executions']])
+
+    def test_get_components_invalid_component_type(self):
+        resp = self.app.get('/v1/traces/%s/components?component_type=invalid' % self.trace3.id,
+                            expect_errors=True)
+        self.assertEqual(resp.status_int, 400)
+
+    def test_get_components_trace_not_found(self):
+        resp = self.app.get('/v1/traces/55d3a73332ed3534d41fc7c1/components',
+                            expect_errors=True)
+        self.assertEqual(resp.status_int, 404)
@@ -17,11 +17,14 @@ import json
 
 import mock
 import six
+from oslo_config import cfg
 from tests import FunctionalTest
 
 from st2api.controllers.v1.webhooks import WebhooksController, HooksHolder
 from st2common.constants.triggers import WEBHOOK_TRIGGER_TYPES
 from st2common.models.db.trigger import TriggerDB
+from st2common.exceptions.triggers import TriggerDispatchBufferFullException
+from st2common.transport.reactor import BufferedTriggerDispatcher
 from st2common.transport.reactor import TriggerInstancePublisher
 
 http_client = six.moves.http_client
@@ -164,6 +167,43 @@ class TestWebhooksController(FunctionalTest):
         self.assertTrue('Failed to parse request body' in post_resp)
         self.assertTrue('Unsupported Content-Type' in post_resp)
 
+    @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
+        return_value=True))
+    @mock.patch.object(WebhooksController, '_is_valid_hook', mock.MagicMock(
+        return_value=True))
+    @mock.patch.object(HooksHolder, 'get_triggers_for_hook', mock.MagicMock(
+        return_value=[DUMMY_TRIGGER]))
+    @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch', mock.MagicMock(
+        side_effect=TriggerDispatchBufferFullException('full')))
+    def test_post_buffer_full(self):
+        post_resp = self.__do_post('git', WEBHOOK_1, expect_errors=True)
+        self.assertEqual(post_resp.status_int, http_client.SERVICE_UNAVAILABLE)
+
+    @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
+        return_value=True))
+    @mock.patch.object(WebhooksController, '_is_valid_hook', mock.MagicMock(
+        return_value=True))
+    @mock.patch.object(HooksHolder, 'get_triggers_for_hook', mock.MagicMock(
+        return_value=[DUMMY_TRIGGER]))
+    @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch', mock.MagicMock())
+    def test_post_large_body_not_echoed(self):
+        cfg.CONF.set_override(name='max_response_body_size', override=10, group='webhook')
+        self.addCleanup(cfg.CONF.clear_override, name='max_response_body_size',
+                        group='webhook')
+
+        post_resp = self.__do_post('git', WEBHOOK_1, expect_errors=False)
+        self.assertEqual(post_resp.status_int, http_client.ACCEPTED)
+        self.assertEqual(post_resp.json, None)
+
+    def test_async_ingestion_uses_buffered_dispatcher(self):
+        cfg.CONF.set_override(name='enable_async_ingestion', override=True, group='webhook')
+        self.addCleanup(cfg.CONF.clear_override, name='enable_async_ingestion',
+                        group='webhook')
+
+        controller = WebhooksController()
+        self.assertIsInstance(controller._trigger_dispatcher, BufferedTriggerDispatcher)
+        controller._trigger_dispatcher.stop()
+
     def test_leading_trailing_slashes(self):
         # Ideally the test should setup fixtures in DB. However, the triggerwatcher
         # that is supposed to load the models from DB does not real start given
@@ -23,6 +23,8 @@ from st2client.models.core import ResourceManager
 from st2client.models.core import ActionAliasResourceManager
 from st2client.models.core import LiveActionResourceManager
 from st2client.models.core import TriggerInstanceResourceManager
+from st2client.models.core import StreamManager
+from st2client.utils import httpclient
 
 
 LOG = logging.getLogger(__name__)
@@ -30,6 +32,7 @@ LOG = logging.getLogger(__name__)
 # Default values for the options not explicitly specified by the user
 DEFAULT_API_PORT = 9101
 DEFAULT_AUTH_PORT = 9100
+DEFAULT_STREAM_PORT = 9102
 
 DEFAULT_BASE_URL = 'http://127.0.0.1'
 DEFAULT_API_VERSION = 'v1'
@@ -37,7 +40,8 @@ DEFAULT_API_VERSION = 'v1'
 
 class Client(object):
     def __init__(self, base_url=None, auth_url=None, api_url=None, api_version=None, cacert=None,
-                 debug=False, token=None):
+                 debug=False, token=None, pool_size=httpclient.DEFAULT_POOL_SIZE,
+                 keep_alive=True, stream_url=None):
         # Get CLI options. If not given, then try to get it from the environment.
         self.endpoints = dict()
 
@@ -61,6 +65,13 @@ class Client(object):
             self.endpoints['auth'] = os.environ.get(
                 'ST2_AUTH_URL', '%s:%s' % (self.endpoints['base'], DEFAULT_AUTH_PORT))
 
+        if stream_url:
+            self.endpoints['stream'] = stream_url
+        else:
+            self.endpoints['stream'] = os.environ.get(
+                'ST2_STREAM_URL',
+                '%s:%s/%s' % (self.endpoints['base'], DEFAULT_STREAM_PORT, api_version))
+
         if cacert is not None:
             self.cacert = cacert
         else:
@@ -79,42 +90,67 @@ class Client(object):
 
         self.token = token
 
+        # All the resource managers share a single session so the connections to the API and
+        # auth endpoints are re-used between requests
+        self.session = httpclient.get_session(pool_size=pool_size, keep_alive=keep_alive)
+
         # Instantiate resource managers and assign appropriate API endpoint.
         self.managers = dict()
         self.managers['Token'] = ResourceManager(
-            models.Token, self.endpoints['auth'], cacert=self.cacert, debug=self.debug)
+            models.Token, self.endpoints['auth'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['RunnerType'] = ResourceManager(
-            models.RunnerType, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.RunnerType, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['Action'] = ResourceManager(
-            models.Action, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.Action, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['ActionAlias'] = ActionAliasResourceManager(
-            models.ActionAlias, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.ActionAlias, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['ApiKey'] = ResourceManager(
-            models.ApiKey, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.ApiKey, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['LiveAction'] = LiveActionResourceManager(
-            models.LiveAction, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.LiveAction, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['Policy'] = ResourceManager(
-            models.Policy, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.Policy, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['PolicyType'] = ResourceManager(
-            models.PolicyType, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.PolicyType, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['Rule'] = ResourceManager(
-            models.Rule, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.Rule, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['Sensor'] = ResourceManager(
-            models.Sensor, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.Sensor, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['TriggerType'] = ResourceManager(
-            models.TriggerType, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.TriggerType, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['Trigger'] = ResourceManager(
-            models.Trigger, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.Trigger, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['TriggerInstance'] = TriggerInstanceResourceManager(
-            models.TriggerInstance, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.TriggerInstance, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['KeyValuePair'] = ResourceManager(
-            models.KeyValuePair, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.KeyValuePair, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['Webhook'] = ResourceManager(
-            models.Webhook, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.Webhook, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['Trace'] = ResourceManager(
-            models.Trace, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.Trace, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
         self.managers['RuleEnforcement'] = ResourceManager(
-            models.RuleEnforcement, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
+            models.RuleEnforcement, self.endpoints['api'], cacert=self.cacert, debug=self.debug,
+            session=self.session)
+
+        # Note: Stream manager is not a resource manager so it's not exposed as a property
+        self.managers['Stream'] = StreamManager(
+            self.endpoints['stream'], cacert=self.cacert, debug=self.debug, session=self.session)
 
     @property
     def actions(self):
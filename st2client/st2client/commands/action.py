@@ -242,6 +242,7 @@ class ActionRunCommandMixin(object):
     }
 
     poll_interval = 2  # how often to poll for execution completion when using sync mode
+    stream_timeout = 60  # how long to wait for data from the stream API before polling instead
 
     def get_resource(self, ref_or_id, **kwargs):
         return self.get_resource_by_ref_or_id(ref_or_id=ref_or_id, **kwargs)
@@ -406,12 +407,21 @@ class ActionRunCommandMixin(object):
         ]
 
         if not args.async:
-            while execution.status in pending_statuses:
-                time.sleep(self.poll_interval)
-                if not args.json:
-                    sys.stdout.write('.')
-                    sys.stdout.flush()
-                execution = action_exec_mgr.get_by_id(execution.id, **kwargs)
+            if execution.status in pending_statuses:
+                try:
+                    execution = self._wait_for_execution_using_stream(
+                        execution=execution, action_exec_mgr=action_exec_mgr, args=args,
+                        pending_statuses=pending_statuses, **kwargs)
+                except resource.ResourceNotFoundError:
+                    raise
+                except Exception as e:
+                    # Stream API is not available, fall back to polling
+                    LOG.debug('Failed to wait for execution "%s" using the stream API: %s' %
+                              (execution.id, str(e)))
+
+            execution = self._wait_for_execution_using_polling(
+                execution=execution, action_exec_mgr=action_exec_mgr, args=args,
+                pending_statuses=pending_statuses, **kwargs)
 
             sys.stdout.write('\n')
 
@@ -420,6 +430,62 @@ class ActionRunCommandMixin(object):
 
         return execution
 
+    def _wait_for_execution_using_stream(self, execution, action_exec_mgr, args,
+                                         pending_statuses, **kwargs):
+        """
+        Wait for the execution to complete by listening for the execution update events on the
+        stream API endpoint. Full execution (including the result) is only retrieved once, after
+        the execution has completed.
+        """
+        stream_mgr = self.app.client.managers['Stream']
+        events = stream_mgr.listen(events=['st2.execution__update'],
+                                   execution_ids=[execution.id], include_result=False,
+                                   timeout=self.stream_timeout, **kwargs)
+
+        try:
+            # Execution could have completed before we have subscribed to the events
+            status = self._get_execution(action_exec_mgr, execution.id,
+                                         params={'exclude_attributes': 'result'},
+                                         **kwargs).status
+
+            if status in pending_statuses:
+                for _, data in events:
+                    if not args.json:
+                        sys.stdout.write('.')
+                        sys.stdout.flush()
+
+                    if data.get('id') != execution.id:
+                        continue
+
+                    if data.get('status') not in pending_statuses:
+                        break
+                else:
+                    raise ValueError('Connection to the stream API has been closed')
+        finally:
+            events.close()
+
+        return self._get_execution(action_exec_mgr, execution.id, **kwargs)
+
+    def _wait_for_execution_using_polling(self, execution, action_exec_mgr, args,
+                                          pending_statuses, **kwargs):
+        while execution.status in pending_statuses:
+            time.sleep(self.poll_interval)
+            if not args.json:
+                sys.stdout.write('.')
+                sys.stdout.flush()
+            execution = self._get_execution(action_exec_mgr, execution.id, **kwargs)
+
+        return execution
+
+    def _get_execution(self, action_exec_mgr, execution_id, **kwargs):
+        execution = action_exec_mgr.get_by_id(execution_id, **kwargs)
+
+        if not execution:
+            raise resource.ResourceNotFoundError('Action execution with id "%s" cannot be found.' %
+                                                 (execution_id))
+
+        return execution
+
     def _get_top_level_error(self, live_action):
         """
         Retrieve a top level workflow error.
@@ -92,6 +92,12 @@ CONFIG_FILE_OPTIONS = {
             'type': 'string',
             'default': None
         }
+    },
+    'stream': {
+        'url': {
+            'type': 'string',
+            'default': None
+        }
     }
 }
 
@@ -17,6 +17,7 @@ import os
 import json
 import logging
 from functools import wraps
+from multiprocessing.pool import ThreadPool
 
 import six
 
@@ -26,6 +27,9 @@ from st2client.utils import httpclient
 
 LOG = logging.getLogger(__name__)
 
+# Default number of concurrent requests used by the bulk methods
+DEFAULT_CONCURRENCY = httpclient.DEFAULT_POOL_SIZE
+
 
 def add_auth_token_to_kwargs_from_env(func):
     @wraps(func)
@@ -143,10 +147,11 @@ class Resource(object):
 
 class ResourceManager(object):
 
-    def __init__(self, resource, endpoint, cacert=None, debug=False):
+    def __init__(self, resource, endpoint, cacert=None, debug=False, session=None):
         self.resource = resource
         self.debug = debug
-        self.client = httpclient.HTTPClient(endpoint, cacert=cacert, debug=debug)
+        self.client = httpclient.HTTPClient(endpoint, cacert=cacert, debug=debug,
+                                            session=session)
 
     @staticmethod
     def handle_error(response):
@@ -200,6 +205,27 @@ class ResourceManager(object):
             self.handle_error(response)
         return self.resource.deserialize(response.json())
 
+    @add_auth_token_to_kwargs_from_env
+    def get_by_ids(self, ids, concurrency=DEFAULT_CONCURRENCY, **kwargs):
+        """
+        Retrieve multiple resources using concurrent requests.
+
+        :param ids: Ids of the resources to retrieve.
+        :type ids: ``list``
+
+        :param concurrency: Maximum number of concurrent requests. It shouldn't be larger than
+                            the connection pool size of the client.
+        :type concurrency: ``int``
+
+        :return: Resources in the same order as the provided ids (None for the resources which
+                 don't exist).
+        :rtype: ``list``
+        """
+        def get_by_id(id):
+            return self.get_by_id(id, **kwargs)
+
+        return run_concurrently(func=get_by_id, items=ids, concurrency=concurrency)
+
     @add_auth_token_to_kwargs_from_env
     def get_property(self, id_, property_name, self_deserialize=True, **kwargs):
         """
@@ -310,15 +336,53 @@ class ResourceManager(object):
             pass
         return True
 
+    @add_auth_token_to_kwargs_from_env
+    def delete_by_ids(self, instance_ids, concurrency=DEFAULT_CONCURRENCY, **kwargs):
+        """
+        Delete multiple resources using concurrent requests.
+
+        :rtype: ``list``
+        """
+        def delete_by_id(instance_id):
+            return self.delete_by_id(instance_id, **kwargs)
+
+        return run_concurrently(func=delete_by_id, items=instance_ids, concurrency=concurrency)
+
 
 class ActionAliasResourceManager(ResourceManager):
-    def __init__(self, resource, endpoint, cacert=None, debug=False):
+    def __init__(self, resource, endpoint, cacert=None, debug=False, session=None):
         self.resource = resource
         self.debug = debug
-        self.client = httpclient.HTTPClient(root=endpoint, cacert=cacert, debug=debug)
+        self.client = httpclient.HTTPClient(root=endpoint, cacert=cacert, debug=debug,
+                                            session=session)
 
 
 class LiveActionResourceManager(ResourceManager):
+    @add_auth_token_to_kwargs_from_env
+    def create_many(self, instances, **kwargs):
+        """
+        Schedule multiple executions with a single request.
+
+        :return: Created execution or an exception with the error message for each of the
+                 provided instances (in the same order).
+        :rtype: ``list``
+        """
+        url = '/%s/bulk' % (self.resource.get_url_path_name())
+        data = {'executions': [instance.serialize() for instance in instances]}
+
+        response = self.client.post(url, data, **kwargs)
+        if response.status_code != 200:
+            self.handle_error(response)
+
+        results = []
+        for item in response.json():
+            if 'execution' in item:
+                results.append(self.resource.deserialize(item['execution']))
+            else:
+                results.append(Exception(item.get('faultstring', 'Unknown error')))
+
+        return results
+
     @add_auth_token_to_kwargs_from_env
     def re_run(self, execution_id, parameters=None, tasks=None, no_reset=None, **kwargs):
         url = '/%s/%s/re_run' % (self.resource.get_url_path_name(), execution_id)
@@ -351,3 +415,142 @@ class TriggerInstanceResourceManager(ResourceManager):
         if response.status_code != 200:
             self.handle_error(response)
         return response.json()
+
+
+class StreamManager(object):
+    def __init__(self, endpoint, cacert=None, debug=False, session=None):
+        self.debug = debug
+        self.client = httpclient.HTTPClient(endpoint, cacert=cacert, debug=debug,
+                                            session=session)
+
+    @add_auth_token_to_kwargs_from_env
+    def listen(self, events=None, execution_ids=None, include_result=True, timeout=None,
+               **kwargs):
+        """
+        Connect to the stream API endpoint and return an iterator which yields the received
+        events as (event name, event data) tuples. The iterator needs to be closed once it's not
+        needed anymore.
+
+        Note: The connection is established before this method returns so no events which happen
+        after the call are missed.
+
+        :param events: Only receive events with the provided names.
+        :type events: ``list``
+
+        :param execution_ids: Only receive events for the action executions with the provided ids.
+        :type execution_ids: ``list``
+
+        :param include_result: False to omit the result attribute from the execution events.
+        :type include_result: ``bool``
+
+        :param timeout: How long to wait (in seconds) for the connection and for each piece of
+                        data (the server sends periodic heartbeats).
+        :type timeout: ``float``
+
+        :rtype: :class:`EventStream`
+        """
+        params = {}
+
+        if events:
+            params['events'] = ','.join(events)
+
+        if execution_ids:
+            params['execution_ids'] = ','.join(execution_ids)
+
+        if not include_result:
+            params['include_result'] = 'false'
+
+        # Compressed responses are buffered by the proxy which would delay the events
+        headers = {'Accept-Encoding': 'identity'}
+
+        response = self.client.get('/stream', params=params, headers=headers, stream=True,
+                                   timeout=timeout, **kwargs)
+        if response.status_code != 200:
+            ResourceManager.handle_error(response)
+
+        return EventStream(response=response)
+
+
+class EventStream(object):
+    """
+    Iterator which yields the events received from the stream API endpoint as (event name, event
+    data) tuples.
+
+    It owns the underlying streaming response which is closed once all the events have been
+    consumed or when close() is called (even if the iteration hasn't been started yet).
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self._events = self._get_events()
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        return next(self._events)
+
+    __next__ = next
+
+    def close(self):
+        # Note: Closing a generator which hasn't been started doesn't run its "finally" block so
+        # the response is closed explicitly
+        self._events.close()
+        self._response.close()
+
+    def _get_events(self):
+        event = None
+        data = []
+
+        try:
+            for line in self._get_lines():
+                if not line:
+                    # Blank line terminates the event, lines without data are heartbeats
+                    if data:
+                        yield (event, json.loads('\n'.join(data)))
+
+                    event = None
+                    data = []
+                elif line.startswith('event:'):
+                    event = line[len('event:'):].strip()
+                elif line.startswith('data:'):
+                    data.append(line[len('data:'):].strip())
+        finally:
+            self._response.close()
+
+    def _get_lines(self):
+        # Note: Data is read byte by byte since the larger chunk sizes block until the chunk is
+        # filled which would delay the events indefinitely
+        line = []
+
+        for char in self._response.iter_content(chunk_size=1):
+            if char == b'\n':
+                yield b''.join(line).decode('utf-8').rstrip('\r')
+                line = []
+            else:
+                line.append(char)
+
+
+def run_concurrently(func, items, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Call the provided function for each item using a pool of threads.
+
+    :return: Results in the same order as the items. If any of the calls fails, the exception
+             is propagated.
+    :rtype: ``list``
+    """
+    items = list(items)
+
+    if not items:
+        return []
+
+    if concurrency <= 1 or len(items) == 1:
+        return [func(item) for item in items]
+
+    pool = ThreadPool(processes=min(concurrency, len(items)))
+
+    try:
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
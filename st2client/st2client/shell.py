@@ -27,7 +27,9 @@ import time
 import argparse
 import calendar
 import logging
+import importlib
 import traceback
+from collections import OrderedDict
 
 import six
 import requests
@@ -35,19 +37,6 @@ import requests
 from st2client import __version__
 from st2client import models
 from st2client.client import Client
-from st2client.commands import auth
-from st2client.commands import action
-from st2client.commands import action_alias
-from st2client.commands import keyvalue
-from st2client.commands import policy
-from st2client.commands import resource
-from st2client.commands import sensor
-from st2client.commands import trace
-from st2client.commands import trigger
-from st2client.commands import triggerinstance
-from st2client.commands import webhook
-from st2client.commands import rule
-from st2client.commands import rule_enforcement
 from st2client.config_parser import CLIConfigParser
 from st2client.config_parser import ST2_CONFIG_DIRECTORY
 from st2client.config_parser import ST2_CONFIG_PATH
@@ -75,21 +64,113 @@ CONFIG_OPTION_TO_CLIENT_KWARGS_MAP = {
     'base_url': ['general', 'base_url'],
     'auth_url': ['auth', 'url'],
     'api_url': ['api', 'url'],
+    'stream_url': ['stream', 'url'],
     'api_version': ['general', 'api_version'],
     'cacert': ['general', 'cacert'],
     'debug': ['cli', 'debug']
 }
 
 # A list of command classes for which automatic authentication should be skipped.
-from st2client.commands.auth import TokenCreateCommand
 SKIP_AUTH_CLASSES = [
-    TokenCreateCommand.__name__
+    'TokenCreateCommand'
 ]
 
+# Available commands. Command modules (and the formatters and libraries they depend on) are only
+# imported when the command is used which speeds up the CLI startup.
+# "class" - Python path to the command or branch class.
+# "args" - Arguments which are passed to the class constructor before the app and subparsers.
+# "kwargs" - Keyword arguments which are passed to the class constructor.
+# "help" - Help which is displayed for the command. Defaults to the last argument (description).
+COMMANDS = OrderedDict([
+    ('action', {
+        'class': 'st2client.commands.action.ActionBranch',
+        'args': ['An activity that happens as a response to the external event.']
+    }),
+    ('action-alias', {
+        'class': 'st2client.commands.action_alias.ActionAliasBranch',
+        'args': ['Action aliases.']
+    }),
+    ('auth', {
+        'class': 'st2client.commands.auth.TokenCreateCommand',
+        'args': [models.Token],
+        'kwargs': {'name': 'auth'},
+        'help': 'Authenticate user and aquire access token.'
+    }),
+    ('api-key', {
+        'class': 'st2client.commands.auth.ApiKeyBranch',
+        'args': ['API Keys.']
+    }),
+    ('execution', {
+        'class': 'st2client.commands.action.ActionExecutionBranch',
+        'args': ['An invocation of an action.']
+    }),
+    ('key', {
+        'class': 'st2client.commands.keyvalue.KeyValuePairBranch',
+        'args': ['Key value pair is used to store commonly used configuration '
+                 'for reuse in sensors, actions, and rules.']
+    }),
+    ('policy', {
+        'class': 'st2client.commands.policy.PolicyBranch',
+        'args': ['Policy that is enforced on a resource.']
+    }),
+    ('policy-type', {
+        'class': 'st2client.commands.policy.PolicyTypeBranch',
+        'args': ['Type of policy that can be applied to resources.']
+    }),
+    ('rule', {
+        'class': 'st2client.commands.rule.RuleBranch',
+        'args': ['A specification to invoke an "action" on a "trigger" selectively '
+                 'based on some criteria.']
+    }),
+    ('run', {
+        'class': 'st2client.commands.action.ActionRunCommand',
+        'args': [models.Action],
+        'kwargs': {'name': 'run', 'add_help': False},
+        'help': 'A command to invoke an action manually.'
+    }),
+    ('runner', {
+        'class': 'st2client.commands.resource.ResourceBranch',
+        'args': [models.RunnerType,
+                 'Runner is a type of handler for a specific class of actions.'],
+        'kwargs': {'read_only': True}
+    }),
+    ('sensor', {
+        'class': 'st2client.commands.sensor.SensorBranch',
+        'args': ['An adapter which allows you to integrate StackStorm with external system ']
+    }),
+    ('trace', {
+        'class': 'st2client.commands.trace.TraceBranch',
+        'args': ['A group of executions, rules and triggerinstances that are related.']
+    }),
+    ('trigger', {
+        'class': 'st2client.commands.trigger.TriggerTypeBranch',
+        'args': ['An external event that is mapped to a st2 input. It is the '
+                 'st2 invocation point.']
+    }),
+    ('trigger-instance', {
+        'class': 'st2client.commands.triggerinstance.TriggerInstanceBranch',
+        'args': ['Actual instances of triggers received by st2.']
+    }),
+    ('webhook', {
+        'class': 'st2client.commands.webhook.WebhookBranch',
+        'args': ['Webhooks.']
+    }),
+    ('rule-enforcement', {
+        'class': 'st2client.commands.rule_enforcement.RuleEnforcementBranch',
+        'args': ['Models that represent enforcement of rules.']
+    })
+])
+
 
 class Shell(object):
 
-    def __init__(self):
+    def __init__(self, argv=None):
+        """
+        :param argv: Command line arguments. If provided, only the command which is used is
+                     registered (and its module imported), other commands are only listed in the
+                     help. Otherwise all the commands are registered.
+        :type argv: ``list``
+        """
         # Set up of endpoints is delayed until program is run.
         self.client = None
 
@@ -130,6 +211,15 @@ class Shell(object):
                  'from the environment variables by default.'
         )
 
+        self.parser.add_argument(
+            '--stream-url',
+            action='store',
+            dest='stream_url',
+            default=None,
+            help='URL for the stream endpoint. Get ST2_STREAM_URL'
+                 'from the environment variables by default.'
+        )
+
         self.parser.add_argument(
             '--api-version',
             action='store',
@@ -185,75 +275,59 @@ class Shell(object):
         self.subparsers = self.parser.add_subparsers()
         self.commands = dict()
 
-        self.commands['action'] = action.ActionBranch(
-            'An activity that happens as a response to the external event.',
-            self, self.subparsers)
-
-        self.commands['action-alias'] = action_alias.ActionAliasBranch(
-            'Action aliases.',
-            self, self.subparsers)
-
-        self.commands['auth'] = auth.TokenCreateCommand(
-            models.Token, self, self.subparsers, name='auth')
-
-        self.commands['api-key'] = auth.ApiKeyBranch(
-            'API Keys.',
-            self, self.subparsers)
-
-        self.commands['execution'] = action.ActionExecutionBranch(
-            'An invocation of an action.',
-            self, self.subparsers)
-
-        self.commands['key'] = keyvalue.KeyValuePairBranch(
-            'Key value pair is used to store commonly used configuration '
-            'for reuse in sensors, actions, and rules.',
-            self, self.subparsers)
-
-        self.commands['policy'] = policy.PolicyBranch(
-            'Policy that is enforced on a resource.',
-            self, self.subparsers)
-
-        self.commands['policy-type'] = policy.PolicyTypeBranch(
-            'Type of policy that can be applied to resources.',
-            self, self.subparsers)
+        if argv is None:
+            # Arguments are not known in advance so all the commands are registered
+            command_names = list(COMMANDS.keys())
+        else:
+            command_names = [self._get_command_name(argv=argv)]
 
-        self.commands['rule'] = rule.RuleBranch(
-            'A specification to invoke an "action" on a "trigger" selectively '
-            'based on some criteria.',
-            self, self.subparsers)
+        for name in COMMANDS.keys():
+            if name in command_names:
+                self._register_command(name=name)
+            else:
+                self._register_command_placeholder(name=name)
 
-        self.commands['run'] = action.ActionRunCommand(
-            models.Action, self, self.subparsers, name='run', add_help=False)
+    def _get_command_name(self, argv):
+        """
+        Return name of the command which is used in the provided arguments.
 
-        self.commands['runner'] = resource.ResourceBranch(
-            models.RunnerType,
-            'Runner is a type of handler for a specific class of actions.',
-            self, self.subparsers, read_only=True)
+        :rtype: ``str``
+        """
+        # Global options which take a value (e.g. --api-version), the value is not a command name
+        options_with_values = [option for option, action in
+                               six.iteritems(self.parser._option_string_actions)
+                               if action.nargs != 0]
+
+        skip_next = False
+        for arg in argv:
+            if skip_next:
+                skip_next = False
+            elif arg.startswith('-'):
+                skip_next = arg in options_with_values
+            else:
+                # First positional argument is the command
+                return arg if arg in COMMANDS else None
 
-        self.commands['sensor'] = sensor.SensorBranch(
-            'An adapter which allows you to integrate StackStorm with external system ',
-            self, self.subparsers)
+        if '--print-config' in argv:
+            # "action list" command is used with --print-config, see run()
+            return 'action'
 
-        self.commands['trace'] = trace.TraceBranch(
-            'A group of executions, rules and triggerinstances that are related.',
-            self, self.subparsers)
+        return None
 
-        self.commands['trigger'] = trigger.TriggerTypeBranch(
-            'An external event that is mapped to a st2 input. It is the '
-            'st2 invocation point.',
-            self, self.subparsers)
+    def _register_command(self, name):
+        spec = COMMANDS[name]
 
-        self.commands['trigger-instance'] = triggerinstance.TriggerInstanceBranch(
-            'Actual instances of triggers received by st2.',
-            self, self.subparsers)
+        module_name, class_name = spec['class'].rsplit('.', 1)
+        command_class = getattr(importlib.import_module(module_name), class_name)
 
-        self.commands['webhook'] = webhook.WebhookBranch(
-            'Webhooks.',
-            self, self.subparsers)
+        args = spec.get('args', []) + [self, self.subparsers]
+        self.commands[name] = command_class(*args, **spec.get('kwargs', {}))
 
-        self.commands['rule-enforcement'] = rule_enforcement.RuleEnforcementBranch(
-            'Models that represent enforcement of rules.',
-            self, self.subparsers)
+    def _register_command_placeholder(self, name):
+        # Placeholder is only used to display the command in the help
+        spec = COMMANDS[name]
+        description = spec.get('help', spec['args'][-1])
+        self.subparsers.add_parser(name, description=description, help=description)
 
     def get_client(self, args, debug=False):
         ST2_CLI_SKIP_CONFIG = os.environ.get('ST2_CLI_SKIP_CONFIG', 0)
@@ -264,7 +338,7 @@ class Shell(object):
 
         # Note: Options provided as the CLI argument have the highest precedence
         # Precedence order: cli arguments > environment variables > rc file variables
-        cli_options = ['base_url', 'auth_url', 'api_url', 'api_version', 'cacert']
+        cli_options = ['base_url', 'auth_url', 'api_url', 'stream_url', 'api_version', 'cacert']
         cli_options = {opt: getattr(args, opt) for opt in cli_options}
         config_file_options = self._get_config_file_options(args=args)
 
@@ -411,6 +485,7 @@ class Shell(object):
         print('ST2_BASE_URL: %s' % (client.endpoints['base']))
         print('ST2_AUTH_URL: %s' % (client.endpoints['auth']))
         print('ST2_API_URL: %s' % (client.endpoints['api']))
+        print('ST2_STREAM_URL: %s' % (client.endpoints['stream']))
         print('ST2_AUTH_TOKEN: %s' % (os.environ.get('ST2_AUTH_TOKEN')))
         print('')
         print('Proxy settings:')
@@ -623,7 +698,7 @@ def setup_logging(argv):
 
 def main(argv=sys.argv[1:]):
     setup_logging(argv)
-    return Shell().run(argv)
+    return Shell(argv=argv).run(argv)
 
 
 if __name__ == '__main__':
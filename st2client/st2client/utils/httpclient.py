@@ -20,10 +20,14 @@ import logging
 from pipes import quote as pquote
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 LOG = logging.getLogger(__name__)
 
+# Default maximum number of connections which are kept open per host
+DEFAULT_POOL_SIZE = 10
+
 
 def add_ssl_verify_to_kwargs(func):
     def decorate(*args, **kwargs):
@@ -55,25 +59,56 @@ def add_json_content_type_to_headers(func):
     return decorate
 
 
+def get_session(pool_size=DEFAULT_POOL_SIZE, keep_alive=True):
+    """
+    Return a requests session which re-uses connections to the API endpoints.
+
+    Session can be shared by multiple HTTPClient instances and threads.
+
+    :param pool_size: Maximum number of connections which are kept open per host (this should
+                      be at least the number of threads which share the session).
+    :type pool_size: ``int``
+
+    :param keep_alive: False to close the connection after each request.
+    :type keep_alive: ``bool``
+
+    :rtype: :class:`requests.Session`
+    """
+    session = requests.Session()
+
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    # Large responses (e.g. execution results) are compressed by the proxy in front of the API
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+
+    return session
+
+
 class HTTPClient(object):
 
-    def __init__(self, root, cacert=None, debug=False):
+    def __init__(self, root, cacert=None, debug=False, session=None):
         self.root = self._get_url_without_trailing_slash(root)
         self.cacert = cacert
         self.debug = debug
+        self.session = session or get_session()
 
     @add_ssl_verify_to_kwargs
     @add_auth_token_to_headers
     def get(self, url, **kwargs):
-        response = requests.get(self.root + url, **kwargs)
-        response = self._response_hook(response=response)
+        response = self.session.get(self.root + url, **kwargs)
+        response = self._response_hook(response=response, stream=kwargs.get('stream', False))
         return response
 
     @add_ssl_verify_to_kwargs
     @add_auth_token_to_headers
     @add_json_content_type_to_headers
     def post(self, url, data, **kwargs):
-        response = requests.post(self.root + url, json.dumps(data), **kwargs)
+        response = self.session.post(self.root + url, json.dumps(data), **kwargs)
         response = self._response_hook(response=response)
         return response
 
@@ -81,7 +116,7 @@ class HTTPClient(object):
     @add_auth_token_to_headers
     @add_json_content_type_to_headers
     def put(self, url, data, **kwargs):
-        response = requests.put(self.root + url, json.dumps(data), **kwargs)
+        response = self.session.put(self.root + url, json.dumps(data), **kwargs)
         response = self._response_hook(response=response)
         return response
 
@@ -89,26 +124,29 @@ class HTTPClient(object):
     @add_auth_token_to_headers
     @add_json_content_type_to_headers
     def patch(self, url, data, **kwargs):
-        response = requests.patch(self.root + url, data, **kwargs)
+        response = self.session.patch(self.root + url, data, **kwargs)
         response = self._response_hook(response=response)
         return response
 
     @add_ssl_verify_to_kwargs
     @add_auth_token_to_headers
     def delete(self, url, **kwargs):
-        response = requests.delete(self.root + url, **kwargs)
+        response = self.session.delete(self.root + url, **kwargs)
         response = self._response_hook(response=response)
         return response
 
-    def _response_hook(self, response):
+    def _response_hook(self, response, stream=False):
         if self.debug:
             # Log cURL request line
             curl_line = self._get_curl_line_for_request(request=response.request)
             print("# -------- begin %d request ----------" % id(self))
             print(curl_line)
-            print("# -------- begin %d response ----------" % (id(self)))
-            print(response.text)
-            print("# -------- end %d response ------------" % (id(self)))
+
+            # Body of a streamed response is consumed by the caller
+            if not stream:
+                print("# -------- begin %d response ----------" % (id(self)))
+                print(response.text)
+                print("# -------- end %d response ------------" % (id(self)))
             print('')
 
         return response
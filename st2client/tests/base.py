@@ -81,7 +81,7 @@ class BaseCLITestCase(unittest2.TestCase):
         super(BaseCLITestCase, self).setUp()
 
         # Setup environment
-        for var in ['ST2_BASE_URL', 'ST2_AUTH_URL', 'ST2_API_URL',
+        for var in ['ST2_BASE_URL', 'ST2_AUTH_URL', 'ST2_API_URL', 'ST2_STREAM_URL',
                     'ST2_AUTH_TOKEN', 'ST2_CONFIG_FILE']:
             if var in os.environ:
                 del os.environ[var]
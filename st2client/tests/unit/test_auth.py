@@ -105,7 +105,7 @@ class TestAuthToken(base.BaseCLITestCase):
         self.assertDictEqual(kwargs['headers'], expected)
 
     @mock.patch.object(
-        requests, 'get',
+        requests.Session, 'get',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps({}), 200, 'OK')))
     def test_decorate_resource_list(self):
         url = 'http://127.0.0.1:9101/v1/rules/?limit=50'
@@ -113,23 +113,23 @@ class TestAuthToken(base.BaseCLITestCase):
         # Test without token.
         self.shell.run(['rule', 'list'])
         kwargs = {}
-        requests.get.assert_called_with(url, **kwargs)
+        requests.Session.get.assert_called_with(url, **kwargs)
 
         # Test with token from  cli.
         token = uuid.uuid4().hex
         self.shell.run(['rule', 'list', '-t', token])
         kwargs = {'headers': {'X-Auth-Token': token}}
-        requests.get.assert_called_with(url, **kwargs)
+        requests.Session.get.assert_called_with(url, **kwargs)
 
         # Test with token from env.
         token = uuid.uuid4().hex
         os.environ['ST2_AUTH_TOKEN'] = token
         self.shell.run(['rule', 'list'])
         kwargs = {'headers': {'X-Auth-Token': token}}
-        requests.get.assert_called_with(url, **kwargs)
+        requests.Session.get.assert_called_with(url, **kwargs)
 
     @mock.patch.object(
-        requests, 'get',
+        requests.Session, 'get',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps(RULE), 200, 'OK')))
     def test_decorate_resource_get(self):
         rule_ref = '%s.%s' % (RULE['pack'], RULE['name'])
@@ -138,23 +138,23 @@ class TestAuthToken(base.BaseCLITestCase):
         # Test without token.
         self.shell.run(['rule', 'get', rule_ref])
         kwargs = {}
-        requests.get.assert_called_with(url, **kwargs)
+        requests.Session.get.assert_called_with(url, **kwargs)
 
         # Test with token from cli.
         token = uuid.uuid4().hex
         self.shell.run(['rule', 'get', rule_ref, '-t', token])
         kwargs = {'headers': {'X-Auth-Token': token}}
-        requests.get.assert_called_with(url, **kwargs)
+        requests.Session.get.assert_called_with(url, **kwargs)
 
         # Test with token from env.
         token = uuid.uuid4().hex
         os.environ['ST2_AUTH_TOKEN'] = token
         self.shell.run(['rule', 'get', rule_ref])
         kwargs = {'headers': {'X-Auth-Token': token}}
-        requests.get.assert_called_with(url, **kwargs)
+        requests.Session.get.assert_called_with(url, **kwargs)
 
     @mock.patch.object(
-        requests, 'post',
+        requests.Session, 'post',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps(RULE), 200, 'OK')))
     def test_decorate_resource_post(self):
         url = 'http://127.0.0.1:9101/v1/rules'
@@ -168,29 +168,29 @@ class TestAuthToken(base.BaseCLITestCase):
             # Test without token.
             self.shell.run(['rule', 'create', path])
             kwargs = {'headers': {'content-type': 'application/json'}}
-            requests.post.assert_called_with(url, json.dumps(data), **kwargs)
+            requests.Session.post.assert_called_with(url, json.dumps(data), **kwargs)
 
             # Test with token from cli.
             token = uuid.uuid4().hex
             self.shell.run(['rule', 'create', path, '-t', token])
             kwargs = {'headers': {'content-type': 'application/json', 'X-Auth-Token': token}}
-            requests.post.assert_called_with(url, json.dumps(data), **kwargs)
+            requests.Session.post.assert_called_with(url, json.dumps(data), **kwargs)
 
             # Test with token from env.
             token = uuid.uuid4().hex
             os.environ['ST2_AUTH_TOKEN'] = token
             self.shell.run(['rule', 'create', path])
             kwargs = {'headers': {'content-type': 'application/json', 'X-Auth-Token': token}}
-            requests.post.assert_called_with(url, json.dumps(data), **kwargs)
+            requests.Session.post.assert_called_with(url, json.dumps(data), **kwargs)
         finally:
             os.close(fd)
             os.unlink(path)
 
     @mock.patch.object(
-        requests, 'get',
+        requests.Session, 'get',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps(RULE), 200, 'OK')))
     @mock.patch.object(
-        requests, 'put',
+        requests.Session, 'put',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps(RULE), 200, 'OK')))
     def test_decorate_resource_put(self):
         rule_ref = '%s.%s' % (RULE['pack'], RULE['name'])
@@ -207,35 +207,35 @@ class TestAuthToken(base.BaseCLITestCase):
             # Test without token.
             self.shell.run(['rule', 'update', rule_ref, path])
             kwargs = {}
-            requests.get.assert_called_with(get_url, **kwargs)
+            requests.Session.get.assert_called_with(get_url, **kwargs)
             kwargs = {'headers': {'content-type': 'application/json'}}
-            requests.put.assert_called_with(put_url, json.dumps(RULE), **kwargs)
+            requests.Session.put.assert_called_with(put_url, json.dumps(RULE), **kwargs)
 
             # Test with token from cli.
             token = uuid.uuid4().hex
             self.shell.run(['rule', 'update', rule_ref, path, '-t', token])
             kwargs = {'headers': {'X-Auth-Token': token}}
-            requests.get.assert_called_with(get_url, **kwargs)
+            requests.Session.get.assert_called_with(get_url, **kwargs)
             kwargs = {'headers': {'content-type': 'application/json', 'X-Auth-Token': token}}
-            requests.put.assert_called_with(put_url, json.dumps(RULE), **kwargs)
+            requests.Session.put.assert_called_with(put_url, json.dumps(RULE), **kwargs)
 
             # Test with token from env.
             token = uuid.uuid4().hex
             os.environ['ST2_AUTH_TOKEN'] = token
             self.shell.run(['rule', 'update', rule_ref, path])
             kwargs = {'headers': {'X-Auth-Token': token}}
-            requests.get.assert_called_with(get_url, **kwargs)
+            requests.Session.get.assert_called_with(get_url, **kwargs)
             kwargs = {'headers': {'content-type': 'application/json', 'X-Auth-Token': token}}
-            requests.put.assert_called_with(put_url, json.dumps(RULE), **kwargs)
+            requests.Session.put.assert_called_with(put_url, json.dumps(RULE), **kwargs)
         finally:
             os.close(fd)
             os.unlink(path)
 
     @mock.patch.object(
-        requests, 'get',
+        requests.Session, 'get',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps(RULE), 200, 'OK')))
     @mock.patch.object(
-        requests, 'delete',
+        requests.Session, 'delete',
         mock.MagicMock(return_value=base.FakeResponse('', 204, 'OK')))
     def test_decorate_resource_delete(self):
         rule_ref = '%s.%s' % (RULE['pack'], RULE['name'])
@@ -245,20 +245,20 @@ class TestAuthToken(base.BaseCLITestCase):
         # Test without token.
         self.shell.run(['rule', 'delete', rule_ref])
         kwargs = {}
-        requests.get.assert_called_with(get_url, **kwargs)
-        requests.delete.assert_called_with(del_url, **kwargs)
+        requests.Session.get.assert_called_with(get_url, **kwargs)
+        requests.Session.delete.assert_called_with(del_url, **kwargs)
 
         # Test with token from cli.
         token = uuid.uuid4().hex
         self.shell.run(['rule', 'delete', rule_ref, '-t', token])
         kwargs = {'headers': {'X-Auth-Token': token}}
-        requests.get.assert_called_with(get_url, **kwargs)
-        requests.delete.assert_called_with(del_url, **kwargs)
+        requests.Session.get.assert_called_with(get_url, **kwargs)
+        requests.Session.delete.assert_called_with(del_url, **kwargs)
 
         # Test with token from env.
         token = uuid.uuid4().hex
         os.environ['ST2_AUTH_TOKEN'] = token
         self.shell.run(['rule', 'delete', rule_ref])
         kwargs = {'headers': {'X-Auth-Token': token}}
-        requests.get.assert_called_with(get_url, **kwargs)
-        requests.delete.assert_called_with(del_url, **kwargs)
+        requests.Session.get.assert_called_with(get_url, **kwargs)
+        requests.Session.delete.assert_called_with(del_url, **kwargs)
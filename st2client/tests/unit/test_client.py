@@ -28,7 +28,7 @@ LOG = logging.getLogger(__name__)
 class TestClientEndpoints(unittest2.TestCase):
 
     def tearDown(self):
-        for var in ['ST2_BASE_URL', 'ST2_API_URL', 'ST2_DATASTORE_URL']:
+        for var in ['ST2_BASE_URL', 'ST2_API_URL', 'ST2_STREAM_URL', 'ST2_DATASTORE_URL']:
             if var in os.environ:
                 del os.environ[var]
 
@@ -43,14 +43,30 @@ class TestClientEndpoints(unittest2.TestCase):
             self.assertIsNotNone(manager)
             self.assertIsInstance(manager, models.ResourceManager)
 
+    def test_managers_share_session(self):
+        client = Client(pool_size=20)
+
+        for manager in six.itervalues(client.managers):
+            self.assertEqual(manager.client.session, client.session)
+
+        adapter = client.session.get_adapter('http://127.0.0.1:9101/v1')
+        self.assertEqual(adapter._pool_maxsize, 20)
+        self.assertFalse('Connection' in client.session.headers)
+
+        client = Client(keep_alive=False)
+        self.assertEqual(client.session.headers['Connection'], 'close')
+
     def test_default(self):
         base_url = 'http://127.0.0.1'
         api_url = 'http://127.0.0.1:9101/v1'
+        stream_url = 'http://127.0.0.1:9102/v1'
 
         client = Client()
         endpoints = client.endpoints
         self.assertEqual(endpoints['base'], base_url)
         self.assertEqual(endpoints['api'], api_url)
+        self.assertEqual(endpoints['stream'], stream_url)
+        self.assertEqual(client.managers['Stream'].client.root, stream_url)
 
     def test_env(self):
         base_url = 'http://www.stackstorm.com'
@@ -117,8 +133,20 @@ class TestClientEndpoints(unittest2.TestCase):
     def test_args_base_only(self):
         base_url = 'http://www.stackstorm.com'
         api_url = 'http://www.stackstorm.com:9101/v1'
+        stream_url = 'http://www.stackstorm.com:9102/v1'
 
         client = Client(base_url=base_url)
         endpoints = client.endpoints
         self.assertEqual(endpoints['base'], base_url)
         self.assertEqual(endpoints['api'], api_url)
+        self.assertEqual(endpoints['stream'], stream_url)
+
+    def test_stream_url(self):
+        stream_url = 'https://www.st2.com/stream/v1'
+
+        client = Client(stream_url=stream_url)
+        self.assertEqual(client.endpoints['stream'], stream_url)
+
+        os.environ['ST2_STREAM_URL'] = 'https://www.st2.com:9102/v1'
+        client = Client()
+        self.assertEqual(client.endpoints['stream'], 'https://www.st2.com:9102/v1')
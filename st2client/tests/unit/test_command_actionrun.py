@@ -15,10 +15,13 @@
 
 import copy
 
+import mock
 import unittest2
 
 from st2client.commands.action import ActionRunCommand
-from st2client.models.action import (Action, RunnerType)
+from st2client.commands.action import ActionRunCommandMixin
+from st2client.commands.resource import ResourceNotFoundError
+from st2client.models.action import (Action, RunnerType, LiveAction)
 
 
 class ActionRunCommandTest(unittest2.TestCase):
@@ -55,3 +58,98 @@ class ActionRunCommandTest(unittest2.TestCase):
         self.assertTrue('stuff' not in imm, '"stuff" param should be in immutable set.')
         self.assertEqual(runner.runner_parameters, orig_runner_params, 'Runner params modified.')
         self.assertEqual(action.parameters, orig_action_params, 'Action params modified.')
+
+    def _get_command(self, events):
+        command = ActionRunCommandMixin()
+        command.app = mock.MagicMock()
+        command.poll_interval = 0
+
+        stream_mgr = command.app.client.managers['Stream']
+        stream_mgr.listen.return_value = (event for event in events)
+
+        return command, stream_mgr
+
+    def test_get_execution_result_using_stream(self):
+        events = [
+            ('st2.execution__update', {'id': '123', 'status': 'running'}),
+            ('st2.execution__update', {'id': '123', 'status': 'succeeded'})
+        ]
+        command, stream_mgr = self._get_command(events=events)
+
+        action_exec_mgr = mock.MagicMock()
+        action_exec_mgr.get_by_id.side_effect = [
+            LiveAction(id='123', status='running'),
+            LiveAction(id='123', status='succeeded', result={'stdout': 'done'})
+        ]
+
+        args = mock.MagicMock(async=False, json=True)
+        execution = command._get_execution_result(
+            execution=LiveAction(id='123', status='requested'), action_exec_mgr=action_exec_mgr,
+            args=args, token='token')
+
+        self.assertEqual(execution.status, 'succeeded')
+        self.assertEqual(execution.result, {'stdout': 'done'})
+
+        stream_mgr.listen.assert_called_once_with(
+            events=['st2.execution__update'], execution_ids=['123'], include_result=False,
+            timeout=command.stream_timeout, token='token')
+
+        # Result is only retrieved once, after the execution has completed
+        self.assertEqual(action_exec_mgr.get_by_id.call_args_list, [
+            mock.call('123', params={'exclude_attributes': 'result'}, token='token'),
+            mock.call('123', token='token')
+        ])
+
+    def test_get_execution_result_falls_back_to_polling(self):
+        command, stream_mgr = self._get_command(events=[])
+        stream_mgr.listen.side_effect = Exception('Connection refused')
+
+        action_exec_mgr = mock.MagicMock()
+        action_exec_mgr.get_by_id.side_effect = [
+            LiveAction(id='123', status='running'),
+            LiveAction(id='123', status='succeeded', result={'stdout': 'done'})
+        ]
+
+        args = mock.MagicMock(async=False, json=True)
+        execution = command._get_execution_result(
+            execution=LiveAction(id='123', status='requested'), action_exec_mgr=action_exec_mgr,
+            args=args)
+
+        self.assertEqual(execution.status, 'succeeded')
+        self.assertEqual(action_exec_mgr.get_by_id.call_count, 2)
+
+    def test_get_execution_result_using_stream_already_completed(self):
+        command, stream_mgr = self._get_command(events=[])
+        events = mock.MagicMock()
+        stream_mgr.listen.return_value = events
+
+        action_exec_mgr = mock.MagicMock()
+        action_exec_mgr.get_by_id.side_effect = [
+            LiveAction(id='123', status='succeeded'),
+            LiveAction(id='123', status='succeeded', result={'stdout': 'done'})
+        ]
+
+        args = mock.MagicMock(async=False, json=True)
+        execution = command._get_execution_result(
+            execution=LiveAction(id='123', status='requested'), action_exec_mgr=action_exec_mgr,
+            args=args)
+
+        self.assertEqual(execution.result, {'stdout': 'done'})
+
+        # Stream connection is closed even though no events have been consumed
+        self.assertFalse(events.__iter__.called)
+        events.close.assert_called_once_with()
+
+    def test_get_execution_result_execution_not_found(self):
+        command, stream_mgr = self._get_command(events=[])
+
+        action_exec_mgr = mock.MagicMock()
+        action_exec_mgr.get_by_id.return_value = None
+
+        args = mock.MagicMock(async=False, json=True)
+        self.assertRaises(ResourceNotFoundError, command._get_execution_result,
+                          execution=LiveAction(id='123', status='requested'),
+                          action_exec_mgr=action_exec_mgr, args=args)
+
+        # Missing execution is not treated as a stream API failure
+        self.assertEqual(action_exec_mgr.get_by_id.call_count, 1)
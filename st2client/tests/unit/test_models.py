@@ -225,3 +225,111 @@ class TestResourceManager(unittest2.TestCase):
         mgr = models.ResourceManager(base.FakeResource, base.FAKE_ENDPOINT)
         instance = mgr.get_by_name('abc')
         self.assertRaises(Exception, mgr.delete, instance)
+
+    @mock.patch.object(
+        httpclient.HTTPClient, 'get',
+        mock.MagicMock(side_effect=lambda url, **kwargs: _get_resource_response(url)))
+    def test_resource_get_by_ids(self):
+        mgr = models.ResourceManager(base.FakeResource, base.FAKE_ENDPOINT)
+        resources = mgr.get_by_ids(['456', '789', '123'], concurrency=2)
+        self.assertEqual(len(resources), 3)
+        self.assertEqual(resources[0].serialize(), base.RESOURCES[1])
+        self.assertIsNone(resources[1])
+        self.assertEqual(resources[2].serialize(), base.RESOURCES[0])
+        self.assertEqual(httpclient.HTTPClient.get.call_count, 3)
+
+    @mock.patch.object(
+        httpclient.HTTPClient, 'get',
+        mock.MagicMock(return_value=base.FakeResponse('', 500, 'INTERNAL SERVER ERROR')))
+    def test_resource_get_by_ids_failed(self):
+        mgr = models.ResourceManager(base.FakeResource, base.FAKE_ENDPOINT)
+        self.assertRaises(Exception, mgr.get_by_ids, ['123', '456'])
+
+    @mock.patch.object(
+        httpclient.HTTPClient, 'delete',
+        mock.MagicMock(return_value=base.FakeResponse('', 204, 'NO CONTENT')))
+    def test_resource_delete_by_ids(self):
+        mgr = models.ResourceManager(base.FakeResource, base.FAKE_ENDPOINT)
+        result = mgr.delete_by_ids(['123', '456'])
+        self.assertEqual(result, [True, True])
+        self.assertEqual(httpclient.HTTPClient.delete.call_count, 2)
+
+    @mock.patch.object(
+        httpclient.HTTPClient, 'post',
+        mock.MagicMock(return_value=base.FakeResponse(json.dumps([
+            {'status': 201, 'execution': {'id': '123', 'action': 'core.local'}},
+            {'status': 400, 'faultstring': 'Action "invalid" cannot be found.'}
+        ]), 200, 'OK')))
+    def test_liveaction_create_many(self):
+        mgr = models.LiveActionResourceManager(models.LiveAction, base.FAKE_ENDPOINT)
+        instances = [models.LiveAction(action='core.local'), models.LiveAction(action='invalid')]
+        results = mgr.create_many(instances)
+
+        httpclient.HTTPClient.post.assert_called_with(
+            '/executions/bulk', {'executions': [{'action': 'core.local'}, {'action': 'invalid'}]})
+        self.assertEqual(results[0].id, '123')
+        self.assertIsInstance(results[1], Exception)
+        self.assertEqual(str(results[1]), 'Action "invalid" cannot be found.')
+
+
+class TestStreamManager(unittest2.TestCase):
+
+    def _get_stream_response(self, data):
+        response = base.FakeResponse('', 200, 'OK')
+        response.iter_content = lambda chunk_size: (data[i:i + 1] for i in range(len(data)))
+        response.close = mock.MagicMock()
+        return response
+
+    def test_listen(self):
+        data = (b'\n'
+                b'event: st2.execution__update\n'
+                b'data: {"id": "123", "status": "running"}\n\n'
+                b'\n'
+                b'event: st2.execution__update\r\n'
+                b'data: {"id": "123", "status": "succeeded"}\r\n\r\n')
+        response = self._get_stream_response(data)
+
+        mgr = models.StreamManager(base.FAKE_ENDPOINT)
+
+        with mock.patch.object(httpclient.HTTPClient, 'get',
+                               mock.MagicMock(return_value=response)):
+            events = mgr.listen(events=['st2.execution__update'], execution_ids=['123'],
+                                include_result=False, timeout=10)
+
+            httpclient.HTTPClient.get.assert_called_with(
+                '/stream', params={'events': 'st2.execution__update', 'execution_ids': '123',
+                                   'include_result': 'false'},
+                headers={'Accept-Encoding': 'identity'}, stream=True, timeout=10)
+
+        self.assertEqual(list(events), [
+            ('st2.execution__update', {'id': '123', 'status': 'running'}),
+            ('st2.execution__update', {'id': '123', 'status': 'succeeded'})
+        ])
+        self.assertTrue(response.close.called)
+
+    def test_listen_close_before_iteration(self):
+        response = self._get_stream_response(b'')
+
+        mgr = models.StreamManager(base.FAKE_ENDPOINT)
+
+        with mock.patch.object(httpclient.HTTPClient, 'get',
+                               mock.MagicMock(return_value=response)):
+            events = mgr.listen(execution_ids=['123'])
+
+        events.close()
+        response.close.assert_called_once_with()
+
+    @mock.patch.object(
+        httpclient.HTTPClient, 'get',
+        mock.MagicMock(return_value=base.FakeResponse('', 500, 'INTERNAL SERVER ERROR')))
+    def test_listen_failed(self):
+        mgr = models.StreamManager(base.FAKE_ENDPOINT)
+        self.assertRaises(Exception, mgr.listen)
+
+
+def _get_resource_response(url):
+    for resource in base.RESOURCES:
+        if url.endswith('/%s' % (resource['id'])):
+            return base.FakeResponse(json.dumps(resource), 200, 'OK')
+
+    return base.FakeResponse('', 404, 'NOT FOUND')
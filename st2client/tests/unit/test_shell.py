@@ -14,11 +14,13 @@
 # limitations under the License.
 
 import os
+import sys
 import time
 import datetime
 import json
 import logging
 import tempfile
+import subprocess
 
 import mock
 import unittest2
@@ -41,6 +43,21 @@ username = foo
 password = bar
 """
 
+ST2CLIENT_DIR = os.path.abspath(os.path.join(BASE_DIR, '../../'))
+
+# Maximum time (in seconds) the CLI startup is allowed to take on top of the Python interpreter
+# startup
+STARTUP_TIME_BUDGET = 1.0
+
+# Prints names of the command modules which have been imported after instantiating the shell
+PRINT_IMPORTED_COMMAND_MODULES = """
+import sys
+from st2client.shell import Shell
+Shell(argv=sys.argv[1:])
+print(','.join(sorted(name for name, module in sys.modules.items()
+                      if name.startswith('st2client.commands.') and module)))
+"""
+
 
 class TestShell(base.BaseCLITestCase):
     capture_output = True
@@ -408,3 +425,68 @@ class CLITokenCachingTestCase(unittest2.TestCase):
         args = shell.parser.parse_args(args=argv)
         shell.get_client(args=args)
         self.assertEqual(shell._get_auth_token.call_count, 0)
+
+
+class ShellStartupTestCase(unittest2.TestCase):
+
+    def _run(self, args):
+        # Note: Subprocess is used so the modules imported by the other tests are not counted
+        process = subprocess.Popen([sys.executable] + args, cwd=ST2CLIENT_DIR,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, _ = process.communicate()
+        return process.returncode, stdout.decode('utf-8').strip()
+
+    def _get_run_duration(self, args, count=3):
+        durations = []
+
+        for index in range(0, count):
+            start = time.time()
+            self._run(args=args)
+            durations.append(time.time() - start)
+
+        return min(durations)
+
+    def test_only_used_command_is_registered(self):
+        shell = Shell(argv=['key', 'get', 'foo'])
+        self.assertEqual(list(shell.commands.keys()), ['key'])
+
+        args = shell.parser.parse_args(['key', 'get', 'foo'])
+        self.assertEqual(args.func, shell.commands['key'].commands['get'].run_and_print)
+
+        # Other commands are still listed in the help
+        self.assertTrue('rule-enforcement' in shell.parser.format_help())
+
+        shell = Shell(argv=['--print-config'])
+        self.assertEqual(list(shell.commands.keys()), ['action'])
+
+        # Values of the global options are not mistaken for the command name
+        argv = ['--api-version', 'run', '--debug', 'action', 'list']
+        shell = Shell(argv=argv)
+        self.assertEqual(list(shell.commands.keys()), ['action'])
+
+        args = shell.parser.parse_args(argv)
+        self.assertEqual(args.api_version, 'run')
+        self.assertEqual(args.func, shell.commands['action'].commands['list'].run_and_print)
+
+        shell = Shell(argv=['--version'])
+        self.assertEqual(shell.commands, {})
+
+    def test_only_used_command_module_is_imported(self):
+        _, stdout = self._run(args=['-c', PRINT_IMPORTED_COMMAND_MODULES, '--version'])
+        self.assertEqual(stdout, '')
+
+        _, stdout = self._run(args=['-c', PRINT_IMPORTED_COMMAND_MODULES, 'key', 'get', 'foo'])
+        self.assertEqual(stdout.split(','), ['st2client.commands.keyvalue',
+                                             'st2client.commands.noop',
+                                             'st2client.commands.resource'])
+
+    def test_startup_time_budget(self):
+        exit_code, _ = self._run(args=['-m', 'st2client.shell', '--version'])
+        self.assertEqual(exit_code, 0)
+
+        interpreter_duration = self._get_run_duration(args=['-c', 'pass'])
+        cli_duration = self._get_run_duration(args=['-m', 'st2client.shell', '--version'])
+
+        self.assertLess(cli_duration - interpreter_duration, STARTUP_TIME_BUDGET,
+                        'CLI startup took %.2fs (budget is %.2fs)' %
+                        (cli_duration - interpreter_duration, STARTUP_TIME_BUDGET))
@@ -66,48 +66,48 @@ class TestHttps(base.BaseCLITestCase):
         os.unlink(self.cacert_path)
 
     @mock.patch.object(
-        requests, 'post',
+        requests.Session, 'post',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps({}), 200, 'OK')))
     def test_decorate_https_without_cacert(self):
         self.shell.run(['auth', USERNAME, '-p', PASSWORD])
         kwargs = {'verify': False, 'headers': HEADERS, 'auth': (USERNAME, PASSWORD)}
-        requests.post.assert_called_with(AUTH_URL, json.dumps({}), **kwargs)
+        requests.Session.post.assert_called_with(AUTH_URL, json.dumps({}), **kwargs)
 
     @mock.patch.object(
-        requests, 'post',
+        requests.Session, 'post',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps({}), 200, 'OK')))
     def test_decorate_https_with_cacert_from_cli(self):
         self.shell.run(['--cacert', self.cacert_path, 'auth', USERNAME, '-p', PASSWORD])
         kwargs = {'verify': self.cacert_path, 'headers': HEADERS, 'auth': (USERNAME, PASSWORD)}
-        requests.post.assert_called_with(AUTH_URL, json.dumps({}), **kwargs)
+        requests.Session.post.assert_called_with(AUTH_URL, json.dumps({}), **kwargs)
 
     @mock.patch.object(
-        requests, 'post',
+        requests.Session, 'post',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps({}), 200, 'OK')))
     def test_decorate_https_with_cacert_from_env(self):
         os.environ['ST2_CACERT'] = self.cacert_path
         self.shell.run(['auth', USERNAME, '-p', PASSWORD])
         kwargs = {'verify': self.cacert_path, 'headers': HEADERS, 'auth': (USERNAME, PASSWORD)}
-        requests.post.assert_called_with(AUTH_URL, json.dumps({}), **kwargs)
+        requests.Session.post.assert_called_with(AUTH_URL, json.dumps({}), **kwargs)
 
     @mock.patch.object(
-        requests, 'get',
+        requests.Session, 'get',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps([]), 200, 'OK')))
     def test_decorate_http_without_cacert(self):
         self.shell.run(['rule', 'list'])
-        requests.get.assert_called_with(GET_RULES_URL)
+        requests.Session.get.assert_called_with(GET_RULES_URL)
 
     @mock.patch.object(
-        requests, 'get',
+        requests.Session, 'get',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps({}), 200, 'OK')))
     def test_decorate_http_with_cacert_from_cli(self):
         self.shell.run(['--cacert', self.cacert_path, 'rule', 'list'])
-        requests.get.assert_called_with(GET_RULES_URL)
+        requests.Session.get.assert_called_with(GET_RULES_URL)
 
     @mock.patch.object(
-        requests, 'get',
+        requests.Session, 'get',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps({}), 200, 'OK')))
     def test_decorate_http_with_cacert_from_env(self):
         os.environ['ST2_CACERT'] = self.cacert_path
         self.shell.run(['rule', 'list'])
-        requests.get.assert_called_with(GET_RULES_URL)
+        requests.Session.get.assert_called_with(GET_RULES_URL)
@@ -60,6 +60,7 @@ install -m755 bin/st2-apply-rbac-definitions %{buildroot}/usr/bin/st2-apply-rbac
 install -m755 bin/st2-run-pack-tests %{buildroot}/usr/bin/st2-run-pack-tests
 install -m755 bin/st2-purge-executions %{buildroot}/usr/bin/st2-purge-executions
 install -m755 bin/st2-purge-trigger-instances %{buildroot}/usr/bin/st2-purge-trigger-instances
+install -m755 bin/st2-migrate-liveactions %{buildroot}/usr/bin/st2-migrate-liveactions
 install -m755 tools/st2ctl %{buildroot}/usr/bin/st2ctl
 install -m755 tools/st2-setup-tests %{buildroot}/usr/lib/python2.7/site-packages/st2common/bin/st2-setup-tests
 install -m755 tools/st2-setup-examples %{buildroot}/usr/lib/python2.7/site-packages/st2common/bin/st2-setup-examples
@@ -80,5 +81,6 @@ install -m755 tools/migrate_triggers_to_include_ref_count.py %{buildroot}/usr/li
 /usr/bin/st2-run-pack-tests
 /usr/bin/st2-purge-executions
 /usr/bin/st2-purge-trigger-instances
+/usr/bin/st2-migrate-liveactions
 /usr/bin/st2ctl
 /etc/logrotate.d/st2.conf
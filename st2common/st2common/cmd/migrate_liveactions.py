@@ -0,0 +1,131 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A utility script which migrates liveactions stored in the liveaction collection into the
+corresponding action execution documents.
+
+It needs to be run (with all the services stopped) before "database.single_document_executions"
+option is enabled.
+"""
+
+from oslo_config import cfg
+
+from st2common import config
+from st2common import log as logging
+from st2common.script_setup import setup as common_setup
+from st2common.script_setup import teardown as common_teardown
+from st2common.constants.exit_codes import SUCCESS_EXIT_CODE
+from st2common.constants.exit_codes import FAILURE_EXIT_CODE
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.models.db.liveaction import liveaction_access
+from st2common.models.db.liveaction import liveaction_execution_access
+
+__all__ = [
+    'migrate_liveactions'
+]
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MIGRATE_BATCH_SIZE = 1000
+
+
+def _do_register_cli_opts(opts, ignore_errors=False):
+    for opt in opts:
+        try:
+            cfg.CONF.register_cli_opt(opt)
+        except:
+            if not ignore_errors:
+                raise
+
+
+def _register_cli_opts():
+    cli_opts = [
+        cfg.IntOpt('batch-size', default=DEFAULT_MIGRATE_BATCH_SIZE,
+                   help='Number of liveactions retrieved from the database at once.'),
+        cfg.BoolOpt('delete', default=False,
+                    help='Delete liveactions from the liveaction collection once they have been '
+                         'migrated.')
+    ]
+    _do_register_cli_opts(cli_opts)
+
+
+def migrate_liveactions(logger, batch_size=DEFAULT_MIGRATE_BATCH_SIZE, delete=False):
+    """
+    Copy all the liveactions into the corresponding execution documents.
+
+    Liveactions without a corresponding execution are skipped and left in place.
+
+    :param batch_size: Number of liveactions retrieved from the database at once.
+    :type batch_size: ``int``
+
+    :param delete: True to delete liveactions once they have been migrated.
+    :type delete: ``bool``
+
+    :return: Number of migrated and skipped liveactions.
+    :rtype: ``tuple``
+    """
+    if batch_size < 1:
+        raise ValueError('Batch size needs to be greater than 0')
+
+    migrated_count = 0
+    skipped_count = 0
+    last_id = None
+
+    while True:
+        queryset = LiveActionDB.objects(id__gt=last_id) if last_id else LiveActionDB.objects
+        liveaction_dbs = list(queryset.order_by('id').limit(batch_size))
+
+        if not liveaction_dbs:
+            break
+
+        for liveaction_db in liveaction_dbs:
+            try:
+                liveaction_execution_access.add_or_update(liveaction_db)
+            except ValueError:
+                logger.warning('Execution for liveaction %s not found, skipping.',
+                               liveaction_db.id)
+                skipped_count += 1
+                continue
+
+            if delete:
+                liveaction_access.delete(liveaction_db)
+
+            migrated_count += 1
+
+        last_id = liveaction_dbs[-1].id
+        logger.debug('Migrated %s liveactions so far.', migrated_count)
+
+        if len(liveaction_dbs) < batch_size:
+            break
+
+    logger.info('Migrated %s liveactions, skipped %s liveactions without an execution.',
+                migrated_count, skipped_count)
+    return migrated_count, skipped_count
+
+
+def main():
+    _register_cli_opts()
+    common_setup(config=config, setup_db=True, register_mq_exchanges=False)
+
+    try:
+        migrate_liveactions(logger=LOG, batch_size=cfg.CONF.batch_size, delete=cfg.CONF.delete)
+    except Exception as e:
+        LOG.exception(str(e))
+        return FAILURE_EXIT_CODE
+    finally:
+        common_teardown()
+
+    return SUCCESS_EXIT_CODE
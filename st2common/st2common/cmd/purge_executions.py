@@ -32,6 +32,8 @@ from st2common.script_setup import setup as common_setup
 from st2common.script_setup import teardown as common_teardown
 from st2common.constants.exit_codes import SUCCESS_EXIT_CODE
 from st2common.constants.exit_codes import FAILURE_EXIT_CODE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
 from st2common.garbage_collection.executions import purge_executions
 
 LOG = logging.getLogger(__name__)
@@ -58,6 +60,10 @@ def _register_cli_opts():
                     help='Purge all models irrespective of their ``status``.' +
                     'By default, only executions in completed states such as "succeeeded" ' +
                     ', "failed", "canceled" and "timed_out" are deleted.'),
+        cfg.IntOpt('batch-size', default=DEFAULT_PURGE_BATCH_SIZE,
+                   help='Maximum number of models deleted in a single delete query.'),
+        cfg.FloatOpt('sleep-delay', default=DEFAULT_PURGE_BATCH_SLEEP_DELAY,
+                     help='How long to sleep (in seconds) between two delete queries.')
     ]
     _do_register_cli_opts(cli_opts)
 
@@ -80,7 +86,9 @@ def main():
 
     try:
         purge_executions(logger=LOG, timestamp=timestamp, action_ref=action_ref,
-                         purge_incomplete=purge_incomplete)
+                         purge_incomplete=purge_incomplete,
+                         batch_size=cfg.CONF.batch_size,
+                         sleep_delay=cfg.CONF.sleep_delay)
     except Exception as e:
         LOG.exception(str(e))
         return FAILURE_EXIT_CODE
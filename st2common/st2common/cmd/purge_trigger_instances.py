@@ -32,6 +32,8 @@ from st2common.script_setup import setup as common_setup
 from st2common.script_setup import teardown as common_teardown
 from st2common.constants.exit_codes import SUCCESS_EXIT_CODE
 from st2common.constants.exit_codes import FAILURE_EXIT_CODE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
 from st2common.garbage_collection.trigger_instances import purge_trigger_instances
 
 LOG = logging.getLogger(__name__)
@@ -51,7 +53,11 @@ def _register_cli_opts():
         cfg.StrOpt('timestamp', default=None,
                    help='Will delete trigger instances older than ' +
                    'this UTC timestamp. ' +
-                   'Example value: 2015-03-13T19:01:27.255542Z')
+                   'Example value: 2015-03-13T19:01:27.255542Z'),
+        cfg.IntOpt('batch-size', default=DEFAULT_PURGE_BATCH_SIZE,
+                   help='Maximum number of models deleted in a single delete query.'),
+        cfg.FloatOpt('sleep-delay', default=DEFAULT_PURGE_BATCH_SLEEP_DELAY,
+                     help='How long to sleep (in seconds) between two delete queries.')
     ]
     _do_register_cli_opts(cli_opts)
 
@@ -72,7 +78,9 @@ def main():
 
     # Purge models.
     try:
-        purge_trigger_instances(logger=LOG, timestamp=timestamp)
+        purge_trigger_instances(logger=LOG, timestamp=timestamp,
+                                batch_size=cfg.CONF.batch_size,
+                                sleep_delay=cfg.CONF.sleep_delay)
     except Exception as e:
         LOG.exception(str(e))
         return FAILURE_EXIT_CODE
@@ -92,7 +92,18 @@ def register_opts(ignore_errors=False):
         cfg.IntOpt('connection_retry_backoff_max_s', help='Connection retry backoff max (seconds).',
                    default=10),
         cfg.IntOpt('connection_retry_backoff_mul', help='Backoff multiplier (seconds).',
-                   default=1)
+                   default=1),
+        cfg.BoolOpt('single_document_executions', default=False,
+                    help='Store liveactions inside the action execution documents instead of a '
+                         'separate collection so each execution state change results in a '
+                         'single database write and a single CUD event.'),
+        cfg.BoolOpt('query_stats', default=False,
+                    help='Record latency histograms of all the database operations per model and '
+                         'operation. Stats are written to the service log when the service '
+                         'receives SIGUSR2 signal.'),
+        cfg.IntOpt('slow_query_threshold', default=0,
+                   help='Database operations which take longer than this number of milliseconds '
+                        'are logged together with the query explain output. 0 to disable.')
     ]
     do_register_opts(db_opts, 'database', ignore_errors)
 
@@ -169,6 +180,13 @@ def register_opts(ignore_errors=False):
     action_sensor_opts = [
         cfg.BoolOpt('enable', default=True,
                     help='Whether to enable or disable the ability to post a trigger on action.'),
+        cfg.IntOpt('max_result_size', default=0,
+                   help='Maximum size (in bytes) of a serialized execution result which is '
+                        'included in action and notify trigger payloads. Larger results are '
+                        'replaced with a reference and a preview. 0 means no limit.'),
+        cfg.IntOpt('result_preview_size', default=1024,
+                   help='Size (in bytes) of the result preview included in trigger payloads '
+                        'for results which are larger than max_result_size.')
     ]
     do_register_opts(action_sensor_opts, group='action_sensor')
 
@@ -198,6 +216,22 @@ def register_opts(ignore_errors=False):
     ]
     do_register_opts(mistral_opts, group='mistral', ignore_errors=ignore_errors)
 
+    # Metrics options
+    metrics_opts = [
+        cfg.StrOpt('driver', default='noop',
+                   help='Driver used to collect metrics (noop, statsd, prometheus or a full path '
+                        'to a driver class).'),
+        cfg.StrOpt('prefix', default='st2', help='Prefix added to all the metric names.'),
+        cfg.StrOpt('host', default='127.0.0.1', help='Host of the statsd server.'),
+        cfg.IntOpt('port', default=8125, help='UDP port of the statsd server.'),
+        cfg.StrOpt('prometheus_textfile_dir', default=None,
+                   help='Directory to which each service periodically writes its metrics in the '
+                        'Prometheus text format (used with the prometheus driver).'),
+        cfg.IntOpt('prometheus_textfile_interval', default=15,
+                   help='How often (in seconds) the Prometheus text file is written.')
+    ]
+    do_register_opts(metrics_opts, group='metrics', ignore_errors=ignore_errors)
+
     # Common CLI options
     debug = cfg.BoolOpt('debug', default=False,
         help='Enable debug mode. By default this will set all log levels to DEBUG.')
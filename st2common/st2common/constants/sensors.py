@@ -21,3 +21,4 @@ DEFAULT_PARTITION_LOADER = 'default'
 KVSTORE_PARTITION_LOADER = 'kvstore'
 FILE_PARTITION_LOADER = 'file'
 HASH_PARTITION_LOADER = 'hash'
+CONSISTENT_HASH_PARTITION_LOADER = 'consistent_hash'
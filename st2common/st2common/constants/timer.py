@@ -13,9 +13,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-__all__ = ['TIMER_ENABLED_LOG_LINE', 'TIMER_DISABLED_LOG_LINE']
+__all__ = [
+    'TIMER_ENABLED_LOG_LINE',
+    'TIMER_DISABLED_LOG_LINE',
+
+    'MISFIRE_POLICY_SKIP',
+    'MISFIRE_POLICY_FIRE_ONCE',
+    'MISFIRE_POLICY_FIRE_ALL',
+    'MISFIRE_POLICIES'
+]
 
 
 # Integration tests look for these loglines to validate timer enable/disable
 TIMER_ENABLED_LOG_LINE = 'Timer is enabled.'
 TIMER_DISABLED_LOG_LINE = 'Timer is disabled.'
+
+# Policies which determine what happens with the fire times which were missed (e.g. because the
+# timer engine wasn't running)
+# Missed fire times are ignored
+MISFIRE_POLICY_SKIP = 'skip'
+# Timer is fired once for all the missed fire times
+MISFIRE_POLICY_FIRE_ONCE = 'fire_once'
+# Timer is fired for each missed fire time (up to the configured maximum)
+MISFIRE_POLICY_FIRE_ALL = 'fire_all'
+
+MISFIRE_POLICIES = [
+    MISFIRE_POLICY_SKIP,
+    MISFIRE_POLICY_FIRE_ONCE,
+    MISFIRE_POLICY_FIRE_ALL
+]
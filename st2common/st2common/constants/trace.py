@@ -13,8 +13,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-__all__ = ['TRACE_CONTEXT', 'TRACE_ID']
+__all__ = [
+    'TRACE_CONTEXT',
+    'TRACE_ID',
+    'TRACE_COMPONENT_TYPES',
+    'TRACE_COMPONENT_BUCKET_SIZE'
+]
 
 
 TRACE_CONTEXT = 'trace_context'
 TRACE_ID = 'trace_tag'
+
+# Attributes under which the components are stored on a trace
+TRACE_COMPONENT_TYPES = ['action_executions', 'rules', 'trigger_instances']
+
+# Maximum number of components stored in the trace document itself and in each of the trace
+# component bucket documents
+TRACE_COMPONENT_BUCKET_SIZE = 100
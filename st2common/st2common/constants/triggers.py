@@ -52,7 +52,10 @@ ACTION_SENSOR_TRIGGER = {
             'start_timestamp': {},
             'action_name': {},
             'parameters': {},
-            'result': {}
+            'result': {},
+            'result_ref': {},
+            'result_preview': {},
+            'result_truncated': {}
         }
     }
 }
@@ -18,3 +18,7 @@ from st2common.exceptions import StackStormBaseException
 
 class TriggerDoesNotExistException(StackStormBaseException):
     pass
+
+
+class TriggerDispatchBufferFullException(StackStormBaseException):
+    pass
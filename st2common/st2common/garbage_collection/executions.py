@@ -21,8 +21,12 @@ corresponding live action objects.
 import copy
 
 from mongoengine.errors import InvalidQueryError
+from oslo_config import cfg
 
 from st2common.constants import action as action_constants
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
+from st2common.garbage_collection.utils import purge_in_batches
 from st2common.persistence.liveaction import LiveAction
 from st2common.persistence.execution import ActionExecution
 
@@ -36,7 +40,9 @@ DONE_STATES = [action_constants.LIVEACTION_STATUS_SUCCEEDED,
                action_constants.LIVEACTION_STATUS_CANCELED]
 
 
-def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False):
+def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False,
+                     batch_size=DEFAULT_PURGE_BATCH_SIZE,
+                     sleep_delay=DEFAULT_PURGE_BATCH_SLEEP_DELAY):
     """
     :param timestamp: Exections older than this timestamp will be deleted.
     :type timestamp: ``datetime.datetime
@@ -46,6 +52,15 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
 
     :param purge_incomplete: True to also delete executions which are not in a done state.
     :type purge_incomplete: ``bool``
+
+    :param batch_size: Maximum number of objects deleted in a single query.
+    :type batch_size: ``int``
+
+    :param sleep_delay: How long to sleep (in seconds) between two delete queries.
+    :type sleep_delay: ``float``
+
+    :return: Number of deleted execution and liveaction objects.
+    :rtype: ``tuple``
     """
     if not timestamp:
         raise ValueError('Specify a valid timestamp to purge.')
@@ -70,12 +85,13 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
     if action_ref:
         liveaction_filters['action'] = action_ref
 
-    # TODO: Update this code to return statistics on deleted objects once we
-    # upgrade to newer version of MongoDB where delete_by_query actually returns
-    # some data
+    deleted_executions = 0
+    deleted_liveactions = 0
 
     try:
-        ActionExecution.delete_by_query(**exec_filters)
+        deleted_executions = purge_in_batches(logger=logger, model_persistence=ActionExecution,
+                                              query_filters=exec_filters, batch_size=batch_size,
+                                              sleep_delay=sleep_delay)
     except InvalidQueryError as e:
         msg = ('Bad query (%s) used to delete execution instances: %s'
                'Please contact support.' % (exec_filters, str(e)))
@@ -84,8 +100,16 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
         logger.exception('Deletion of execution models failed for query with filters: %s.',
                          exec_filters)
 
+    # In the single document mode, liveactions are stored in the execution documents and have
+    # already been deleted together with the executions
+    single_document = cfg.CONF.database.single_document_executions
+
     try:
-        LiveAction.delete_by_query(**liveaction_filters)
+        if not single_document:
+            deleted_liveactions = purge_in_batches(logger=logger, model_persistence=LiveAction,
+                                                   query_filters=liveaction_filters,
+                                                   batch_size=batch_size,
+                                                   sleep_delay=sleep_delay)
     except InvalidQueryError as e:
         msg = ('Bad query (%s) used to delete liveaction instances: %s'
                'Please contact support.' % (liveaction_filters, str(e)))
@@ -94,12 +118,16 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
         logger.exception('Deletion of liveaction models failed for query with filters: %s.',
                          liveaction_filters)
 
-    zombie_execution_instances = len(ActionExecution.query(**exec_filters))
-    zombie_liveaction_instances = len(LiveAction.query(**liveaction_filters))
+    zombie_execution_instances = ActionExecution.count(**exec_filters)
+    zombie_liveaction_instances = 0 if single_document else LiveAction.count(**liveaction_filters)
 
     if (zombie_execution_instances > 0) or (zombie_liveaction_instances > 0):
         logger.error('Zombie execution instances left: %d.', zombie_execution_instances)
         logger.error('Zombie liveaction instances left: %s.', zombie_liveaction_instances)
 
     # Print stats
+    logger.info('Deleted %s execution and %s liveaction models.', deleted_executions,
+                deleted_liveactions)
     logger.info('All execution models older than timestamp %s were deleted.', timestamp)
+
+    return deleted_executions, deleted_liveactions
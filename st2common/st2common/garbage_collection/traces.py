@@ -0,0 +1,76 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module with utility functions for purging old trace objects.
+"""
+
+from mongoengine.errors import InvalidQueryError
+
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
+from st2common.garbage_collection.utils import purge_in_batches
+from st2common.persistence.trace import Trace
+from st2common.persistence.trace import TraceComponentBucket
+
+__all__ = [
+    'purge_traces'
+]
+
+
+def purge_traces(logger, timestamp, batch_size=DEFAULT_PURGE_BATCH_SIZE,
+                 sleep_delay=DEFAULT_PURGE_BATCH_SLEEP_DELAY):
+    """
+    :param timestamp: Traces older than this timestamp will be deleted.
+    :type timestamp: ``datetime.datetime
+
+    :param batch_size: Maximum number of objects deleted in a single query.
+    :type batch_size: ``int``
+
+    :param sleep_delay: How long to sleep (in seconds) between two delete queries.
+    :type sleep_delay: ``float``
+
+    :return: Number of deleted traces.
+    :rtype: ``int``
+    """
+    if not timestamp:
+        raise ValueError('Specify a valid timestamp to purge.')
+
+    logger.info('Purging traces older than timestamp: %s' %
+                timestamp.strftime('%Y-%m-%dT%H:%M:%S.%fZ'))
+
+    query_filters = {'start_timestamp__lt': timestamp}
+
+    deleted_count = 0
+
+    try:
+        deleted_count = purge_in_batches(logger=logger, model_persistence=Trace,
+                                         query_filters=query_filters, batch_size=batch_size,
+                                         sleep_delay=sleep_delay)
+        # Component buckets inherit start_timestamp from the trace they belong to
+        purge_in_batches(logger=logger, model_persistence=TraceComponentBucket,
+                         query_filters=query_filters, batch_size=batch_size,
+                         sleep_delay=sleep_delay)
+    except InvalidQueryError as e:
+        msg = ('Bad query (%s) used to delete traces: %s'
+               'Please contact support.' % (query_filters, str(e)))
+        raise InvalidQueryError(msg)
+    except:
+        logger.exception('Deleting traces using query_filters %s failed.', query_filters)
+
+    # Print stats
+    logger.info('All trace models older than timestamp %s were deleted.', timestamp)
+
+    return deleted_count
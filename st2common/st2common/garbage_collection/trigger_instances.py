@@ -19,6 +19,9 @@ Module with utility functions for purging old trigger instance objects.
 
 from mongoengine.errors import InvalidQueryError
 
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
+from st2common.garbage_collection.utils import purge_in_batches
 from st2common.persistence.trigger import TriggerInstance
 from st2common.util import isotime
 
@@ -27,10 +30,20 @@ __all__ = [
 ]
 
 
-def purge_trigger_instances(logger, timestamp):
+def purge_trigger_instances(logger, timestamp, batch_size=DEFAULT_PURGE_BATCH_SIZE,
+                            sleep_delay=DEFAULT_PURGE_BATCH_SLEEP_DELAY):
     """
     :param timestamp: Trigger instances older than this timestamp will be deleted.
     :type timestamp: ``datetime.datetime
+
+    :param batch_size: Maximum number of objects deleted in a single query.
+    :type batch_size: ``int``
+
+    :param sleep_delay: How long to sleep (in seconds) between two delete queries.
+    :type sleep_delay: ``float``
+
+    :return: Number of deleted trigger instances.
+    :rtype: ``int``
     """
     if not timestamp:
         raise ValueError('Specify a valid timestamp to purge.')
@@ -40,12 +53,12 @@ def purge_trigger_instances(logger, timestamp):
 
     query_filters = {'occurrence_time__lt': isotime.parse(timestamp)}
 
-    # TODO: Update this code to return statistics on deleted objects once we
-    # upgrade to newer version of MongoDB where delete_by_query actually returns
-    # some data
+    deleted_count = 0
 
     try:
-        TriggerInstance.delete_by_query(**query_filters)
+        deleted_count = purge_in_batches(logger=logger, model_persistence=TriggerInstance,
+                                         query_filters=query_filters, batch_size=batch_size,
+                                         sleep_delay=sleep_delay)
     except InvalidQueryError as e:
         msg = ('Bad query (%s) used to delete trigger instances: %s'
                'Please contact support.' % (query_filters, str(e)))
@@ -55,3 +68,5 @@ def purge_trigger_instances(logger, timestamp):
 
     # Print stats
     logger.info('All trigger instance models older than timestamp %s were deleted.', timestamp)
+
+    return deleted_count
@@ -0,0 +1,143 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module with utility functions which are shared by the garbage collection modules.
+"""
+
+import time
+
+import eventlet
+
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
+
+__all__ = [
+    'purge_in_batches',
+    'ensure_ttl_index',
+    'drop_ttl_index'
+]
+
+
+def purge_in_batches(logger, model_persistence, query_filters, batch_size=DEFAULT_PURGE_BATCH_SIZE,
+                     sleep_delay=DEFAULT_PURGE_BATCH_SLEEP_DELAY):
+    """
+    Delete all the objects which match the provided filters in batches of batch_size objects
+    ordered by _id (insertion order).
+
+    Deleting in small batches and sleeping between them prevents a single long running delete
+    from locking up the database when there is a large backlog of objects to delete.
+
+    :param model_persistence: Persistence class (e.g. ActionExecution).
+
+    :param batch_size: Maximum number of objects deleted in a single query.
+    :type batch_size: ``int``
+
+    :param sleep_delay: How long to sleep (in seconds) between two batches.
+    :type sleep_delay: ``float``
+
+    :return: Number of deleted objects.
+    :rtype: ``int``
+    """
+    if batch_size < 1:
+        raise ValueError('Batch size needs to be greater than 0')
+
+    model = model_persistence._get_impl().model
+    collection = model._get_collection()
+    name = model.__name__
+
+    deleted_count = 0
+    batch_count = 0
+    start_time = time.time()
+
+    while True:
+        queryset = model.objects(**query_filters).order_by('id').only('id').limit(batch_size)
+        ids = list(queryset.scalar('id'))
+
+        if not ids:
+            break
+
+        result = collection.remove({'_id': {'$in': ids}})
+        deleted = result.get('n', len(ids)) if isinstance(result, dict) else len(ids)
+
+        deleted_count += deleted
+        batch_count += 1
+        logger.debug('Deleted batch %s of %s %s objects (%s deleted so far)', batch_count,
+                     deleted, name, deleted_count)
+
+        if len(ids) < batch_size:
+            break
+
+        if sleep_delay:
+            eventlet.sleep(sleep_delay)
+
+    duration = (time.time() - start_time)
+    logger.info('Deleted %s %s objects in %s batches (%.2f seconds).', deleted_count, name,
+                batch_count, duration)
+    return deleted_count
+
+
+def ensure_ttl_index(logger, model_persistence, field, ttl):
+    """
+    Create or update a MongoDB TTL index which makes the server delete objects older than ttl
+    seconds.
+
+    Note: TTL indexes only work on fields which are stored as dates (e.g. DateTimeField).
+    Descending index is used so it doesn't clash with an existing regular ascending index on the
+    same field.
+
+    :param field: Name of the date field.
+    :type field: ``str``
+
+    :param ttl: TTL in seconds.
+    :type ttl: ``int``
+    """
+    collection = model_persistence._get_impl().model._get_collection()
+    index_name = _get_ttl_index_name(field=field)
+    indexes = collection.index_information()
+
+    if index_name in indexes:
+        if indexes[index_name].get('expireAfterSeconds', None) == ttl:
+            return False
+
+        logger.info('Updating TTL index %s on collection %s (ttl=%ss)', index_name,
+                    collection.name, ttl)
+        collection.database.command('collMod', collection.name,
+                                    index={'keyPattern': {field: -1}, 'expireAfterSeconds': ttl})
+        return True
+
+    logger.info('Creating TTL index %s on collection %s (ttl=%ss)', index_name, collection.name,
+                ttl)
+    collection.create_index([(field, -1)], name=index_name, expireAfterSeconds=ttl)
+    return True
+
+
+def drop_ttl_index(logger, model_persistence, field):
+    """
+    Drop TTL index which has been created using ensure_ttl_index (if it exists).
+    """
+    collection = model_persistence._get_impl().model._get_collection()
+    index_name = _get_ttl_index_name(field=field)
+
+    if index_name not in collection.index_information():
+        return False
+
+    logger.info('Dropping TTL index %s on collection %s', index_name, collection.name)
+    collection.drop_index(index_name)
+    return True
+
+
+def _get_ttl_index_name(field):
+    return '%s_ttl' % (field)
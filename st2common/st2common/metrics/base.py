@@ -0,0 +1,194 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module containing pluggable metrics (counters, gauges and timers) instrumentation.
+
+Metrics are sent to the driver which is configured using "metrics.driver" config option. By
+default, no-op driver is used and the instrumentation has negligible overhead.
+"""
+
+import functools
+import importlib
+import time
+
+from oslo_config import cfg
+
+from st2common import log as logging
+
+__all__ = [
+    'BaseMetricsDriver',
+    'Timer',
+
+    'init',
+    'shutdown',
+    'get_driver',
+    'is_enabled',
+    'inc_counter',
+    'dec_counter',
+    'set_gauge',
+    'timing'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Maps names of the available drivers to the driver classes
+DRIVERS = {
+    'noop': 'st2common.metrics.drivers.noop_driver.NoopMetricsDriver',
+    'statsd': 'st2common.metrics.drivers.statsd_driver.StatsdMetricsDriver',
+    'prometheus': 'st2common.metrics.drivers.prometheus_driver.PrometheusMetricsDriver'
+}
+
+METRICS_DRIVER = None
+
+
+class BaseMetricsDriver(object):
+    """
+    Base class for the metrics drivers.
+
+    Note: Metric keys are dot delimited (e.g. rules_engine.match_time) and don't include the
+    prefix. Drivers are responsible for adding the prefix and the service name.
+    """
+
+    def __init__(self, service, prefix=None):
+        self.service = service
+        self.prefix = prefix
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def inc_counter(self, key, amount=1):
+        raise NotImplementedError()
+
+    def dec_counter(self, key, amount=1):
+        raise NotImplementedError()
+
+    def set_gauge(self, key, value):
+        raise NotImplementedError()
+
+    def timing(self, key, duration):
+        """
+        :param duration: Duration in seconds.
+        :type duration: ``float``
+        """
+        raise NotImplementedError()
+
+    def get_metric_name(self, key, delimiter='.'):
+        parts = [self.prefix, self.service] + key.split('.')
+        return delimiter.join([part for part in parts if part])
+
+
+class Timer(object):
+    """
+    Context manager and decorator which records duration of the wrapped code block as a timer.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._start_time = None
+
+    def __enter__(self):
+        if METRICS_DRIVER:
+            self._start_time = time.time()
+        return self
+
+    def __exit__(self, *args):
+        if METRICS_DRIVER and self._start_time is not None:
+            timing(self.key, time.time() - self._start_time)
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Timer(self.key):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def init(service, driver=None):
+    """
+    Initialize the metrics driver for the provided service.
+
+    :param service: Name of the service (e.g. api, rulesengine).
+    :type service: ``str``
+
+    :param driver: Name of the driver or a full path to the driver class. Defaults to the value
+                   of the "metrics.driver" config option.
+    :type driver: ``str``
+    """
+    global METRICS_DRIVER
+
+    driver = driver or cfg.CONF.metrics.driver
+
+    shutdown()
+
+    if not driver or driver == 'noop':
+        return None
+
+    driver_cls = _get_driver_class(name=driver)
+    METRICS_DRIVER = driver_cls(service=service, prefix=cfg.CONF.metrics.prefix)
+    METRICS_DRIVER.start()
+
+    LOG.debug('Using metrics driver "%s" for service "%s"', driver, service)
+    return METRICS_DRIVER
+
+
+def shutdown():
+    global METRICS_DRIVER
+
+    if METRICS_DRIVER:
+        METRICS_DRIVER.stop()
+        METRICS_DRIVER = None
+
+
+def get_driver():
+    return METRICS_DRIVER
+
+
+def is_enabled():
+    return METRICS_DRIVER is not None
+
+
+def inc_counter(key, amount=1):
+    if METRICS_DRIVER:
+        METRICS_DRIVER.inc_counter(key, amount)
+
+
+def dec_counter(key, amount=1):
+    if METRICS_DRIVER:
+        METRICS_DRIVER.dec_counter(key, amount)
+
+
+def set_gauge(key, value):
+    if METRICS_DRIVER:
+        METRICS_DRIVER.set_gauge(key, value)
+
+
+def timing(key, duration):
+    if METRICS_DRIVER:
+        METRICS_DRIVER.timing(key, duration)
+
+
+def _get_driver_class(name):
+    class_path = DRIVERS.get(name, name)
+    module_name, _, class_name = class_path.rpartition('.')
+
+    try:
+        module = importlib.import_module(module_name)
+        return getattr(module, class_name)
+    except (ImportError, AttributeError, ValueError):
+        raise ValueError('Invalid metrics driver specified: %s' % (name))
@@ -0,0 +1,38 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from st2common.metrics.base import BaseMetricsDriver
+
+__all__ = [
+    'NoopMetricsDriver'
+]
+
+
+class NoopMetricsDriver(BaseMetricsDriver):
+    """
+    Driver which discards all the metrics.
+    """
+
+    def inc_counter(self, key, amount=1):
+        pass
+
+    def dec_counter(self, key, amount=1):
+        pass
+
+    def set_gauge(self, key, value):
+        pass
+
+    def timing(self, key, duration):
+        pass
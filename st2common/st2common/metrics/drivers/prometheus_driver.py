@@ -0,0 +1,164 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import re
+import bisect
+import tempfile
+
+import eventlet
+import six
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.metrics.base import BaseMetricsDriver
+
+__all__ = [
+    'PrometheusMetricsDriver'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Upper bounds (in seconds) of the timer histogram buckets
+TIMER_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+INVALID_NAME_CHARACTERS_REGEX = re.compile(r'[^a-zA-Z0-9_:]')
+
+# Mode of the written file. The collector usually runs as a different user.
+TEXTFILE_MODE = 0o644
+
+
+class PrometheusMetricsDriver(BaseMetricsDriver):
+    """
+    Driver which keeps metrics in memory and periodically writes them to a file using the
+    Prometheus text exposition format.
+
+    The file is meant to be collected by the node_exporter textfile collector. Each service
+    writes to its own file (<prefix>_<service>.prom) in the "metrics.prometheus_textfile_dir"
+    directory.
+
+    Note: Prometheus counters can't decrease so counters which are decremented are exported as
+    gauges.
+    """
+
+    def __init__(self, service, prefix=None):
+        super(PrometheusMetricsDriver, self).__init__(service=service, prefix=prefix)
+        self._counters = {}
+        self._gauges = {}
+        # Maps metric name to a (bucket counts, sum, count) list
+        self._timers = {}
+        self._writer_thread = None
+
+    def start(self):
+        if cfg.CONF.metrics.prometheus_textfile_dir:
+            self._writer_thread = eventlet.spawn(self._write_periodically)
+
+    def stop(self):
+        if self._writer_thread:
+            self._writer_thread.kill()
+            self._writer_thread = None
+            self.write_textfile()
+
+    def inc_counter(self, key, amount=1):
+        name = self._get_name(key)
+
+        if name in self._gauges:
+            # Counter has been decremented before and is exported as a gauge
+            self._gauges[name] += amount
+        else:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def dec_counter(self, key, amount=1):
+        name = self._get_name(key)
+        value = self._counters.pop(name, 0)
+        self._gauges[name] = self._gauges.get(name, value) - amount
+
+    def set_gauge(self, key, value):
+        self._gauges[self._get_name(key)] = value
+
+    def timing(self, key, duration):
+        name = self._get_name(key) + '_seconds'
+        timer = self._timers.get(name, None)
+
+        if not timer:
+            timer = [[0] * (len(TIMER_BUCKETS) + 1), 0.0, 0]
+            self._timers[name] = timer
+
+        timer[0][bisect.bisect_left(TIMER_BUCKETS, duration)] += 1
+        timer[1] += duration
+        timer[2] += 1
+
+    def format_metrics(self):
+        """
+        Return all the metrics in the Prometheus text exposition format.
+
+        :rtype: ``str``
+        """
+        lines = []
+
+        for name, value in sorted(six.iteritems(self._counters)):
+            lines.append('# TYPE %s counter' % (name))
+            lines.append('%s %s' % (name, value))
+
+        for name, value in sorted(six.iteritems(self._gauges)):
+            lines.append('# TYPE %s gauge' % (name))
+            lines.append('%s %s' % (name, value))
+
+        for name, (buckets, total, count) in sorted(six.iteritems(self._timers)):
+            lines.append('# TYPE %s histogram' % (name))
+
+            # Prometheus histogram buckets are cumulative
+            cumulative = 0
+            for bound, bucket_count in zip(TIMER_BUCKETS + ['+Inf'], buckets):
+                cumulative += bucket_count
+                lines.append('%s_bucket{le="%s"} %s' % (name, bound, cumulative))
+
+            lines.append('%s_sum %s' % (name, total))
+            lines.append('%s_count %s' % (name, count))
+
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self):
+        directory = cfg.CONF.metrics.prometheus_textfile_dir
+        file_path = os.path.join(directory, self._get_name('') + '.prom')
+
+        # Write to a temporary file first and rename it so the collector never reads a
+        # partially written file
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                fp.write(self.format_metrics())
+
+            # mkstemp creates the file which is only readable by the owner
+            os.chmod(temp_path, TEXTFILE_MODE)
+            os.rename(temp_path, file_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def _write_periodically(self):
+        while True:
+            eventlet.sleep(cfg.CONF.metrics.prometheus_textfile_interval)
+
+            try:
+                self.write_textfile()
+            except Exception:
+                LOG.exception('Failed to write Prometheus metrics text file.')
+
+    def _get_name(self, key):
+        name = self.get_metric_name(key, delimiter='_')
+        return INVALID_NAME_CHARACTERS_REGEX.sub('_', name)
@@ -0,0 +1,74 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.metrics.base import BaseMetricsDriver
+
+__all__ = [
+    'StatsdMetricsDriver'
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class StatsdMetricsDriver(BaseMetricsDriver):
+    """
+    Driver which sends metrics to a statsd server over UDP.
+
+    Sending is fire and forget so a statsd server which is not available doesn't affect the
+    instrumented service.
+    """
+
+    def __init__(self, service, prefix=None):
+        super(StatsdMetricsDriver, self).__init__(service=service, prefix=prefix)
+        self._address = (cfg.CONF.metrics.host, cfg.CONF.metrics.port)
+        self._socket = None
+
+    def start(self):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def stop(self):
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+
+    def inc_counter(self, key, amount=1):
+        self._send(key=key, value=amount, metric_type='c')
+
+    def dec_counter(self, key, amount=1):
+        self._send(key=key, value=-amount, metric_type='c')
+
+    def set_gauge(self, key, value):
+        self._send(key=key, value=value, metric_type='g')
+
+    def timing(self, key, duration):
+        # statsd timers are in milliseconds
+        self._send(key=key, value=int(round(duration * 1000)), metric_type='ms')
+
+    def _send(self, key, value, metric_type):
+        if not self._socket:
+            return
+
+        data = '%s:%s|%s' % (self.get_metric_name(key), value, metric_type)
+
+        try:
+            self._socket.sendto(data.encode('utf-8'), self._address)
+        except (socket.error, socket.gaierror):
+            LOG.debug('Failed to send metric to statsd server %s:%s', self._address[0],
+                      self._address[1], exc_info=True)
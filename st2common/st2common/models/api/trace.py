@@ -95,6 +95,10 @@ class TraceAPI(BaseAPI):
                 'type': 'string',
                 'pattern': isotime.ISO8601_UTC_REGEX
             },
+            'component_count': {
+                'description': 'Number of components associated with a Trace.',
+                'type': 'integer'
+            },
         },
         'additionalProperties': False
     }
@@ -22,6 +22,8 @@ import mongoengine
 from st2common import log as logging
 from st2common.util import isotime
 from st2common.models.db import stormbase
+from st2common.models.utils.profiling import instrument_operation
+from st2common.models.utils.profiling import instrument_queryset
 from st2common.models.utils.profiling import log_query_and_profile_data_for_queryset
 
 
@@ -39,6 +41,7 @@ MODEL_MODULE_NAMES = [
     'st2common.models.db.rule',
     'st2common.models.db.runner',
     'st2common.models.db.sensor',
+    'st2common.models.db.timer',
     'st2common.models.db.trigger',
 ]
 
@@ -111,6 +114,7 @@ class MongoDBAccess(object):
     def get_by_ref(self, value):
         return self.get(ref=value, raise_exception=True)
 
+    @instrument_operation('get')
     def get(self, exclude_fields=None, *args, **kwargs):
         raise_exception = kwargs.pop('raise_exception', False)
 
@@ -129,6 +133,7 @@ class MongoDBAccess(object):
     def get_all(self, *args, **kwargs):
         return self.query(*args, **kwargs)
 
+    @instrument_operation('count')
     def count(self, *args, **kwargs):
         result = self.model.objects(**kwargs).count()
         log_query_and_profile_data_for_queryset(queryset=result)
@@ -153,33 +158,46 @@ class MongoDBAccess(object):
 
         result = result.order_by(*order_by)
         result = result[offset:eop]
+        result = instrument_queryset(queryset=result)
         log_query_and_profile_data_for_queryset(queryset=result)
 
         return result
 
+    @instrument_operation('distinct')
     def distinct(self, *args, **kwargs):
         field = kwargs.pop('field')
         result = self.model.objects(**kwargs).distinct(field)
         log_query_and_profile_data_for_queryset(queryset=result)
         return result
 
+    @instrument_operation('aggregate', explain=False)
     def aggregate(self, *args, **kwargs):
         return self.model.objects(**kwargs)._collection.aggregate(*args, **kwargs)
 
+    @instrument_operation('insert', explain=False)
     def insert(self, instance):
         instance = self.model.objects.insert(instance)
         return self._undo_dict_field_escape(instance)
 
+    @instrument_operation('insert_many', explain=False)
+    def insert_many(self, instances):
+        instances = self.model.objects.insert(instances)
+        return [self._undo_dict_field_escape(instance) for instance in instances]
+
+    @instrument_operation('add_or_update', explain=False)
     def add_or_update(self, instance):
         instance.save()
         return self._undo_dict_field_escape(instance)
 
+    @instrument_operation('update', explain=False)
     def update(self, instance, **kwargs):
         return instance.update(**kwargs)
 
+    @instrument_operation('delete', explain=False)
     def delete(self, instance):
         return instance.delete()
 
+    @instrument_operation('delete_by_query')
     def delete_by_query(self, **query):
         qs = self.model.objects.filter(**query)
         qs.delete()
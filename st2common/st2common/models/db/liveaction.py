@@ -15,12 +15,17 @@
 
 import copy
 
+import bson
 import mongoengine as me
+import six
 
 from st2common import log as logging
 from st2common.models.db import MongoDBAccess
 from st2common.models.db import stormbase
+from st2common.models.db.execution import ActionExecutionDB
 from st2common.models.db.notification import NotificationSchema
+from st2common.models.utils.profiling import instrument_operation
+from st2common.models.utils.profiling import instrument_queryset
 from st2common.fields import ComplexDateTimeField
 from st2common.util import date as date_utils
 from st2common.util.secrets import get_secret_parameters
@@ -28,6 +33,7 @@ from st2common.util.secrets import mask_secret_parameters
 
 __all__ = [
     'LiveActionDB',
+    'ExecutionLiveActionAccess'
 ]
 
 LOG = logging.getLogger(__name__)
@@ -116,7 +122,296 @@ class LiveActionDB(stormbase.StormFoundationDB):
         return serializable_dict['parameters']
 
 
+class ExecutionLiveActionAccess(MongoDBAccess):
+    """
+    Access class which stores liveactions inside the corresponding action execution documents.
+
+    It's used in the single document execution storage mode. In this mode, execution document is
+    the single source of truth and liveaction is a projection of it so each liveaction write
+    results in a single database write.
+
+    Note: Execution document is created by the execution service so saving a new liveaction only
+    assigns it an id.
+    """
+
+    # Liveaction fields which are stored under a different name in the execution document. All
+    # the other fields are stored under the same name.
+    FIELD_MAP = {
+        'id': 'liveaction__id',
+        'action': 'action__ref',
+        'callback': 'liveaction__callback',
+        'runner_info': 'liveaction__runner_info',
+        'notify': 'liveaction__notify',
+        # Execution "parameters" attribute can hold different (user provided) values
+        'parameters': 'liveaction__parameters'
+    }
+
+    def __init__(self):
+        super(ExecutionLiveActionAccess, self).__init__(ActionExecutionDB)
+
+    @instrument_operation('get', explain=False)
+    def get(self, exclude_fields=None, *args, **kwargs):
+        raise_exception = kwargs.pop('raise_exception', False)
+
+        instances = self.model.objects(**self._get_execution_filters(kwargs))
+
+        if exclude_fields:
+            instances = instances.exclude(*self._get_execution_fields(exclude_fields))
+
+        instance = instances[0] if instances else None
+
+        if not instance and raise_exception:
+            msg = 'Unable to find the %s instance. %s' % (LiveActionDB.__name__, kwargs)
+            raise ValueError(msg)
+
+        return self._get_liveaction(instance) if instance else None
+
+    @instrument_operation('count', explain=False)
+    def count(self, *args, **kwargs):
+        return self.model.objects(**self._get_execution_filters(kwargs)).count()
+
+    def query(self, offset=0, limit=None, order_by=None, exclude_fields=None, **filters):
+        order_by = order_by or []
+        exclude_fields = exclude_fields or []
+        eop = offset + int(limit) if limit else None
+
+        filters, order_by = self._process_datetime_range_filters(filters=filters, order_by=order_by)
+        filters = self._process_null_filters(filters=filters)
+
+        result = self.model.objects(**self._get_execution_filters(filters))
+
+        if exclude_fields:
+            result = result.exclude(*self._get_execution_fields(exclude_fields))
+
+        result = result.order_by(*self._get_execution_fields(order_by))
+        result = result[offset:eop]
+        result = instrument_queryset(queryset=result)
+
+        return [self._get_liveaction(instance) for instance in result]
+
+    @instrument_operation('distinct', explain=False)
+    def distinct(self, *args, **kwargs):
+        field = self._get_execution_fields([kwargs.pop('field')])[0]
+        return self.model.objects(**self._get_execution_filters(kwargs)).distinct(field)
+
+    @instrument_operation('aggregate', explain=False)
+    def aggregate(self, pipeline, **kwargs):
+        """
+        Run aggregation pipeline on the execution collection.
+
+        Liveaction field names which are referenced in the pipeline are translated to the
+        execution document fields up to (and including) the first stage which reshapes the
+        documents ($group, $project). Stages which follow only reference the computed fields.
+        """
+        pipeline = self._get_execution_pipeline(pipeline)
+        return self.model._get_collection().aggregate(pipeline, **kwargs)
+
+    def insert(self, instance):
+        instance.id = bson.ObjectId()
+        return instance
+
+    def insert_many(self, instances):
+        return [self.insert(instance) for instance in instances]
+
+    @instrument_operation('add_or_update', explain=False)
+    def add_or_update(self, instance):
+        if not instance.id:
+            return self.insert(instance)
+
+        execution = self.model.objects(liveaction__id=str(instance.id)).first()
+
+        if not execution:
+            raise ValueError('Unable to find the %s instance for liveaction %s.' %
+                             (self.model.__name__, instance.id))
+
+        execution.status = instance.status
+        execution.start_timestamp = instance.start_timestamp
+        execution.end_timestamp = instance.end_timestamp
+        execution.result = instance.result
+        execution.context = instance.context
+        execution.liveaction.update(self.get_liveaction_fields(instance))
+        execution.save()
+
+        return instance
+
+    @instrument_operation('update', explain=False)
+    def update(self, instance, **kwargs):
+        kwargs = self._get_execution_update_kwargs(kwargs)
+        return self.model.objects(liveaction__id=str(instance.id)).update(**kwargs)
+
+    @instrument_operation('delete', explain=False)
+    def delete(self, instance):
+        return self.model.objects(liveaction__id=str(instance.id)).delete()
+
+    @instrument_operation('delete_by_query', explain=False)
+    def delete_by_query(self, **query):
+        self.model.objects.filter(**self._get_execution_filters(query)).delete()
+        return None
+
+    @staticmethod
+    def get_liveaction_fields(instance):
+        """
+        Return liveaction attributes which are stored in the "liveaction" attribute of the
+        execution document.
+
+        :rtype: ``dict``
+        """
+        fields = {
+            'id': str(instance.id),
+            'action': instance.action,
+            'callback': instance.callback,
+            'runner_info': instance.runner_info,
+            'parameters': instance.parameters
+        }
+
+        if getattr(instance, 'notify', None):
+            fields['notify'] = instance.notify.to_mongo()
+
+        return fields
+
+    def _get_liveaction(self, execution):
+        liveaction = execution.liveaction
+        notify = liveaction.get('notify', None)
+
+        return LiveActionDB(id=bson.ObjectId(liveaction['id']),
+                            status=execution.status,
+                            start_timestamp=execution.start_timestamp,
+                            end_timestamp=execution.end_timestamp,
+                            action=liveaction['action'],
+                            parameters=liveaction.get('parameters', {}),
+                            result=execution.result,
+                            context=execution.context,
+                            callback=liveaction.get('callback', {}),
+                            runner_info=liveaction.get('runner_info', {}),
+                            notify=NotificationSchema._from_son(notify) if notify else None)
+
+    def _get_execution_filters(self, filters):
+        result = {}
+
+        for key, value in six.iteritems(filters):
+            field = key.split('__', 1)[0]
+
+            if field == 'id':
+                value = [str(item) for item in value] if isinstance(value, (list, tuple)) \
+                    else str(value)
+
+            result[self._get_execution_field(key)] = value
+
+        return result
+
+    def _get_execution_update_kwargs(self, kwargs):
+        """
+        Translate names of the fields used in update operations (e.g. set__status).
+        """
+        result = {}
+
+        for key, value in six.iteritems(kwargs):
+            operator, _, field = key.partition('__')
+
+            if not field:
+                # Update options such as upsert and write_concern are passed through as-is
+                result[key] = value
+                continue
+
+            result['%s__%s' % (operator, self._get_execution_field(field))] = value
+
+        return result
+
+    def _get_execution_pipeline(self, pipeline):
+        """
+        Translate names of the fields referenced in the aggregation pipeline.
+        """
+        result = []
+        translate = True
+
+        for stage in pipeline:
+            if not translate:
+                result.append(stage)
+                continue
+
+            operator, spec = list(stage.items())[0]
+
+            if operator in ['$match', '$sort']:
+                spec = self._get_execution_pipeline_query(spec)
+            else:
+                spec = self._get_execution_pipeline_expression(spec)
+
+            result.append({operator: spec})
+            translate = operator not in ['$group', '$project']
+
+        return result
+
+    def _get_execution_pipeline_query(self, query):
+        result = {}
+
+        for key, value in six.iteritems(query):
+            if key in ['$and', '$or', '$nor']:
+                result[key] = [self._get_execution_pipeline_query(item) for item in value]
+                continue
+
+            field = self._get_execution_raw_field(key)
+
+            if field == 'liveaction.id':
+                # Liveaction id is stored as a string in the execution document
+                value = self._get_execution_pipeline_id(value)
+
+            result[field] = value
+
+        return result
+
+    def _get_execution_pipeline_id(self, value):
+        if isinstance(value, dict):
+            return dict([(key, self._get_execution_pipeline_id(item))
+                         for key, item in six.iteritems(value)])
+        elif isinstance(value, (list, tuple)):
+            return [self._get_execution_pipeline_id(item) for item in value]
+        elif isinstance(value, bson.ObjectId):
+            return str(value)
+
+        return value
+
+    def _get_execution_pipeline_expression(self, expression):
+        if isinstance(expression, dict):
+            return dict([(key, self._get_execution_pipeline_expression(value))
+                         for key, value in six.iteritems(expression)])
+        elif isinstance(expression, (list, tuple)):
+            return [self._get_execution_pipeline_expression(item) for item in expression]
+        elif isinstance(expression, six.string_types) and expression.startswith('$') and \
+                not expression.startswith('$$'):
+            return '$' + self._get_execution_raw_field(expression[1:])
+
+        return expression
+
+    def _get_execution_raw_field(self, name):
+        """
+        Translate name of the field in the raw document (dot notation, e.g. _id, notify.data).
+        """
+        field, _, rest = name.partition('.')
+        field = 'id' if field == '_id' else field
+        field = self._get_execution_field(field).replace('__', '.')
+        return '.'.join([field, rest]) if rest else field
+
+    def _get_execution_fields(self, fields):
+        """
+        Translate names of the fields used for sorting and projections.
+        """
+        result = []
+
+        for field in fields:
+            prefix = field[0] if field[0] in ['-', '+'] else ''
+            field = self._get_execution_field(field[len(prefix):])
+            result.append(prefix + field.replace('__', '.'))
+
+        return result
+
+    def _get_execution_field(self, key):
+        field, _, rest = key.partition('__')
+        field = self.FIELD_MAP.get(field, field)
+        return '__'.join([field, rest]) if rest else field
+
+
 # specialized access objects
 liveaction_access = MongoDBAccess(LiveActionDB)
+liveaction_execution_access = ExecutionLiveActionAccess()
 
 MODELS = [LiveActionDB]
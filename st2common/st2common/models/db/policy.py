@@ -17,13 +17,15 @@ import mongoengine as me
 
 from st2common import log as logging
 from st2common.constants import pack as pack_constants
+from st2common.fields import ComplexDateTimeField
 from st2common.models.db import stormbase
 from st2common.models.system import common as common_models
 
 
 __all__ = ['PolicyTypeReference',
            'PolicyTypeDB',
-           'PolicyDB']
+           'PolicyDB',
+           'PolicyConcurrencyCounterDB']
 
 LOG = logging.getLogger(__name__)
 
@@ -179,4 +181,25 @@ class PolicyDB(stormbase.StormFoundationDB, stormbase.ContentPackResourceMixin):
                                                                        name=self.name)
 
 
-MODELS = [PolicyTypeDB, PolicyDB]
+class PolicyConcurrencyCounterDB(stormbase.StormFoundationDB):
+    """
+    Tracks the executions which are currently in-flight (scheduled or running) for a resource
+    protected by a concurrency policy.
+
+    Attribute:
+        key: Unique key identifying the policy type, action and attribute values.
+        liveaction_ids: Ids of the in-flight live actions.
+        reconciled_at: The timestamp when the counter was last reconciled with the database.
+    """
+    key = me.StringField(
+        required=True,
+        unique=True,
+        help_text='Unique key identifying the policy type, action and attribute values.')
+    liveaction_ids = me.ListField(
+        field=me.StringField(),
+        help_text='Ids of the in-flight live actions.')
+    reconciled_at = ComplexDateTimeField(
+        help_text='The timestamp when the counter was last reconciled with the database.')
+
+
+MODELS = [PolicyTypeDB, PolicyDB, PolicyConcurrencyCounterDB]
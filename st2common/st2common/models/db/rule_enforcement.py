@@ -55,6 +55,7 @@ class RuleEnforcementDB(stormbase.StormFoundationDB, stormbase.TagsMixin):
     meta = {
         'indexes': [
             {'fields': ['rule.ref']},
+            {'fields': ['enforced_at']},
         ]
     }
 
@@ -0,0 +1,53 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mongoengine as me
+
+from st2common.fields import ComplexDateTimeField
+from st2common.models.db import MongoDBAccess
+from st2common.models.db import stormbase
+from st2common.util import date as date_utils
+
+__all__ = [
+    'TimerStateDB'
+]
+
+
+class TimerStateDB(stormbase.StormFoundationDB):
+    """
+    Persisted scheduling state of a timer trigger. It allows the timer engine to resume the
+    schedule (and catch up on the missed fire times) after a restart or when the timer moves
+    to a different rules engine instance.
+    """
+    trigger_id = me.StringField(
+        required=True,
+        unique=True,
+        help_text='Id of the timer trigger.')
+    next_fire_time = ComplexDateTimeField(
+        help_text='The time when the timer is due to fire next.')
+    last_fire_time = ComplexDateTimeField(
+        help_text='The time when the timer has last fired.')
+    updated_at = ComplexDateTimeField(
+        default=date_utils.get_datetime_utc_now,
+        help_text='The timestamp when the state was last updated.')
+
+    meta = {
+        'indexes': ['next_fire_time']
+    }
+
+# specialized access objects
+timerstate_access = MongoDBAccess(TimerStateDB)
+
+MODELS = [TimerStateDB]
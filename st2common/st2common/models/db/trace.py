@@ -20,10 +20,12 @@ from st2common.fields import ComplexDateTimeField
 from st2common.util import date as date_utils
 
 from st2common.models.db import MongoDBAccess
+from st2common.models.utils.profiling import instrument_operation
 
 __all__ = [
     'TraceDB',
-    'TraceComponentDB'
+    'TraceComponentDB',
+    'TraceComponentBucketDB'
 ]
 
 
@@ -58,6 +60,10 @@ class TraceDB(stormbase.StormFoundationDB):
     :param rules: Rules associated with this trace.
 
     :param action_executions: ActionExecutions associated with this trace.
+
+    :param component_count: Total number of components associated with this trace. Only the
+                            first bucket of components is stored in the trace document, the rest
+                            are stored in TraceComponentBucketDB documents.
     """
     trace_tag = me.StringField(required=True,
                                help_text='A user specified reference to the trace.')
@@ -72,6 +78,8 @@ class TraceDB(stormbase.StormFoundationDB):
                                      help_text='Associated ActionExecutions.')
     start_timestamp = ComplexDateTimeField(default=date_utils.get_datetime_utc_now,
                                            help_text='The timestamp when the Trace was created.')
+    component_count = me.IntField(default=0,
+                                  help_text='Number of components associated with this trace.')
 
     meta = {
         'indexes': [
@@ -83,7 +91,71 @@ class TraceDB(stormbase.StormFoundationDB):
         ]
     }
 
+
+class TraceComponentBucketDB(stormbase.StormFoundationDB):
+    """
+    Bucket which holds a bounded number of components of a single trace. Storing components in
+    buckets instead of in the trace document itself means a trace with a large number of
+    components (e.g. a trace_tag which is reused by a sensor) doesn't grow the trace document
+    without a bound.
+
+    :param trace_id: Id of the trace the components belong to.
+
+    :param bucket: Sequence number of the bucket. Bucket 0 is the trace document itself.
+
+    :param component_counts: Number of components of each type stored in this bucket.
+    """
+    trace_id = me.StringField(required=True,
+                              help_text='Id of the trace the components belong to.')
+    bucket = me.IntField(required=True,
+                         help_text='Sequence number of the bucket.')
+    trigger_instances = me.ListField(field=me.EmbeddedDocumentField(TraceComponentDB),
+                                     required=False,
+                                     help_text='Associated TriggerInstances.')
+    rules = me.ListField(field=me.EmbeddedDocumentField(TraceComponentDB),
+                         required=False,
+                         help_text='Associated Rules.')
+    action_executions = me.ListField(field=me.EmbeddedDocumentField(TraceComponentDB),
+                                     required=False,
+                                     help_text='Associated ActionExecutions.')
+    component_counts = me.DictField(help_text='Number of components of each type.')
+    start_timestamp = ComplexDateTimeField(default=date_utils.get_datetime_utc_now,
+                                           help_text='The timestamp when the Trace was created.')
+
+    meta = {
+        'indexes': [
+            {'fields': ['trace_id', 'bucket'], 'unique': True},
+            {'fields': ['start_timestamp']},
+            {'fields': ['action_executions.object_id']},
+            {'fields': ['trigger_instances.object_id']},
+            {'fields': ['rules.object_id']}
+        ]
+    }
+
+
+class TraceAccess(MongoDBAccess):
+    @instrument_operation('inc_component_count', explain=False)
+    def inc_component_count(self, instance, count):
+        """
+        Atomically increment the number of components of the provided trace.
+
+        :return: Number of components after the increment.
+        :rtype: ``int``
+        """
+        collection = self.model._get_collection()
+        result = collection.find_and_modify(query={'_id': instance.id},
+                                            update={'$inc': {'component_count': count}},
+                                            fields={'component_count': True},
+                                            new=True)
+
+        if not result:
+            raise ValueError('Unable to find the %s instance. %s' % (self.model.__name__,
+                                                                     instance.id))
+
+        return result['component_count']
+
 # specialized access objects
-trace_access = MongoDBAccess(TraceDB)
+trace_access = TraceAccess(TraceDB)
+trace_component_bucket_access = MongoDBAccess(TraceComponentBucketDB)
 
-MODELS = [TraceDB]
+MODELS = [TraceDB, TraceComponentBucketDB]
@@ -17,21 +17,55 @@
 Module containing MongoDB profiling related functionality.
 """
 
+import bisect
+import collections
+import functools
+import time
+
+import six
 from mongoengine.queryset import QuerySet
 
 from st2common import log as logging
+from st2common.util import date as date_utils
+from st2common.util import isotime
 
 __all__ = [
     'enable_profiling',
     'disable_profiling',
     'is_enabled',
-    'log_query_and_profile_data_for_queryset'
+    'log_query_and_profile_data_for_queryset',
+
+    'enable_query_stats',
+    'disable_query_stats',
+    'is_query_stats_enabled',
+    'reset_query_stats',
+    'get_query_stats',
+    'record_operation',
+    'instrument_operation',
+    'instrument_queryset',
+    'InstrumentedQuerySet'
 ]
 
 LOG = logging.getLogger(__name__)
 
 ENABLE_PROFILING = False
 
+# Upper bounds (in seconds) of the buckets of the operation latency histograms
+LATENCY_HISTOGRAM_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+
+# Maximum number of captured slow queries which are kept in memory
+MAX_SLOW_QUERIES = 100
+
+# Keyword arguments of MongoDBAccess methods which are not query filters
+NON_FILTER_KWARGS = ['exclude_fields', 'raise_exception', 'field', 'offset', 'limit', 'order_by']
+
+ENABLE_QUERY_STATS = False
+SLOW_QUERY_THRESHOLD = None
+
+# Maps (model name, operation) to OperationStats
+OPERATION_STATS = {}
+SLOW_QUERIES = collections.deque(maxlen=MAX_SLOW_QUERIES)
+
 
 def enable_profiling():
     global ENABLE_PROFILING
@@ -50,6 +84,234 @@ def is_enabled():
     return ENABLE_PROFILING
 
 
+def enable_query_stats(slow_query_threshold=None):
+    """
+    Enable recording of the database operation latencies.
+
+    :param slow_query_threshold: Operations which take longer than this (in milliseconds) are
+                                 captured together with the explain output. None to disable.
+    :type slow_query_threshold: ``int``
+    """
+    global ENABLE_QUERY_STATS, SLOW_QUERY_THRESHOLD
+    ENABLE_QUERY_STATS = True
+    SLOW_QUERY_THRESHOLD = slow_query_threshold or None
+    return ENABLE_QUERY_STATS
+
+
+def disable_query_stats():
+    global ENABLE_QUERY_STATS, SLOW_QUERY_THRESHOLD
+    ENABLE_QUERY_STATS = False
+    SLOW_QUERY_THRESHOLD = None
+    return ENABLE_QUERY_STATS
+
+
+def is_query_stats_enabled():
+    return ENABLE_QUERY_STATS
+
+
+def reset_query_stats():
+    OPERATION_STATS.clear()
+    SLOW_QUERIES.clear()
+
+
+class OperationStats(object):
+    """
+    Latency statistics of a single operation on a single model.
+    """
+
+    __slots__ = ['count', 'total', 'max', 'histogram']
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # Last bucket holds the operations which took longer than the largest bucket bound
+        self.histogram = [0] * (len(LATENCY_HISTOGRAM_BUCKETS) + 1)
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.histogram[bisect.bisect_left(LATENCY_HISTOGRAM_BUCKETS, duration)] += 1
+
+    def to_dict(self):
+        bounds = LATENCY_HISTOGRAM_BUCKETS + ['+Inf']
+        return {
+            'count': self.count,
+            'total': self.total,
+            'avg': (self.total / self.count) if self.count else 0.0,
+            'max': self.max,
+            'histogram': [[bound, count] for bound, count in zip(bounds, self.histogram)]
+        }
+
+
+def get_query_stats():
+    """
+    Retrieve the recorded operation latencies and the captured slow queries.
+
+    Note: All the durations are in seconds.
+
+    :rtype: ``dict``
+    """
+    operations = []
+    for (model_name, operation), stats in sorted(six.iteritems(OPERATION_STATS)):
+        item = {
+            'model': model_name,
+            'operation': operation
+        }
+        item.update(stats.to_dict())
+        operations.append(item)
+
+    return {
+        'operations': operations,
+        'slow_queries': list(SLOW_QUERIES)
+    }
+
+
+def record_operation(model, operation, duration, queryset=None, filters=None):
+    """
+    Record latency of a database operation.
+
+    :param model: Model class the operation was performed on.
+
+    :param operation: Name of the operation (e.g. query, count).
+    :type operation: ``str``
+
+    :param duration: Operation duration in seconds.
+    :type duration: ``float``
+
+    :param queryset: Queryset which was used by the operation. It's used to explain slow queries.
+    :type queryset: ``QuerySet``
+
+    :param filters: Query filters which were used by the operation. They're used to explain slow
+                    queries when queryset is not available.
+    :type filters: ``dict``
+    """
+    key = (model.__name__, operation)
+    stats = OPERATION_STATS.get(key, None)
+
+    if not stats:
+        stats = OperationStats()
+        OPERATION_STATS[key] = stats
+
+    stats.add(duration)
+
+    if SLOW_QUERY_THRESHOLD and (duration * 1000) >= SLOW_QUERY_THRESHOLD:
+        _capture_slow_query(model=model, operation=operation, duration=duration,
+                            queryset=queryset, filters=filters)
+
+
+def instrument_operation(operation, explain=True):
+    """
+    Decorator for MongoDBAccess methods which records the operation latency when query stats are
+    enabled.
+
+    :param explain: True if the keyword arguments of the decorated method are query filters which
+                    can be used to explain a slow operation.
+    :type explain: ``bool``
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not ENABLE_QUERY_STATS:
+                return func(self, *args, **kwargs)
+
+            start_time = time.time()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                duration = (time.time() - start_time)
+
+                if explain:
+                    filters = dict([(key, value) for key, value in six.iteritems(kwargs)
+                                    if key not in NON_FILTER_KWARGS])
+                else:
+                    filters = None
+
+                record_operation(model=self.model, operation=operation, duration=duration,
+                                 filters=filters)
+        return wrapper
+    return decorator
+
+
+def instrument_queryset(queryset):
+    """
+    Return an instrumented copy of the provided lazy queryset when query stats are enabled.
+    """
+    if not ENABLE_QUERY_STATS or not isinstance(queryset, QuerySet):
+        return queryset
+
+    instrumented = InstrumentedQuerySet(queryset._document, queryset._collection_obj)
+    return queryset.clone_into(instrumented)
+
+
+class InstrumentedQuerySet(QuerySet):
+    """
+    QuerySet which records latency of the query when results are retrieved for the first time
+    and latency of the count operation.
+
+    Querysets are lazy so the query is only performed once the results are accessed and not when
+    the queryset is returned by MongoDBAccess.query.
+    """
+
+    _query_recorded = False
+
+    def count(self, *args, **kwargs):
+        start_time = time.time()
+        try:
+            return super(InstrumentedQuerySet, self).count(*args, **kwargs)
+        finally:
+            record_operation(model=self._document, operation='query_count',
+                             duration=(time.time() - start_time), queryset=self)
+
+    def _populate_cache(self):
+        # Only the first batch includes the actual query
+        if self._query_recorded:
+            return super(InstrumentedQuerySet, self)._populate_cache()
+
+        self._query_recorded = True
+
+        start_time = time.time()
+        try:
+            return super(InstrumentedQuerySet, self)._populate_cache()
+        finally:
+            record_operation(model=self._document, operation='query',
+                             duration=(time.time() - start_time), queryset=self)
+
+
+def _capture_slow_query(model, operation, duration, queryset=None, filters=None):
+    if queryset is None and filters is not None:
+        queryset = model.objects(**filters)
+
+    mongo_query = None
+    explain_info = None
+
+    if isinstance(queryset, QuerySet):
+        query = getattr(queryset, '_query', None)
+        mongo_query = getattr(queryset, '_mongo_query', query)
+
+        # Note: Explain advances the cursor so it needs to be performed on a clone
+        try:
+            explain_info = queryset.clone().explain()
+        except Exception as e:
+            explain_info = {'error': str(e)}
+
+    slow_query = {
+        'model': model.__name__,
+        'collection': model._get_collection_name(),
+        'operation': operation,
+        'duration': duration,
+        'query': str(mongo_query) if mongo_query is not None else None,
+        'explain': explain_info,
+        'timestamp': isotime.format(date_utils.get_datetime_utc_now(), offset=False)
+    }
+    SLOW_QUERIES.append(slow_query)
+
+    LOG.warning('Slow MongoDB %s operation on collection "%s" took %.2f ms: %s',
+                operation, slow_query['collection'], (duration * 1000), slow_query['query'],
+                extra={'slow_query': slow_query})
+
+
 def log_query_and_profile_data_for_queryset(queryset):
     """
     Function which logs MongoDB query and profile data for the provided mongoengine queryset object.
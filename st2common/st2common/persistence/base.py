@@ -147,6 +147,26 @@ class Access(object):
 
         return model_object
 
+    @classmethod
+    def insert_many(cls, model_objects):
+        """
+        Insert multiple new objects using a single bulk insert.
+
+        Note: Unlike insert, this method doesn't publish CUD events or dispatch triggers. It's up
+        to the caller to publish the events (e.g. using publish_create_many) once the objects
+        are ready.
+
+        :rtype: ``list``
+        """
+        if not model_objects:
+            return []
+
+        for model_object in model_objects:
+            if model_object.id:
+                raise ValueError('id for object %s was unexpected.' % model_object)
+
+        return cls._get_impl().insert_many(model_objects)
+
     @classmethod
     def add_or_update(cls, model_object, publish=True, dispatch_trigger=True,
                       log_not_unique_error_as_debug=False):
@@ -249,6 +269,12 @@ class Access(object):
         if publisher:
             publisher.publish_create(model_object)
 
+    @classmethod
+    def publish_create_many(cls, model_objects):
+        publisher = cls._get_publisher()
+        if publisher:
+            publisher.publish_create_many(model_objects)
+
     @classmethod
     def publish_update(cls, model_object):
         publisher = cls._get_publisher()
@@ -354,3 +380,21 @@ class StatusBasedResource(Access):
         publisher = cls._get_publisher()
         if publisher:
             publisher.publish_state(model_object, getattr(model_object, 'status', None))
+
+    @classmethod
+    def publish_status_many(cls, model_objects):
+        """
+        Publish status of multiple objects. Objects are grouped by status and each group is
+        published using a single channel.
+        """
+        publisher = cls._get_publisher()
+        if not publisher:
+            return
+
+        by_status = {}
+        for model_object in model_objects:
+            status = getattr(model_object, 'status', None)
+            by_status.setdefault(status, []).append(model_object)
+
+        for status, status_model_objects in six.iteritems(by_status):
+            publisher.publish_state_many(status_model_objects, status)
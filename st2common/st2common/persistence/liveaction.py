@@ -13,18 +13,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from oslo_config import cfg
+
 from st2common import transport
 from st2common.models.db.liveaction import liveaction_access
+from st2common.models.db.liveaction import liveaction_execution_access
 from st2common.persistence import base as persistence
 from st2common.transport import utils as transport_utils
 
 
 class LiveAction(persistence.StatusBasedResource):
     impl = liveaction_access
+    execution_impl = liveaction_execution_access
     publisher = None
 
     @classmethod
     def _get_impl(cls):
+        if cfg.CONF.database.single_document_executions:
+            return cls.execution_impl
+
         return cls.impl
 
     @classmethod
@@ -37,3 +44,26 @@ class LiveAction(persistence.StatusBasedResource):
     @classmethod
     def delete_by_query(cls, **query):
         return cls._get_impl().delete_by_query(**query)
+
+    @classmethod
+    def publish_create(cls, model_object):
+        # In the single document mode, execution CUD events already carry all the liveaction
+        # data. Status events are still published since they drive the execution lifecycle.
+        if cfg.CONF.database.single_document_executions:
+            return
+
+        super(LiveAction, cls).publish_create(model_object)
+
+    @classmethod
+    def publish_create_many(cls, model_objects):
+        if cfg.CONF.database.single_document_executions:
+            return
+
+        super(LiveAction, cls).publish_create_many(model_objects)
+
+    @classmethod
+    def publish_update(cls, model_object):
+        if cfg.CONF.database.single_document_executions:
+            return
+
+        super(LiveAction, cls).publish_update(model_object)
@@ -13,9 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from st2common import transport
 from st2common.models.db import MongoDBAccess
 from st2common.models.db.policy import PolicyTypeReference, PolicyTypeDB, PolicyDB
+from st2common.models.db.policy import PolicyConcurrencyCounterDB
 from st2common.persistence.base import Access, ContentPackResource
+from st2common.transport import utils as transport_utils
+from st2common.util import date as date_utils
 
 
 class PolicyType(Access):
@@ -44,7 +48,54 @@ class PolicyType(Access):
 
 class Policy(ContentPackResource):
     impl = MongoDBAccess(PolicyDB)
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
+
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.policy.PolicyCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
+
+
+class PolicyConcurrencyCounter(Access):
+    impl = MongoDBAccess(PolicyConcurrencyCounterDB)
+
+    @classmethod
+    def _get_impl(cls):
+        return cls.impl
+
+    @classmethod
+    def add_liveaction(cls, key, liveaction_id):
+        """
+        Atomically add the provided live action to the counter.
+        """
+        model = cls._get_impl().model
+        model.objects(key=key).update_one(add_to_set__liveaction_ids=str(liveaction_id),
+                                          upsert=True)
+
+    @classmethod
+    def remove_liveaction(cls, key, liveaction_id):
+        """
+        Atomically remove the provided live action from the counter.
+        """
+        model = cls._get_impl().model
+        model.objects(key=key).update_one(pull__liveaction_ids=str(liveaction_id))
+
+    @classmethod
+    def reconcile(cls, key, liveaction_ids):
+        """
+        Replace the live actions stored in the counter with the provided ones.
+
+        :rtype: :class:`PolicyConcurrencyCounterDB`
+        """
+        model = cls._get_impl().model
+        liveaction_ids = [str(liveaction_id) for liveaction_id in liveaction_ids]
+        model.objects(key=key).update_one(set__liveaction_ids=liveaction_ids,
+                                          set__reconciled_at=date_utils.get_datetime_utc_now(),
+                                          upsert=True)
+        return cls.get(key=key)
@@ -0,0 +1,81 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from st2common.models.db.timer import TimerStateDB
+from st2common.models.db.timer import timerstate_access
+from st2common.persistence import base as persistence
+from st2common.util import date as date_utils
+
+__all__ = [
+    'TimerState'
+]
+
+
+class TimerState(persistence.Access):
+    impl = timerstate_access
+    publisher = None
+
+    @classmethod
+    def _get_impl(cls):
+        return cls.impl
+
+    @classmethod
+    def get_by_trigger_ids(cls, trigger_ids):
+        """
+        Retrieve persisted state for the provided timer triggers.
+
+        :rtype: ``dict`` of trigger_id -> ``TimerStateDB``
+        """
+        return dict([(state_db.trigger_id, state_db) for state_db in
+                     cls.query(trigger_id__in=list(trigger_ids))])
+
+    @classmethod
+    def save_fire_times(cls, fire_times):
+        """
+        Create or update state for multiple timers using a single bulk operation.
+
+        :param fire_times: List of (trigger_id, next_fire_time, last_fire_time) tuples.
+        :type fire_times: ``list``
+        """
+        if not fire_times:
+            return
+
+        updated_at = cls._to_mongo('updated_at', date_utils.get_datetime_utc_now())
+
+        collection = cls._get_impl().model._get_collection()
+        bulk = collection.initialize_unordered_bulk_op()
+
+        for trigger_id, next_fire_time, last_fire_time in fire_times:
+            values = {
+                'next_fire_time': cls._to_mongo('next_fire_time', next_fire_time),
+                'last_fire_time': cls._to_mongo('last_fire_time', last_fire_time),
+                'updated_at': updated_at
+            }
+            bulk.find({'trigger_id': trigger_id}).upsert().update({'$set': values})
+
+        return bulk.execute()
+
+    @classmethod
+    def delete_by_trigger_id(cls, trigger_id):
+        return cls._get_impl().model.objects(trigger_id=trigger_id).delete()
+
+    @staticmethod
+    def _to_mongo(field_name, value):
+        if value is None:
+            return None
+
+        # Fire times are in the timezone of the timer, database stores UTC
+        value = date_utils.convert_to_utc(value)
+        return TimerStateDB._fields[field_name].to_mongo(value)
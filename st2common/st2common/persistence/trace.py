@@ -13,38 +13,201 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
+import six
+from mongoengine import OperationError
+
+from st2common.constants.trace import TRACE_COMPONENT_TYPES
+from st2common.constants.trace import TRACE_COMPONENT_BUCKET_SIZE
 from st2common.models.db.trace import trace_access
+from st2common.models.db.trace import trace_component_bucket_access
 from st2common.persistence.base import Access
 
+__all__ = [
+    'Trace',
+    'TraceComponentBucket'
+]
+
+
+class TraceComponentBucket(Access):
+    impl = trace_component_bucket_access
+
+    @classmethod
+    def _get_impl(cls):
+        return cls.impl
+
+    @classmethod
+    def push_components(cls, trace, bucket, components):
+        """
+        Add components to the provided bucket. Bucket is created if it doesn't exist yet.
+
+        :param components: Components to add keyed by component type.
+        :type components: ``dict``
+        """
+        update_kwargs = {
+            'set__start_timestamp': trace.start_timestamp
+        }
+
+        for component_type, values in six.iteritems(components):
+            update_kwargs['push_all__%s' % (component_type)] = values
+            update_kwargs['inc__component_counts__%s' % (component_type)] = len(values)
+
+        queryset = cls._get_impl().model.objects(trace_id=str(trace.id), bucket=bucket)
+
+        try:
+            queryset.update_one(upsert=True, **update_kwargs)
+        except OperationError:
+            # Bucket has been created by a concurrent upsert in the mean time (unique index
+            # violation) so it now exists and a regular update can be used
+            queryset.update_one(**update_kwargs)
+
 
 class Trace(Access):
     impl = trace_access
+    bucket_size = TRACE_COMPONENT_BUCKET_SIZE
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def query(cls, *args, **kwargs):
+        kwargs = cls._process_component_filters(filters=kwargs)
+        return super(Trace, cls).query(*args, **kwargs)
+
+    @classmethod
+    def count(cls, *args, **kwargs):
+        kwargs = cls._process_component_filters(filters=kwargs)
+        return super(Trace, cls).count(*args, **kwargs)
+
+    @classmethod
+    def delete(cls, model_object, publish=True, dispatch_trigger=True):
+        TraceComponentBucket._get_impl().delete_by_query(trace_id=str(model_object.id))
+        return super(Trace, cls).delete(model_object, publish=publish,
+                                        dispatch_trigger=dispatch_trigger)
+
     @classmethod
     def push_components(cls, instance, action_executions=None, rules=None, trigger_instances=None):
-        update_kwargs = {}
-        if action_executions:
-            update_kwargs['push_all__action_executions'] = action_executions
-        if rules:
-            update_kwargs['push_all__rules'] = rules
-        if trigger_instances:
-            update_kwargs['push_all__trigger_instances'] = trigger_instances
-        if update_kwargs:
-            return cls.update(instance, **update_kwargs)
-        return instance
+        """
+        Add components to the provided trace.
+
+        Each component gets a position in the trace by atomically incrementing the component
+        counter of the trace. The first bucket_size components are stored in the trace document
+        itself and the rest in TraceComponentBucketDB documents of bucket_size components each.
+        This way adding a component is a constant time operation regardless of how many
+        components the trace already has.
+        """
+        components = []
+        components.extend([('action_executions', component)
+                           for component in action_executions or []])
+        components.extend([('rules', component) for component in rules or []])
+        components.extend([('trigger_instances', component)
+                           for component in trigger_instances or []])
+
+        if not components:
+            return instance
+
+        end = cls._get_impl().inc_component_count(instance, count=len(components))
+        start = end - len(components)
+
+        buckets = {}
+        for position, (component_type, component) in enumerate(components, start):
+            bucket_components = buckets.setdefault(position // cls.bucket_size, {})
+            bucket_components.setdefault(component_type, []).append(component)
+
+        for bucket, bucket_components in sorted(six.iteritems(buckets)):
+            if bucket == 0:
+                update_kwargs = dict([('push_all__%s' % (component_type), values)
+                                      for component_type, values
+                                      in six.iteritems(bucket_components)])
+                cls._get_impl().update(instance, **update_kwargs)
+            else:
+                TraceComponentBucket.push_components(trace=instance, bucket=bucket,
+                                                     components=bucket_components)
+
+        return cls.get_by_id(instance.id)
 
     @classmethod
     def push_action_execution(cls, instance, action_execution):
-        return cls.update(instance, push__action_executions=action_execution)
+        return cls.push_components(instance, action_executions=[action_execution])
 
     @classmethod
     def push_rule(cls, instance, rule):
-        return cls.update(instance, push__rules=rule)
+        return cls.push_components(instance, rules=[rule])
 
     @classmethod
     def push_trigger_instance(cls, instance, trigger_instance):
-        return cls.update(instance, push__trigger_instances=trigger_instance)
+        return cls.push_components(instance, trigger_instances=[trigger_instance])
+
+    @classmethod
+    def get_components(cls, instance, component_type, offset=0, limit=None):
+        """
+        Retrieve a page of the trace components of the provided type. Components are ordered by
+        the position in the trace.
+
+        :param component_type: Component type (action_executions, rules, trigger_instances).
+        :type component_type: ``str``
+
+        :return: Components and the total number of the components of the provided type.
+        :rtype: ``tuple`` of (``list``, ``int``)
+        """
+        if component_type not in TRACE_COMPONENT_TYPES:
+            raise ValueError('Invalid component type: %s' % (component_type))
+
+        eop = offset + int(limit) if limit else None
+
+        # Components in the trace document come first
+        components = getattr(instance, component_type, None) or []
+        result = list(components[offset:eop])
+        position = len(components)
+
+        # Only retrieve the buckets which contain components from the requested page
+        bucket_model = TraceComponentBucket._get_impl().model
+        bucket_dbs = bucket_model.objects(trace_id=str(instance.id))
+        bucket_dbs = bucket_dbs.only('bucket', 'component_counts').order_by('bucket')
+
+        page_buckets = []
+        for bucket_db in bucket_dbs:
+            count = bucket_db.component_counts.get(component_type, 0)
+
+            if count and position + count > offset and (eop is None or position < eop):
+                page_buckets.append((bucket_db.bucket, position))
+
+            position += count
+
+        for bucket, bucket_start in page_buckets:
+            bucket_db = bucket_model.objects(trace_id=str(instance.id), bucket=bucket)
+            bucket_db = bucket_db.only(component_type).first()
+            components = getattr(bucket_db, component_type, None) or []
+            result.extend(components[max(offset - bucket_start, 0):
+                                     eop - bucket_start if eop else None])
+
+        return result, position
+
+    @classmethod
+    def _process_component_filters(cls, filters):
+        """
+        Replace component filters (e.g. action_executions__object_id) with a filter on trace ids
+        so traces which store the matching component in a bucket document are also matched.
+        """
+        filters = copy.copy(filters)
+
+        for component_type in TRACE_COMPONENT_TYPES:
+            filter_name = '%s__object_id' % (component_type)
+
+            if filter_name not in filters:
+                continue
+
+            component_filters = {filter_name: filters.pop(filter_name)}
+
+            trace_ids = set([str(trace_id) for trace_id in
+                             cls._get_impl().distinct(field='id', **component_filters)])
+            trace_ids.update(TraceComponentBucket.distinct(field='trace_id', **component_filters))
+
+            if 'id__in' in filters:
+                trace_ids &= set([str(trace_id) for trace_id in filters['id__in']])
+
+            filters['id__in'] = list(trace_ids)
+
+        return filters
@@ -0,0 +1,95 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+from st2common import log as logging
+from st2common.constants import action as action_constants
+from st2common.persistence.liveaction import LiveAction
+from st2common.persistence.policy import PolicyConcurrencyCounter
+from st2common.util import date as date_utils
+
+__all__ = [
+    'get_in_flight_count',
+    'add_in_flight',
+    'remove_in_flight',
+    'reconcile_in_flight'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Live action statuses which count towards the concurrency threshold
+IN_FLIGHT_STATES = [
+    action_constants.LIVEACTION_STATUS_SCHEDULED,
+    action_constants.LIVEACTION_STATUS_RUNNING
+]
+
+# How often (in seconds) the counters are reconciled with the live actions in the database.
+# Reconciliation corrects the counters for the executions which left the in-flight states
+# without going through the post run policies (e.g. runner crashed).
+RECONCILE_INTERVAL = 60
+
+
+def get_in_flight_count(key, filters):
+    """
+    Return the number of in-flight executions tracked by the counter with the provided key.
+
+    Counter is reconciled with the database using the provided live action filters if it doesn't
+    exist yet or if it hasn't been reconciled in the last RECONCILE_INTERVAL seconds.
+
+    Note: The caller should hold the policy lock for the provided key.
+
+    :param key: Counter key.
+    :type key: ``str``
+
+    :param filters: Live action filters which match all the executions for this counter.
+    :type filters: ``dict``
+
+    :rtype: ``int``
+    """
+    counter_db = PolicyConcurrencyCounter.get(key=key)
+
+    if not counter_db or _is_stale(counter_db):
+        counter_db = reconcile_in_flight(key=key, filters=filters)
+
+    return len(counter_db.liveaction_ids)
+
+
+def add_in_flight(key, liveaction_db):
+    PolicyConcurrencyCounter.add_liveaction(key=key, liveaction_id=liveaction_db.id)
+
+
+def remove_in_flight(key, liveaction_db):
+    PolicyConcurrencyCounter.remove_liveaction(key=key, liveaction_id=liveaction_db.id)
+
+
+def reconcile_in_flight(key, filters):
+    """
+    Reset the counter with the provided key to the in-flight executions stored in the database.
+
+    :rtype: :class:`PolicyConcurrencyCounterDB`
+    """
+    liveaction_ids = LiveAction.distinct(field='id', status__in=IN_FLIGHT_STATES, **filters)
+    LOG.debug('Reconciling concurrency counter "%s" with %s in-flight executions.', key,
+              len(liveaction_ids))
+    return PolicyConcurrencyCounter.reconcile(key=key, liveaction_ids=liveaction_ids)
+
+
+def _is_stale(counter_db):
+    if not counter_db.reconciled_at:
+        return True
+
+    delta = datetime.timedelta(seconds=RECONCILE_INTERVAL)
+    return counter_db.reconciled_at + delta < date_utils.get_datetime_utc_now()
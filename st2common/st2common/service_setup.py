@@ -24,6 +24,7 @@ import os
 from oslo_config import cfg
 
 from st2common import log as logging
+from st2common.metrics import base as metrics
 from st2common.models import db
 from st2common.constants.logging import DEFAULT_LOGGING_CONF_PATH
 from st2common.persistence import db_init
@@ -31,6 +32,7 @@ from st2common.transport.bootstrap_utils import register_exchanges
 from st2common.signal_handlers import register_common_signal_handlers
 from st2common.util.debugging import enable_debugging
 from st2common.models.utils.profiling import enable_profiling
+from st2common.models.utils.profiling import enable_query_stats
 from st2common import triggers
 
 from st2common.rbac.migrations import run_all as run_all_rbac_migrations
@@ -92,6 +94,11 @@ def setup(service, config, setup_db=True, register_mq_exchanges=True,
     if cfg.CONF.profile:
         enable_profiling()
 
+    if cfg.CONF.database.query_stats or cfg.CONF.database.slow_query_threshold:
+        enable_query_stats(slow_query_threshold=cfg.CONF.database.slow_query_threshold)
+
+    metrics.init(service=service)
+
     # All other setup which requires config to be parsed and logging to
     # be correctly setup.
     if setup_db:
@@ -120,6 +127,7 @@ def teardown():
     """
     Common teardown function.
     """
+    metrics.shutdown()
     db_teardown()
 
 
@@ -13,25 +13,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
 import six
 
 from st2common import log as logging
 from st2common.constants import action as action_constants
+from st2common.constants.trace import TRACE_CONTEXT
 from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.exceptions.trace import TraceNotFoundException
+from st2common.models.db.trace import TraceDB
 from st2common.persistence.liveaction import LiveAction
 from st2common.persistence.execution import ActionExecution
 from st2common.services import executions
 from st2common.services import trace as trace_service
 from st2common.util import date as date_utils
 from st2common.util import action_db as action_utils
+from st2common.util import param as param_utils
 from st2common.util import schema as util_schema
 
 
 __all__ = [
     'request',
     'create_request',
+    'create_requests',
     'publish_request',
+    'publish_requests',
     'is_action_canceled_or_canceling'
 ]
 
@@ -51,6 +58,128 @@ def create_request(liveaction):
     :return: (liveaction, execution)
     :rtype: tuple
     """
+    _prepare_request(liveaction)
+
+    # Publish creation after both liveaction and actionexecution are created.
+    liveaction = LiveAction.add_or_update(liveaction, publish=False)
+
+    # Get trace_db if it exists. This could throw. If it throws, we have to cleanup
+    # liveaction object so we don't see things in requested mode.
+    trace_db = None
+    try:
+        _, trace_db = trace_service.get_trace_db_by_live_action(liveaction)
+    except StackStormDBObjectNotFoundError as e:
+        _cleanup_liveaction(liveaction)
+        raise TraceNotFoundException(str(e))
+
+    execution = executions.create_execution_object(liveaction, publish=False)
+
+    if trace_db:
+        trace_service.add_or_update_given_trace_db(
+            trace_db=trace_db,
+            action_executions=[
+                trace_service.get_trace_component_for_action_execution(execution, liveaction)
+            ])
+
+    return liveaction, execution
+
+
+def create_requests(liveactions):
+    """
+    Create multiple action executions at once.
+
+    All the liveactions are validated and their parameters are rendered first. Liveactions,
+    executions and new traces for the valid requests are then written to the database using
+    bulk inserts. Same as with create_request, executions store the parameters provided by the
+    user and liveactions store the rendered parameters.
+
+    Note: Unlike create_request, a request whose parameters can't be rendered is rejected
+    before anything is written to the database.
+
+    :return: List with a (liveaction, execution) tuple or an exception for each of the provided
+             liveactions (in the same order).
+    :rtype: ``list``
+    """
+    results = [None] * len(liveactions)
+
+    # Actions and runners are usually shared by many of the requests so we only retrieve them
+    # once
+    cache = {}
+
+    valid = []
+    raw_parameters = {}
+    for index, liveaction in enumerate(liveactions):
+        try:
+            action_db, runnertype_db = _prepare_request(liveaction, cache=cache)
+            raw_parameters[index] = copy.deepcopy(liveaction.parameters)
+            liveaction.parameters = param_utils.render_live_params(
+                runnertype_db.runner_parameters, action_db.parameters, liveaction.parameters,
+                liveaction.context)
+        except Exception as e:
+            results[index] = e
+        else:
+            valid.append(index)
+
+    if not valid:
+        return results
+
+    inserted = LiveAction.insert_many([liveactions[index] for index in valid])
+
+    # Retrieve existing traces. Requests which don't reference a trace or a parent execution
+    # always start a new trace so there is nothing to look up.
+    trace_dbs = {}
+    for index, liveaction in zip(list(valid), inserted):
+        liveactions[index] = liveaction
+
+        if not liveaction.context.get(TRACE_CONTEXT, None) and \
+                not executions.get_parent_context(liveaction):
+            trace_dbs[index] = TraceDB(trace_tag='execution-%s' % str(liveaction.id))
+            continue
+
+        try:
+            _, trace_dbs[index] = trace_service.get_trace_db_by_live_action(liveaction)
+        except StackStormDBObjectNotFoundError as e:
+            _cleanup_liveaction(liveaction)
+            results[index] = TraceNotFoundException(str(e))
+            valid.remove(index)
+
+    execution_dbs = executions.create_execution_objects(
+        [liveactions[index] for index in valid], publish=False,
+        parameters=[raw_parameters[index] for index in valid])
+
+    new_trace_dbs = []
+    new_trace_components = []
+    for index, execution in zip(valid, execution_dbs):
+        liveaction = liveactions[index]
+        results[index] = (liveaction, execution)
+
+        trace_db = trace_dbs[index]
+        trace_component = trace_service.get_trace_component_for_action_execution(
+            execution, liveaction)
+
+        if trace_db.id:
+            trace_service.add_or_update_given_trace_db(trace_db=trace_db,
+                                                       action_executions=[trace_component])
+        else:
+            new_trace_dbs.append(trace_db)
+            new_trace_components.append(trace_component)
+
+    if new_trace_dbs:
+        trace_service.add_traces_for_action_executions(trace_dbs=new_trace_dbs,
+                                                       action_executions=new_trace_components)
+
+    return results
+
+
+def _prepare_request(liveaction, cache=None):
+    """
+    Validate the request and set the attributes of a new liveaction.
+
+    :return: (action_db, runnertype_db)
+    :rtype: tuple
+    """
+    cache = cache if cache is not None else {}
+
     # Use the user context from the parent action execution. Subtasks in a workflow
     # action can be invoked by a system user and so we want to use the user context
     # from the original workflow action.
@@ -61,14 +190,19 @@ def create_request(liveaction):
             liveaction.context['user'] = parent_user
 
     # Validate action.
-    action_db = action_utils.get_action_by_ref(liveaction.action)
-    if not action_db:
-        raise ValueError('Action "%s" cannot be found.' % liveaction.action)
+    if liveaction.action in cache:
+        action_db, runnertype_db = cache[liveaction.action]
+    else:
+        action_db = action_utils.get_action_by_ref(liveaction.action)
+        if not action_db:
+            raise ValueError('Action "%s" cannot be found.' % liveaction.action)
+
+        runnertype_db = action_utils.get_runnertype_by_name(action_db.runner_type['name'])
+        cache[liveaction.action] = (action_db, runnertype_db)
+
     if not action_db.enabled:
         raise ValueError('Unable to execute. Action "%s" is disabled.' % liveaction.action)
 
-    runnertype_db = action_utils.get_runnertype_by_name(action_db.runner_type['name'])
-
     if not hasattr(liveaction, 'parameters'):
         liveaction.parameters = dict()
 
@@ -98,28 +232,7 @@ def create_request(liveaction):
     liveaction.status = action_constants.LIVEACTION_STATUS_REQUESTED
     liveaction.start_timestamp = date_utils.get_datetime_utc_now()
 
-    # Publish creation after both liveaction and actionexecution are created.
-    liveaction = LiveAction.add_or_update(liveaction, publish=False)
-
-    # Get trace_db if it exists. This could throw. If it throws, we have to cleanup
-    # liveaction object so we don't see things in requested mode.
-    trace_db = None
-    try:
-        _, trace_db = trace_service.get_trace_db_by_live_action(liveaction)
-    except StackStormDBObjectNotFoundError as e:
-        _cleanup_liveaction(liveaction)
-        raise TraceNotFoundException(str(e))
-
-    execution = executions.create_execution_object(liveaction, publish=False)
-
-    if trace_db:
-        trace_service.add_or_update_given_trace_db(
-            trace_db=trace_db,
-            action_executions=[
-                trace_service.get_trace_component_for_action_execution(execution, liveaction)
-            ])
-
-    return liveaction, execution
+    return action_db, runnertype_db
 
 
 def publish_request(liveaction, execution):
@@ -141,6 +254,36 @@ def publish_request(liveaction, execution):
     return liveaction, execution
 
 
+def publish_requests(requests):
+    """
+    Publish multiple action executions. Messages of the same type are published using a
+    single channel.
+
+    :param requests: List of (liveaction, execution) tuples.
+    :type requests: ``list``
+
+    :return: requests
+    :rtype: ``list``
+    """
+    if not requests:
+        return requests
+
+    liveactions = [liveaction for liveaction, _ in requests]
+    execution_dbs = [execution for _, execution in requests]
+
+    # Assume that this is a creation.
+    LiveAction.publish_create_many(liveactions)
+    LiveAction.publish_status_many(liveactions)
+    ActionExecution.publish_create_many(execution_dbs)
+
+    for liveaction, execution in requests:
+        extra = {'liveaction_db': liveaction, 'execution_db': execution}
+        LOG.audit('Action execution requested. LiveAction.id=%s, ActionExecution.id=%s' %
+                  (liveaction.id, execution.id), extra=extra)
+
+    return requests
+
+
 def request(liveaction):
     liveaction, execution = create_request(liveaction)
     liveaction, execution = publish_request(liveaction, execution)
@@ -0,0 +1,114 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.persistence.execution import ActionExecution
+
+__all__ = [
+    'RESULT_REF_KEY',
+    'RESULT_PREVIEW_KEY',
+    'RESULT_TRUNCATED_KEY',
+
+    'get_result_payload',
+    'get_payload_with_lazy_result',
+    'LazyResultPayload'
+]
+
+LOG = logging.getLogger(__name__)
+
+RESULT_KEY = 'result'
+RESULT_REF_KEY = 'result_ref'
+RESULT_PREVIEW_KEY = 'result_preview'
+RESULT_TRUNCATED_KEY = 'result_truncated'
+
+
+def get_result_payload(result, execution_id, serialized_result=None):
+    """
+    Return the result related trigger payload items for the provided execution result.
+
+    If the serialized result is larger than the configured threshold, the result is replaced
+    with a reference to the execution and a truncated preview of the serialized result.
+
+    :param serialized_result: JSON serialized result if already available.
+    :type serialized_result: ``str``
+
+    :rtype: ``dict``
+    """
+    max_result_size = cfg.CONF.action_sensor.max_result_size
+
+    if not max_result_size or max_result_size <= 0:
+        return {RESULT_KEY: result}
+
+    if serialized_result is None:
+        serialized_result = json.dumps(result)
+
+    if len(serialized_result) <= max_result_size:
+        return {RESULT_KEY: result}
+
+    preview_size = cfg.CONF.action_sensor.result_preview_size
+    return {
+        RESULT_REF_KEY: execution_id,
+        RESULT_PREVIEW_KEY: serialized_result[:preview_size],
+        RESULT_TRUNCATED_KEY: True
+    }
+
+
+def get_payload_with_lazy_result(payload):
+    """
+    Return a copy of the provided trigger payload. If the payload carries a result reference
+    instead of the result, the result is retrieved from the execution on first access.
+
+    :rtype: ``dict``
+    """
+    if payload and payload.get(RESULT_REF_KEY, None) and RESULT_KEY not in payload:
+        return LazyResultPayload(payload)
+
+    return dict(payload or {})
+
+
+class LazyResultPayload(dict):
+    """
+    Trigger payload which retrieves a referenced execution result on first access.
+
+    Both jsonpath (rule criteria) and Jinja (rule action parameters) perform item lookups
+    which end up in ``__missing__`` when the result is not part of the payload.
+
+    If the referenced execution doesn't exist anymore (e.g. it has been garbage collected), the
+    result is None.
+    """
+
+    def __missing__(self, key):
+        if key != RESULT_KEY or RESULT_REF_KEY not in self:
+            raise KeyError(key)
+
+        result = self._get_result(execution_id=self[RESULT_REF_KEY])
+        self[RESULT_KEY] = result
+        return result
+
+    def _get_result(self, execution_id):
+        LOG.debug('Retrieving result of execution %s referenced in trigger payload.',
+                  execution_id)
+        execution_db = ActionExecution.get(id=execution_id)
+
+        if not execution_db:
+            LOG.warning('Execution %s referenced in trigger payload not found, result is not '
+                        'available.', execution_id)
+            return None
+
+        return execution_db.result
@@ -28,6 +28,10 @@ COORDINATOR = None
 __all__ = [
     'configured',
     'get_coordinator',
+    'get_member_id',
+    'join_group',
+    'leave_group',
+    'get_group_members',
 
     'coordinator_setup',
     'coordinator_teardown'
@@ -146,8 +150,7 @@ def coordinator_setup():
     """
     url = cfg.CONF.coordination.url
     lock_timeout = cfg.CONF.coordination.lock_timeout
-    proc_info = system_info.get_process_info()
-    member_id = '%s_%d' % (proc_info['hostname'], proc_info['pid'])
+    member_id = get_member_id()
 
     if url:
         coordinator = coordination.get_coordinator(url, member_id, lock_timeout=lock_timeout)
@@ -162,6 +165,52 @@ def coordinator_setup():
     return coordinator
 
 
+def get_member_id():
+    """
+    Return member id which is used by this process when talking to the coordination service.
+
+    :rtype: ``str``
+    """
+    proc_info = system_info.get_process_info()
+    return '%s_%d' % (proc_info['hostname'], proc_info['pid'])
+
+
+def join_group(coordinator, group_id, capabilities=''):
+    """
+    Join the provided group. Group is created if it doesn't exist yet.
+    """
+    try:
+        coordinator.create_group(group_id).get()
+    except coordination.GroupAlreadyExist:
+        pass
+
+    try:
+        coordinator.join_group(group_id, capabilities=capabilities).get()
+    except coordination.MemberAlreadyExist:
+        pass
+
+
+def leave_group(coordinator, group_id):
+    try:
+        coordinator.leave_group(group_id).get()
+    except (coordination.GroupNotCreated, coordination.MemberNotJoined):
+        pass
+
+
+def get_group_members(coordinator, group_id):
+    """
+    Retrieve ids of all the members of the provided group.
+
+    :rtype: ``list``
+    """
+    try:
+        members = coordinator.get_members(group_id).get()
+    except coordination.GroupNotCreated:
+        return []
+
+    return sorted(members)
+
+
 def coordinator_teardown(coordinator):
     coordinator.stop()
 
@@ -28,7 +28,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import copy
+
 import six
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.util import reference
@@ -42,9 +46,11 @@ from st2common.models.api.action import RunnerTypeAPI, ActionAPI, LiveActionAPI
 from st2common.models.api.rule import RuleAPI
 from st2common.models.api.trigger import TriggerTypeAPI, TriggerAPI, TriggerInstanceAPI
 from st2common.models.db.execution import ActionExecutionDB
+from st2common.models.db.liveaction import ExecutionLiveActionAccess
 
 __all__ = [
     'create_execution_object',
+    'create_execution_objects',
     'update_execution',
     'abandon_execution_if_incomplete',
     'is_execution_canceled',
@@ -73,16 +79,91 @@ def _decompose_liveaction(liveaction_db):
 
 
 def create_execution_object(liveaction, publish=True):
-    action_db = action_utils.get_action_by_ref(liveaction.action)
-    runner = RunnerType.get_by_name(action_db.runner_type['name'])
+    execution, parent = _get_execution_object(liveaction)
+    execution = ActionExecution.add_or_update(execution, publish=publish)
+
+    if parent:
+        _add_child_to_parent(parent=parent, execution=execution)
+
+    return execution
+
+
+def create_execution_objects(liveactions, publish=True, parameters=None):
+    """
+    Create execution objects for multiple liveactions using a single bulk insert.
+
+    :param liveactions: Persisted liveactions.
+    :type liveactions: ``list`` of :class:`LiveActionDB`
+
+    :param parameters: Parameters to store on each of the executions (in the same order as
+                       liveactions) if they differ from the liveaction parameters (e.g. the
+                       parameters provided by the user before they were rendered).
+    :type parameters: ``list`` of ``dict``
+
+    :return: Created executions (in the same order as liveactions).
+    :rtype: ``list`` of :class:`ActionExecutionDB`
+    """
+    # Actions and runners are usually shared by many of the liveactions so we only retrieve them
+    # once
+    cache = {}
+
+    parameters = parameters or [None] * len(liveactions)
+
+    executions = []
+    parents = []
+    for liveaction, execution_parameters in zip(liveactions, parameters):
+        execution, parent = _get_execution_object(liveaction, cache=cache,
+                                                  parameters=execution_parameters)
+        executions.append(execution)
+        parents.append(parent)
+
+    executions = ActionExecution.insert_many(executions)
+
+    for execution, parent in zip(executions, parents):
+        if parent:
+            _add_child_to_parent(parent=parent, execution=execution)
+
+    if publish:
+        ActionExecution.publish_create_many(executions)
+
+    return executions
+
+
+def _get_execution_object(liveaction, cache=None, parameters=None):
+    """
+    Return a (not yet persisted) execution object for the provided liveaction and the parent
+    execution (if any).
+
+    :param parameters: Parameters to store on the execution instead of the liveaction ones.
+    :type parameters: ``dict``
+
+    :rtype: ``tuple`` of (:class:`ActionExecutionDB`, :class:`ActionExecutionDB`)
+    """
+    cache = cache if cache is not None else {}
+
+    if liveaction.action not in cache:
+        action_db = action_utils.get_action_by_ref(liveaction.action)
+        runner = RunnerType.get_by_name(action_db.runner_type['name'])
+        cache[liveaction.action] = (vars(ActionAPI.from_model(action_db)),
+                                    vars(RunnerTypeAPI.from_model(runner)))
+
+    action_api, runner_api = cache[liveaction.action]
 
     attrs = {
-        'action': vars(ActionAPI.from_model(action_db)),
+        'action': copy.deepcopy(action_api),
         'parameters': liveaction['parameters'],
-        'runner': vars(RunnerTypeAPI.from_model(runner))
+        'runner': copy.deepcopy(runner_api)
     }
     attrs.update(_decompose_liveaction(liveaction))
 
+    if parameters is not None:
+        attrs['parameters'] = parameters
+        attrs['liveaction']['parameters'] = parameters
+
+    if cfg.CONF.database.single_document_executions:
+        # Execution document is the only place where the liveaction is stored
+        attrs['liveaction'].update(ExecutionLiveActionAccess.get_liveaction_fields(liveaction))
+
     if 'rule' in liveaction.context:
         rule = reference.get_model_from_ref(Rule, liveaction.context.get('rule', {}))
         attrs['rule'] = vars(RuleAPI.from_model(rule))
@@ -105,15 +186,13 @@ def create_execution_object(liveaction, publish=True):
     if parent:
         attrs['parent'] = str(parent.id)
 
-    execution = ActionExecutionDB(**attrs)
-    execution = ActionExecution.add_or_update(execution, publish=publish)
+    return ActionExecutionDB(**attrs), parent
 
-    if parent:
-        if str(execution.id) not in parent.children:
-            parent.children.append(str(execution.id))
-            ActionExecution.add_or_update(parent)
 
-    return execution
+def _add_child_to_parent(parent, execution):
+    if str(execution.id) not in parent.children:
+        parent.children.append(str(execution.id))
+        ActionExecution.add_or_update(parent)
 
 
 def _get_parent_execution(child_liveaction_db):
@@ -130,6 +209,14 @@ def _get_parent_execution(child_liveaction_db):
 
 
 def update_execution(liveaction_db, publish=True):
+    if cfg.CONF.database.single_document_executions:
+        # Liveaction is stored in the execution document so the execution has already been
+        # updated when the liveaction was saved.
+        execution = ActionExecution.get(liveaction__id=str(liveaction_db.id))
+        if publish:
+            ActionExecution.publish_update(execution)
+        return execution
+
     execution = ActionExecution.get(liveaction__id=str(liveaction_db.id))
     decomposed = _decompose_liveaction(liveaction_db)
     for k, v in six.iteritems(decomposed):
@@ -217,22 +304,48 @@ def get_descendants(actionexecution_id, descendant_depth=-1, result_fmt=None):
     the supplied actionexecution_id.
     """
     descendants = DESCENDANT_VIEWS.get(result_fmt, DFSDescendantView)()
-    children = ActionExecution.query(parent=actionexecution_id,
-                                     **{'order_by': ['start_timestamp']})
-    LOG.debug('Found %s children for id %s.', len(children), actionexecution_id)
-    current_level = [(child, 1) for child in children]
-
-    while current_level:
-        parent, level = current_level.pop(0)
-        parent_id = str(parent.id)
-        descendants.add(parent)
-        if not parent.children:
-            continue
-        if level != -1 and level == descendant_depth:
-            continue
-        children = ActionExecution.query(parent=parent_id, **{'order_by': ['start_timestamp']})
-        LOG.debug('Found %s children for id %s.', len(children), parent_id)
-        # prepend for DFS
-        for idx in range(len(children)):
-            current_level.insert(idx, (children[idx], level + 1))
+    children_by_parent = _get_children_by_parent(actionexecution_id=actionexecution_id,
+                                                 descendant_depth=descendant_depth)
+
+    # Children are already sorted by start_timestamp so prepending them in reverse order to the
+    # front of the queue yields a DFS traversal.
+    remaining = collections.deque(children_by_parent.get(actionexecution_id, []))
+    while remaining:
+        execution = remaining.popleft()
+        descendants.add(execution)
+        children = children_by_parent.get(str(execution.id), [])
+        remaining.extendleft(reversed(children))
     return descendants.result
+
+
+def _get_children_by_parent(actionexecution_id, descendant_depth=-1):
+    """
+    Retrieve the execution tree rooted at actionexecution_id one level at a time. Each level is
+    fetched with a single query so the number of queries is bound by the depth of the tree and
+    not by the number of executions in it.
+
+    :return: Children sorted by start_timestamp keyed by the parent execution id.
+    :rtype: ``dict``
+    """
+    children_by_parent = collections.defaultdict(list)
+    parent_ids = [actionexecution_id]
+    level = 0
+
+    while parent_ids:
+        if descendant_depth > 0 and level == descendant_depth:
+            break
+
+        children = ActionExecution.query(parent__in=parent_ids,
+                                         **{'order_by': ['start_timestamp']})
+        LOG.debug('Found %s children for %s executions on level %s.', len(children),
+                  len(parent_ids), level + 1)
+
+        parent_ids = []
+        for child in children:
+            children_by_parent[child.parent].append(child)
+            if child.children:
+                parent_ids.append(str(child.id))
+
+        level += 1
+
+    return children_by_parent
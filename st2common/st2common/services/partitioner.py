@@ -0,0 +1,124 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import eventlet
+
+from st2common import log as logging
+from st2common.services import coordination
+from st2common.util.hashring import ConsistentHashRing
+from st2common.util.hashring import DEFAULT_REPLICAS
+
+__all__ = [
+    'GroupPartitioner'
+]
+
+LOG = logging.getLogger(__name__)
+
+# How often (in seconds) to refresh the group membership
+DEFAULT_REFRESH_INTERVAL = 10
+
+
+class GroupPartitioner(object):
+    """
+    Partitions keys (e.g. execution or sensor references) across all the members of a group in
+    the coordination service.
+
+    Group members are placed on a consistent hash ring and each key is owned by exactly one
+    member. Group membership is refreshed periodically and on_rebalance callback is invoked each
+    time the membership changes. If the coordination backend is not configured, this member owns
+    all the keys.
+    """
+
+    def __init__(self, group_id, replicas=DEFAULT_REPLICAS,
+                 refresh_interval=DEFAULT_REFRESH_INTERVAL, coordinator=None, member_id=None,
+                 on_rebalance=None):
+        self.group_id = group_id
+        self.on_rebalance = on_rebalance
+
+        self._replicas = replicas
+        self._refresh_interval = refresh_interval
+        self._coordinator = coordinator
+        self._member_id = member_id or coordination.get_member_id()
+        self._ring = ConsistentHashRing(members=[self._member_id], replicas=self._replicas)
+        self._refresh_thread = None
+
+    @property
+    def members(self):
+        return self._ring.members
+
+    def start(self):
+        if not coordination.configured():
+            LOG.warn('Coordination backend is not configured. Member "%s" of group "%s" will own '
+                     'all the partitions.', self._member_id, self.group_id)
+            return
+
+        if not self._coordinator:
+            self._coordinator = coordination.get_coordinator()
+
+        coordination.join_group(self._coordinator, self.group_id)
+        self.refresh()
+        self._refresh_thread = eventlet.spawn(self._refresh_periodically)
+
+    def stop(self):
+        if self._refresh_thread:
+            self._refresh_thread.kill()
+            self._refresh_thread = None
+
+        if self._coordinator and coordination.configured():
+            coordination.leave_group(self._coordinator, self.group_id)
+
+    def is_owner(self, key):
+        """
+        Return True if the provided key is owned by this member.
+
+        :rtype: ``bool``
+        """
+        return self._ring.get_member(str(key)) == self._member_id
+
+    def refresh(self):
+        """
+        Refresh group membership and rebuild the hash ring if it has changed.
+
+        :return: True if the membership has changed.
+        :rtype: ``bool``
+        """
+        members = coordination.get_group_members(self._coordinator, self.group_id)
+
+        # Make sure this member always owns a partition, even if the membership information
+        # is lagging behind.
+        if self._member_id not in members:
+            members.append(self._member_id)
+
+        if sorted(members) == self._ring.members:
+            return False
+
+        LOG.info('Group "%s" membership has changed: %s -> %s', self.group_id,
+                 self._ring.members, sorted(members))
+        self._ring = ConsistentHashRing(members=members, replicas=self._replicas)
+
+        if self.on_rebalance:
+            self.on_rebalance()
+
+        return True
+
+    def _refresh_periodically(self):
+        while True:
+            eventlet.sleep(self._refresh_interval)
+
+            try:
+                self._coordinator.heartbeat()
+                self.refresh()
+            except Exception:
+                LOG.exception('Failed to refresh group "%s" membership.', self.group_id)
@@ -0,0 +1,80 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from st2common import log as logging
+from st2common import policies
+from st2common.persistence.policy import Policy
+from st2common.services.policy_watcher import PolicyWatcher
+
+__all__ = [
+    'PolicyCache'
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class PolicyCache(object):
+    """
+    Cache of the policies and the corresponding policy drivers keyed by the reference of the
+    resource they apply to.
+
+    Policy drivers are stateless so the same instance is reused for all the executions. Once
+    started, the whole cache is cleared on each policy create, update and delete event.
+    """
+
+    def __init__(self, queue_suffix=None):
+        self._drivers = {}
+        self._watcher = PolicyWatcher(handler=self._handle_policy_event,
+                                      queue_suffix=queue_suffix)
+
+    def start(self):
+        self._watcher.start()
+
+    def stop(self):
+        self._watcher.stop()
+
+    def get_drivers(self, resource_ref):
+        """
+        Retrieve policies and instantiated drivers for the provided resource.
+
+        :rtype: ``list`` of (:class:`PolicyDB`, :class:`ResourcePolicyApplicator`) tuples
+        """
+        drivers = self._drivers.get(resource_ref, None)
+
+        if drivers is None:
+            drivers = self._get_drivers_from_db(resource_ref=resource_ref)
+            self._drivers[resource_ref] = drivers
+
+        return drivers
+
+    def clear(self):
+        self._drivers = {}
+
+    def _get_drivers_from_db(self, resource_ref):
+        drivers = []
+
+        for policy_db in Policy.query(resource_ref=resource_ref):
+            driver = policies.get_driver(policy_db.ref,
+                                         policy_db.policy_type,
+                                         **policy_db.parameters)
+            drivers.append((policy_db, driver))
+
+        LOG.debug('Cached %s policies for resource "%s".', len(drivers), resource_ref)
+        return drivers
+
+    def _handle_policy_event(self, policy_db):
+        LOG.debug('Policy "%s" has changed, clearing policy cache.',
+                  getattr(policy_db, 'ref', None))
+        self.clear()
@@ -0,0 +1,87 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import eventlet
+from kombu.mixins import ConsumerMixin
+from kombu import Connection
+
+from st2common import log as logging
+from st2common.transport import policy as policy_transport
+from st2common.transport import utils as transport_utils
+import st2common.util.queues as queue_utils
+
+__all__ = [
+    'PolicyWatcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class PolicyWatcher(ConsumerMixin):
+    """
+    Watcher which invokes the provided handler on each Policy CUD event.
+    """
+
+    def __init__(self, handler, queue_suffix=None):
+        """
+        :param handler: Function which is called with the PolicyDB on create, update and delete
+                        events.
+        :type handler: ``callable``
+        """
+        self._handler = handler
+        self._policy_watcher_q = self._get_queue(queue_suffix)
+
+        self.connection = None
+        self._updates_thread = None
+
+    def get_consumers(self, Consumer, channel):
+        return [Consumer(queues=[self._policy_watcher_q],
+                         accept=['pickle'],
+                         callbacks=[self.process_task])]
+
+    def process_task(self, body, message):
+        LOG.debug('Received policy event with routing key "%s": %s',
+                  message.delivery_info.get('routing_key', ''), body)
+
+        try:
+            self._handler(body)
+        except Exception:
+            LOG.exception('Handling failed. Message body: %s.', body)
+        finally:
+            message.ack()
+
+    def start(self):
+        try:
+            self.connection = Connection(transport_utils.get_messaging_urls())
+            self._updates_thread = eventlet.spawn(self.run)
+        except:
+            LOG.exception('Failed to start policy watcher.')
+            self.connection.release()
+
+    def stop(self):
+        try:
+            if self._updates_thread:
+                self._updates_thread = eventlet.kill(self._updates_thread)
+        finally:
+            if self.connection:
+                self.connection.release()
+
+    @staticmethod
+    def _get_queue(queue_suffix):
+        queue_name = queue_utils.get_queue_name(queue_name_base='st2.policy.watch',
+                                                queue_name_suffix=queue_suffix,
+                                                add_random_uuid_to_suffix=True)
+        return policy_transport.get_policy_cud_queue(queue_name, routing_key='#',
+                                                     exclusive=True)
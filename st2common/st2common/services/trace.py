@@ -36,6 +36,7 @@ __all__ = [
     'get_trace',
     'add_or_update_given_trace_context',
     'add_or_update_given_trace_db',
+    'add_traces_for_action_executions',
     'get_trace_component_for_action_execution',
     'get_trace_component_for_rule',
     'get_trace_component_for_trigger_instance'
@@ -276,10 +277,37 @@ def add_or_update_given_trace_db(trace_db, action_executions=None, rules=None,
     trace_db.action_executions = action_executions
     trace_db.rules = rules
     trace_db.trigger_instances = trigger_instances
+    trace_db.component_count = len(action_executions) + len(rules) + len(trigger_instances)
 
     return Trace.add_or_update(trace_db)
 
 
+def add_traces_for_action_executions(trace_dbs, action_executions):
+    """
+    Create multiple new Traces using a single bulk insert. Each Trace contains the matching
+    action_execution.
+
+    :param trace_dbs: New (not yet persisted) TraceDBs.
+    :type trace_dbs: ``list``
+
+    :param action_executions: The action_executions to be added to the Traces. Should be a list
+                              of object_ids or dicts containing object_ids and caused_by.
+    :type action_executions: ``list``
+
+    :rtype: ``list`` of ``TraceDB``
+    """
+    if len(trace_dbs) != len(action_executions):
+        raise ValueError('Number of traces and action_executions should match.')
+
+    for trace_db, action_execution in zip(trace_dbs, action_executions):
+        trace_db.action_executions = [_to_trace_component_db(component=action_execution)]
+        trace_db.rules = []
+        trace_db.trigger_instances = []
+        trace_db.component_count = 1
+
+    return Trace.insert_many(trace_dbs)
+
+
 def get_trace_component_for_action_execution(action_execution_db, liveaction_db):
     """
     Returns the trace_component compatible dict representation of an actionexecution.
@@ -20,18 +20,23 @@ the whole code base.
 
 from __future__ import absolute_import
 
+import json
 import signal
 import logging
 
 from st2common.logging.misc import reopen_log_files
+from st2common.models.utils import profiling
 
 __all__ = [
     'register_common_signal_handlers',
 ]
 
+LOG = logging.getLogger(__name__)
+
 
 def register_common_signal_handlers():
     signal.signal(signal.SIGUSR1, handle_sigusr1)
+    signal.signal(signal.SIGUSR2, handle_sigusr2)
 
 
 def handle_sigusr1(signal_number, stack_frame):
@@ -42,3 +47,15 @@ def handle_sigusr1(signal_number, stack_frame):
     """
     handlers = logging.getLoggerClass().manager.root.handlers
     reopen_log_files(handlers=handlers)
+
+
+def handle_sigusr2(signal_number, stack_frame):
+    """
+    Global SIGUSR2 signal handler which writes the database query stats to the service log.
+    """
+    if not profiling.is_query_stats_enabled():
+        LOG.info('Database query stats are not enabled.')
+        return
+
+    stats = profiling.get_query_stats()
+    LOG.info('Database query stats: %s', json.dumps(stats, default=str), extra={'stats': stats})
@@ -19,6 +19,7 @@ from st2common.transport import utils as transport_utils
 from st2common.transport.connection_retry_wrapper import ConnectionRetryWrapper
 from st2common.transport.execution import EXECUTION_XCHG
 from st2common.transport.liveaction import LIVEACTION_XCHG
+from st2common.transport.policy import POLICY_CUD_XCHG
 from st2common.transport.reactor import TRIGGER_CUD_XCHG, TRIGGER_INSTANCE_XCHG
 from st2common.transport.reactor import SENSOR_CUD_XCHG
 
@@ -29,7 +30,14 @@ __all__ = [
 ]
 
 EXCHANGES = [EXECUTION_XCHG, LIVEACTION_XCHG, TRIGGER_CUD_XCHG, TRIGGER_INSTANCE_XCHG,
-             SENSOR_CUD_XCHG]
+             SENSOR_CUD_XCHG, POLICY_CUD_XCHG]
+
+# Durable queues which are not consumed anymore. Those queues are still bound to the exchanges on
+# the upgraded deployments so they need to be deleted, otherwise messages would pile up in them.
+DEPRECATED_QUEUES = [
+    # Replaced by "st2.notifiers.completed.work" queue which is only bound to the completed states
+    'st2.notifiers.work'
+]
 
 
 def _do_register_exchange(exchange, connection, channel, retry_wrapper):
@@ -53,6 +61,23 @@ def _do_register_exchange(exchange, connection, channel, retry_wrapper):
         LOG.exception('Failed to register exchange : %s.', exchange.name)
 
 
+def _do_delete_queue(queue_name, connection, channel, retry_wrapper):
+    try:
+        kwargs = {
+            'queue': queue_name,
+            'if_unused': False,
+            'if_empty': False,
+            'nowait': False
+        }
+        retry_wrapper.ensured(connection=connection,
+                              obj=channel,
+                              to_ensure_func=channel.queue_delete,
+                              **kwargs)
+        LOG.debug('deleted queue %s.', queue_name)
+    except Exception:
+        LOG.exception('Failed to delete queue : %s.', queue_name)
+
+
 def register_exchanges():
     LOG.debug('Registering exchanges...')
     connection_urls = transport_utils.get_messaging_urls()
@@ -65,4 +90,8 @@ def register_exchanges():
                 _do_register_exchange(exchange=exchange, connection=connection, channel=channel,
                                       retry_wrapper=retry_wrapper)
 
+            for queue_name in DEPRECATED_QUEUES:
+                _do_delete_queue(queue_name=queue_name, connection=connection, channel=channel,
+                                 retry_wrapper=retry_wrapper)
+
         retry_wrapper.run(connection=conn, wrapped_callback=wrapped_register_exchanges)
@@ -97,7 +97,7 @@ class ConnectionRetryWrapper(object):
     def errback(self, exc, interval):
         self._logger.error('Rabbitmq connection error: %s', exc.message)
 
-    def run(self, connection, wrapped_callback):
+    def run(self, connection, wrapped_callback, get_channel=None, close_channel=True):
         """
         Run the wrapped_callback in a protective covering of retries and error handling.
 
@@ -107,12 +107,22 @@ class ConnectionRetryWrapper(object):
         :param wrapped_callback: Callback that will be wrapped by all the fine handling in this
                                  method. Expected signature of callback -
                                  ``def func(connection, channel)``
+
+        :param get_channel: Optional function which returns a channel for the provided
+                            connection. By default a new channel is created for each attempt.
+                            Expected signature - ``def func(connection)``
+
+        :param close_channel: True to close the channel once the callback has completed. Should
+                              be False for long lived channels returned by ``get_channel``.
+        :type close_channel: ``bool``
         """
+        get_channel = get_channel or (lambda connection: connection.channel())
+
         should_stop = False
         channel = None
         while not should_stop:
             try:
-                channel = connection.channel()
+                channel = get_channel(connection)
                 wrapped_callback(connection=connection, channel=channel)
                 should_stop = True
             except connection.connection_errors + connection.channel_errors as e:
@@ -143,7 +153,7 @@ class ConnectionRetryWrapper(object):
                 # Not being able to publish a message could be a significant issue for an app.
                 raise
             finally:
-                if should_stop and channel:
+                if should_stop and channel and close_channel:
                     try:
                         channel.close()
                     except Exception:
@@ -14,12 +14,16 @@
 # limitations under the License.
 
 import abc
+import time
+
 import eventlet
 import six
 
 from kombu.mixins import ConsumerMixin
 
 from st2common import log as logging
+from st2common.metrics import base as metrics
+from st2common.transport.publishers import PUBLISHED_AT_HEADER
 from st2common.util.greenpooldispatch import BufferedDispatcher
 
 
@@ -32,6 +36,7 @@ class QueueConsumer(ConsumerMixin):
         self._dispatcher = BufferedDispatcher()
         self._queues = queues
         self._handler = handler
+        self._metrics_prefix = 'queue_consumer.%s' % (handler.__class__.__name__)
 
     def shutdown(self):
         self._dispatcher.shutdown()
@@ -46,6 +51,9 @@ class QueueConsumer(ConsumerMixin):
         return [consumer]
 
     def process(self, body, message):
+        if metrics.is_enabled():
+            self._record_queue_lag(message=message)
+
         try:
             self._dispatcher.dispatch(self._process_message, body)
         finally:
@@ -56,10 +64,21 @@ class QueueConsumer(ConsumerMixin):
             if not isinstance(body, self._handler.message_type):
                 raise TypeError('Received an unexpected type "%s" for payload.' % type(body))
 
-            self._handler.process(body)
+            with metrics.Timer(self._metrics_prefix + '.process_time'):
+                self._handler.process(body)
         except:
             LOG.exception('%s failed to process message: %s', self.__class__.__name__, body)
 
+    def _record_queue_lag(self, message):
+        metrics.inc_counter(self._metrics_prefix + '.messages')
+
+        # Publish timestamp is only available if the publisher also has metrics enabled
+        headers = getattr(message, 'headers', None) or {}
+        published_at = headers.get(PUBLISHED_AT_HEADER, None)
+
+        if published_at:
+            metrics.timing(self._metrics_prefix + '.queue_lag', time.time() - published_at)
+
 
 @six.add_metaclass(abc.ABCMeta)
 class MessageHandler(object):
@@ -15,7 +15,7 @@
 
 # All Exchanges and Queues related to liveaction.
 
-from kombu import Exchange, Queue
+from kombu import Exchange, Queue, binding
 from st2common.transport import publishers
 
 
@@ -36,3 +36,12 @@ def get_queue(name, routing_key):
 
 def get_status_management_queue(name, routing_key):
     return Queue(name, LIVEACTION_STATUS_MGMT_XCHG, routing_key=routing_key)
+
+
+def get_status_management_queue_for_states(name, states):
+    """
+    Return a queue which is bound to the status management exchange once for each of the
+    provided states. This way a consumer only receives messages for the states it cares about.
+    """
+    bindings = [binding(LIVEACTION_STATUS_MGMT_XCHG, routing_key=state) for state in states]
+    return Queue(name, bindings=bindings)
@@ -14,11 +14,16 @@
 # limitations under the License.
 
 import copy
+import socket
+import time
 
+import six
 from kombu import Connection
 from kombu.messaging import Producer
 
 from st2common import log as logging
+from st2common.exceptions.transport import MessageNotConfirmedException
+from st2common.metrics import base as metrics
 from st2common.transport.connection_retry_wrapper import ConnectionRetryWrapper
 
 ANY_RK = '*'
@@ -26,39 +31,266 @@ CREATE_RK = 'create'
 UPDATE_RK = 'update'
 DELETE_RK = 'delete'
 
+# How long (in seconds) to wait for the broker to confirm a batch of published messages
+DEFAULT_CONFIRM_TIMEOUT = 30
+
+# Name of the message header which holds the publish timestamp. It's only set when metrics are
+# enabled and used by consumers to measure the queue lag.
+PUBLISHED_AT_HEADER = 'st2_published_at'
+
 LOG = logging.getLogger(__name__)
 
 
+class PublishConfirmTracker(object):
+    """
+    Tracks publisher confirms for a channel which has been put into the confirm mode.
+
+    Broker confirms messages using delivery tags which are sequence numbers of the messages
+    published on the channel (starting with 1) so messages can be published without waiting and
+    confirms for the whole batch are then awaited at once.
+    """
+
+    def __init__(self, channel):
+        self._next_tag = 1
+        self._unconfirmed = set()
+        self._nacked = set()
+
+        channel.confirm_select()
+        channel.events['basic_ack'].add(self._on_ack)
+        channel.events['basic_nack'].add(self._on_nack)
+
+    @staticmethod
+    def is_supported(channel):
+        return hasattr(channel, 'confirm_select') and hasattr(channel, 'events')
+
+    def add(self):
+        """
+        Register a published message and return its delivery tag.
+        """
+        tag = self._next_tag
+        self._next_tag += 1
+        self._unconfirmed.add(tag)
+        return tag
+
+    def is_confirmed(self, tag):
+        return tag not in self._unconfirmed
+
+    def wait(self, connection, tags, timeout=DEFAULT_CONFIRM_TIMEOUT):
+        """
+        Wait until all the provided messages have been confirmed by the broker.
+
+        Note: socket.timeout is raised on timeout so it's handled the same way as other
+        connection errors.
+
+        :return: Delivery tags of the messages which were rejected (nacked) by the broker.
+        :rtype: ``list``
+        """
+        deadline = time.time() + timeout
+
+        while not all(self.is_confirmed(tag) for tag in tags):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise socket.timeout('Timed out waiting for publisher confirms.')
+
+            connection.drain_events(timeout=remaining)
+
+        return [tag for tag in tags if tag in self._nacked]
+
+    def _on_ack(self, delivery_tag, multiple, *args):
+        self._confirm(delivery_tag=delivery_tag, multiple=multiple)
+
+    def _on_nack(self, delivery_tag, multiple, *args):
+        self._confirm(delivery_tag=delivery_tag, multiple=multiple, nacked=True)
+
+    def _confirm(self, delivery_tag, multiple, nacked=False):
+        if multiple:
+            tags = [tag for tag in self._unconfirmed if tag <= delivery_tag]
+        else:
+            tags = [delivery_tag]
+
+        for tag in tags:
+            self._unconfirmed.discard(tag)
+            if nacked:
+                self._nacked.add(tag)
+
+
+class PublishChannel(object):
+    """
+    Long lived channel and producer used for publishing messages over a pooled connection.
+    """
+
+    def __init__(self, channel, confirm_publish=False):
+        self.channel = channel
+        self.producer = Producer(channel)
+        self.tracker = None
+
+        if confirm_publish:
+            if PublishConfirmTracker.is_supported(channel):
+                self.tracker = PublishConfirmTracker(channel)
+            else:
+                LOG.warning('Messaging transport doesn\'t support publisher confirms, messages '
+                            'will be published without confirms.')
+
+    def is_usable(self):
+        # Producer is bound to a new channel when the connection is revived after an error
+        if self.producer.channel is not self.channel:
+            return False
+
+        if hasattr(self.channel, 'is_open'):
+            return self.channel.is_open
+
+        return not getattr(self.channel, 'closed', False)
+
+    def close(self):
+        try:
+            self.channel.close()
+        except Exception:
+            LOG.debug('Error closing channel.', exc_info=True)
+
+
 class PoolPublisher(object):
-    def __init__(self, urls):
+    def __init__(self, urls, confirm_publish=False, confirm_timeout=DEFAULT_CONFIRM_TIMEOUT):
+        """
+        :param confirm_publish: True to wait for the broker to confirm the published messages.
+                                Messages published with publish_many are confirmed as a batch.
+        :type confirm_publish: ``bool``
+
+        :param confirm_timeout: How long (in seconds) to wait for the confirms.
+        :type confirm_timeout: ``float``
+        """
         self.pool = Connection(urls, failover_strategy='round-robin').Pool(limit=10)
         self.cluster_size = len(urls)
+        self._confirm_publish = confirm_publish
+        self._confirm_timeout = confirm_timeout
+
+        # Long lived channels keyed by the id of the pooled connection they belong to. Pooled
+        # connections are only used by a single green thread at a time so the channels are
+        # never shared between green threads.
+        self._channels = {}
 
     def errback(self, exc, interval):
         LOG.error('Rabbitmq connection error: %s', exc.message, exc_info=False)
 
     def publish(self, payload, exchange, routing_key=''):
+        self._publish(payloads=[payload], exchange=exchange, routing_key=routing_key)
+
+    def publish_many(self, payloads, exchange, routing_key=''):
+        """
+        Publish multiple messages using a single connection, channel and producer.
+
+        If publisher confirms are enabled, all the messages are published before waiting for the
+        confirms so the whole batch only waits for the broker once.
+
+        :param payloads: Message payloads.
+        :type payloads: ``list``
+        """
+        if not payloads:
+            return
+
+        self._publish(payloads=payloads, exchange=exchange, routing_key=routing_key)
+
+    @metrics.Timer('publisher.publish_time')
+    def _publish(self, payloads, exchange, routing_key):
+        metrics.inc_counter('publisher.messages', len(payloads))
+
         with self.pool.acquire(block=True) as connection:
             retry_wrapper = ConnectionRetryWrapper(cluster_size=self.cluster_size, logger=LOG)
+            # Indexes of the messages which haven't been published (or confirmed) yet. It
+            # survives retries so messages which have already been published are not published
+            # again on reconnect.
+            state = {'pending': list(range(0, len(payloads)))}
 
             def do_publish(connection, channel):
-                # ProducerPool ends up creating it own ConnectionPool which ends up completely
-                # invalidating this ConnectionPool. Also, a ConnectionPool for producer does not
-                # really solve any problems for us so better to create a Producer for each
-                # publish.
-                producer = Producer(channel)
-                kwargs = {
-                    'body': payload,
-                    'exchange': exchange,
-                    'routing_key': routing_key,
-                    'serializer': 'pickle'
-                }
-                retry_wrapper.ensured(connection=connection,
-                                      obj=producer,
-                                      to_ensure_func=producer.publish,
-                                      **kwargs)
-
-            retry_wrapper.run(connection=connection, wrapped_callback=do_publish)
+                while state['pending']:
+                    self._publish_pending(connection=connection, retry_wrapper=retry_wrapper,
+                                          payloads=payloads, exchange=exchange,
+                                          routing_key=routing_key, state=state)
+
+            try:
+                retry_wrapper.run(connection=connection, wrapped_callback=do_publish,
+                                  get_channel=self._get_channel, close_channel=False)
+            except Exception:
+                self._discard_channel(connection)
+                raise
+
+    def _publish_pending(self, connection, retry_wrapper, payloads, exchange, routing_key,
+                         state):
+        publish_channel = self._get_publish_channel(connection)
+        producer = publish_channel.producer
+        tracker = publish_channel.tracker
+
+        # Maps delivery tag to the message index
+        tags = {}
+
+        for index in list(state['pending']):
+            kwargs = {
+                'body': payloads[index],
+                'exchange': exchange,
+                'routing_key': routing_key,
+                'serializer': 'pickle'
+            }
+
+            if metrics.is_enabled():
+                kwargs['headers'] = {PUBLISHED_AT_HEADER: time.time()}
+
+            retry_wrapper.ensured(connection=connection,
+                                  obj=producer,
+                                  to_ensure_func=producer.publish,
+                                  **kwargs)
+
+            if not publish_channel.is_usable():
+                # Connection has been revived and the producer now uses a new channel. Confirms
+                # for the messages published on the old channel will never arrive so those
+                # messages are published again using a new long lived channel.
+                self._discard_channel(connection)
+
+                if not tracker:
+                    state['pending'].remove(index)
+                return
+
+            if tracker:
+                tags[tracker.add()] = index
+            else:
+                state['pending'].remove(index)
+
+        if not tags:
+            return
+
+        try:
+            nacked = tracker.wait(connection=connection, tags=list(tags.keys()),
+                                  timeout=self._confirm_timeout)
+        finally:
+            # Messages which have been confirmed before an error are not published again
+            confirmed = [index for tag, index in six.iteritems(tags) if tracker.is_confirmed(tag)]
+            state['pending'] = [index for index in state['pending'] if index not in confirmed]
+
+        if nacked:
+            raise MessageNotConfirmedException('%s message(s) published to exchange "%s" were '
+                                               'rejected by the broker.' %
+                                               (len(nacked), getattr(exchange, 'name', exchange)))
+
+    def _get_channel(self, connection):
+        return self._get_publish_channel(connection).channel
+
+    def _get_publish_channel(self, connection):
+        publish_channel = self._channels.get(id(connection), None)
+
+        if publish_channel and publish_channel.is_usable():
+            return publish_channel
+
+        if publish_channel:
+            publish_channel.close()
+
+        publish_channel = PublishChannel(channel=connection.channel(),
+                                         confirm_publish=self._confirm_publish)
+        self._channels[id(connection)] = publish_channel
+        return publish_channel
+
+    def _discard_channel(self, connection):
+        publish_channel = self._channels.pop(id(connection), None)
+
+        if publish_channel:
+            publish_channel.close()
 
 
 class SharedPoolPublishers(object):
@@ -95,6 +327,9 @@ class CUDPublisher(object):
     def publish_update(self, payload):
         self._publisher.publish(payload, self._exchange, UPDATE_RK)
 
+    def publish_create_many(self, payloads):
+        self._publisher.publish_many(payloads, self._exchange, CREATE_RK)
+
     def publish_delete(self, payload):
         self._publisher.publish(payload, self._exchange, DELETE_RK)
 
@@ -109,3 +344,9 @@ class StatePublisherMixin(object):
             raise Exception('Unable to publish unassigned state.')
 
         self._state_publisher.publish(payload, self._state_exchange, state)
+
+    def publish_state_many(self, payloads, state):
+        if not state:
+            raise Exception('Unable to publish unassigned state.')
+
+        self._state_publisher.publish_many(payloads, self._state_exchange, state)
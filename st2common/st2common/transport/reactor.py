@@ -13,10 +13,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
+import eventlet
+from eventlet.queue import Empty, Full, LightQueue
 from kombu import Exchange, Queue
 
 from st2common import log as logging
 from st2common.constants.trace import TRACE_CONTEXT
+from st2common.exceptions.triggers import TriggerDispatchBufferFullException
 from st2common.models.api.trace import TraceContext
 from st2common.transport import publishers
 from st2common.transport import utils as transport_utils
@@ -26,6 +31,7 @@ __all__ = [
     'TriggerInstancePublisher',
 
     'TriggerDispatcher',
+    'BufferedTriggerDispatcher',
 
     'get_sensor_cud_queue',
     'get_trigger_cud_queue',
@@ -63,21 +69,27 @@ class TriggerCUDPublisher(publishers.CUDPublisher):
 
 
 class TriggerInstancePublisher(object):
-    def __init__(self, urls):
-        self._publisher = publishers.PoolPublisher(urls=urls)
+    def __init__(self, urls, confirm_publish=False):
+        self._publisher = publishers.PoolPublisher(urls=urls, confirm_publish=confirm_publish)
 
     def publish_trigger(self, payload=None, routing_key=None):
         # TODO: We should use trigger reference as a routing key
         self._publisher.publish(payload, TRIGGER_INSTANCE_XCHG, routing_key)
 
+    def publish_triggers(self, payloads, routing_key=None):
+        self._publisher.publish_many(payloads, TRIGGER_INSTANCE_XCHG, routing_key)
+
 
 class TriggerDispatcher(object):
     """
     This trigger dispatcher dispatches trigger instances to a message queue (RabbitMQ).
     """
 
-    def __init__(self, logger=LOG):
-        self._publisher = TriggerInstancePublisher(urls=transport_utils.get_messaging_urls())
+    routing_key = 'trigger_instance'
+
+    def __init__(self, logger=LOG, confirm_publish=False):
+        self._publisher = TriggerInstancePublisher(urls=transport_utils.get_messaging_urls(),
+                                                   confirm_publish=confirm_publish)
         self._logger = logger
 
     def dispatch(self, trigger, payload=None, trace_context=None):
@@ -93,18 +105,226 @@ class TriggerDispatcher(object):
         :param trace_context: Trace context to associate with Trigger.
         :type trace_context: ``TraceContext``
         """
+        payload = self._get_message(trigger=trigger, payload=payload,
+                                    trace_context=trace_context)
+
+        self._logger.debug('Dispatching trigger (trigger=%s,payload=%s)', trigger, payload)
+        self._publisher.publish_trigger(payload=payload, routing_key=self.routing_key)
+
+    def dispatch_many(self, trigger_instances):
+        """
+        Method which dispatches multiple triggers at once using a single channel.
+
+        :param trigger_instances: List of (trigger, payload, trace_context) tuples.
+        :type trigger_instances: ``list`` of ``tuple``
+        """
+        payloads = [self._get_message(trigger=trigger, payload=payload,
+                                      trace_context=trace_context)
+                    for trigger, payload, trace_context in trigger_instances]
+
+        self._logger.debug('Dispatching %s triggers', len(payloads))
+        self._publisher.publish_triggers(payloads=payloads, routing_key=self.routing_key)
+
+    def _get_message(self, trigger, payload=None, trace_context=None):
         assert isinstance(payload, (type(None), dict))
         assert isinstance(trace_context, (type(None), TraceContext))
 
-        payload = {
+        return {
             'trigger': trigger,
             'payload': payload,
             TRACE_CONTEXT: trace_context
         }
-        routing_key = 'trigger_instance'
 
-        self._logger.debug('Dispatching trigger (trigger=%s,payload=%s)', trigger, payload)
-        self._publisher.publish_trigger(payload=payload, routing_key=routing_key)
+
+class BufferedTriggerDispatcher(TriggerDispatcher):
+    """
+    Trigger dispatcher which buffers dispatched triggers in memory and publishes them in batches
+    from a background green thread.
+
+    Messages are published with publisher confirms. If the buffer is full, dispatch blocks for
+    up to ``buffer_timeout`` seconds and then raises ``TriggerDispatchBufferFullException``
+    which signals the caller to slow down.
+
+    A batch which fails to publish stays at the head of the buffer and is retried with an
+    exponential backoff until it's published. No new messages are taken from the buffer in the
+    mean time so a broker outage results in a full buffer (backpressure) instead of lost
+    triggers. Messages are only dropped once the dispatcher is stopping and the remaining batch
+    still fails to publish after ``shutdown_attempts`` attempts.
+
+    Note: Messages of a batch which failed part way through may be published more than once.
+    """
+
+    # How long the flusher waits for the first message of a batch before checking if it should
+    # stop.
+    idle_timeout = 1
+
+    # Initial and maximum delay (in seconds) between the attempts to publish a failed batch.
+    retry_delay = 0.5
+    max_retry_delay = 30
+
+    # How many times each of the remaining batches is attempted once the dispatcher is stopping.
+    shutdown_attempts = 3
+
+    def __init__(self, logger=LOG, batch_size=100, linger_time=0.05, buffer_size=10000,
+                 buffer_timeout=5, stats_interval=None):
+        """
+        :param batch_size: Maximum number of messages published in a single batch.
+        :type batch_size: ``int``
+
+        :param linger_time: How long (in seconds) to wait for more messages once the first
+                            message of a batch has been received.
+        :type linger_time: ``float``
+
+        :param buffer_size: Maximum number of buffered messages.
+        :type buffer_size: ``int``
+
+        :param buffer_timeout: How long (in seconds) dispatch blocks when the buffer is full.
+        :type buffer_timeout: ``float``
+
+        :param stats_interval: How often (in seconds) to log the dispatcher stats. None to
+                               disable.
+        :type stats_interval: ``int``
+        """
+        super(BufferedTriggerDispatcher, self).__init__(logger=logger, confirm_publish=True)
+        self._batch_size = batch_size
+        self._linger_time = linger_time
+        self._buffer_timeout = buffer_timeout
+        self._buffer = LightQueue(maxsize=buffer_size)
+        # Batch which is being published (or retried)
+        self._batch = []
+        self._flusher = None
+        self._running = False
+
+        self._stats_interval = stats_interval
+        self._stats_logged_at = time.time()
+        self._stats = {
+            'dispatched': 0,
+            'rejected': 0,
+            'published': 0,
+            'retried': 0,
+            'failed': 0
+        }
+
+    def start(self):
+        self._running = True
+        self._flusher = eventlet.spawn(self._flush)
+
+    def stop(self):
+        """
+        Stop the flusher after all the buffered messages have been published.
+        """
+        self._running = False
+
+        if self._flusher:
+            self._flusher.wait()
+            self._flusher = None
+
+    def dispatch(self, trigger, payload=None, trace_context=None):
+        message = (trigger, payload, trace_context)
+        # Validate here so the caller and not the flusher gets the error
+        self._get_message(trigger=trigger, payload=payload, trace_context=trace_context)
+
+        try:
+            self._buffer.put(message, block=True, timeout=self._buffer_timeout)
+        except Full:
+            self._stats['rejected'] += 1
+            msg = ('Trigger dispatch buffer is full (%s messages), unable to dispatch trigger '
+                   '"%s"' % (self._buffer.qsize(), trigger))
+            raise TriggerDispatchBufferFullException(msg)
+
+        self._stats['dispatched'] += 1
+
+    def get_buffered_count(self):
+        """
+        Return the number of messages which are waiting to be published.
+
+        :rtype: ``int``
+        """
+        return self._buffer.qsize() + len(self._batch)
+
+    def get_stats(self):
+        """
+        Return the number of dispatched, rejected (buffer full), published, retried, failed
+        (dropped on shutdown) and currently buffered triggers.
+
+        :rtype: ``dict``
+        """
+        stats = dict(self._stats)
+        stats['buffered'] = self.get_buffered_count()
+        return stats
+
+    def _flush(self):
+        while self._running or self._buffer.qsize() > 0:
+            batch = self._get_batch()
+            self._log_stats()
+
+            if not batch:
+                continue
+
+            self._batch = batch
+
+            try:
+                self._publish_batch(batch)
+            finally:
+                self._batch = []
+
+    def _publish_batch(self, batch):
+        delay = self.retry_delay
+        attempts = 0
+
+        while True:
+            attempts += 1
+
+            try:
+                self.dispatch_many(batch)
+            except Exception:
+                self._logger.exception('Failed to publish %s buffered triggers (attempt %s).',
+                                       len(batch), attempts)
+            else:
+                self._stats['published'] += len(batch)
+                return
+
+            if not self._running and attempts >= self.shutdown_attempts:
+                self._stats['failed'] += len(batch)
+                self._logger.error('Dispatcher is stopping, dropping %s buffered triggers which '
+                                   'failed to publish.', len(batch))
+                return
+
+            self._stats['retried'] += len(batch)
+            eventlet.sleep(delay)
+            delay = min(delay * 2, self.max_retry_delay)
+
+    def _log_stats(self):
+        if not self._stats_interval:
+            return
+
+        now = time.time()
+        if now - self._stats_logged_at < self._stats_interval:
+            return
+
+        self._stats_logged_at = now
+        self._logger.info('Trigger dispatcher stats: %s', self.get_stats())
+
+    def _get_batch(self):
+        batch = []
+
+        try:
+            batch.append(self._buffer.get(block=True, timeout=self.idle_timeout))
+        except Empty:
+            return batch
+
+        deadline = time.time() + self._linger_time
+        while len(batch) < self._batch_size:
+            remaining = deadline - time.time()
+            try:
+                if remaining > 0:
+                    batch.append(self._buffer.get(block=True, timeout=remaining))
+                else:
+                    batch.append(self._buffer.get_nowait())
+            except Empty:
+                break
+
+        return batch
 
 
 def get_trigger_cud_queue(name, routing_key, exclusive=False):
@@ -0,0 +1,101 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import hashlib
+import struct
+
+import six
+
+__all__ = [
+    'ConsistentHashRing',
+    'hash_key'
+]
+
+# Number of virtual nodes placed on the ring for each member
+DEFAULT_REPLICAS = 100
+
+
+def hash_key(key):
+    """
+    Map the provided key to an unsigned 64-bit integer.
+
+    :rtype: ``int``
+    """
+    if isinstance(key, six.text_type):
+        key = key.encode('utf-8')
+
+    return struct.unpack('>Q', hashlib.md5(key).digest()[:8])[0]
+
+
+class ConsistentHashRing(object):
+    """
+    Consistent hash ring which maps keys to members.
+
+    Each member is placed on the ring multiple times (virtual nodes) so the keys are evenly
+    distributed and only ~1/N of the keys move when a member joins or leaves.
+    """
+
+    def __init__(self, members=None, replicas=DEFAULT_REPLICAS):
+        self._replicas = replicas
+        self._members = set()
+        self._ring = {}
+        self._sorted_keys = []
+
+        for member in members or []:
+            self.add_member(member)
+
+    @property
+    def members(self):
+        return sorted(self._members)
+
+    def add_member(self, member):
+        if member in self._members:
+            return
+
+        self._members.add(member)
+        for replica in range(self._replicas):
+            point = hash_key('%s:%s' % (member, replica))
+            self._ring[point] = member
+            bisect.insort(self._sorted_keys, point)
+
+    def remove_member(self, member):
+        if member not in self._members:
+            return
+
+        self._members.remove(member)
+        for replica in range(self._replicas):
+            point = hash_key('%s:%s' % (member, replica))
+            if self._ring.get(point, None) == member:
+                del self._ring[point]
+                self._sorted_keys.remove(point)
+
+    def get_member(self, key):
+        """
+        Retrieve member which owns the provided key.
+
+        :return: Member or None if the ring is empty.
+        """
+        if not self._sorted_keys:
+            return None
+
+        index = bisect.bisect(self._sorted_keys, hash_key(key))
+        if index == len(self._sorted_keys):
+            index = 0
+
+        return self._ring[self._sorted_keys[index]]
+
+    def __len__(self):
+        return len(self._members)
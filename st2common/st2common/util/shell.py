@@ -27,6 +27,7 @@ from st2common import log as logging
 __all__ = [
     'run_command',
     'kill_process',
+    'get_process_resource_usage',
 
     'quote_unix',
     'quote_windows'
@@ -37,6 +38,9 @@ LOG = logging.getLogger(__name__)
 # Constant taken from http://linux.die.net/include/linux/prctl.h
 PR_SET_PDEATHSIG = 1
 
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
 
 # pylint: disable=too-many-function-args
 def run_command(cmd, stdin=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=False,
@@ -101,6 +105,35 @@ def kill_process(process):
     return status
 
 
+def get_process_resource_usage(pid):
+    """
+    Return CPU time (in seconds) and resident set size (in bytes) of the provided process.
+
+    Information is read from procfs so None is returned on systems without it or if the process
+    doesn't exist anymore.
+
+    :rtype: ``dict`` or ``None``
+    """
+    try:
+        with open('/proc/%s/stat' % (pid), 'r') as fp:
+            stat = fp.read()
+
+        with open('/proc/%s/statm' % (pid), 'r') as fp:
+            statm = fp.read()
+    except (IOError, OSError):
+        return None
+
+    # Process name (2nd field) can contain spaces so fields are counted from its end
+    stat_fields = stat[stat.rfind(')') + 2:].split()
+    utime, stime = int(stat_fields[11]), int(stat_fields[12])
+    rss_pages = int(statm.split()[1])
+
+    return {
+        'cpu_time': float(utime + stime) / CLOCK_TICKS,
+        'rss': rss_pages * PAGE_SIZE
+    }
+
+
 def quote_unix(value):
     """
     Return a quoted (shell-escaped) version of the value which can be used as one token in a shell
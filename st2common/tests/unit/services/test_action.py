@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
 import jsonschema
 import mock
 import six
@@ -20,12 +22,16 @@ import six
 from st2actions.container.base import RunnerContainer
 from st2common.constants import action as action_constants
 from st2common.exceptions.action import InvalidActionParameterException
+from st2common.exceptions.param import ParamException
 from st2common.models.db.liveaction import LiveActionDB
 from st2common.models.api.action import RunnerTypeAPI, ActionAPI
 from st2common.models.system.common import ResourceReference
 from st2common.persistence.action import Action
+from st2common.persistence.execution import ActionExecution
+from st2common.persistence.liveaction import LiveAction
 from st2common.persistence.runner import RunnerType
 from st2common.services import action as action_service
+from st2common.services import trace as trace_service
 from st2common.transport.publishers import PoolPublisher
 from st2common.util import isotime
 from st2common.util import action_db
@@ -287,6 +293,52 @@ class TestActionExecutionService(DbTestCase):
             actiondb.enabled = True
             Action.add_or_update(actiondb)
 
+    def test_create_requests(self):
+        parameters = {'hosts': '127.0.0.1', 'cmd': 'uname -a'}
+        liveactions = [
+            LiveActionDB(action=ACTION_REF, context={'user': USERNAME},
+                         parameters=copy.deepcopy(parameters)),
+            LiveActionDB(action=ACTION_REF, parameters={'hosts': '127.0.0.1',
+                                                        'arg_default_value': 123}),
+            LiveActionDB(action=ACTION_REF, parameters={'hosts': '{{ABSENT}}'}),
+            LiveActionDB(action='default.doesntexist', parameters=copy.deepcopy(parameters)),
+            LiveActionDB(action=ACTION_OVR_PARAM_REF, parameters=copy.deepcopy(parameters))
+        ]
+
+        results = action_service.create_requests(liveactions)
+        self.assertEqual(len(results), 5)
+
+        self.assertTrue(isinstance(results[1], jsonschema.ValidationError))
+        self.assertTrue(isinstance(results[2], ParamException))
+        self.assertTrue(isinstance(results[3], ValueError))
+
+        for result in [results[0], results[4]]:
+            liveaction, execution = result
+            self.assertIsNotNone(liveaction.id)
+            self.assertEqual(liveaction.status, action_constants.LIVEACTION_STATUS_REQUESTED)
+            self.assertEqual(execution.liveaction['id'], str(liveaction.id))
+
+            liveaction_db = action_db.get_liveaction_by_id(str(liveaction.id))
+            self.assertEqual(liveaction_db.parameters['hosts'], '127.0.0.1')
+            self.assertEqual(liveaction_db.parameters['cmd'], 'uname -a')
+
+            # Same as for a single request, execution stores the parameters provided by the user
+            execution_db = ActionExecution.get_by_id(str(execution.id))
+            self.assertEqual(execution_db.parameters, parameters)
+            self.assertEqual(execution_db.liveaction['parameters'], parameters)
+
+            trace_db = trace_service.get_trace_db_by_action_execution(
+                action_execution_id=str(execution.id))
+            self.assertEqual(trace_db.trace_tag, 'execution-%s' % str(liveaction.id))
+
+        # Default values are only rendered into the liveaction parameters
+        liveaction, execution = results[0]
+        self.assertEqual(liveaction.parameters['arg_default_value'], 'abc')
+        self.assertFalse('arg_default_value' in execution.parameters)
+
+        # Invalid requests are not written to the database
+        self.assertEqual(len(LiveAction.query(action='default.doesntexist')), 0)
+
     def test_request_cancellation(self):
         request, execution = self._submit_request()
         self.assertIsNotNone(execution)
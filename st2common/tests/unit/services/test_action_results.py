@@ -0,0 +1,91 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import mock
+import unittest2
+from oslo_config import cfg
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.models.db.execution import ActionExecutionDB
+from st2common.persistence.execution import ActionExecution
+from st2common.services import action_results
+from st2common.util import jinja as jinja_utils
+
+RESULT = {'stdout': 'a' * 100, 'stderr': '', 'return_code': 0}
+
+
+class ActionResultsServiceTestCase(unittest2.TestCase):
+
+    def tearDown(self):
+        super(ActionResultsServiceTestCase, self).tearDown()
+        cfg.CONF.clear_override(name='max_result_size', group='action_sensor')
+        cfg.CONF.clear_override(name='result_preview_size', group='action_sensor')
+
+    def test_get_result_payload_no_limit(self):
+        payload = action_results.get_result_payload(result=RESULT, execution_id='e1')
+        self.assertEqual(payload, {'result': RESULT})
+
+    def test_get_result_payload_below_limit(self):
+        cfg.CONF.set_override(name='max_result_size', override=1024, group='action_sensor')
+        payload = action_results.get_result_payload(result=RESULT, execution_id='e1')
+        self.assertEqual(payload, {'result': RESULT})
+
+    def test_get_result_payload_above_limit(self):
+        cfg.CONF.set_override(name='max_result_size', override=50, group='action_sensor')
+        cfg.CONF.set_override(name='result_preview_size', override=10, group='action_sensor')
+        payload = action_results.get_result_payload(result=RESULT, execution_id='e1')
+
+        self.assertNotIn('result', payload)
+        self.assertEqual(payload[action_results.RESULT_REF_KEY], 'e1')
+        self.assertEqual(payload[action_results.RESULT_PREVIEW_KEY], json.dumps(RESULT)[:10])
+        self.assertTrue(payload[action_results.RESULT_TRUNCATED_KEY])
+
+    def test_payload_without_reference_is_copied(self):
+        payload = {'result': RESULT}
+        lazy_payload = action_results.get_payload_with_lazy_result(payload)
+        self.assertNotIsInstance(lazy_payload, action_results.LazyResultPayload)
+        self.assertEqual(lazy_payload, payload)
+        self.assertIsNot(lazy_payload, payload)
+
+    @mock.patch.object(ActionExecution, 'get', mock.MagicMock(
+        return_value=ActionExecutionDB(result=RESULT)))
+    def test_referenced_result_is_retrieved_on_access(self):
+        payload = {'execution_id': 'e1', action_results.RESULT_REF_KEY: 'e1',
+                   action_results.RESULT_TRUNCATED_KEY: True}
+        lazy_payload = action_results.get_payload_with_lazy_result(payload)
+        self.assertEqual(ActionExecution.get.call_count, 0)
+
+        # Jinja item lookup
+        rendered = jinja_utils.render_values(mapping={'rc': '{{trigger.result.return_code}}'},
+                                             context={'trigger': lazy_payload})
+        self.assertEqual(rendered['rc'], '0')
+        self.assertEqual(lazy_payload['result'], RESULT)
+
+        # Result is only retrieved once
+        self.assertEqual(ActionExecution.get.call_count, 1)
+        self.assertRaises(KeyError, lambda: lazy_payload['unknown'])
+
+    @mock.patch.object(ActionExecution, 'get', mock.MagicMock(return_value=None))
+    def test_referenced_result_of_missing_execution(self):
+        payload = {'execution_id': 'e1', action_results.RESULT_REF_KEY: 'e1',
+                   action_results.RESULT_TRUNCATED_KEY: True}
+        lazy_payload = action_results.get_payload_with_lazy_result(payload)
+
+        self.assertIsNone(lazy_payload['result'])
+        ActionExecution.get.assert_called_once_with(id='e1')
@@ -0,0 +1,54 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest2
+
+from st2common.services import coordination
+from st2common.services.partitioner import GroupPartitioner
+
+
+class GroupPartitionerTestCase(unittest2.TestCase):
+
+    @mock.patch.object(coordination, 'configured', mock.MagicMock(return_value=False))
+    @mock.patch.object(coordination, 'join_group')
+    def test_start_coordination_not_configured(self, mock_join_group):
+        partitioner = GroupPartitioner(group_id='st2.test', coordinator=mock.Mock(),
+                                       member_id='member1')
+        partitioner.start()
+        partitioner.stop()
+
+        self.assertFalse(mock_join_group.called)
+        self.assertTrue(partitioner.is_owner('key1'))
+
+    @mock.patch.object(coordination, 'configured', mock.MagicMock(return_value=True))
+    @mock.patch.object(coordination, 'get_group_members',
+                       mock.MagicMock(return_value=['member1', 'member2']))
+    @mock.patch.object(coordination, 'leave_group')
+    @mock.patch.object(coordination, 'join_group')
+    def test_start_and_stop(self, mock_join_group, mock_leave_group):
+        coordinator = mock.Mock()
+        on_rebalance = mock.Mock()
+        partitioner = GroupPartitioner(group_id='st2.test', coordinator=coordinator,
+                                       member_id='member1', on_rebalance=on_rebalance)
+
+        partitioner.start()
+        mock_join_group.assert_called_once_with(coordinator, 'st2.test')
+        self.assertEqual(partitioner.members, ['member1', 'member2'])
+        self.assertEqual(on_rebalance.call_count, 1)
+
+        partitioner.stop()
+        mock_leave_group.assert_called_once_with(coordinator, 'st2.test')
+        self.assertEqual(partitioner._refresh_thread, None)
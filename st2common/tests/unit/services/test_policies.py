@@ -0,0 +1,86 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from st2common.persistence.policy import Policy
+from st2common.policies import ResourcePolicyApplicator
+from st2common.services.policies import PolicyCache
+from st2tests import DbTestCase
+from st2tests.fixturesloader import FixturesLoader
+
+PACK = 'generic'
+TEST_FIXTURES = {
+    'runners': [
+        'testrunner1.yaml'
+    ],
+    'actions': [
+        'action1.yaml'
+    ],
+    'policytypes': [
+        'fake_policy_type_1.yaml',
+        'fake_policy_type_2.yaml'
+    ],
+    'policies': [
+        'policy_1.yaml',
+        'policy_2.yaml'
+    ]
+}
+
+
+class PolicyCacheTestCase(DbTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(PolicyCacheTestCase, cls).setUpClass()
+
+        loader = FixturesLoader()
+        loader.save_fixtures_to_db(fixtures_pack=PACK,
+                                   fixtures_dict=TEST_FIXTURES)
+
+    def test_get_drivers(self):
+        policy_cache = PolicyCache()
+        drivers = policy_cache.get_drivers('wolfpack.action-1')
+
+        self.assertEqual(len(drivers), 2)
+        for policy_db, driver in drivers:
+            self.assertEqual(policy_db.resource_ref, 'wolfpack.action-1')
+            self.assertIsInstance(driver, ResourcePolicyApplicator)
+
+    def test_get_drivers_is_cached(self):
+        policy_cache = PolicyCache()
+
+        with mock.patch.object(Policy, 'query', mock.MagicMock(side_effect=Policy.query)):
+            drivers_1 = policy_cache.get_drivers('wolfpack.action-1')
+            drivers_2 = policy_cache.get_drivers('wolfpack.action-1')
+            self.assertEqual(Policy.query.call_count, 1)
+
+            # Resources without policies are cached as well
+            self.assertEqual(policy_cache.get_drivers('wolfpack.action-2'), [])
+            self.assertEqual(policy_cache.get_drivers('wolfpack.action-2'), [])
+            self.assertEqual(Policy.query.call_count, 2)
+
+        # Same driver instances are reused
+        self.assertEqual([driver for _, driver in drivers_1],
+                         [driver for _, driver in drivers_2])
+
+    def test_policy_event_clears_cache(self):
+        policy_cache = PolicyCache()
+        policy_cache.get_drivers('wolfpack.action-1')
+
+        with mock.patch.object(Policy, 'query', mock.MagicMock(side_effect=Policy.query)):
+            policy_cache._handle_policy_event(Policy.get_by_ref('wolfpack.action-1.concurrency'))
+            policy_cache.get_drivers('wolfpack.action-1')
+            self.assertEqual(Policy.query.call_count, 1)
@@ -0,0 +1,237 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+from oslo_config import cfg
+
+from st2common.cmd.migrate_liveactions import migrate_liveactions
+from st2common.constants import action as action_constants
+from st2common.models.api.action import ActionAPI
+from st2common.models.api.action import RunnerTypeAPI
+from st2common.models.db.execution import ActionExecutionDB
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.models.db.notification import NotificationSchema, NotificationSubSchema
+from st2common.persistence.action import Action
+from st2common.persistence.execution import ActionExecution
+from st2common.persistence.liveaction import LiveAction
+from st2common.persistence.runner import RunnerType
+from st2common.services import action as action_service
+from st2common.transport.publishers import PoolPublisher
+
+from st2tests import CleanDbTestCase
+
+__all__ = [
+    'SingleDocumentExecutionStorageTestCase'
+]
+
+RUNNER = {
+    'name': 'local-shell-script',
+    'description': 'A runner to execute local command.',
+    'enabled': True,
+    'runner_parameters': {
+        'hosts': {'type': 'string'},
+        'cmd': {'type': 'string'}
+    },
+    'runner_module': 'st2actions.runners.fabricrunner'
+}
+
+ACTION = {
+    'name': 'my.action',
+    'description': 'my test',
+    'enabled': True,
+    'entry_point': '/tmp/test/action.sh',
+    'pack': 'default',
+    'runner_type': 'local-shell-script',
+    'parameters': {}
+}
+
+ACTION_REF = 'default.my.action'
+
+PARAMETERS = {'hosts': '127.0.0.1', 'cmd': 'uname -a'}
+
+
+@mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+@mock.patch.object(PoolPublisher, 'publish_many', mock.MagicMock())
+class SingleDocumentExecutionStorageTestCase(CleanDbTestCase):
+
+    def setUp(self):
+        super(SingleDocumentExecutionStorageTestCase, self).setUp()
+        cfg.CONF.set_override(name='single_document_executions', override=True,
+                              group='database')
+
+        RunnerType.add_or_update(RunnerTypeAPI.to_model(RunnerTypeAPI(**RUNNER)))
+        Action.add_or_update(ActionAPI.to_model(ActionAPI(**ACTION)))
+
+    def tearDown(self):
+        cfg.CONF.clear_override(name='single_document_executions', group='database')
+        super(SingleDocumentExecutionStorageTestCase, self).tearDown()
+
+    def test_liveaction_is_stored_in_execution_document(self):
+        liveaction_db, execution_db = self._request()
+
+        self.assertEqual(LiveActionDB.objects.count(), 0)
+        self.assertEqual(ActionExecutionDB.objects.count(), 1)
+        self.assertEqual(execution_db.liveaction['id'], str(liveaction_db.id))
+
+        retrieved = LiveAction.get_by_id(str(liveaction_db.id))
+        self.assertEqual(retrieved.id, liveaction_db.id)
+        self.assertEqual(retrieved.action, ACTION_REF)
+        self.assertEqual(retrieved.status, action_constants.LIVEACTION_STATUS_REQUESTED)
+        self.assertDictEqual(retrieved.parameters, PARAMETERS)
+        self.assertEqual(retrieved.context['user'], 'stanley')
+
+    def test_update_status(self):
+        liveaction_db, _ = self._request()
+
+        liveaction_db = action_service.update_status(
+            liveaction_db, action_constants.LIVEACTION_STATUS_RUNNING)
+        liveaction_db.runner_info = {'hostname': 'localhost', 'pid': 1234}
+        LiveAction.add_or_update(liveaction_db)
+
+        result = {'stdout': 'Linux', 'key.with.dots': {'$key': 'value'}}
+        liveaction_db = action_service.update_status(
+            liveaction_db, action_constants.LIVEACTION_STATUS_SUCCEEDED, result=result)
+
+        execution_db = ActionExecution.get(liveaction__id=str(liveaction_db.id))
+        self.assertEqual(execution_db.status, action_constants.LIVEACTION_STATUS_SUCCEEDED)
+        self.assertDictEqual(execution_db.result, result)
+        self.assertDictEqual(execution_db.liveaction['runner_info'],
+                             {'hostname': 'localhost', 'pid': 1234})
+
+        retrieved = LiveAction.get_by_id(str(liveaction_db.id))
+        self.assertEqual(retrieved.status, action_constants.LIVEACTION_STATUS_SUCCEEDED)
+        self.assertDictEqual(retrieved.result, result)
+        self.assertDictEqual(retrieved.runner_info, {'hostname': 'localhost', 'pid': 1234})
+
+        self.assertEqual(LiveActionDB.objects.count(), 0)
+        self.assertEqual(ActionExecutionDB.objects.count(), 1)
+
+    def test_query_count_and_distinct(self):
+        liveaction_dbs = [self._request()[0] for _ in range(0, 3)]
+        action_service.update_status(liveaction_dbs[1],
+                                     action_constants.LIVEACTION_STATUS_RUNNING)
+
+        self.assertEqual(len(LiveAction.query(action=ACTION_REF)), 3)
+        self.assertEqual(LiveAction.count(status=action_constants.LIVEACTION_STATUS_REQUESTED), 2)
+
+        running = LiveAction.query(status=action_constants.LIVEACTION_STATUS_RUNNING)
+        self.assertEqual(len(running), 1)
+        self.assertEqual(running[0].id, liveaction_dbs[1].id)
+
+        retrieved = LiveAction.query(id__in=[liveaction_dbs[0].id, liveaction_dbs[2].id],
+                                     order_by=['-start_timestamp'])
+        self.assertEqual([item.id for item in retrieved],
+                         [liveaction_dbs[2].id, liveaction_dbs[0].id])
+
+        ids = LiveAction.distinct(field='id', action=ACTION_REF,
+                                  status__in=[action_constants.LIVEACTION_STATUS_REQUESTED])
+        self.assertItemsEqual(ids, [str(liveaction_dbs[0].id), str(liveaction_dbs[2].id)])
+
+    def test_update(self):
+        liveaction_db, _ = self._request()
+
+        parameters = {'hosts': 'localhost', 'cmd': 'uname -r'}
+        liveaction_db = LiveAction.update(liveaction_db, publish=False,
+                                          set__status=action_constants.LIVEACTION_STATUS_RUNNING,
+                                          set__callback={'source': 'mistral'},
+                                          set__parameters=parameters)
+
+        self.assertEqual(liveaction_db.status, action_constants.LIVEACTION_STATUS_RUNNING)
+        self.assertDictEqual(liveaction_db.callback, {'source': 'mistral'})
+        self.assertDictEqual(liveaction_db.parameters, parameters)
+
+        execution_db = ActionExecution.get(liveaction__id=str(liveaction_db.id))
+        self.assertEqual(execution_db.status, action_constants.LIVEACTION_STATUS_RUNNING)
+        self.assertDictEqual(execution_db.liveaction['callback'], {'source': 'mistral'})
+        self.assertDictEqual(execution_db.liveaction['parameters'], parameters)
+        self.assertDictEqual(execution_db.parameters, PARAMETERS)
+        self.assertEqual(LiveActionDB.objects.count(), 0)
+
+    def test_liveaction_and_execution_parameters_are_stored_separately(self):
+        liveaction_db, _ = self._request()
+
+        # Liveaction holds the rendered parameters which can differ from the user provided ones
+        rendered = {'hosts': '127.0.0.1', 'cmd': 'uname -a', 'sudo': False}
+        liveaction_db.parameters = rendered
+        liveaction_db = LiveAction.add_or_update(liveaction_db)
+        action_service.update_status(liveaction_db, action_constants.LIVEACTION_STATUS_RUNNING)
+
+        execution_db = ActionExecution.get(liveaction__id=str(liveaction_db.id))
+        self.assertDictEqual(execution_db.parameters, PARAMETERS)
+        self.assertDictEqual(execution_db.liveaction['parameters'], rendered)
+
+        retrieved = LiveAction.get_by_id(str(liveaction_db.id))
+        self.assertDictEqual(retrieved.parameters, rendered)
+        self.assertEqual(len(LiveAction.query(parameters__sudo=False)), 1)
+
+    def test_aggregate(self):
+        liveaction_dbs = [self._request()[0] for _ in range(0, 3)]
+        action_service.update_status(liveaction_dbs[1],
+                                     action_constants.LIVEACTION_STATUS_RUNNING)
+
+        pipeline = [
+            {'$match': {'action': ACTION_REF,
+                        '_id': {'$in': [liveaction_dbs[0].id, liveaction_dbs[1].id]}}},
+            {'$group': {'_id': '$status', 'actions': {'$addToSet': '$action'}}},
+            {'$sort': {'_id': 1}}
+        ]
+        result = LiveAction.aggregate(pipeline)
+        result = result['result'] if isinstance(result, dict) else list(result)
+
+        self.assertEqual(result, [
+            {'_id': action_constants.LIVEACTION_STATUS_REQUESTED, 'actions': [ACTION_REF]},
+            {'_id': action_constants.LIVEACTION_STATUS_RUNNING, 'actions': [ACTION_REF]}
+        ])
+
+    def test_notify_is_preserved(self):
+        notify_sub_schema = NotificationSubSchema(message='Action complete.',
+                                                  data={'foo': 'bar'})
+        notify_db = NotificationSchema(on_complete=notify_sub_schema)
+        liveaction_db, _ = self._request(notify=notify_db)
+
+        retrieved = LiveAction.get_by_id(str(liveaction_db.id))
+        self.assertEqual(retrieved.notify.on_complete.message, 'Action complete.')
+        self.assertDictEqual(retrieved.notify.on_complete.data, {'foo': 'bar'})
+
+    def test_delete(self):
+        liveaction_db, _ = self._request()
+        LiveAction.delete(liveaction_db)
+
+        self.assertEqual(ActionExecutionDB.objects.count(), 0)
+        self.assertRaises(ValueError, LiveAction.get_by_id, str(liveaction_db.id))
+
+    def test_migrate_liveactions(self):
+        cfg.CONF.set_override(name='single_document_executions', override=False,
+                              group='database')
+        liveaction_db, _ = self._request()
+        action_service.update_status(liveaction_db, action_constants.LIVEACTION_STATUS_RUNNING)
+
+        # Liveaction without an execution is skipped
+        orphan_db = LiveAction.add_or_update(LiveActionDB(action=ACTION_REF, status='running'))
+
+        migrated, skipped = migrate_liveactions(logger=mock.Mock(), batch_size=1, delete=True)
+        self.assertEqual((migrated, skipped), (1, 1))
+        self.assertEqual([item.id for item in LiveActionDB.objects], [orphan_db.id])
+
+        cfg.CONF.set_override(name='single_document_executions', override=True,
+                              group='database')
+        retrieved = LiveAction.get_by_id(str(liveaction_db.id))
+        self.assertEqual(retrieved.status, action_constants.LIVEACTION_STATUS_RUNNING)
+        self.assertEqual(retrieved.context['user'], 'stanley')
+
+    def _request(self, notify=None):
+        liveaction_db = LiveActionDB(action=ACTION_REF, parameters=dict(PARAMETERS),
+                                     context={'user': 'stanley'}, notify=notify)
+        return action_service.request(liveaction_db)
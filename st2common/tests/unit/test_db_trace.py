@@ -14,8 +14,9 @@
 # limitations under the License.
 
 import bson
+import mock
 
-from st2common.models.db.trace import TraceDB, TraceComponentDB
+from st2common.models.db.trace import TraceDB, TraceComponentDB, TraceComponentBucketDB
 from st2common.persistence.trace import Trace
 
 from st2tests.base import CleanDbTestCase
@@ -129,6 +130,91 @@ class TraceDBTest(CleanDbTestCase):
         self.assertEquals(len(retrieved.rules), no_rules * 2)
         self.assertEquals(len(retrieved.trigger_instances), no_trigger_instances * 2)
 
+    @mock.patch.object(Trace, 'bucket_size', 3)
+    def test_push_components_buckets(self):
+        saved = TraceDBTest._create_save_trace(trace_tag='test_trace')
+
+        Trace.push_components(
+            saved,
+            action_executions=[TraceComponentDB(object_id=str(bson.ObjectId()))
+                               for _ in range(2)])
+        retrieved = Trace.push_components(
+            saved,
+            rules=[TraceComponentDB(object_id=str(bson.ObjectId())) for _ in range(4)],
+            trigger_instances=[TraceComponentDB(object_id=str(bson.ObjectId()))
+                               for _ in range(2)])
+
+        # Only the first bucket is stored in the trace document
+        self.assertEquals(retrieved.component_count, 8)
+        self.assertEquals(len(retrieved.action_executions), 2)
+        self.assertEquals(len(retrieved.rules), 1)
+        self.assertEquals(len(retrieved.trigger_instances), 0)
+
+        bucket_dbs = TraceComponentBucketDB.objects(trace_id=str(saved.id)).order_by('bucket')
+        self.assertEquals([bucket_db.bucket for bucket_db in bucket_dbs], [1, 2])
+        self.assertEquals(len(bucket_dbs[0].rules), 3)
+        self.assertEquals(bucket_dbs[0].component_counts, {'rules': 3})
+        self.assertEquals(len(bucket_dbs[1].trigger_instances), 2)
+        self.assertEquals(bucket_dbs[1].component_counts, {'trigger_instances': 2})
+
+    @mock.patch.object(Trace, 'bucket_size', 2)
+    def test_query_by_component_in_bucket(self):
+        saved = TraceDBTest._create_save_trace(trace_tag='test_trace')
+        TraceDBTest._create_save_trace(trace_tag='test_trace_2')
+
+        rule_ids = [str(bson.ObjectId()) for _ in range(3)]
+        for rule_id in rule_ids:
+            Trace.push_rule(saved, rule=TraceComponentDB(object_id=rule_id))
+
+        for rule_id in rule_ids:
+            retrieved = Trace.query(rules__object_id=rule_id)
+            self.assertEquals(len(retrieved), 1, 'Should have 1 trace.')
+            self.assertEquals(retrieved[0].id, saved.id, 'Incorrect trace retrieved.')
+            self.assertEquals(Trace.count(rules__object_id=rule_id), 1)
+
+        retrieved = Trace.query(rules__object_id=str(bson.ObjectId()))
+        self.assertEquals(len(retrieved), 0, 'Should have no traces.')
+
+    @mock.patch.object(Trace, 'bucket_size', 2)
+    def test_get_components(self):
+        saved = TraceDBTest._create_save_trace(trace_tag='test_trace')
+
+        execution_ids = []
+        for _ in range(7):
+            execution_ids.append(str(bson.ObjectId()))
+            Trace.push_components(
+                saved,
+                action_executions=[TraceComponentDB(object_id=execution_ids[-1])],
+                rules=[TraceComponentDB(object_id=str(bson.ObjectId()))])
+        retrieved = Trace.get_by_id(saved.id)
+
+        components, total = Trace.get_components(retrieved, component_type='action_executions')
+        self.assertEquals(total, 7)
+        self.assertEquals([component.object_id for component in components], execution_ids)
+
+        components, total = Trace.get_components(retrieved, component_type='action_executions',
+                                                 offset=2, limit=3)
+        self.assertEquals(total, 7)
+        self.assertEquals([component.object_id for component in components],
+                          execution_ids[2:5])
+
+        components, total = Trace.get_components(retrieved, component_type='trigger_instances')
+        self.assertEquals(total, 0)
+        self.assertEquals(components, [])
+
+        self.assertRaises(ValueError, Trace.get_components, retrieved, component_type='invalid')
+
+    @mock.patch.object(Trace, 'bucket_size', 1)
+    def test_delete_removes_buckets(self):
+        saved = TraceDBTest._create_save_trace(trace_tag='test_trace')
+        Trace.push_components(saved,
+                              rules=[TraceComponentDB(object_id=str(bson.ObjectId()))
+                                     for _ in range(3)])
+        self.assertEquals(TraceComponentBucketDB.objects(trace_id=str(saved.id)).count(), 2)
+
+        Trace.delete(saved)
+        self.assertEquals(TraceComponentBucketDB.objects(trace_id=str(saved.id)).count(), 0)
+
     @staticmethod
     def _create_save_trace(trace_tag, id_=None, action_executions=None, rules=None,
                            trigger_instances=None):
@@ -196,6 +196,29 @@ class ExecutionsUtilDescendantsTestCase(CleanDbTestCase):
 
         self.assertListEqual(all_descendants_ids, expected_ids)
 
+    def test_get_all_descendants_dfs_order(self):
+        root_execution = self.MODELS['executions']['root_execution.yaml']
+        all_descendants = executions_util.get_descendants(str(root_execution.id))
+
+        all_descendants_ids = [str(descendant.id) for descendant in all_descendants]
+        expected_names = ['child1_level1.yaml', 'child1_level2.yaml', 'child2_level2.yaml',
+                          'child1_level3.yaml', 'child2_level1.yaml', 'child3_level2.yaml',
+                          'child2_level3.yaml', 'child3_level3.yaml']
+        expected_ids = [str(self.MODELS['executions'][name].id) for name in expected_names]
+
+        self.assertListEqual(all_descendants_ids, expected_ids)
+
+    def test_get_all_descendants_one_query_per_level(self):
+        root_execution = self.MODELS['executions']['root_execution.yaml']
+
+        with mock.patch.object(ActionExecution, 'query',
+                               mock.MagicMock(side_effect=ActionExecution.query)) as query:
+            all_descendants = executions_util.get_descendants(str(root_execution.id))
+
+        self.assertEqual(len(all_descendants), 8)
+        # 3 levels of children, leaf executions are never queried
+        self.assertEqual(query.call_count, 3)
+
     def test_get_1_level_descendants_sorted(self):
         root_execution = self.MODELS['executions']['root_execution.yaml']
         all_descendants = executions_util.get_descendants(str(root_execution.id),
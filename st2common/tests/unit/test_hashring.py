@@ -0,0 +1,65 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest2
+
+from st2common.util.hashring import ConsistentHashRing
+
+
+class ConsistentHashRingTestCase(unittest2.TestCase):
+    def test_empty_ring(self):
+        ring = ConsistentHashRing()
+        self.assertEqual(len(ring), 0)
+        self.assertEqual(ring.get_member('foo'), None)
+
+    def test_get_member_is_stable(self):
+        ring_1 = ConsistentHashRing(members=['node1', 'node2', 'node3'])
+        ring_2 = ConsistentHashRing(members=['node3', 'node1', 'node2'])
+
+        for index in range(100):
+            key = 'key-%s' % (index)
+            self.assertEqual(ring_1.get_member(key), ring_2.get_member(key))
+
+    def test_all_members_own_keys(self):
+        ring = ConsistentHashRing(members=['node1', 'node2', 'node3'])
+
+        owners = set([ring.get_member('key-%s' % (index)) for index in range(1000)])
+        self.assertEqual(owners, set(['node1', 'node2', 'node3']))
+
+    def test_only_keys_of_removed_member_move(self):
+        ring = ConsistentHashRing(members=['node1', 'node2', 'node3'])
+        keys = ['key-%s' % (index) for index in range(1000)]
+        owners_before = dict([(key, ring.get_member(key)) for key in keys])
+
+        ring.remove_member('node2')
+        self.assertEqual(ring.members, ['node1', 'node3'])
+
+        for key in keys:
+            owner = ring.get_member(key)
+            if owners_before[key] != 'node2':
+                self.assertEqual(owner, owners_before[key])
+            else:
+                self.assertIn(owner, ['node1', 'node3'])
+
+    def test_add_member_moves_keys_only_to_new_member(self):
+        ring = ConsistentHashRing(members=['node1', 'node2'])
+        keys = ['key-%s' % (index) for index in range(1000)]
+        owners_before = dict([(key, ring.get_member(key)) for key in keys])
+
+        ring.add_member('node3')
+
+        for key in keys:
+            owner = ring.get_member(key)
+            self.assertIn(owner, [owners_before[key], 'node3'])
@@ -0,0 +1,207 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import stat
+import shutil
+import tempfile
+
+import mock
+import unittest2
+from oslo_config import cfg
+
+from st2tests import config
+from st2common.metrics import base as metrics
+from st2common.metrics.drivers.statsd_driver import StatsdMetricsDriver
+from st2common.metrics.drivers.prometheus_driver import PrometheusMetricsDriver
+
+__all__ = [
+    'MetricsTestCase',
+    'StatsdMetricsDriverTestCase',
+    'PrometheusMetricsDriverTestCase'
+]
+
+
+class MetricsTestCase(unittest2.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(MetricsTestCase, cls).setUpClass()
+        config.parse_args()
+
+    def tearDown(self):
+        super(MetricsTestCase, self).tearDown()
+        metrics.shutdown()
+
+    def test_noop_driver_is_used_by_default(self):
+        result = metrics.init(service='test')
+        self.assertEqual(result, None)
+        self.assertFalse(metrics.is_enabled())
+
+        # Instrumentation functions are a no-op when metrics are disabled
+        metrics.inc_counter('test.counter')
+        metrics.set_gauge('test.gauge', 10)
+
+        with metrics.Timer('test.timer'):
+            pass
+
+    def test_invalid_driver(self):
+        self.assertRaises(ValueError, metrics.init, service='test', driver='invalid')
+        self.assertRaises(ValueError, metrics.init, service='test',
+                          driver='st2common.metrics.drivers.invalid.InvalidDriver')
+        self.assertFalse(metrics.is_enabled())
+
+    def test_functions_are_proxied_to_the_driver(self):
+        driver = metrics.init(service='test', driver='prometheus')
+        self.assertTrue(metrics.is_enabled())
+        self.assertEqual(metrics.get_driver(), driver)
+
+        driver = mock.Mock()
+        metrics.METRICS_DRIVER = driver
+
+        metrics.inc_counter('test.counter', 2)
+        metrics.dec_counter('test.counter')
+        metrics.set_gauge('test.gauge', 5)
+        metrics.timing('test.timer', 0.5)
+
+        driver.inc_counter.assert_called_once_with('test.counter', 2)
+        driver.dec_counter.assert_called_once_with('test.counter', 1)
+        driver.set_gauge.assert_called_once_with('test.gauge', 5)
+        driver.timing.assert_called_once_with('test.timer', 0.5)
+
+        metrics.shutdown()
+        driver.stop.assert_called_once_with()
+        self.assertFalse(metrics.is_enabled())
+
+    @mock.patch('st2common.metrics.base.time.time', mock.Mock(side_effect=[10.0, 12.5]))
+    def test_timer_context_manager_and_decorator(self):
+        driver = mock.Mock()
+        metrics.METRICS_DRIVER = driver
+
+        with metrics.Timer('test.timer'):
+            pass
+
+        driver.timing.assert_called_once_with('test.timer', 2.5)
+
+        metrics.METRICS_DRIVER = None
+
+        @metrics.Timer('test.timer')
+        def func(value):
+            return value * 2
+
+        # Time is not measured when metrics are disabled
+        self.assertEqual(func(2), 4)
+        self.assertEqual(driver.timing.call_count, 1)
+
+
+class StatsdMetricsDriverTestCase(unittest2.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(StatsdMetricsDriverTestCase, cls).setUpClass()
+        config.parse_args()
+
+    @mock.patch('st2common.metrics.drivers.statsd_driver.socket.socket')
+    def test_metrics_are_sent_in_statsd_format(self, mock_socket):
+        driver = StatsdMetricsDriver(service='rulesengine', prefix='st2')
+        driver.start()
+
+        driver.inc_counter('rules_engine.matched_rules', 3)
+        driver.dec_counter('rules_engine.matched_rules')
+        driver.set_gauge('stream.clients', 5)
+        driver.timing('rules_engine.match_time', 0.0123)
+
+        address = (cfg.CONF.metrics.host, cfg.CONF.metrics.port)
+        sendto = mock_socket.return_value.sendto
+        self.assertEqual(sendto.call_args_list, [
+            mock.call(b'st2.rulesengine.rules_engine.matched_rules:3|c', address),
+            mock.call(b'st2.rulesengine.rules_engine.matched_rules:-1|c', address),
+            mock.call(b'st2.rulesengine.stream.clients:5|g', address),
+            mock.call(b'st2.rulesengine.rules_engine.match_time:12|ms', address)
+        ])
+
+        driver.stop()
+        mock_socket.return_value.close.assert_called_once_with()
+
+        # Metrics are dropped once the driver is stopped
+        driver.inc_counter('rules_engine.matched_rules')
+        self.assertEqual(sendto.call_count, 4)
+
+
+class PrometheusMetricsDriverTestCase(unittest2.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(PrometheusMetricsDriverTestCase, cls).setUpClass()
+        config.parse_args()
+
+    def setUp(self):
+        super(PrometheusMetricsDriverTestCase, self).setUp()
+        self.textfile_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(PrometheusMetricsDriverTestCase, self).tearDown()
+        shutil.rmtree(self.textfile_dir)
+        cfg.CONF.set_override(name='prometheus_textfile_dir', override=None, group='metrics')
+
+    def test_format_metrics(self):
+        driver = PrometheusMetricsDriver(service='api', prefix='st2')
+        driver.inc_counter('publisher.messages', 2)
+        driver.inc_counter('publisher.messages')
+        driver.set_gauge('stream.clients', 4)
+        driver.timing('publisher.publish_time', 0.02)
+        driver.timing('publisher.publish_time', 20)
+
+        lines = driver.format_metrics().splitlines()
+        self.assertEqual(lines[0:4], [
+            '# TYPE st2_api_publisher_messages counter',
+            'st2_api_publisher_messages 3',
+            '# TYPE st2_api_stream_clients gauge',
+            'st2_api_stream_clients 4'
+        ])
+        self.assertEqual(lines[4], '# TYPE st2_api_publisher_publish_time_seconds histogram')
+        self.assertTrue('st2_api_publisher_publish_time_seconds_bucket{le="0.01"} 0' in lines)
+        self.assertTrue('st2_api_publisher_publish_time_seconds_bucket{le="0.025"} 1' in lines)
+        self.assertTrue('st2_api_publisher_publish_time_seconds_bucket{le="10.0"} 1' in lines)
+        self.assertTrue('st2_api_publisher_publish_time_seconds_bucket{le="+Inf"} 2' in lines)
+        self.assertTrue('st2_api_publisher_publish_time_seconds_count 2' in lines)
+
+    def test_decremented_counter_is_exported_as_gauge(self):
+        driver = PrometheusMetricsDriver(service='api', prefix='st2')
+        driver.inc_counter('stream.connections', 3)
+        driver.dec_counter('stream.connections')
+        driver.inc_counter('stream.connections')
+
+        self.assertEqual(driver.format_metrics().splitlines(), [
+            '# TYPE st2_api_stream_connections gauge',
+            'st2_api_stream_connections 3'
+        ])
+
+    def test_write_textfile(self):
+        cfg.CONF.set_override(name='prometheus_textfile_dir', override=self.textfile_dir,
+                              group='metrics')
+
+        driver = PrometheusMetricsDriver(service='stream', prefix='st2')
+        driver.start()
+        driver.inc_counter('stream.events')
+        driver.stop()
+
+        file_path = os.path.join(self.textfile_dir, 'st2_stream.prom')
+
+        with open(file_path, 'r') as fp:
+            content = fp.read()
+
+        self.assertEqual(content, driver.format_metrics())
+        self.assertEqual(os.listdir(self.textfile_dir), ['st2_stream.prom'])
+
+        # File needs to be readable by the collector which runs as a different user
+        self.assertEqual(stat.S_IMODE(os.stat(file_path).st_mode), 0o644)
@@ -16,10 +16,18 @@
 import mock
 
 from st2tests import DbTestCase
+from st2common.models.db.auth import UserDB
 from st2common.persistence.auth import User
+from st2common.models.utils import profiling
 from st2common.models.utils.profiling import enable_profiling
 from st2common.models.utils.profiling import disable_profiling
 from st2common.models.utils.profiling import log_query_and_profile_data_for_queryset
+from st2common.models.utils.profiling import enable_query_stats
+from st2common.models.utils.profiling import disable_query_stats
+from st2common.models.utils.profiling import reset_query_stats
+from st2common.models.utils.profiling import get_query_stats
+from st2common.models.utils.profiling import record_operation
+from st2common.models.utils.profiling import OperationStats
 
 
 class MongoDBProfilingTestCase(DbTestCase):
@@ -60,3 +68,74 @@ class MongoDBProfilingTestCase(DbTestCase):
         queryset = 1
         result = log_query_and_profile_data_for_queryset(queryset)
         self.assertEqual(result, queryset)
+
+
+class MongoDBQueryStatsTestCase(DbTestCase):
+    def setUp(self):
+        super(MongoDBQueryStatsTestCase, self).setUp()
+        reset_query_stats()
+
+    def tearDown(self):
+        disable_query_stats()
+        reset_query_stats()
+        super(MongoDBQueryStatsTestCase, self).tearDown()
+
+    def test_query_stats_are_disabled(self):
+        disable_query_stats()
+        User.add_or_update(UserDB(name='stats_user'))
+        list(User.query(name='stats_user'))
+        User.count(name='stats_user')
+
+        self.assertEqual(get_query_stats(), {'operations': [], 'slow_queries': []})
+
+    def test_query_stats_are_enabled(self):
+        enable_query_stats()
+        User.add_or_update(UserDB(name='stats_user'))
+        list(User.query(name='stats_user'))
+        User.query(name='stats_user').count()
+        User.count(name='stats_user')
+        User.get(name='stats_user')
+
+        stats = get_query_stats()
+        operations = dict([(item['operation'], item) for item in stats['operations']
+                           if item['model'] == 'UserDB'])
+
+        for operation in ['add_or_update', 'query', 'query_count', 'count', 'get']:
+            self.assertTrue(operation in operations, 'Missing "%s" operation' % (operation))
+            self.assertEqual(operations[operation]['count'], 1)
+            self.assertEqual(sum([count for _, count in operations[operation]['histogram']]), 1)
+
+        self.assertEqual(stats['slow_queries'], [])
+
+    @mock.patch('st2common.models.utils.profiling.LOG')
+    def test_slow_query_is_captured(self, mock_log):
+        enable_query_stats(slow_query_threshold=100)
+
+        record_operation(model=UserDB, operation='count', duration=0.05,
+                         filters={'name': 'stats_user'})
+        self.assertEqual(get_query_stats()['slow_queries'], [])
+
+        record_operation(model=UserDB, operation='count', duration=0.5,
+                         filters={'name': 'stats_user'})
+        slow_queries = get_query_stats()['slow_queries']
+        self.assertEqual(len(slow_queries), 1)
+        self.assertEqual(slow_queries[0]['model'], 'UserDB')
+        self.assertEqual(slow_queries[0]['operation'], 'count')
+        self.assertEqual(slow_queries[0]['duration'], 0.5)
+        self.assertTrue('stats_user' in slow_queries[0]['query'])
+        self.assertTrue(slow_queries[0]['explain'])
+        self.assertEqual(mock_log.warning.call_count, 1)
+
+    def test_operation_stats_histogram(self):
+        stats = OperationStats()
+        stats.add(0.001)
+        stats.add(0.003)
+        stats.add(100)
+
+        result = stats.to_dict()
+        self.assertEqual(result['count'], 3)
+        self.assertEqual(result['max'], 100)
+        self.assertEqual(result['histogram'][0], [0.001, 1])
+        self.assertEqual(result['histogram'][1], [0.005, 1])
+        self.assertEqual(result['histogram'][-1], ['+Inf', 1])
+        self.assertEqual(len(result['histogram']), len(profiling.LATENCY_HISTOGRAM_BUCKETS) + 1)
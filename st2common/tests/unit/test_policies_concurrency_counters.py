@@ -0,0 +1,84 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+from st2common.constants import action as action_constants
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.persistence.liveaction import LiveAction
+from st2common.persistence.policy import PolicyConcurrencyCounter
+from st2common.policies import concurrency as concurrency_counters
+from st2common.util import date as date_utils
+from st2tests import DbTestCase
+
+COUNTER_KEY = 'policy_type=action.concurrency,action=wolfpack.action-1'
+FILTERS = {'action': 'wolfpack.action-1'}
+
+
+class ConcurrencyCountersTestCase(DbTestCase):
+    def setUp(self):
+        super(ConcurrencyCountersTestCase, self).setUp()
+
+        for counter_db in PolicyConcurrencyCounter.get_all():
+            PolicyConcurrencyCounter.delete(counter_db)
+
+        for liveaction_db in LiveAction.get_all():
+            LiveAction.delete(liveaction_db)
+
+    def _create_liveaction(self, status):
+        liveaction_db = LiveActionDB(action='wolfpack.action-1', status=status,
+                                     start_timestamp=date_utils.get_datetime_utc_now())
+        return LiveAction.add_or_update(liveaction_db, publish=False)
+
+    def test_counter_is_reconciled_on_first_use(self):
+        self._create_liveaction(action_constants.LIVEACTION_STATUS_SCHEDULED)
+        self._create_liveaction(action_constants.LIVEACTION_STATUS_RUNNING)
+        self._create_liveaction(action_constants.LIVEACTION_STATUS_DELAYED)
+        self._create_liveaction(action_constants.LIVEACTION_STATUS_SUCCEEDED)
+
+        count = concurrency_counters.get_in_flight_count(key=COUNTER_KEY, filters=FILTERS)
+        self.assertEqual(count, 2)
+
+    def test_add_and_remove_in_flight(self):
+        self.assertEqual(
+            concurrency_counters.get_in_flight_count(key=COUNTER_KEY, filters=FILTERS), 0)
+
+        liveaction_db = self._create_liveaction(action_constants.LIVEACTION_STATUS_SCHEDULED)
+        concurrency_counters.add_in_flight(key=COUNTER_KEY, liveaction_db=liveaction_db)
+        concurrency_counters.add_in_flight(key=COUNTER_KEY, liveaction_db=liveaction_db)
+        self.assertEqual(
+            concurrency_counters.get_in_flight_count(key=COUNTER_KEY, filters=FILTERS), 1)
+
+        concurrency_counters.remove_in_flight(key=COUNTER_KEY, liveaction_db=liveaction_db)
+        concurrency_counters.remove_in_flight(key=COUNTER_KEY, liveaction_db=liveaction_db)
+        self.assertEqual(
+            concurrency_counters.get_in_flight_count(key=COUNTER_KEY, filters=FILTERS), 0)
+
+    def test_stale_counter_is_reconciled(self):
+        self.assertEqual(
+            concurrency_counters.get_in_flight_count(key=COUNTER_KEY, filters=FILTERS), 0)
+
+        # Live action which entered the in-flight state without going through the policy
+        self._create_liveaction(action_constants.LIVEACTION_STATUS_RUNNING)
+        self.assertEqual(
+            concurrency_counters.get_in_flight_count(key=COUNTER_KEY, filters=FILTERS), 0)
+
+        counter_db = PolicyConcurrencyCounter.get(key=COUNTER_KEY)
+        delta = datetime.timedelta(seconds=concurrency_counters.RECONCILE_INTERVAL + 1)
+        counter_db.reconciled_at = counter_db.reconciled_at - delta
+        PolicyConcurrencyCounter.add_or_update(counter_db)
+
+        self.assertEqual(
+            concurrency_counters.get_in_flight_count(key=COUNTER_KEY, filters=FILTERS), 1)
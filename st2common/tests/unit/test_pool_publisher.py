@@ -0,0 +1,170 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import socket
+
+import kombu
+import mock
+import unittest2
+
+from st2common.exceptions.transport import MessageNotConfirmedException
+from st2common.transport import publishers
+
+FAKE_XCHG = kombu.Exchange('st2.fake.publisher', type='topic')
+
+
+class FakeChannel(object):
+    def __init__(self):
+        self.events = collections.defaultdict(set)
+        self.is_open = True
+        self.published = []
+
+    def confirm_select(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+    def ack(self, delivery_tag, multiple=False):
+        for callback in list(self.events['basic_ack']):
+            callback(delivery_tag, multiple)
+
+    def nack(self, delivery_tag, multiple=False):
+        for callback in list(self.events['basic_nack']):
+            callback(delivery_tag, multiple, False)
+
+
+class FakeProducer(object):
+    def __init__(self, channel):
+        self.channel = channel
+
+    def publish(self, body, **kwargs):
+        self.channel.published.append(body)
+
+
+class PublishConfirmTrackerTest(unittest2.TestCase):
+
+    def setUp(self):
+        super(PublishConfirmTrackerTest, self).setUp()
+        self.channel = FakeChannel()
+        self.tracker = publishers.PublishConfirmTracker(self.channel)
+        self.connection = mock.Mock()
+
+    def test_ack_multiple(self):
+        tags = [self.tracker.add() for _ in range(0, 3)]
+        self.assertEqual(tags, [1, 2, 3])
+
+        self.connection.drain_events.side_effect = lambda timeout: self.channel.ack(3, True)
+        nacked = self.tracker.wait(connection=self.connection, tags=tags, timeout=1)
+
+        self.assertEqual(nacked, [])
+        self.assertEqual(self.connection.drain_events.call_count, 1)
+
+    def test_nack(self):
+        tags = [self.tracker.add() for _ in range(0, 3)]
+
+        def drain_events(timeout):
+            self.channel.ack(2, True)
+            self.channel.nack(3)
+
+        self.connection.drain_events.side_effect = drain_events
+        nacked = self.tracker.wait(connection=self.connection, tags=tags, timeout=1)
+
+        self.assertEqual(nacked, [3])
+
+    def test_wait_timeout(self):
+        tag = self.tracker.add()
+
+        self.connection.drain_events.return_value = None
+        self.assertRaises(socket.timeout, self.tracker.wait, connection=self.connection,
+                          tags=[tag], timeout=0.01)
+        self.assertFalse(self.tracker.is_confirmed(tag))
+
+
+class PoolPublisherTest(unittest2.TestCase):
+
+    def test_channel_is_reused(self):
+        publisher = publishers.PoolPublisher(urls=['memory://'])
+
+        publisher.publish({'index': 1}, FAKE_XCHG, 'test')
+        channels = dict(publisher._channels)
+        self.assertEqual(len(channels), 1)
+
+        publisher.publish({'index': 2}, FAKE_XCHG, 'test')
+        publisher.publish_many([{'index': 3}, {'index': 4}], FAKE_XCHG, 'test')
+        self.assertEqual(publisher._channels, channels)
+
+    def test_publish_many_messages_are_delivered_in_order(self):
+        publisher = publishers.PoolPublisher(urls=['memory://'])
+        queue = kombu.Queue('st2.fake.publisher.queue', FAKE_XCHG, routing_key='test')
+
+        with publisher.pool.acquire(block=True) as connection:
+            queue(connection.channel()).declare()
+
+        publisher.publish_many([{'index': index} for index in range(0, 5)], FAKE_XCHG, 'test')
+
+        payloads = []
+        with publisher.pool.acquire(block=True) as connection:
+            channel = connection.channel()
+            message = queue(channel).get(accept=['pickle'])
+            while message:
+                payloads.append(message.payload)
+                message = queue(channel).get(accept=['pickle'])
+
+        self.assertEqual(payloads, [{'index': index} for index in range(0, 5)])
+
+    @mock.patch.object(publishers, 'Producer', FakeProducer)
+    def test_publish_many_waits_for_confirms_once(self):
+        channel = FakeChannel()
+        drain_events = mock.Mock(side_effect=lambda timeout: channel.ack(len(channel.published),
+                                                                        True))
+        publisher = publishers.PoolPublisher(urls=['memory://'], confirm_publish=True,
+                                             confirm_timeout=1)
+
+        with mock.patch.object(kombu.Connection, 'channel', mock.Mock(return_value=channel)), \
+                mock.patch.object(kombu.Connection, 'ensure',
+                                  lambda self, obj, fun, **kwargs: fun), \
+                mock.patch.object(kombu.Connection, 'drain_events', drain_events):
+            publisher.publish_many(['a', 'b', 'c'], FAKE_XCHG, 'test')
+            self.assertEqual(drain_events.call_count, 1)
+
+            publisher.publish('d', FAKE_XCHG, 'test')
+            self.assertEqual(drain_events.call_count, 2)
+
+        self.assertEqual(channel.published, ['a', 'b', 'c', 'd'])
+        self.assertEqual(len(publisher._channels), 1)
+
+    @mock.patch.object(publishers, 'Producer', FakeProducer)
+    def test_publish_many_nacked_messages(self):
+        channel = FakeChannel()
+        publisher = publishers.PoolPublisher(urls=['memory://'], confirm_publish=True,
+                                             confirm_timeout=1)
+
+        def drain_events(timeout):
+            channel.ack(1)
+            channel.nack(2)
+
+        with mock.patch.object(kombu.Connection, 'channel', mock.Mock(return_value=channel)), \
+                mock.patch.object(kombu.Connection, 'ensure',
+                                  lambda self, obj, fun, **kwargs: fun), \
+                mock.patch.object(kombu.Connection, 'drain_events',
+                                  mock.Mock(side_effect=drain_events)):
+            self.assertRaises(MessageNotConfirmedException, publisher.publish_many, ['a', 'b'],
+                              FAKE_XCHG, 'test')
+
+        # Channel is discarded on failure
+        self.assertFalse(channel.is_open)
+        self.assertEqual(publisher._channels, {})
@@ -0,0 +1,63 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import timedelta
+
+from st2common import log as logging
+from st2common.garbage_collection.rule_enforcements import purge_rule_enforcements
+from st2common.models.db.rule_enforcement import RuleEnforcementDB, RuleReferenceSpecDB
+from st2common.persistence.rule_enforcement import RuleEnforcement
+from st2common.util import date as date_utils
+from st2tests.base import CleanDbTestCase
+
+LOG = logging.getLogger(__name__)
+
+
+class TestPurgeRuleEnforcements(CleanDbTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        CleanDbTestCase.setUpClass()
+        super(TestPurgeRuleEnforcements, cls).setUpClass()
+
+    def test_no_timestamp_doesnt_delete(self):
+        self._create_models()
+
+        expected_msg = 'Specify a valid timestamp'
+        self.assertRaisesRegexp(ValueError, expected_msg, purge_rule_enforcements,
+                                logger=LOG, timestamp=None)
+        self.assertEqual(len(RuleEnforcement.get_all()), 4)
+
+    def test_purge(self):
+        now = date_utils.get_datetime_utc_now()
+        self._create_models()
+
+        deleted_count = purge_rule_enforcements(logger=LOG, timestamp=now - timedelta(days=10),
+                                                batch_size=2, sleep_delay=0)
+        self.assertEqual(deleted_count, 3)
+        self.assertEqual(len(RuleEnforcement.get_all()), 1)
+
+    def _create_models(self):
+        now = date_utils.get_datetime_utc_now()
+        rule = RuleReferenceSpecDB(ref='wolfpack.rule', id='1', uid='rule:wolfpack:rule')
+
+        for index in range(0, 3):
+            enforcement_db = RuleEnforcementDB(trigger_instance_id='ti', rule=rule,
+                                               enforced_at=now - timedelta(days=20))
+            RuleEnforcement.add_or_update(enforcement_db)
+
+        enforcement_db = RuleEnforcementDB(trigger_instance_id='ti', rule=rule,
+                                           enforced_at=now - timedelta(days=5))
+        RuleEnforcement.add_or_update(enforcement_db)
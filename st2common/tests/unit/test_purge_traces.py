@@ -0,0 +1,76 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import timedelta
+
+from st2common import log as logging
+from st2common.garbage_collection.traces import purge_traces
+from st2common.models.db.trace import TraceDB
+from st2common.models.db.trace import TraceComponentBucketDB
+from st2common.persistence.trace import Trace
+from st2common.util import date as date_utils
+from st2tests.base import CleanDbTestCase
+
+LOG = logging.getLogger(__name__)
+
+
+class TestPurgeTraces(CleanDbTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        CleanDbTestCase.setUpClass()
+        super(TestPurgeTraces, cls).setUpClass()
+
+    def test_no_timestamp_doesnt_delete(self):
+        self._create_models()
+
+        expected_msg = 'Specify a valid timestamp'
+        self.assertRaisesRegexp(ValueError, expected_msg, purge_traces,
+                                logger=LOG, timestamp=None)
+        self.assertEqual(len(Trace.get_all()), 4)
+
+    def test_purge(self):
+        now = date_utils.get_datetime_utc_now()
+        self._create_models()
+
+        deleted_count = purge_traces(logger=LOG, timestamp=now - timedelta(days=10),
+                                     batch_size=2, sleep_delay=0)
+        self.assertEqual(deleted_count, 3)
+        self.assertEqual(len(Trace.get_all()), 1)
+
+    def test_purge_component_buckets(self):
+        now = date_utils.get_datetime_utc_now()
+        self._create_models()
+
+        for trace_db in Trace.get_all():
+            bucket_db = TraceComponentBucketDB(trace_id=str(trace_db.id), bucket=1,
+                                               start_timestamp=trace_db.start_timestamp)
+            bucket_db.save()
+
+        purge_traces(logger=LOG, timestamp=now - timedelta(days=10), batch_size=2,
+                     sleep_delay=0)
+        self.assertEqual(len(Trace.get_all()), 1)
+        self.assertEqual(TraceComponentBucketDB.objects.count(), 1)
+        self.assertEqual(TraceComponentBucketDB.objects[0].trace_id, str(Trace.get_all()[0].id))
+
+    def _create_models(self):
+        now = date_utils.get_datetime_utc_now()
+
+        for index in range(0, 3):
+            trace_db = TraceDB(trace_tag='test_trace', start_timestamp=now - timedelta(days=20))
+            Trace.add_or_update(trace_db)
+
+        trace_db = TraceDB(trace_tag='test_trace', start_timestamp=now - timedelta(days=5))
+        Trace.add_or_update(trace_db)
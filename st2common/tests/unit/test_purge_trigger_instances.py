@@ -66,3 +66,22 @@ class TestPurgeTriggerInstances(CleanDbTestCase):
         self.assertEqual(len(TriggerInstance.get_all()), 2)
         purge_trigger_instances(logger=LOG, timestamp=now - timedelta(days=10))
         self.assertEqual(len(TriggerInstance.get_all()), 1)
+
+    def test_purge_in_batches(self):
+        now = date_utils.get_datetime_utc_now()
+
+        for index in range(0, 7):
+            instance_db = TriggerInstanceDB(trigger='purge_tool.dummy.trigger',
+                                            payload={'index': index},
+                                            occurrence_time=now - timedelta(days=20))
+            TriggerInstance.add_or_update(instance_db)
+
+        instance_db = TriggerInstanceDB(trigger='purge_tool.dummy.trigger',
+                                        payload={'hola': 'hi', 'kuraci': 'chicken'},
+                                        occurrence_time=now - timedelta(days=5))
+        TriggerInstance.add_or_update(instance_db)
+
+        deleted_count = purge_trigger_instances(logger=LOG, timestamp=now - timedelta(days=10),
+                                                batch_size=3, sleep_delay=0)
+        self.assertEqual(deleted_count, 7)
+        self.assertEqual(len(TriggerInstance.get_all()), 1)
@@ -0,0 +1,122 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+from unittest2 import TestCase
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.exceptions.triggers import TriggerDispatchBufferFullException
+from st2common.transport.reactor import BufferedTriggerDispatcher
+from st2common.transport.reactor import TriggerDispatcher
+from st2common.transport.reactor import TriggerInstancePublisher
+from st2common.transport.reactor import TRIGGER_INSTANCE_XCHG
+from st2common.transport.publishers import PoolPublisher
+
+
+class TestTriggerDispatcher(TestCase):
+
+    @mock.patch.object(PoolPublisher, 'publish_many')
+    def test_dispatch_many(self, publish_many):
+        dispatcher = TriggerDispatcher()
+        dispatcher.dispatch_many([('pack.trigger1', {'a': 1}, None),
+                                  ('pack.trigger2', None, None)])
+
+        publish_many.assert_called_once_with([
+            {'trigger': 'pack.trigger1', 'payload': {'a': 1}, 'trace_context': None},
+            {'trigger': 'pack.trigger2', 'payload': None, 'trace_context': None}
+        ], TRIGGER_INSTANCE_XCHG, 'trigger_instance')
+
+    @mock.patch.object(TriggerInstancePublisher, 'publish_triggers')
+    def test_buffered_dispatch_batches(self, publish_triggers):
+        dispatcher = BufferedTriggerDispatcher(batch_size=4, linger_time=0.01)
+        dispatcher.start()
+
+        for index in range(10):
+            dispatcher.dispatch('pack.trigger', payload={'index': index})
+
+        # Stop publishes all the buffered triggers
+        dispatcher.stop()
+        self.assertEqual(dispatcher.get_buffered_count(), 0)
+
+        batches = [call[1]['payloads'] for call in publish_triggers.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+        indexes = [message['payload']['index'] for batch in batches for message in batch]
+        self.assertEqual(indexes, range(10))
+        self.assertEqual(dispatcher.get_stats()['published'], 10)
+
+    @mock.patch.object(TriggerInstancePublisher, 'publish_triggers')
+    def test_buffered_dispatch_buffer_full(self, publish_triggers):
+        dispatcher = BufferedTriggerDispatcher(buffer_size=2, buffer_timeout=0.01)
+
+        # Flusher is not running so nothing is removed from the buffer
+        dispatcher.dispatch('pack.trigger', payload={})
+        dispatcher.dispatch('pack.trigger', payload={})
+        self.assertRaises(TriggerDispatchBufferFullException, dispatcher.dispatch,
+                          'pack.trigger', payload={})
+        self.assertEqual(dispatcher.get_buffered_count(), 2)
+        self.assertEqual(dispatcher.get_stats(), {'dispatched': 2, 'rejected': 1,
+                                                  'published': 0, 'retried': 0, 'failed': 0,
+                                                  'buffered': 2})
+
+    @mock.patch.object(TriggerInstancePublisher, 'publish_triggers')
+    def test_buffered_dispatch_failed_batch_is_retried(self, publish_triggers):
+        publish_triggers.side_effect = [Exception('Connection refused'),
+                                        Exception('Connection refused'), None]
+
+        dispatcher = BufferedTriggerDispatcher(batch_size=4, linger_time=0.01)
+        dispatcher.retry_delay = 0.01
+        dispatcher.start()
+
+        for index in range(3):
+            dispatcher.dispatch('pack.trigger', payload={'index': index})
+
+        dispatcher.stop()
+
+        # Same batch is published again until it succeeds
+        self.assertEqual(publish_triggers.call_count, 3)
+        batches = [call[1]['payloads'] for call in publish_triggers.call_args_list]
+        self.assertEqual(batches[0], batches[2])
+
+        stats = dispatcher.get_stats()
+        self.assertEqual(stats['published'], 3)
+        self.assertEqual(stats['retried'], 6)
+        self.assertEqual(stats['failed'], 0)
+        self.assertEqual(stats['buffered'], 0)
+
+    @mock.patch.object(TriggerInstancePublisher, 'publish_triggers',
+                       mock.Mock(side_effect=Exception('Connection refused')))
+    def test_buffered_dispatch_failed_batch_is_dropped_on_shutdown(self):
+        dispatcher = BufferedTriggerDispatcher(batch_size=4, linger_time=0.01)
+        dispatcher.retry_delay = 0.01
+
+        dispatcher.dispatch('pack.trigger', payload={})
+        dispatcher.dispatch('pack.trigger', payload={})
+
+        # Flusher only runs while stopping so the batch is attempted shutdown_attempts times
+        dispatcher.start()
+        dispatcher.stop()
+
+        self.assertEqual(TriggerInstancePublisher.publish_triggers.call_count,
+                         dispatcher.shutdown_attempts)
+        stats = dispatcher.get_stats()
+        self.assertEqual(stats['failed'], 2)
+        self.assertEqual(stats['buffered'], 0)
+
+    def test_buffered_dispatch_invalid_payload(self):
+        dispatcher = BufferedTriggerDispatcher()
+        self.assertRaises(AssertionError, dispatcher.dispatch, 'pack.trigger', payload='foo')
+        self.assertEqual(dispatcher.get_buffered_count(), 0)
@@ -46,7 +46,22 @@ def _register_common_opts():
 def _register_app_opts():
     dump_opts = [
         cfg.StrOpt('dump_dir', default='/opt/stackstorm/exports/',
-                   help='Directory to dump data to.')
+                   help='Directory to dump data to.'),
+        cfg.StrOpt('file_format', default='json',
+                   help='Format of the exported files. "json" writes batches of executions as '
+                        'JSON arrays, "ndjson" streams executions as newline delimited JSON.'),
+        cfg.StrOpt('compression', default='none',
+                   help='Compression used for "ndjson" files (none, gzip, zstd). zstd requires '
+                        '"zstandard" Python package.'),
+        cfg.IntOpt('max_file_size', default=100 * 1024 * 1024,
+                   help='Size in bytes (uncompressed) after which "ndjson" file is rotated.'),
+        cfg.IntOpt('max_file_age', default=300,
+                   help='Number of seconds after which "ndjson" file is rotated.'),
+        cfg.IntOpt('bootstrap_batch_size', default=1000,
+                   help='Number of executions retrieved from the database at once when '
+                        'exporting executions missed while the service was not running.'),
+        cfg.IntOpt('max_queue_size', default=10000,
+                   help='Maximum number of executions held in memory waiting to be exported.')
     ]
     CONF.register_opts(dump_opts, group='exporter')
 
@@ -19,26 +19,77 @@ import Queue
 import eventlet
 
 from st2common import log as logging
+from st2exporter.exporter.file_writer import COMPRESSION_EXTENSIONS
+from st2exporter.exporter.file_writer import PART_FILE_SUFFIX
+from st2exporter.exporter.file_writer import StreamingFileWriter
 from st2exporter.exporter.file_writer import TextFileWriter
 from st2exporter.exporter.json_converter import JsonConverter
+from st2exporter.exporter.json_converter import NDJsonConverter
 from st2common.models.db.marker import DumperMarkerDB
 from st2common.persistence.marker import DumperMarker
 from st2common.util import date as date_utils
 from st2common.util import isotime
 
 __all__ = [
-    'Dumper'
+    'Dumper',
+    'StreamingDumper',
+
+    'format_marker',
+    'parse_marker'
 ]
 
-ALLOWED_EXTENSIONS = ['json']
+ALLOWED_EXTENSIONS = ['json', 'ndjson']
 
 CONVERTERS = {
-    'json': JsonConverter
+    'json': JsonConverter,
+    'ndjson': NDJsonConverter
 }
 
+# Separates end timestamp and execution id in the persisted marker string
+MARKER_SEPARATOR = '|'
+
+DEFAULT_MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB
+DEFAULT_MAX_FILE_AGE = 300  # 5 minutes
+
 LOG = logging.getLogger(__name__)
 
 
+def format_marker(timestamp, execution_id=None):
+    """
+    Serialize export marker into a string which is stored in the database.
+
+    :param timestamp: End timestamp of the last exported execution.
+    :type timestamp: ``datetime.datetime``
+
+    :param execution_id: Id of the last exported execution.
+    :type execution_id: ``str``
+
+    :rtype: ``str``
+    """
+    marker = isotime.format(timestamp, offset=False)
+
+    if execution_id:
+        marker = marker + MARKER_SEPARATOR + str(execution_id)
+
+    return marker
+
+
+def parse_marker(marker):
+    """
+    Parse marker string as returned by format_marker. Old style markers which only contain a
+    timestamp are also supported.
+
+    :return: (timestamp, execution_id) tuple. execution_id is None for old style markers.
+    :rtype: ``tuple``
+    """
+    if MARKER_SEPARATOR in marker:
+        timestamp, execution_id = marker.split(MARKER_SEPARATOR, 1)
+    else:
+        timestamp, execution_id = marker, None
+
+    return isotime.parse(timestamp), execution_id
+
+
 class Dumper(object):
 
     def __init__(self, queue, export_dir, file_format='json',
@@ -171,14 +222,14 @@ class Dumper(object):
 
         return self._persisted_marker
 
-    def _write_marker_to_db(self, new_marker):
-        LOG.info('Updating marker in db to: %s', new_marker)
+    def _write_marker_to_db(self, new_marker, execution_id=None):
+        LOG.info('Updating marker in db to: %s (execution=%s)', new_marker, execution_id)
         markers = DumperMarker.get_all()
 
         if len(markers) > 1:
             LOG.exception('More than one dumper marker found. Using first found one.')
 
-        marker = isotime.format(new_marker, offset=False)
+        marker = format_marker(new_marker, execution_id=execution_id)
         updated_at = date_utils.get_datetime_utc_now()
 
         if markers:
@@ -188,3 +239,151 @@ class Dumper(object):
 
         marker_db = DumperMarkerDB(id=marker_id, marker=marker, updated_at=updated_at)
         return DumperMarker.add_or_update(marker_db)
+
+
+class StreamingDumper(Dumper):
+    """
+    Dumper which streams executions into newline delimited JSON files (optionally compressed)
+    as they come in instead of buffering them into batches.
+
+    A file is rotated once it reaches max_file_size (uncompressed) bytes or once it has been open
+    for max_file_age seconds.
+
+    The marker (end timestamp and id of the newest execution in a file) is only persisted after
+    the file has been fully written and moved into place. On restart, the exporter resumes right
+    after the last execution which is guaranteed to be on disk. Executions in a partially written
+    file are exported again.
+    """
+
+    def __init__(self, queue, export_dir, file_prefix='st2-executions-', compression='none',
+                 max_file_size=DEFAULT_MAX_FILE_SIZE, max_file_age=DEFAULT_MAX_FILE_AGE,
+                 poll_interval=1):
+        super(StreamingDumper, self).__init__(queue=queue, export_dir=export_dir,
+                                              file_format='ndjson', file_prefix=file_prefix,
+                                              sleep_interval=poll_interval)
+        compression = compression or 'none'
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError('Unsupported compression %s.' % compression)
+
+        self._compression = compression
+        self._max_file_size = max_file_size
+        self._max_file_age = max_file_age
+
+        # Currently open file and (timestamp, execution_id) marker of the newest execution in it
+        self._writer = None
+        self._file_marker = None
+
+    def start(self, wait=False):
+        self._remove_part_files()
+        super(StreamingDumper, self).start(wait=wait)
+
+    def stop(self):
+        self._shutdown = True
+        result = eventlet.kill(self._flush_thread)
+
+        # Close and persist data which has been written so far
+        self._rotate()
+        return result
+
+    def _flush(self):
+        while not self._shutdown:
+            try:
+                item = self._queue.get(block=True, timeout=self._sleep_interval)
+            except Queue.Empty:
+                item = None
+
+            try:
+                if item is not None:
+                    self._write_item(item)
+
+                if self._should_rotate():
+                    self._rotate()
+            except:
+                # Marker is not moved past the discarded data. We bail out so the executions
+                # which were in the aborted file are exported again on restart
+                LOG.exception('Failed writing data to disk. Discarding file %s.',
+                              self._writer.part_file_path if self._writer else None)
+                self._abort()
+                raise
+
+    def _write_item(self, item):
+        if not self._writer:
+            self._create_date_folder()
+            self._writer = StreamingFileWriter(file_path=self._get_file_name(),
+                                               compression=self._compression)
+            LOG.debug('Opened new export file %s.', self._writer.part_file_path)
+
+        self._writer.write_line(self._converter.convert_item(item))
+
+        item_marker = (isotime.parse(item.end_timestamp), getattr(item, 'id', None))
+        if not self._file_marker or item_marker > self._file_marker:
+            self._file_marker = item_marker
+
+    def _should_rotate(self):
+        if not self._writer or self._writer.lines_written == 0:
+            return False
+
+        if self._writer.bytes_written >= self._max_file_size:
+            return True
+
+        return self._writer.get_age() >= self._max_file_age
+
+    def _rotate(self):
+        """
+        Close the currently open file and persist the marker of the newest execution in it.
+        """
+        if not self._writer:
+            return None
+
+        writer, file_marker = self._writer, self._file_marker
+        self._writer, self._file_marker = None, None
+
+        file_path = writer.close()
+        LOG.info('Exported %d executions to %s.', writer.lines_written, file_path)
+
+        if not file_marker:
+            return None
+
+        timestamp, execution_id = file_marker
+
+        if self._persisted_marker and self._persisted_marker > file_marker:
+            LOG.warn('Older executions are being exported. Perhaps out of order messages.')
+
+        try:
+            self._write_marker_to_db(timestamp, execution_id=execution_id)
+        except:
+            LOG.exception('Failed persisting dumper marker to db.')
+        else:
+            self._persisted_marker = file_marker
+
+        return file_path
+
+    def _abort(self):
+        if not self._writer:
+            return
+
+        writer = self._writer
+        self._writer, self._file_marker = None, None
+
+        try:
+            writer.abort()
+        except:
+            LOG.exception('Failed to remove partial export file %s.', writer.part_file_path)
+
+    def _remove_part_files(self):
+        """
+        Remove files which were left behind by a previous run which didn't exit cleanly. Marker
+        was never moved past the executions in those files so they will be exported again.
+        """
+        for root, _, file_names in os.walk(self._export_dir):
+            for file_name in file_names:
+                if not file_name.endswith(PART_FILE_SUFFIX):
+                    continue
+
+                file_path = os.path.join(root, file_name)
+                LOG.info('Removing partially written export file %s.', file_path)
+
+                try:
+                    os.remove(file_path)
+                except:
+                    LOG.exception('Failed to remove partial export file %s.', file_path)
@@ -13,16 +13,37 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gzip
 import os
+import time
 
 import abc
 import six
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 __all__ = [
     'FileWriter',
-    'TextFileWriter'
+    'TextFileWriter',
+    'StreamingFileWriter',
+
+    'COMPRESSION_EXTENSIONS',
+    'PART_FILE_SUFFIX'
 ]
 
+# Maps supported compression algorithms to the extension appended to the file name
+COMPRESSION_EXTENSIONS = {
+    'none': '',
+    'gzip': '.gz',
+    'zstd': '.zst'
+}
+
+# Suffix used for files which are still being written to
+PART_FILE_SUFFIX = '.part'
+
 
 @six.add_metaclass(abc.ABCMeta)
 class FileWriter(object):
@@ -50,3 +71,99 @@ class TextFileWriter(FileWriter):
 
         with open(file_path, 'w') as f:
             f.write(data)
+
+
+class StreamingFileWriter(object):
+    """
+    Writer which appends lines to a single file as they come in and (optionally) compresses them
+    on the fly.
+
+    Data is written to a "<file_path>.part" file which is only renamed to the final file path
+    once the file is closed. This way consumers of the export directory never see partially
+    written files.
+    """
+
+    def __init__(self, file_path, compression='none'):
+        compression = compression or 'none'
+
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError('Unsupported compression "%s". Valid values are: %s' %
+                             (compression, ', '.join(sorted(COMPRESSION_EXTENSIONS.keys()))))
+
+        if compression == 'zstd' and not zstandard:
+            raise ValueError('zstd compression requires "zstandard" Python package to be '
+                             'installed.')
+
+        self.file_path = file_path + COMPRESSION_EXTENSIONS[compression]
+        self.part_file_path = self.file_path + PART_FILE_SUFFIX
+
+        if os.path.exists(self.file_path):
+            raise Exception('File %s already exists.' % self.file_path)
+
+        # Number of uncompressed bytes and lines written to the file so far
+        self.bytes_written = 0
+        self.lines_written = 0
+        self.opened_at = time.time()
+
+        self._compression = compression
+        self._fp = open(self.part_file_path, 'wb')
+        self._stream = self._get_stream(fp=self._fp, compression=compression)
+
+    def write_line(self, line):
+        if isinstance(line, six.text_type):
+            line = line.encode('utf-8')
+
+        data = line + b'\n'
+        self._stream.write(data)
+        self.bytes_written += len(data)
+        self.lines_written += 1
+
+    def get_age(self):
+        """
+        Return number of seconds which have passed since the file has been opened.
+        """
+        return time.time() - self.opened_at
+
+    def close(self):
+        """
+        Finish the compressed stream, flush all the data to disk and move the file to the final
+        location.
+
+        :return: Final path of the written file.
+        :rtype: ``str``
+        """
+        self._close_stream()
+        os.rename(self.part_file_path, self.file_path)
+        return self.file_path
+
+    def abort(self):
+        """
+        Close the file and discard all the data written to it.
+        """
+        try:
+            self._close_stream()
+        finally:
+            if os.path.exists(self.part_file_path):
+                os.remove(self.part_file_path)
+
+    def _get_stream(self, fp, compression):
+        if compression == 'gzip':
+            return gzip.GzipFile(fileobj=fp, mode='wb')
+        elif compression == 'zstd':
+            return zstandard.ZstdCompressor().stream_writer(fp)
+
+        return fp
+
+    def _close_stream(self):
+        if self._fp.closed:
+            return
+
+        if self._compression == 'gzip':
+            # Writes gzip trailer, underlying file object is left open
+            self._stream.close()
+        elif self._compression == 'zstd':
+            self._stream.flush(zstandard.FLUSH_FRAME)
+
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._fp.close()
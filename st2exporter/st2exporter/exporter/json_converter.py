@@ -16,7 +16,8 @@
 from st2common.util.jsonify import json_encode
 
 __all__ = [
-    'JsonConverter'
+    'JsonConverter',
+    'NDJsonConverter'
 ]
 
 
@@ -27,3 +28,18 @@ class JsonConverter(object):
             raise ValueError('Items to be converted should be a list.')
         json_doc = json_encode(items_list)
         return json_doc
+
+
+class NDJsonConverter(object):
+    """
+    Converter which serializes each item as a single line JSON document (newline delimited JSON).
+    """
+
+    def convert(self, items_list):
+        if not isinstance(items_list, list):
+            raise ValueError('Items to be converted should be a list.')
+        return '\n'.join([self.convert_item(item) for item in items_list])
+
+    def convert_item(self, item):
+        # Note: Indentation needs to be disabled, otherwise the document would span multiple lines
+        return json_encode(item, indent=None)
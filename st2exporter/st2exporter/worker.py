@@ -15,8 +15,8 @@
 
 import Queue
 
-import eventlet
 from kombu import Connection
+from mongoengine.queryset import Q
 from oslo_config import cfg
 
 from st2common import log as logging
@@ -28,8 +28,9 @@ from st2common.persistence.execution import ActionExecution
 from st2common.persistence.marker import DumperMarker
 from st2common.transport import consumers, execution, publishers
 from st2common.transport import utils as transport_utils
-from st2common.util import isotime
 from st2exporter.exporter.dumper import Dumper
+from st2exporter.exporter.dumper import StreamingDumper
+from st2exporter.exporter.dumper import parse_marker
 
 __all__ = [
     'ExecutionsExporter'
@@ -48,26 +49,34 @@ class ExecutionsExporter(consumers.MessageHandler):
 
     def __init__(self, connection, queues):
         super(ExecutionsExporter, self).__init__(connection, queues)
-        self.pending_executions = Queue.Queue()
-        self._dumper = Dumper(queue=self.pending_executions,
-                              export_dir=cfg.CONF.exporter.dump_dir)
+        # Bounded queue - producers (bootstrap and message consumer) block when the dumper can't
+        # keep up instead of loading everything into memory
+        self.pending_executions = Queue.Queue(maxsize=cfg.CONF.exporter.max_queue_size)
+        self._dumper = self._get_dumper()
         self._consumer_thread = None
 
     def start(self, wait=False):
+        # Dumper needs to be running before bootstrap since bootstrap blocks once the queue is full
+        self._dumper.start()
+
         LOG.info('Bootstrapping executions from db...')
         try:
             self._bootstrap()
         except:
             LOG.exception('Unable to bootstrap executions from db. Aborting.')
             raise
-        self._consumer_thread = eventlet.spawn(super(ExecutionsExporter, self).start, wait=True)
-        self._dumper.start()
+
+        # Only starts the queue consumer thread, bootstrap has already been performed above
+        super(ExecutionsExporter, self).start(wait=False)
+
         if wait:
             self.wait()
 
     def wait(self):
-        self._consumer_thread.wait()
+        # Dumper exits when it fails to write data to disk. In that case we propagate the error so
+        # the service exits and resumes from the last persisted marker once restarted.
         self._dumper.wait()
+        self._consumer_thread.wait()
 
     def shutdown(self):
         self._dumper.stop()
@@ -78,26 +87,35 @@ class ExecutionsExporter(consumers.MessageHandler):
         if execution.status not in COMPLETION_STATUSES:
             return
         execution_api = ActionExecutionAPI.from_model(execution, mask_secrets=True)
-        self.pending_executions.put_nowait(execution_api)
+        self.pending_executions.put(execution_api)
         LOG.debug("Added execution to queue.")
 
+    def _get_dumper(self):
+        if cfg.CONF.exporter.file_format == 'ndjson':
+            return StreamingDumper(queue=self.pending_executions,
+                                   export_dir=cfg.CONF.exporter.dump_dir,
+                                   compression=cfg.CONF.exporter.compression,
+                                   max_file_size=cfg.CONF.exporter.max_file_size,
+                                   max_file_age=cfg.CONF.exporter.max_file_age)
+
+        return Dumper(queue=self.pending_executions,
+                      export_dir=cfg.CONF.exporter.dump_dir,
+                      file_format=cfg.CONF.exporter.file_format)
+
     def _bootstrap(self):
         marker = self._get_export_marker_from_db()
-        LOG.info('Using marker %s...' % marker)
+        LOG.info('Using marker %s...' % (marker,))
         missed_executions = self._get_missed_executions_from_db(export_marker=marker)
-        LOG.info('Found %d executions not exported yet...', len(missed_executions))
 
+        count = 0
         for missed_execution in missed_executions:
-            if missed_execution.status not in COMPLETION_STATUSES:
-                continue
             execution_api = ActionExecutionAPI.from_model(missed_execution, mask_secrets=True)
-            try:
-                LOG.debug('Missed execution %s', execution_api)
-                self.pending_executions.put_nowait(execution_api)
-            except:
-                LOG.exception('Failed adding execution to in-memory queue.')
-                continue
-        LOG.info('Bootstrapped executions...')
+            LOG.debug('Missed execution %s', execution_api)
+
+            # Blocks until the dumper makes room in the queue
+            self.pending_executions.put(execution_api)
+            count += 1
+        LOG.info('Bootstrapped %d executions...', count)
 
     def _get_export_marker_from_db(self):
         try:
@@ -107,22 +125,46 @@ class ExecutionsExporter(consumers.MessageHandler):
         else:
             if len(markers) >= 1:
                 marker = markers[0]
-                return isotime.parse(marker.marker)
+                return parse_marker(marker.marker)
             else:
                 return None
 
     def _get_missed_executions_from_db(self, export_marker=None):
-        if not export_marker:
-            return self._get_all_executions_from_db()
+        """
+        Generator which yields completed executions which come after the provided marker ordered
+        by (end_timestamp, id).
+
+        Executions are retrieved in pages of "bootstrap_batch_size" items. Each page continues
+        where the previous one ended (keyset pagination) so only a single page is held in memory
+        and the query doesn't slow down with the number of skipped documents.
+
+        :param export_marker: (timestamp, execution_id) tuple as returned by parse_marker.
+        :type export_marker: ``tuple``
+        """
+        last_timestamp, last_id = export_marker if export_marker else (None, None)
+        batch_size = cfg.CONF.exporter.bootstrap_batch_size
+        model = ActionExecution._get_impl().model
+
+        while True:
+            query = Q(status__in=COMPLETION_STATUSES)
+
+            if last_timestamp and last_id:
+                query &= (Q(end_timestamp__gt=last_timestamp) |
+                          Q(end_timestamp=last_timestamp, id__gt=last_id))
+            elif last_timestamp:
+                query &= Q(end_timestamp__gt=last_timestamp)
+
+            LOG.debug('Querying for executions after marker: %s, %s', last_timestamp, last_id)
+            queryset = model.objects(query).order_by('end_timestamp', 'id').limit(batch_size)
+            executions = list(queryset)
+
+            for execution_db in executions:
+                yield execution_db
 
-        # XXX: Should adapt this query to get only executions with status
-        # in COMPLETION_STATUSES.
-        filters = {'end_timestamp__gt': export_marker}
-        LOG.info('Querying for executions with filters: %s', filters)
-        return ActionExecution.query(**filters)
+            if len(executions) < batch_size:
+                break
 
-    def _get_all_executions_from_db(self):
-        return ActionExecution.get_all()  # XXX: Paginated call.
+            last_timestamp, last_id = executions[-1].end_timestamp, executions[-1].id
 
 
 def get_worker():
@@ -21,8 +21,11 @@ import mock
 from st2common.models.api.execution import ActionExecutionAPI
 from st2common.models.db.marker import DumperMarkerDB
 from st2common.persistence.marker import DumperMarker
+from st2common.transport.consumers import MessageHandler
 from st2common.util import isotime
 from st2common.util import date as date_utils
+from st2exporter.exporter.dumper import format_marker
+from st2exporter.exporter.dumper import parse_marker
 from st2exporter.worker import ExecutionsExporter
 from st2tests.base import DbTestCase
 from st2tests.fixturesloader import FixturesLoader
@@ -48,34 +51,74 @@ class TestExportWorker(DbTestCase):
                                                               fixtures_dict=DESCENDANTS_FIXTURES)
         TestExportWorker.saved_executions = loaded_fixtures['executions']
 
+    def tearDown(self):
+        super(TestExportWorker, self).tearDown()
+
+        for marker_db in DumperMarker.get_all():
+            DumperMarker.delete(marker_db)
+
     @mock.patch.object(os.path, 'exists', mock.MagicMock(return_value=True))
     def test_get_marker_from_db(self):
         marker_dt = date_utils.get_datetime_utc_now() - datetime.timedelta(minutes=5)
-        marker_db = DumperMarkerDB(marker=isotime.format(marker_dt, offset=False),
-                                   updated_at=date_utils.get_datetime_utc_now())
-        DumperMarker.add_or_update(marker_db)
+        execution_id = str(self.saved_executions.values()[0].id)
+        self._save_marker(format_marker(marker_dt, execution_id))
         exec_exporter = ExecutionsExporter(None, None)
         export_marker = exec_exporter._get_export_marker_from_db()
-        self.assertEqual(export_marker, date_utils.add_utc_tz(marker_dt))
+        self.assertEqual(export_marker, (date_utils.add_utc_tz(marker_dt), execution_id))
+
+    @mock.patch.object(os.path, 'exists', mock.MagicMock(return_value=True))
+    def test_get_legacy_marker_from_db(self):
+        # Markers written before the upgrade only contain a timestamp
+        marker_dt = date_utils.get_datetime_utc_now() - datetime.timedelta(minutes=5)
+        self._save_marker(isotime.format(marker_dt, offset=False))
+        exec_exporter = ExecutionsExporter(None, None)
+        export_marker = exec_exporter._get_export_marker_from_db()
+        self.assertEqual(export_marker, (date_utils.add_utc_tz(marker_dt), None))
 
     @mock.patch.object(os.path, 'exists', mock.MagicMock(return_value=True))
     def test_get_missed_executions_from_db_no_marker(self):
         exec_exporter = ExecutionsExporter(None, None)
-        all_execs = exec_exporter._get_missed_executions_from_db(export_marker=None)
+        all_execs = list(exec_exporter._get_missed_executions_from_db(export_marker=None))
         self.assertEqual(len(all_execs), len(self.saved_executions.values()))
 
     @mock.patch.object(os.path, 'exists', mock.MagicMock(return_value=True))
     def test_get_missed_executions_from_db_with_marker(self):
         exec_exporter = ExecutionsExporter(None, None)
-        all_execs = exec_exporter._get_missed_executions_from_db(export_marker=None)
+        all_execs = list(exec_exporter._get_missed_executions_from_db(export_marker=None))
         min_timestamp = min([item.end_timestamp for item in all_execs])
-        marker = min_timestamp + datetime.timedelta(seconds=1)
-        execs_greater_than_marker = [item for item in all_execs if item.end_timestamp > marker]
-        all_execs = exec_exporter._get_missed_executions_from_db(export_marker=marker)
+        marker_dt = min_timestamp + datetime.timedelta(seconds=1)
+        execs_greater_than_marker = [item for item in all_execs if item.end_timestamp > marker_dt]
+        marker = parse_marker(format_marker(marker_dt))
+        all_execs = list(exec_exporter._get_missed_executions_from_db(export_marker=marker))
         self.assertTrue(len(all_execs) > 0)
         self.assertTrue(len(all_execs) == len(execs_greater_than_marker))
         for item in all_execs:
-            self.assertTrue(item.end_timestamp > marker)
+            self.assertTrue(item.end_timestamp > marker_dt)
+
+    @mock.patch.object(os.path, 'exists', mock.MagicMock(return_value=True))
+    def test_get_missed_executions_from_db_with_id_marker(self):
+        exec_exporter = ExecutionsExporter(None, None)
+        all_execs = list(exec_exporter._get_missed_executions_from_db(export_marker=None))
+
+        # Export resumes right after the last exported execution, executions with the same end
+        # timestamp and a greater id are included
+        last_exported = all_execs[0]
+        marker = parse_marker(format_marker(last_exported.end_timestamp, last_exported.id))
+        missed_execs = list(exec_exporter._get_missed_executions_from_db(export_marker=marker))
+        self.assertEqual([item.id for item in missed_execs], [item.id for item in all_execs[1:]])
+
+    @mock.patch.object(os.path, 'exists', mock.MagicMock(return_value=True))
+    def test_bootstrap_with_legacy_marker(self):
+        exec_exporter = ExecutionsExporter(None, None)
+        all_execs = list(exec_exporter._get_missed_executions_from_db(export_marker=None))
+        min_timestamp = min([item.end_timestamp for item in all_execs])
+        marker_dt = min_timestamp + datetime.timedelta(seconds=1)
+        execs_greater_than_marker = [item for item in all_execs if item.end_timestamp > marker_dt]
+        self._save_marker(isotime.format(marker_dt, offset=False))
+
+        exec_exporter._bootstrap()
+        self.assertEqual(exec_exporter.pending_executions.qsize(),
+                         len(execs_greater_than_marker))
 
     @mock.patch.object(os.path, 'exists', mock.MagicMock(return_value=True))
     def test_bootstrap(self):
@@ -88,6 +131,18 @@ class TestExportWorker(DbTestCase):
             self.assertTrue(isinstance(exec_exporter.pending_executions.get(), ActionExecutionAPI))
             count += 1
 
+    @mock.patch.object(os.path, 'exists', mock.MagicMock(return_value=True))
+    @mock.patch.object(MessageHandler, 'start', mock.MagicMock())
+    @mock.patch.object(ExecutionsExporter, '_bootstrap')
+    def test_start_bootstraps_once(self, mock_bootstrap):
+        exec_exporter = ExecutionsExporter(None, None)
+        exec_exporter._dumper = mock.Mock()
+        exec_exporter.start(wait=False)
+
+        self.assertEqual(mock_bootstrap.call_count, 1)
+        self.assertEqual(exec_exporter._dumper.start.call_count, 1)
+        MessageHandler.start.assert_called_once_with(wait=False)
+
     @mock.patch.object(os.path, 'exists', mock.MagicMock(return_value=True))
     def test_process(self):
         some_execution = self.saved_executions.values()[5]
@@ -99,6 +154,11 @@ class TestExportWorker(DbTestCase):
         exec_exporter.process(some_execution)
         self.assertEqual(exec_exporter.pending_executions.qsize(), 1)
 
+    @staticmethod
+    def _save_marker(marker):
+        marker_db = DumperMarkerDB(marker=marker, updated_at=date_utils.get_datetime_utc_now())
+        return DumperMarker.add_or_update(marker_db)
+
     @classmethod
     def tearDownClass(cls):
         super(TestExportWorker, cls).tearDownClass()
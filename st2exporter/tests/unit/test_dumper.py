@@ -14,8 +14,12 @@
 # limitations under the License.
 
 import datetime
+import gzip
+import json
 import os
 import Queue
+import shutil
+import tempfile
 
 import eventlet
 import mock
@@ -23,6 +27,9 @@ import mock
 from st2common.models.api.execution import ActionExecutionAPI
 from st2common.util import isotime
 from st2exporter.exporter.dumper import Dumper
+from st2exporter.exporter.dumper import StreamingDumper
+from st2exporter.exporter.dumper import format_marker
+from st2exporter.exporter.dumper import parse_marker
 from st2exporter.exporter.file_writer import TextFileWriter
 from st2tests.base import EventletTestCase
 from st2tests.fixturesloader import FixturesLoader
@@ -165,3 +172,141 @@ class TestDumper(EventletTestCase):
         self.assertEqual(dumper._persisted_marker, max_timestamp)
         self.assertEqual(new_marker, max_timestamp)
         dumper._write_marker_to_db.assert_called_with(new_marker)
+
+
+class TestStreamingDumper(EventletTestCase):
+
+    fixtures_loader = FixturesLoader()
+    loaded_fixtures = fixtures_loader.load_fixtures(fixtures_pack=DESCENDANTS_PACK,
+                                                    fixtures_dict=DESCENDANTS_FIXTURES)
+    execution_apis = [ActionExecutionAPI(**execution) for execution in
+                      loaded_fixtures['executions'].values()]
+
+    def setUp(self):
+        super(TestStreamingDumper, self).setUp()
+        self.export_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(TestStreamingDumper, self).tearDown()
+        shutil.rmtree(self.export_dir)
+
+    def _get_exported_files(self):
+        result = []
+        for root, _, file_names in os.walk(self.export_dir):
+            result.extend([os.path.join(root, file_name) for file_name in file_names])
+        return sorted(result)
+
+    def test_format_and_parse_marker(self):
+        timestamp = isotime.parse('2014-09-01T00:00:59.000001Z')
+
+        marker = format_marker(timestamp, execution_id='54e657d60640fd16887d6855')
+        self.assertEqual(marker, '2014-09-01T00:00:59.000001Z|54e657d60640fd16887d6855')
+        self.assertEqual(parse_marker(marker), (timestamp, '54e657d60640fd16887d6855'))
+
+        # Old style marker without execution id
+        self.assertEqual(parse_marker('2014-09-01T00:00:59.000001Z'), (timestamp, None))
+
+    @mock.patch.object(StreamingDumper, '_write_marker_to_db', mock.MagicMock(return_value=True))
+    def test_write_and_rotate(self):
+        dumper = StreamingDumper(queue=Queue.Queue(), export_dir=self.export_dir)
+
+        for execution_api in self.execution_apis:
+            dumper._write_item(execution_api)
+
+        # Nothing is visible to the consumers and no marker is persisted before rotation
+        exported_files = self._get_exported_files()
+        self.assertEqual(len(exported_files), 1)
+        self.assertTrue(exported_files[0].endswith('.ndjson.part'))
+        self.assertFalse(dumper._write_marker_to_db.called)
+
+        file_path = dumper._rotate()
+        self.assertTrue(file_path.endswith('.ndjson'))
+        self.assertEqual(self._get_exported_files(), [file_path])
+
+        with open(file_path, 'r') as fp:
+            lines = fp.read().splitlines()
+        self.assertEqual(len(lines), len(self.execution_apis))
+        self.assertEqual([json.loads(line)['id'] for line in lines],
+                         [execution_api.id for execution_api in self.execution_apis])
+
+        # Marker points to the newest exported execution
+        newest = max([(isotime.parse(execution_api.end_timestamp), execution_api.id)
+                      for execution_api in self.execution_apis])
+        dumper._write_marker_to_db.assert_called_once_with(newest[0], execution_id=newest[1])
+        self.assertEqual(dumper._persisted_marker, newest)
+
+    @mock.patch.object(StreamingDumper, '_write_marker_to_db', mock.MagicMock(return_value=True))
+    def test_gzip_compression(self):
+        dumper = StreamingDumper(queue=Queue.Queue(), export_dir=self.export_dir,
+                                 compression='gzip')
+
+        for execution_api in self.execution_apis:
+            dumper._write_item(execution_api)
+        file_path = dumper._rotate()
+        self.assertTrue(file_path.endswith('.ndjson.gz'))
+
+        fp = gzip.open(file_path, 'rb')
+        try:
+            lines = fp.read().splitlines()
+        finally:
+            fp.close()
+        self.assertEqual(len(lines), len(self.execution_apis))
+
+    def test_invalid_compression(self):
+        self.assertRaises(ValueError, StreamingDumper, queue=Queue.Queue(),
+                          export_dir=self.export_dir, compression='invalid')
+
+    def test_should_rotate(self):
+        dumper = StreamingDumper(queue=Queue.Queue(), export_dir=self.export_dir,
+                                 max_file_size=10 * 1024 * 1024, max_file_age=300)
+        self.assertFalse(dumper._should_rotate())
+
+        dumper._write_item(self.execution_apis[0])
+        self.assertFalse(dumper._should_rotate())
+
+        # Size limit reached
+        dumper._max_file_size = dumper._writer.bytes_written
+        self.assertTrue(dumper._should_rotate())
+
+        # Age limit reached
+        dumper._max_file_size = 10 * 1024 * 1024
+        dumper._writer.opened_at -= 301
+        self.assertTrue(dumper._should_rotate())
+        dumper._abort()
+
+    @mock.patch.object(StreamingDumper, '_write_marker_to_db', mock.MagicMock(return_value=True))
+    def test_abort_discards_file_and_marker(self):
+        dumper = StreamingDumper(queue=Queue.Queue(), export_dir=self.export_dir)
+        dumper._write_item(self.execution_apis[0])
+        dumper._abort()
+
+        self.assertEqual(self._get_exported_files(), [])
+        self.assertEqual(dumper._rotate(), None)
+        self.assertFalse(dumper._write_marker_to_db.called)
+
+    def test_start_removes_left_over_part_files(self):
+        part_file_path = os.path.join(self.export_dir, 'st2-executions-foo.ndjson.part')
+        with open(part_file_path, 'w') as fp:
+            fp.write('{}')
+
+        dumper = StreamingDumper(queue=Queue.Queue(), export_dir=self.export_dir)
+        dumper._remove_part_files()
+        self.assertFalse(os.path.exists(part_file_path))
+
+    @mock.patch.object(StreamingDumper, '_write_marker_to_db', mock.MagicMock(return_value=True))
+    def test_start_stop_dumper(self):
+        executions_queue = Queue.Queue()
+        for execution_api in self.execution_apis:
+            executions_queue.put(execution_api)
+
+        dumper = StreamingDumper(queue=executions_queue, export_dir=self.export_dir,
+                                 poll_interval=0.01)
+        dumper.start()
+        eventlet.sleep(0.1)
+        dumper.stop()
+
+        # Stopping the dumper closes the current file and persists the marker
+        exported_files = self._get_exported_files()
+        self.assertEqual(len(exported_files), 1)
+        self.assertTrue(exported_files[0].endswith('.ndjson'))
+        self.assertTrue(dumper._write_marker_to_db.called)
@@ -19,6 +19,7 @@ import unittest2
 
 from st2tests.fixturesloader import FixturesLoader
 from st2exporter.exporter.json_converter import JsonConverter
+from st2exporter.exporter.json_converter import NDJsonConverter
 
 DESCENDANTS_PACK = 'descendants'
 
@@ -51,3 +52,23 @@ class TestJsonConverter(unittest2.TestCase):
             self.fail('Should have thrown exception.')
         except ValueError:
             pass
+
+
+class TestNDJsonConverter(unittest2.TestCase):
+
+    fixtures_loader = FixturesLoader()
+    loaded_fixtures = fixtures_loader.load_fixtures(fixtures_pack=DESCENDANTS_PACK,
+                                                    fixtures_dict=DESCENDANTS_FIXTURES)
+
+    def test_convert(self):
+        executions_list = self.loaded_fixtures['executions'].values()
+        converter = NDJsonConverter()
+        converted_doc = converter.convert(executions_list)
+        lines = converted_doc.split('\n')
+        self.assertEqual(len(lines), len(executions_list))
+        self.assertListEqual(executions_list, [json.loads(line) for line in lines])
+
+    def test_convert_non_list(self):
+        executions_dict = self.loaded_fixtures['executions']
+        converter = NDJsonConverter()
+        self.assertRaises(ValueError, converter.convert, executions_dict)
@@ -58,7 +58,10 @@ def _run_worker():
     try:
         timer_thread = None
         if cfg.CONF.timer.enable:
-            timer = St2Timer(local_timezone=cfg.CONF.timer.local_timezone)
+            timer = St2Timer(local_timezone=cfg.CONF.timer.local_timezone,
+                             misfire_policy=cfg.CONF.timer.misfire_policy,
+                             misfire_grace_time=cfg.CONF.timer.misfire_grace_time,
+                             max_catchup_runs=cfg.CONF.timer.max_catchup_runs)
             timer_thread = eventlet.spawn(_kickoff_timer, timer)
             LOG.info(TIMER_ENABLED_LOG_LINE)
         else:
@@ -0,0 +1,77 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from st2common.services.partitioner import GroupPartitioner
+from st2common.services.partitioner import DEFAULT_REFRESH_INTERVAL
+from st2common.util.hashring import DEFAULT_REPLICAS
+from st2reactor.container.partitioners import DefaultPartitioner, get_all_enabled_sensors
+
+__all__ = [
+    'ConsistentHashPartitioner'
+]
+
+GROUP_ID = 'st2.sensorcontainer'
+
+
+class ConsistentHashPartitioner(DefaultPartitioner):
+    """
+    Partitions sensors across all the running sensor containers.
+
+    Each sensor is owned by exactly one member of the sensor container group. on_rebalance
+    callback is invoked each time the group membership changes so the sensors can be
+    redistributed.
+    """
+
+    def __init__(self, sensor_node_name, replicas=DEFAULT_REPLICAS,
+                 refresh_interval=DEFAULT_REFRESH_INTERVAL, coordinator=None, member_id=None):
+        super(ConsistentHashPartitioner, self).__init__(sensor_node_name=sensor_node_name)
+
+        # Extra partition provider config values are passed in as strings
+        self._partitioner = GroupPartitioner(group_id=GROUP_ID, replicas=int(replicas),
+                                             refresh_interval=float(refresh_interval),
+                                             coordinator=coordinator, member_id=member_id,
+                                             on_rebalance=self._on_rebalance)
+
+    @property
+    def members(self):
+        return self._partitioner.members
+
+    def start(self):
+        self._partitioner.start()
+
+    def stop(self):
+        self._partitioner.stop()
+
+    def refresh(self):
+        return self._partitioner.refresh()
+
+    def is_sensor_owner(self, sensor_db):
+        return self._partitioner.is_owner(sensor_db.get_reference().ref)
+
+    def get_sensors(self):
+        all_enabled_sensors = get_all_enabled_sensors()
+
+        partition_members = []
+
+        for sensor in all_enabled_sensors:
+            if self._partitioner.is_owner(sensor.get_reference().ref):
+                partition_members.append(sensor)
+
+        return partition_members
+
+    def _on_rebalance(self):
+        # on_rebalance is assigned by the sensor container manager after instantiation
+        if self.on_rebalance:
+            self.on_rebalance()
@@ -13,7 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import ctypes
 import hashlib
 
 from st2reactor.container.partitioners import DefaultPartitioner, get_all_enabled_sensors
@@ -27,6 +26,8 @@ __all__ = [
 SUB_RANGE_SEPARATOR = '|'
 RANGE_BOUNDARY_SEPARATOR = '..'
 
+UINT32_MASK = 0xffffffff
+
 
 class Range(object):
 
@@ -100,22 +101,17 @@ class HashPartitioner(DefaultPartitioner):
         return False
 
     def _hash_sensor_ref(self, sensor_ref):
-        # Hmm... maybe this should be done in C. If it becomes a performance
-        # bottleneck will look at that optimization.
-
         # From http://www.cs.hmc.edu/~geoff/classes/hmc.cs070.200101/homework10/hashfuncs.html
-        # The 'liberal' use of ctypes.c_unit is to guarantee unsigned integer and workaround
-        # inifinite precision.
+        # Values are masked to 32 bits to get unsigned integer semantics without the overhead of
+        # ctypes objects. Hash values are the same as before so the configured ranges still
+        # apply.
         md5_hash = hashlib.md5(sensor_ref.encode())
         md5_hash_int_repr = int(md5_hash.hexdigest(), 16)
-        h = ctypes.c_uint(0)
+        h = 0
         for d in reversed(str(md5_hash_int_repr)):
-            d = ctypes.c_uint(int(d))
-            higherorder = ctypes.c_uint(h.value & 0xf8000000)
-            h = ctypes.c_uint(h.value << 5)
-            h = ctypes.c_uint(h.value ^ (higherorder.value >> 27))
-            h = ctypes.c_uint(h.value ^ d.value)
-        return h.value
+            higherorder = h & 0xf8000000
+            h = ((h << 5) & UINT32_MASK) ^ (higherorder >> 27) ^ int(d)
+        return h
 
     def _create_hash_ranges(self, hash_ranges_repr):
         """
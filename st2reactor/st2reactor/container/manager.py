@@ -18,9 +18,11 @@ import sys
 import signal
 
 import eventlet
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2reactor.container.process_container import ProcessSensorContainer
+from st2reactor.container.multi_process_container import MultiSensorProcessContainer
 from st2common.services.sensor_watcher import SensorWatcher
 from st2common.models.system.common import ResourceReference
 
@@ -39,11 +41,16 @@ class SensorContainerManager(object):
         if not sensors_partitioner:
             raise ValueError('sensors_partitioner should be non-None.')
         self._sensors_partitioner = sensors_partitioner
+        self._sensors_partitioner.on_rebalance = self._rebalance_sensors
+
+        # Sensors which have been handed to the container, maps sensor ref -> sensor object
+        self._sensors = {}
 
     def run_sensors(self):
         """
         Run all sensors as determined by sensors_partitioner.
         """
+        self._sensors_partitioner.start()
         sensors = self._sensors_partitioner.get_sensors()
         if sensors:
             LOG.info('Setting up container to run %d sensors.', len(sensors))
@@ -52,7 +59,9 @@ class SensorContainerManager(object):
         sensors_to_run = []
         for sensor in sensors:
             # TODO: Directly pass DB object to the ProcessContainer
-            sensors_to_run.append(self._to_sensor_object(sensor))
+            sensor_obj = self._to_sensor_object(sensor)
+            self._sensors[sensor_obj['ref']] = sensor_obj
+            sensors_to_run.append(sensor_obj)
 
         LOG.info('(PID:%s) SensorContainer started.', os.getpid())
         self._setup_sigterm_handler()
@@ -60,7 +69,7 @@ class SensorContainerManager(object):
 
     def _spin_container_and_wait(self, sensors):
         try:
-            self._sensor_container = ProcessSensorContainer(sensors=sensors)
+            self._sensor_container = self._get_sensor_container(sensors=sensors)
             self._container_thread = eventlet.spawn(self._sensor_container.run)
             LOG.debug('Starting sensor CUD watcher...')
             self._sensors_watcher.start()
@@ -70,6 +79,7 @@ class SensorContainerManager(object):
         except (KeyboardInterrupt, SystemExit):
             self._sensor_container.shutdown()
             self._sensors_watcher.stop()
+            self._sensors_partitioner.stop()
 
             LOG.info('(PID:%s) SensorContainer stopped. Reason - %s', os.getpid(),
                      sys.exc_info()[0].__name__)
@@ -79,6 +89,38 @@ class SensorContainerManager(object):
 
             return 0
 
+    def _get_sensor_container(self, sensors):
+        if cfg.CONF.sensorcontainer.multi_sensor_processes:
+            LOG.info('Running sensors from the same pack in a single process.')
+            return MultiSensorProcessContainer(sensors=sensors)
+
+        return ProcessSensorContainer(sensors=sensors)
+
+    def _rebalance_sensors(self):
+        """
+        Start the sensors which are now owned by this node and stop the ones which have moved to
+        other nodes.
+        """
+        if not self._sensor_container:
+            return
+
+        owned_sensors = {}
+        for sensor_db in self._sensors_partitioner.get_sensors():
+            sensor_obj = self._to_sensor_object(sensor_db)
+            owned_sensors[sensor_obj['ref']] = sensor_obj
+
+        removed_refs = set(self._sensors.keys()) - set(owned_sensors.keys())
+        added_refs = set(owned_sensors.keys()) - set(self._sensors.keys())
+        LOG.info('Rebalancing sensors. Adding %s, removing %s.', sorted(added_refs),
+                 sorted(removed_refs))
+
+        for sensor_ref in removed_refs:
+            self._sensor_container.remove_sensor(sensor=self._sensors.pop(sensor_ref))
+
+        for sensor_ref in added_refs:
+            self._sensors[sensor_ref] = owned_sensors[sensor_ref]
+            self._sensor_container.add_sensor(sensor=owned_sensors[sensor_ref])
+
     def _setup_sigterm_handler(self):
 
         def sigterm_handler(signum=None, frame=None):
@@ -117,7 +159,9 @@ class SensorContainerManager(object):
             LOG.info('sensor %s is not enabled.', self._get_sensor_ref(sensor))
             return
         LOG.info('Adding sensor %s.', self._get_sensor_ref(sensor))
-        self._sensor_container.add_sensor(sensor=self._to_sensor_object(sensor))
+        sensor_obj = self._to_sensor_object(sensor)
+        self._sensors[sensor_obj['ref']] = sensor_obj
+        self._sensor_container.add_sensor(sensor=sensor_obj)
 
     def _handle_update_sensor(self, sensor):
         if not self._sensors_partitioner.is_sensor_owner(sensor):
@@ -129,6 +173,7 @@ class SensorContainerManager(object):
         # Handle disabling sensor
         if not sensor.enabled:
             LOG.info('Sensor %s disabled. Unloading sensor.', sensor_ref)
+            self._sensors.pop(sensor_ref, None)
             self._sensor_container.remove_sensor(sensor=sensor_obj)
             return
 
@@ -138,6 +183,7 @@ class SensorContainerManager(object):
         except:
             LOG.exception('Failed to reload sensor %s', sensor_ref)
         else:
+            self._sensors[sensor_ref] = sensor_obj
             self._sensor_container.add_sensor(sensor=sensor_obj)
             LOG.info('Sensor %s reloaded.', sensor_ref)
 
@@ -146,6 +192,7 @@ class SensorContainerManager(object):
             LOG.info('sensor %s is not supported. Ignoring delete.', self._get_sensor_ref(sensor))
             return
         LOG.info('Unloading sensor %s.', self._get_sensor_ref(sensor))
+        self._sensors.pop(self._get_sensor_ref(sensor), None)
         self._sensor_container.remove_sensor(sensor=self._to_sensor_object(sensor))
 
     def _get_sensor_ref(self, sensor):
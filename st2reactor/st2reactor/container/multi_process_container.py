@@ -0,0 +1,153 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import json
+from collections import defaultdict
+
+from st2common import log as logging
+from st2reactor.container.process_container import ProcessSensorContainer
+
+__all__ = [
+    'MultiSensorProcessContainer'
+]
+
+LOG = logging.getLogger('st2reactor.multi_process_sensor_container')
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WRAPPER_SCRIPT_NAME = 'multi_sensor_wrapper.py'
+WRAPPER_SCRIPT_PATH = os.path.join(BASE_DIR, WRAPPER_SCRIPT_NAME)
+
+
+class MultiSensorProcessContainer(ProcessSensorContainer):
+    """
+    Sensor container which runs all the sensors from the same pack in a single process.
+
+    Sensors from the same pack share the pack virtual environment so they can be co-hosted in a
+    single wrapper process where each sensor runs in a separate green thread. Container manages
+    one process per pack and restarts it when a sensor is added to or removed from the pack.
+    """
+
+    def __init__(self, sensors, poll_interval=5, dispatcher=None):
+        self._pack_sensors = defaultdict(dict)  # maps pack -> sensor_id -> sensor object
+
+        sensors = sensors or []
+        for sensor in sensors:
+            sensor_id = self._get_sensor_id(sensor=sensor)
+            self._pack_sensors[sensor['pack']][sensor_id] = sensor
+
+        groups = [self._get_pack_group(pack=pack) for pack in self._pack_sensors.keys()]
+        super(MultiSensorProcessContainer, self).__init__(sensors=groups,
+                                                          poll_interval=poll_interval,
+                                                          dispatcher=dispatcher)
+
+    def add_sensor(self, sensor):
+        """
+        Add a new sensor to the container and restart the process of the sensor pack.
+
+        :type sensor: ``dict``
+        """
+        sensor_id = self._get_sensor_id(sensor=sensor)
+        pack = sensor['pack']
+
+        if sensor_id in self._pack_sensors[pack]:
+            LOG.warning('Sensor %s already exists and running.', sensor_id)
+            return False
+
+        self._pack_sensors[pack][sensor_id] = sensor
+        self._restart_pack_process(pack=pack)
+        LOG.debug('Sensor %s started.', sensor_id)
+        return True
+
+    def remove_sensor(self, sensor):
+        """
+        Remove an existing sensor from the container and restart the process of the sensor pack.
+
+        :type sensor: ``dict``
+        """
+        sensor_id = self._get_sensor_id(sensor=sensor)
+        pack = sensor['pack']
+
+        if sensor_id not in self._pack_sensors[pack]:
+            LOG.warning('Sensor %s isn\'t running in this container.', sensor_id)
+            return False
+
+        del self._pack_sensors[pack][sensor_id]
+        self._restart_pack_process(pack=pack)
+        LOG.debug('Sensor %s stopped.', sensor_id)
+        return True
+
+    def _restart_pack_process(self, pack):
+        group_id = self._get_group_id(pack=pack)
+
+        if group_id in self._processes:
+            self._stop_sensor_process(sensor_id=group_id)
+
+        if self._pack_sensors[pack]:
+            self._spawn_sensor_process(sensor=self._get_pack_group(pack=pack))
+
+    def _spawn_sensor_process(self, sensor):
+        # Sensors might have been added or removed since the group has been created (e.g. when
+        # respawning a dead process) so we always use an up to date group
+        pack = sensor['pack']
+
+        if not self._pack_sensors[pack]:
+            LOG.debug('No sensors left in pack %s, not spawning a process', pack)
+            return None
+
+        group = self._get_pack_group(pack=pack)
+        return super(MultiSensorProcessContainer, self)._spawn_sensor_process(sensor=group)
+
+    def _get_sensor_process_args(self, sensor, python_path):
+        sensors = []
+        for sensor_obj in sensor['sensors']:
+            sensors.append({
+                'ref': sensor_obj['ref'],
+                'file_path': sensor_obj['file_path'],
+                'class_name': sensor_obj['class_name'],
+                'trigger_types': sensor_obj['trigger_types'] or [],
+                'poll_interval': sensor_obj['poll_interval']
+            })
+
+        args = [
+            python_path,
+            WRAPPER_SCRIPT_PATH,
+            '--pack=%s' % (sensor['pack']),
+            '--sensors=%s' % (json.dumps(sensors)),
+            '--parent-args=%s' % (json.dumps(sys.argv[1:]))
+        ]
+
+        return args
+
+    def _get_pack_group(self, pack):
+        """
+        Return a dict which represents a process running all the sensors of the provided pack.
+
+        :rtype: ``dict``
+        """
+        group_id = self._get_group_id(pack=pack)
+        sensors = sorted(self._pack_sensors[pack].values(), key=lambda sensor: sensor['ref'])
+
+        group = {
+            'ref': group_id,
+            'pack': pack,
+            'class_name': group_id,
+            'sensors': sensors
+        }
+        return group
+
+    def _get_group_id(self, pack):
+        return 'sensors:%s' % (pack)
@@ -0,0 +1,306 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Wrapper process which runs multiple sensors from the same pack in a single Python process.
+
+Each sensor runs in a separate green thread. Config, database connection, trigger watcher and
+trigger dispatcher are shared by all the sensors in the process. If a sensor dies, only that
+sensor is restarted.
+"""
+
+import sys
+import copy
+import json
+import time
+import atexit
+import argparse
+from collections import defaultdict
+
+import eventlet
+
+from st2common import log as logging
+from st2common.constants.exit_codes import SUCCESS_EXIT_CODE
+from st2common.constants.exit_codes import FAILURE_EXIT_CODE
+from st2common.services.triggerwatcher import TriggerWatcher
+from st2common.transport.reactor import BufferedTriggerDispatcher
+from st2reactor.container.sensor_wrapper import SensorWrapper
+from st2reactor.container.sensor_wrapper import SensorService
+from st2reactor.container.sensor_wrapper import setup_sensor_process
+from st2reactor.container.sensor_wrapper import get_trigger_dispatcher
+from st2reactor.container.process_container import SENSOR_MAX_RESPAWN_COUNTS
+from st2reactor.container.process_container import SENSOR_SUCCESSFUL_START_THRESHOLD
+from st2reactor.container.process_container import SENSOR_RESPAWN_DELAY
+from st2reactor.container.process_container import SENSOR_MAX_RESPAWN_DELAY
+
+__all__ = [
+    'MultiSensorWrapper',
+    'HostedSensorWrapper'
+]
+
+
+class HostedSensorWrapper(SensorWrapper):
+    """
+    Wrapper for a single sensor which runs in a green thread inside the MultiSensorWrapper process.
+    """
+
+    def __init__(self, pack, file_path, class_name, trigger_types, dispatcher,
+                 poll_interval=None):
+        """
+        :param dispatcher: Trigger dispatcher shared by all the sensors in the process.
+        :type dispatcher: :class:`TriggerDispatcher`
+        """
+        self._pack = pack
+        self._file_path = file_path
+        self._class_name = class_name
+        self._trigger_types = trigger_types or []
+        self._poll_interval = poll_interval
+        self._parent_args = []
+        self._trigger_names = {}
+        self._dispatcher = dispatcher
+
+        # Trigger events are received by the MultiSensorWrapper and routed to the sensors
+        self._trigger_watcher = None
+
+        self._logger = logging.getLogger('SensorWrapper.%s.%s' %
+                                         (self._pack, self._class_name))
+
+        self._sensor_service = None
+        self._sensor_instance = self._get_sensor_instance()
+
+    def run(self):
+        self._run_sensor_instance()
+
+    def stop(self):
+        self._stop_sensor_instance()
+
+    def _get_sensor_service(self):
+        return SensorService(sensor_wrapper=self, dispatcher=self._dispatcher)
+
+    def _sanitize_trigger(self, trigger):
+        # Trigger object is shared by all the sensors in the process so each sensor gets its
+        # own copy
+        return copy.deepcopy(super(HostedSensorWrapper, self)._sanitize_trigger(trigger=trigger))
+
+
+class MultiSensorWrapper(object):
+    def __init__(self, pack, sensors, parent_args=None):
+        """
+        :param pack: Name of the pack the sensors belong to.
+        :type pack: ``str``
+
+        :param sensors: A list of sensor dicts with "ref", "file_path", "class_name",
+                        "trigger_types" and "poll_interval" keys.
+        :type sensors: ``list`` of ``dict``
+
+        :param parent_args: Command line arguments passed to the parent process.
+        :type parse_args: ``list``
+        """
+        self._pack = pack
+        self._sensors = dict([(sensor['ref'], sensor) for sensor in sensors])
+        self._parent_args = parent_args or []
+
+        self._wrappers = {}  # maps sensor ref -> HostedSensorWrapper
+        self._threads = {}  # maps sensor ref -> green thread running the sensor
+        self._triggers = {}  # maps trigger id -> trigger received by the watcher
+        self._respawn_counts = defaultdict(int)  # maps sensor ref -> number of respawns
+        self._stopped = False
+
+        # 1. Parse the config, establish DB connection and set up logging
+        setup_sensor_process(parent_args=self._parent_args)
+
+        self._logger = logging.getLogger('MultiSensorWrapper.%s' % (self._pack))
+
+        # 2. Instantiate the dispatcher and the watcher which are shared by all the sensors
+        self._dispatcher = get_trigger_dispatcher(self._logger)
+
+        trigger_types = set([])
+        for sensor in sensors:
+            trigger_types.update(sensor['trigger_types'] or [])
+
+        self._trigger_watcher = TriggerWatcher(create_handler=self._handle_create_trigger,
+                                               update_handler=self._handle_update_trigger,
+                                               delete_handler=self._handle_delete_trigger,
+                                               trigger_types=sorted(trigger_types),
+                                               queue_suffix='sensorwrapper_%s' % (self._pack),
+                                               exclusive=True)
+
+        # 3. Instantiate all the sensors
+        for sensor_ref, sensor in self._sensors.items():
+            try:
+                self._wrappers[sensor_ref] = self._get_sensor_wrapper(sensor=sensor)
+            except Exception:
+                self._logger.exception('Failed to instantiate sensor "%s"', sensor_ref)
+
+    def run(self):
+        """
+        Run all the sensors and wait for them to finish.
+
+        :return: Exit code. Non-zero if any of the sensors has failed and couldn't be restarted.
+        :rtype: ``int``
+        """
+        atexit.register(self.stop)
+
+        if isinstance(self._dispatcher, BufferedTriggerDispatcher):
+            self._dispatcher.start()
+
+        self._trigger_watcher.start()
+        self._logger.info('Watcher started')
+
+        for sensor_ref in self._wrappers.keys():
+            self._threads[sensor_ref] = eventlet.spawn(self._run_sensor, sensor_ref=sensor_ref)
+
+        results = [thread.wait() for thread in self._threads.values()]
+        failed = len(self._wrappers) != len(self._sensors) or not all(results)
+
+        return FAILURE_EXIT_CODE if failed else SUCCESS_EXIT_CODE
+
+    def stop(self):
+        if self._stopped:
+            return
+
+        self._stopped = True
+
+        self._logger.info('Stopping trigger watcher')
+        self._trigger_watcher.stop()
+
+        for sensor_ref, wrapper in self._wrappers.items():
+            thread = self._threads.get(sensor_ref, None)
+
+            if thread:
+                thread.kill()
+
+            try:
+                wrapper.stop()
+            except Exception:
+                self._logger.exception('Failed to stop sensor "%s"', sensor_ref)
+
+        if isinstance(self._dispatcher, BufferedTriggerDispatcher):
+            # Publishes all the remaining buffered triggers
+            self._dispatcher.stop()
+
+    def _run_sensor(self, sensor_ref):
+        """
+        Run a single sensor and restart it if it fails.
+
+        :return: False if the sensor has failed and couldn't be restarted, True otherwise.
+        :rtype: ``bool``
+        """
+        while not self._stopped:
+            wrapper = self._wrappers[sensor_ref]
+            start_time = time.time()
+
+            try:
+                wrapper.run()
+                return True
+            except Exception:
+                # Exception has already been logged by the wrapper
+                pass
+
+            try:
+                wrapper.stop()
+            except Exception:
+                self._logger.exception('Failed to stop sensor "%s"', sensor_ref)
+
+            if (time.time() - start_time) >= SENSOR_SUCCESSFUL_START_THRESHOLD:
+                self._respawn_counts[sensor_ref] = 0
+
+            if self._respawn_counts[sensor_ref] >= SENSOR_MAX_RESPAWN_COUNTS:
+                self._logger.error('Sensor "%s" has already been restarted max times, giving up',
+                                   sensor_ref)
+                del self._wrappers[sensor_ref]
+                return False
+
+            self._respawn_counts[sensor_ref] += 1
+            delay = min(SENSOR_RESPAWN_DELAY * (2 ** (self._respawn_counts[sensor_ref] - 1)),
+                        SENSOR_MAX_RESPAWN_DELAY)
+            self._logger.info('Restarting sensor "%s" in %s seconds', sensor_ref, delay)
+            eventlet.sleep(delay)
+
+            if self._stopped:
+                break
+
+            try:
+                self._wrappers[sensor_ref] = self._get_sensor_wrapper(
+                    sensor=self._sensors[sensor_ref])
+            except Exception:
+                self._logger.exception('Failed to instantiate sensor "%s"', sensor_ref)
+                del self._wrappers[sensor_ref]
+                return False
+
+        return True
+
+    def _get_sensor_wrapper(self, sensor):
+        wrapper = HostedSensorWrapper(pack=self._pack,
+                                      file_path=sensor['file_path'],
+                                      class_name=sensor['class_name'],
+                                      trigger_types=sensor['trigger_types'],
+                                      poll_interval=sensor['poll_interval'],
+                                      dispatcher=self._dispatcher)
+
+        # Replay triggers which have already been received so the restarted sensor knows about
+        # them
+        for trigger in self._triggers.values():
+            if trigger.type in wrapper._trigger_types:
+                wrapper._handle_create_trigger(trigger=trigger)
+
+        return wrapper
+
+    ##############################################
+    # Event handler methods for the trigger events
+    ##############################################
+
+    def _handle_create_trigger(self, trigger):
+        self._triggers[str(trigger.id)] = trigger
+        self._call_trigger_handler(trigger=trigger, handler_name='_handle_create_trigger')
+
+    def _handle_update_trigger(self, trigger):
+        self._triggers[str(trigger.id)] = trigger
+        self._call_trigger_handler(trigger=trigger, handler_name='_handle_update_trigger')
+
+    def _handle_delete_trigger(self, trigger):
+        self._triggers.pop(str(trigger.id), None)
+        self._call_trigger_handler(trigger=trigger, handler_name='_handle_delete_trigger')
+
+    def _call_trigger_handler(self, trigger, handler_name):
+        for sensor_ref, wrapper in self._wrappers.items():
+            if trigger.type not in wrapper._trigger_types:
+                continue
+
+            # Failure in one sensor shouldn't affect other sensors
+            try:
+                getattr(wrapper, handler_name)(trigger=trigger)
+            except Exception:
+                self._logger.exception('Sensor "%s" failed to handle trigger "%s"', sensor_ref,
+                                       trigger.id)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Multi sensor runner wrapper')
+    parser.add_argument('--pack', required=True,
+                        help='Name of the pack the sensors belong to')
+    parser.add_argument('--sensors', required=True,
+                        help='JSON serialized list of sensors to run')
+    parser.add_argument('--parent-args', required=False,
+                        help='Command line arguments passed to the parent process')
+    args = parser.parse_args()
+
+    sensors = json.loads(args.sensors)
+    parent_args = json.loads(args.parent_args) if args.parent_args else []
+    assert isinstance(sensors, list)
+    assert isinstance(parent_args, list)
+
+    obj = MultiSensorWrapper(pack=args.pack, sensors=sensors, parent_args=parent_args)
+    sys.exit(obj.run())
@@ -18,11 +18,12 @@ from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.constants.sensors import DEFAULT_PARTITION_LOADER, KVSTORE_PARTITION_LOADER, \
-    FILE_PARTITION_LOADER, HASH_PARTITION_LOADER
+    FILE_PARTITION_LOADER, HASH_PARTITION_LOADER, CONSISTENT_HASH_PARTITION_LOADER
 from st2common.exceptions.sensors import SensorPartitionerNotSupportedException
 from st2reactor.container.partitioners import DefaultPartitioner, KVStorePartitioner, \
     FileBasedPartitioner, SingleSensorPartitioner
 from st2reactor.container.hash_partitioner import HashPartitioner
+from st2reactor.container.consistent_hash_partitioner import ConsistentHashPartitioner
 
 __all__ = [
     'get_sensors_partitioner'
@@ -34,7 +35,8 @@ PROVIDERS = {
     DEFAULT_PARTITION_LOADER: DefaultPartitioner,
     KVSTORE_PARTITION_LOADER: KVStorePartitioner,
     FILE_PARTITION_LOADER: FileBasedPartitioner,
-    HASH_PARTITION_LOADER: HashPartitioner
+    HASH_PARTITION_LOADER: HashPartitioner,
+    CONSISTENT_HASH_PARTITION_LOADER: ConsistentHashPartitioner
 }
 
 
@@ -43,9 +43,19 @@ def get_all_enabled_sensors():
 
 class DefaultPartitioner(object):
 
+    # Called when the sensors owned by this node change while the container is running. Only
+    # used by partitioners which support rebalancing.
+    on_rebalance = None
+
     def __init__(self, sensor_node_name):
         self.sensor_node_name = sensor_node_name
 
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
     def is_sensor_owner(self, sensor_db):
         """
         All sensors are supported
@@ -121,9 +131,17 @@ class FileBasedPartitioner(DefaultPartitioner):
 
 class SingleSensorPartitioner(object):
 
+    on_rebalance = None
+
     def __init__(self, sensor_ref):
         self._sensor_ref = sensor_ref
 
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
     def get_sensors(self):
         sensor = SensorType.get_by_ref(self._sensor_ref)
         if not sensor:
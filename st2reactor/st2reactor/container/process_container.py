@@ -17,11 +17,16 @@ import os
 import sys
 import time
 import json
+import errno
+import fcntl
+import signal
 import subprocess
 
 from collections import defaultdict
 
+import six
 import eventlet
+from eventlet.hubs import trampoline
 from eventlet.support import greenlets as greenlet
 
 from st2common import log as logging
@@ -36,6 +41,7 @@ from st2common.services.access import create_token
 from st2common.transport.reactor import TriggerDispatcher
 from st2common.util.api import get_full_public_api_url
 from st2common.util.shell import on_parent_exit
+from st2common.util.shell import get_process_resource_usage
 from st2common.util.sandboxing import get_sandbox_python_path
 from st2common.util.sandboxing import get_sandbox_python_binary_path
 from st2common.util.sandboxing import get_sandbox_virtualenv_path
@@ -51,14 +57,20 @@ WRAPPER_SCRIPT_NAME = 'sensor_wrapper.py'
 WRAPPER_SCRIPT_PATH = os.path.join(BASE_DIR, WRAPPER_SCRIPT_NAME)
 
 # How many times to try to subsequently respawn a sensor after a non-zero exit before giving up
-SENSOR_MAX_RESPAWN_COUNTS = 2
+SENSOR_MAX_RESPAWN_COUNTS = 5
 
 # How many seconds after the sensor has been started we should wait before considering sensor as
 # being started and running successfully
 SENSOR_SUCCESSFUL_START_THRESHOLD = 10
 
-# How long to wait (in seconds) before respawning a dead process
+# How long to wait (in seconds) before respawning a dead process. Delay is doubled on each
+# subsequent respawn up to SENSOR_MAX_RESPAWN_DELAY seconds
 SENSOR_RESPAWN_DELAY = 2.5
+SENSOR_MAX_RESPAWN_DELAY = 60
+
+# How often (in seconds) to collect and log resource usage stats for the sensor processes. When
+# child exits are detected using SIGCHLD, this is also the longest time the container sleeps
+SENSOR_STATS_INTERVAL = 60
 
 # How long to wait for process to exit after sending SIGTERM signal. If the process doesn't
 # exit in this amount of seconds, SIGKILL signal will be sent to the process.
@@ -69,9 +81,17 @@ PROCESS_EXIT_TIMEOUT = 5
 # method to the sensor class
 
 
+class SensorWaitTimeout(Exception):
+    pass
+
+
 class ProcessSensorContainer(object):
     """
     Sensor container which runs sensors in a separate process.
+
+    Dead sensor processes are detected by listening for SIGCHLD signal. If the signal handler
+    can't be installed (e.g. container doesn't run in the main thread), container falls back
+    to polling the processes every poll_interval seconds.
     """
 
     def __init__(self, sensors, poll_interval=5, dispatcher=None):
@@ -80,10 +100,16 @@ class ProcessSensorContainer(object):
         :type sensors: ``list`` of ``dict``
 
         :param poll_interval: How long to sleep between each poll for running / dead sensors.
+                              Only used if SIGCHLD signal handler can't be installed.
         :type poll_interval: ``float``
         """
         self._poll_interval = poll_interval
 
+        # Read end of the pipe which is written to when SIGCHLD signal is received
+        self._wakeup_fd = None
+        self._wakeup_write_fd = None
+        self._stats_logged_at = time.time()
+
         self._sensors = {}  # maps sensor_id -> sensor object
         self._processes = {}  # maps sensor_id -> sensor process
 
@@ -101,11 +127,12 @@ class ProcessSensorContainer(object):
         # Stores information needed for respawning dead sensors
         self._sensor_start_times = {}  # maps sensor_id -> sensor start time
         self._sensor_respawn_counts = defaultdict(int)  # maps sensor_id -> number of respawns
+        self._sensor_restart_counts = defaultdict(int)  # maps sensor_id -> total number of restarts
 
         # A list of all the instance variables which hold internal state information about a
         # particular_sensor
-        # Note: We don't clear respawn counts since we want to track this through the whole life
-        # cycle of the container manager
+        # Note: We don't clear respawn and restart counts since we want to track this through the
+        # whole life cycle of the container manager
         self._internal_sensor_state_variables = [
             self._processes,
             self._sensors,
@@ -113,6 +140,7 @@ class ProcessSensorContainer(object):
         ]
 
     def run(self):
+        self._setup_sigchld_handler()
         self._run_all_sensors()
 
         try:
@@ -126,22 +154,136 @@ class ProcessSensorContainer(object):
                 else:
                     LOG.debug('No active sensors')
 
-                eventlet.sleep(self._poll_interval)
+                if time.time() - self._stats_logged_at >= SENSOR_STATS_INTERVAL:
+                    self._log_sensor_stats()
+
+                self._wait_for_sensor_exit()
         except greenlet.GreenletExit:
             # This exception is thrown when sensor container manager
             # kills the thread which runs process container. Not sure
             # if this is the best thing to do.
             self._stopped = True
+            self._teardown_sigchld_handler()
             return SUCCESS_EXIT_CODE
         except:
             LOG.exception('Container failed to run sensors.')
             self._stopped = True
+            self._teardown_sigchld_handler()
             return FAILURE_EXIT_CODE
 
         self._stopped = True
+        self._teardown_sigchld_handler()
         LOG.error('Process container quit. It shouldn\'t.')
         return SUCCESS_EXIT_CODE
 
+    def get_sensor_stats(self):
+        """
+        Return resource usage and restart stats for all the running sensor processes.
+
+        :rtype: ``dict``
+        """
+        now = int(time.time())
+        result = {}
+
+        for sensor_id, process in self._processes.items():
+            usage = get_process_resource_usage(pid=process.pid) or {}
+            result[sensor_id] = {
+                'pid': process.pid,
+                'cpu_time': usage.get('cpu_time', None),
+                'rss': usage.get('rss', None),
+                'restarts': self._sensor_restart_counts[sensor_id],
+                'uptime': now - self._sensor_start_times.get(sensor_id, now)
+            }
+
+        return result
+
+    def _log_sensor_stats(self):
+        self._stats_logged_at = time.time()
+
+        for sensor_id, stats in six.iteritems(self.get_sensor_stats()):
+            extra = {'sensor_id': sensor_id, 'stats': stats}
+            LOG.info('Sensor %s stats: pid=%s, cpu_time=%s, rss=%s, restarts=%s, uptime=%s',
+                     sensor_id, stats['pid'], stats['cpu_time'], stats['rss'],
+                     stats['restarts'], stats['uptime'], extra=extra)
+
+    def _setup_sigchld_handler(self):
+        """
+        Install SIGCHLD handler which wakes up the container when a child process exits.
+
+        Signal handler itself is a no-op, the actual wake up happens through the pipe registered
+        using signal.set_wakeup_fd.
+
+        :return: True if the handler has been installed, False otherwise.
+        :rtype: ``bool``
+        """
+        if self._wakeup_fd is not None:
+            return True
+
+        read_fd, write_fd = os.pipe()
+
+        try:
+            for fd in [read_fd, write_fd]:
+                flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+                fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+            signal.signal(signal.SIGCHLD, self._handle_sigchld)
+            signal.siginterrupt(signal.SIGCHLD, False)
+            signal.set_wakeup_fd(write_fd)
+        except (ValueError, OSError, RuntimeError) as e:
+            # signal module can only be used in the main thread
+            LOG.warning('Failed to install SIGCHLD handler, falling back to polling sensor '
+                        'processes every %s seconds: %s', self._poll_interval, str(e))
+            os.close(read_fd)
+            os.close(write_fd)
+            return False
+
+        self._wakeup_fd = read_fd
+        self._wakeup_write_fd = write_fd
+        return True
+
+    def _teardown_sigchld_handler(self):
+        if self._wakeup_fd is None:
+            return
+
+        try:
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        except (ValueError, RuntimeError):
+            pass
+
+        os.close(self._wakeup_fd)
+        os.close(self._wakeup_write_fd)
+        self._wakeup_fd = None
+        self._wakeup_write_fd = None
+
+    def _handle_sigchld(self, signum, frame):
+        # Nothing to do here, signal number is written to the wakeup fd which wakes up the
+        # container loop
+        pass
+
+    def _wait_for_sensor_exit(self):
+        """
+        Block until a child process exits or until the stats need to be logged.
+        """
+        if self._wakeup_fd is None:
+            eventlet.sleep(self._poll_interval)
+            return
+
+        timeout = max(SENSOR_STATS_INTERVAL - (time.time() - self._stats_logged_at), 0.1)
+
+        try:
+            trampoline(self._wakeup_fd, read=True, timeout=timeout,
+                       timeout_exc=SensorWaitTimeout)
+        except SensorWaitTimeout:
+            return
+
+        # Multiple signals can be coalesced so we always poll all the processes
+        try:
+            os.read(self._wakeup_fd, 4096)
+        except OSError as e:
+            if e.errno not in [errno.EAGAIN, errno.EWOULDBLOCK]:
+                raise
+
     def _poll_sensors_for_results(self, sensor_ids):
         """
         Main loop which polls sensor for results and detects dead sensors.
@@ -156,6 +298,14 @@ class ProcessSensorContainer(object):
                 # Dead process detected
                 LOG.info('Process for sensor %s has exited with code %s', sensor_id, status)
 
+                sensor_start_time = self._sensor_start_times[sensor_id]
+                successfuly_started = (now - sensor_start_time) >= SENSOR_SUCCESSFUL_START_THRESHOLD
+
+                if successfuly_started:
+                    # Sensor has been successfully running more than threshold seconds, clear the
+                    # respawn counter so we can try to restart the sensor as it died later on
+                    self._sensor_respawn_counts[sensor_id] = 0
+
                 sensor = self._sensors[sensor_id]
                 self._delete_sensor(sensor_id)
 
@@ -166,15 +316,6 @@ class ProcessSensorContainer(object):
                 # resolved with a restart)
                 eventlet.spawn_n(self._respawn_sensor, sensor_id=sensor_id, sensor=sensor,
                                  exit_code=status)
-            else:
-                sensor_start_time = self._sensor_start_times[sensor_id]
-                sensor_respawn_count = self._sensor_respawn_counts[sensor_id]
-                successfuly_started = (now - sensor_start_time) >= SENSOR_SUCCESSFUL_START_THRESHOLD
-
-                if successfuly_started and sensor_respawn_count >= 1:
-                    # Sensor has been successfully running more than threshold seconds, clear the
-                    # respawn counter so we can try to restart the sensor if it dies later on
-                    self._sensor_respawn_counts[sensor_id] = 0
 
     def running(self):
         return len(self._processes)
@@ -267,23 +408,7 @@ class ProcessSensorContainer(object):
             msg = PACK_VIRTUALENV_DOESNT_EXIST % format_values
             raise Exception(msg)
 
-        trigger_type_refs = sensor['trigger_types'] or []
-        trigger_type_refs = ','.join(trigger_type_refs)
-
-        parent_args = json.dumps(sys.argv[1:])
-
-        args = [
-            python_path,
-            WRAPPER_SCRIPT_PATH,
-            '--pack=%s' % (sensor['pack']),
-            '--file-path=%s' % (sensor['file_path']),
-            '--class-name=%s' % (sensor['class_name']),
-            '--trigger-type-refs=%s' % (trigger_type_refs),
-            '--parent-args=%s' % (parent_args)
-        ]
-
-        if sensor['poll_interval']:
-            args.append('--poll-interval=%s' % (sensor['poll_interval']))
+        args = self._get_sensor_process_args(sensor=sensor, python_path=python_path)
 
         env = os.environ.copy()
         env['PYTHONPATH'] = get_sandbox_python_path(inherit_from_parent=True,
@@ -321,6 +446,32 @@ class ProcessSensorContainer(object):
 
         return process
 
+    def _get_sensor_process_args(self, sensor, python_path):
+        """
+        Return command line arguments for the wrapper process of the provided sensor.
+
+        :rtype: ``list``
+        """
+        trigger_type_refs = sensor['trigger_types'] or []
+        trigger_type_refs = ','.join(trigger_type_refs)
+
+        parent_args = json.dumps(sys.argv[1:])
+
+        args = [
+            python_path,
+            WRAPPER_SCRIPT_PATH,
+            '--pack=%s' % (sensor['pack']),
+            '--file-path=%s' % (sensor['file_path']),
+            '--class-name=%s' % (sensor['class_name']),
+            '--trigger-type-refs=%s' % (trigger_type_refs),
+            '--parent-args=%s' % (parent_args)
+        ]
+
+        if sensor['poll_interval']:
+            args.append('--poll-interval=%s' % (sensor['poll_interval']))
+
+        return args
+
     def _stop_sensor_process(self, sensor_id, exit_timeout=PROCESS_EXIT_TIMEOUT):
         """
         Stop a sensor process for the provided sensor.
@@ -380,7 +531,8 @@ class ProcessSensorContainer(object):
         LOG.debug('Respawning dead sensor', extra=extra)
 
         self._sensor_respawn_counts[sensor_id] += 1
-        sleep_delay = (SENSOR_RESPAWN_DELAY * self._sensor_respawn_counts[sensor_id])
+        self._sensor_restart_counts[sensor_id] += 1
+        sleep_delay = self._get_respawn_delay(respawn_count=self._sensor_respawn_counts[sensor_id])
         eventlet.sleep(sleep_delay)
 
         try:
@@ -391,6 +543,13 @@ class ProcessSensorContainer(object):
             # Disable sensor which we are unable to start
             del self._sensors[sensor_id]
 
+    def _get_respawn_delay(self, respawn_count):
+        """
+        Return how long to wait (in seconds) before respawning a sensor for the n-th time.
+        """
+        delay = SENSOR_RESPAWN_DELAY * (2 ** (respawn_count - 1))
+        return min(delay, SENSOR_MAX_RESPAWN_DELAY)
+
     def _should_respawn_sensor(self, sensor_id, sensor, exit_code):
         """
         Return True if the provided sensor should be respawned, False otherwise.
@@ -15,9 +15,11 @@
 
 import os
 import json
+import time
 import atexit
 import argparse
 
+import eventlet
 from oslo_config import cfg
 
 from st2common import log as logging
@@ -25,6 +27,7 @@ from st2common.logging.misc import set_log_level_for_all_loggers
 from st2common.models.api.trace import TraceContext
 from st2common.persistence.db_init import db_setup_with_retry
 from st2common.transport.reactor import TriggerDispatcher
+from st2common.transport.reactor import BufferedTriggerDispatcher
 from st2common.util import loader
 from st2common.util.config_parser import ContentPackConfigParser
 from st2common.services.triggerwatcher import TriggerWatcher
@@ -35,11 +38,58 @@ from st2common.util.monkey_patch import monkey_patch
 
 __all__ = [
     'SensorWrapper',
-    'SensorService'
+    'SensorService',
+
+    'setup_sensor_process',
+    'get_trigger_dispatcher'
 ]
 
 monkey_patch()
 
+# How often (in seconds) to log the trigger dispatch rate for this sensor
+DISPATCH_STATS_INTERVAL = 60
+
+
+def setup_sensor_process(parent_args):
+    """
+    Parse the config, establish database connection and set up logging for the sensor process.
+
+    :param parent_args: Command line arguments passed to the parent process.
+    :type parent_args: ``list``
+    """
+    # 1. Parse the config with inherited parent args
+    try:
+        config.parse_args(args=parent_args)
+    except Exception:
+        pass
+
+    # 2. Establish DB connection
+    username = cfg.CONF.database.username if hasattr(cfg.CONF.database, 'username') else None
+    password = cfg.CONF.database.password if hasattr(cfg.CONF.database, 'password') else None
+    db_setup_with_retry(cfg.CONF.database.db_name, cfg.CONF.database.host,
+                        cfg.CONF.database.port, username=username, password=password)
+
+    # 3. Set up logging
+    logging.setup(cfg.CONF.sensorcontainer.logging)
+
+    if '--debug' in parent_args:
+        set_log_level_for_all_loggers()
+
+
+def get_trigger_dispatcher(logger):
+    """
+    Return trigger dispatcher instance which is used by the sensors.
+    """
+    if not cfg.CONF.sensorcontainer.enable_dispatch_buffer:
+        return TriggerDispatcher(logger)
+
+    return BufferedTriggerDispatcher(
+        logger,
+        batch_size=cfg.CONF.sensorcontainer.dispatch_batch_size,
+        linger_time=cfg.CONF.sensorcontainer.dispatch_linger_time,
+        buffer_size=cfg.CONF.sensorcontainer.dispatch_buffer_size,
+        buffer_timeout=cfg.CONF.sensorcontainer.dispatch_buffer_timeout)
+
 
 class SensorService(object):
     """
@@ -47,10 +97,16 @@ class SensorService(object):
     methods which can be called by the sensor.
     """
 
-    def __init__(self, sensor_wrapper):
+    def __init__(self, sensor_wrapper, dispatcher=None):
+        """
+        :param dispatcher: Trigger dispatcher shared with other sensors. If not provided, a new
+                           dispatcher which is owned by this service is created.
+        :type dispatcher: :class:`TriggerDispatcher`
+        """
         self._sensor_wrapper = sensor_wrapper
         self._logger = self._sensor_wrapper._logger
-        self._dispatcher = TriggerDispatcher(self._logger)
+        self._owns_dispatcher = dispatcher is None
+        self._dispatcher = dispatcher or self._get_dispatcher()
         self._datastore_service = DatastoreService(logger=self._logger,
                                                    pack_name=self._sensor_wrapper._pack,
                                                    class_name=self._sensor_wrapper._class_name,
@@ -58,6 +114,9 @@ class SensorService(object):
 
         self._client = None
 
+        self._dispatch_count = 0
+        self._stats_thread = None
+
     def get_logger(self, name):
         """
         Retrieve an instance of a logger to be used by the sensor class.
@@ -97,8 +156,53 @@ class SensorService(object):
 
         :param trace_context: Trace context to associate with Trigger.
         :type trace_context: ``st2common.api.models.api.trace.TraceContext``
+
+        :raises: ``TriggerDispatchBufferFullException`` if dispatch buffering is enabled and the
+                 buffer stays full. Sensor should slow down when this happens.
         """
         self._dispatcher.dispatch(trigger, payload=payload, trace_context=trace_context)
+        self._dispatch_count += 1
+
+    def start(self):
+        if self._owns_dispatcher and isinstance(self._dispatcher, BufferedTriggerDispatcher):
+            self._dispatcher.start()
+
+        self._stats_thread = eventlet.spawn(self._log_dispatch_stats)
+
+    def stop(self):
+        if self._stats_thread:
+            self._stats_thread.kill()
+            self._stats_thread = None
+
+        if self._owns_dispatcher and isinstance(self._dispatcher, BufferedTriggerDispatcher):
+            # Publishes all the remaining buffered triggers
+            self._dispatcher.stop()
+
+    def get_dispatch_count(self):
+        """
+        Return number of triggers dispatched by this sensor.
+
+        :rtype: ``int``
+        """
+        return self._dispatch_count
+
+    def _log_dispatch_stats(self, interval=DISPATCH_STATS_INTERVAL):
+        last_count = self._dispatch_count
+        last_time = time.time()
+
+        while True:
+            eventlet.sleep(interval)
+
+            now = time.time()
+            count = self._dispatch_count
+            rate = float(count - last_count) / max(now - last_time, 1)
+            last_count, last_time = count, now
+
+            self._logger.info('Dispatched %s triggers (%.2f triggers/s)', count, rate,
+                              extra={'dispatch_count': count, 'dispatch_rate': rate})
+
+    def _get_dispatcher(self):
+        return get_trigger_dispatcher(self._logger)
 
     ##################################
     # Methods for datastore management
@@ -148,19 +252,10 @@ class SensorWrapper(object):
         self._parent_args = parent_args or []
         self._trigger_names = {}
 
-        # 1. Parse the config with inherited parent args
-        try:
-            config.parse_args(args=self._parent_args)
-        except Exception:
-            pass
-
-        # 2. Establish DB connection
-        username = cfg.CONF.database.username if hasattr(cfg.CONF.database, 'username') else None
-        password = cfg.CONF.database.password if hasattr(cfg.CONF.database, 'password') else None
-        db_setup_with_retry(cfg.CONF.database.db_name, cfg.CONF.database.host,
-                            cfg.CONF.database.port, username=username, password=password)
+        # 1. Parse the config, establish DB connection and set up logging
+        setup_sensor_process(parent_args=self._parent_args)
 
-        # 3. Instantiate the watcher
+        # 2. Instantiate the watcher
         self._trigger_watcher = TriggerWatcher(create_handler=self._handle_create_trigger,
                                                update_handler=self._handle_update_trigger,
                                                delete_handler=self._handle_delete_trigger,
@@ -169,14 +264,11 @@ class SensorWrapper(object):
                                                (self._pack, self._class_name),
                                                exclusive=True)
 
-        # 4. Set up logging
+        # 3. Instantiate the logger
         self._logger = logging.getLogger('SensorWrapper.%s.%s' %
                                          (self._pack, self._class_name))
-        logging.setup(cfg.CONF.sensorcontainer.logging)
-
-        if '--debug' in parent_args:
-            set_log_level_for_all_loggers()
 
+        self._sensor_service = None
         self._sensor_instance = self._get_sensor_instance()
 
     def run(self):
@@ -185,6 +277,18 @@ class SensorWrapper(object):
         self._trigger_watcher.start()
         self._logger.info('Watcher started')
 
+        self._run_sensor_instance()
+
+    def stop(self):
+        # Stop watcher
+        self._logger.info('Stopping trigger watcher')
+        self._trigger_watcher.stop()
+
+        self._stop_sensor_instance()
+
+    def _run_sensor_instance(self):
+        self._sensor_service.start()
+
         self._logger.info('Running sensor initialization code')
         self._sensor_instance.setup()
 
@@ -205,15 +309,14 @@ class SensorWrapper(object):
             self._logger.warn(msg, exc_info=True)
             raise Exception(msg)
 
-    def stop(self):
-        # Stop watcher
-        self._logger.info('Stopping trigger watcher')
-        self._trigger_watcher.stop()
-
+    def _stop_sensor_instance(self):
         # Run sensor cleanup code
         self._logger.info('Invoking cleanup on sensor')
         self._sensor_instance.cleanup()
 
+        # Flush buffered triggers
+        self._sensor_service.stop()
+
     ##############################################
     # Event handler methods for the trigger events
     ##############################################
@@ -267,7 +370,8 @@ class SensorWrapper(object):
                              (self._class_name))
 
         sensor_class_kwargs = {}
-        sensor_class_kwargs['sensor_service'] = SensorService(sensor_wrapper=self)
+        self._sensor_service = self._get_sensor_service()
+        sensor_class_kwargs['sensor_service'] = self._sensor_service
 
         sensor_config = self._get_sensor_config()
         sensor_class_kwargs['config'] = sensor_config
@@ -283,6 +387,9 @@ class SensorWrapper(object):
 
         return sensor_instance
 
+    def _get_sensor_service(self):
+        return SensorService(sensor_wrapper=self)
+
     def _get_sensor_config(self):
         config_parser = ContentPackConfigParser(pack_name=self._pack)
         config = config_parser.get_sensor_config(sensor_file_path=self._file_path)
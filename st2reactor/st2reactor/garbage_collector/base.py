@@ -33,6 +33,12 @@ from st2common.util import isotime
 from st2common.util.date import get_datetime_utc_now
 from st2common.garbage_collection.executions import purge_executions
 from st2common.garbage_collection.trigger_instances import purge_trigger_instances
+from st2common.garbage_collection.rule_enforcements import purge_rule_enforcements
+from st2common.garbage_collection.traces import purge_traces
+from st2common.garbage_collection.utils import ensure_ttl_index
+from st2common.garbage_collection.utils import drop_ttl_index
+from st2common.persistence.trigger import TriggerInstance
+from st2common.signal_handlers import handle_sigusr2 as handle_common_sigusr2
 
 __all__ = [
     'GarbageCollectorService'
@@ -52,8 +58,14 @@ class GarbageCollectorService(object):
 
         self._action_executions_ttl = cfg.CONF.garbagecollector.action_executions_ttl
         self._trigger_instances_ttl = cfg.CONF.garbagecollector.trigger_instances_ttl
+        self._rule_enforcements_ttl = cfg.CONF.garbagecollector.rule_enforcements_ttl
+        self._traces_ttl = cfg.CONF.garbagecollector.traces_ttl
         self._validate_ttl_values()
 
+        self._purge_batch_size = cfg.CONF.garbagecollector.purge_batch_size
+        self._purge_batch_sleep_delay = cfg.CONF.garbagecollector.purge_batch_sleep_delay
+        self._use_ttl_indexes = cfg.CONF.garbagecollector.use_ttl_indexes
+
         self._running = True
 
     def run(self):
@@ -63,6 +75,15 @@ class GarbageCollectorService(object):
         # effect when restarting multiple services at the same time
         eventlet.sleep(2)
 
+        try:
+            self._manage_ttl_indexes()
+        except Exception as e:
+            # Garbage collection should still be performed so the trigger instances are purged in
+            # batches instead
+            LOG.exception('Failed to manage TTL indexes, falling back to batch purge: %s' %
+                          (str(e)))
+            self._use_ttl_indexes = False
+
         try:
             self._main_loop()
         except greenlet.GreenletExit:
@@ -79,6 +100,9 @@ class GarbageCollectorService(object):
         signal.signal(signal.SIGUSR2, self.handle_sigusr2)
 
     def handle_sigusr2(self, signal_number, stack_frame):
+        # Overrides the common SIGUSR2 handler so the query stats are also written here
+        handle_common_sigusr2(signal_number, stack_frame)
+
         LOG.info('Forcing garbage collection...')
         self._perform_garbage_collection()
 
@@ -97,11 +121,27 @@ class GarbageCollectorService(object):
         """
         Validate that a user has supplied reasonable TTL values.
         """
-        if self._action_executions_ttl and self._action_executions_ttl < MINIMUM_TTL_DAYS:
-            raise ValueError('Minimum possible TTL in days is %s' % (MINIMUM_TTL_DAYS))
+        ttl_values = [self._action_executions_ttl, self._trigger_instances_ttl,
+                      self._rule_enforcements_ttl, self._traces_ttl]
+
+        for ttl in ttl_values:
+            if ttl and ttl < MINIMUM_TTL_DAYS:
+                raise ValueError('Minimum possible TTL in days is %s' % (MINIMUM_TTL_DAYS))
+
+    def _manage_ttl_indexes(self):
+        """
+        Create, update or drop MongoDB TTL indexes based on the config.
 
-        if self._trigger_instances_ttl and self._trigger_instances_ttl < MINIMUM_TTL_DAYS:
-            raise ValueError('Minimum possible TTL in days is %s' % (MINIMUM_TTL_DAYS))
+        Only trigger instances are supported since TTL indexes require a date field and the
+        timestamps of other models are stored as integers.
+        """
+        if self._use_ttl_indexes and self._trigger_instances_ttl >= MINIMUM_TTL_DAYS:
+            ttl = int(datetime.timedelta(days=self._trigger_instances_ttl).total_seconds())
+            ensure_ttl_index(logger=LOG, model_persistence=TriggerInstance,
+                             field='occurrence_time', ttl=ttl)
+        else:
+            drop_ttl_index(logger=LOG, model_persistence=TriggerInstance,
+                           field='occurrence_time')
 
     def _perform_garbage_collection(self):
         LOG.info('Performing garbage collection...')
@@ -115,12 +155,27 @@ class GarbageCollectorService(object):
 
         # Note: We sleep for a bit between garbage collection of each object
         # type to prevent busy waiting
-        if self._trigger_instances_ttl >= MINIMUM_TTL_DAYS:
+        if self._trigger_instances_ttl >= MINIMUM_TTL_DAYS and self._use_ttl_indexes:
+            LOG.debug('Skipping garbage collection for trigger instances since they are expired '
+                      'using a TTL index')
+        elif self._trigger_instances_ttl >= MINIMUM_TTL_DAYS:
             self._purge_trigger_instances()
         else:
             LOG.debug('Skipping garbage collection for trigger instances since it\'s not '
                       'configured')
 
+        if self._rule_enforcements_ttl >= MINIMUM_TTL_DAYS:
+            self._purge_models(name='rule enforcements', ttl=self._rule_enforcements_ttl,
+                               purge_func=purge_rule_enforcements)
+        else:
+            LOG.debug('Skipping garbage collection for rule enforcements since it\'s not '
+                      'configured')
+
+        if self._traces_ttl >= MINIMUM_TTL_DAYS:
+            self._purge_models(name='traces', ttl=self._traces_ttl, purge_func=purge_traces)
+        else:
+            LOG.debug('Skipping garbage collection for traces since it\'s not configured')
+
     def _purge_action_executions(self):
         """
         Purge action executions and corresponding live actions which match the criteria defined in
@@ -141,7 +196,9 @@ class GarbageCollectorService(object):
         assert timestamp < utc_now
 
         try:
-            purge_executions(logger=LOG, timestamp=timestamp)
+            purge_executions(logger=LOG, timestamp=timestamp,
+                             batch_size=self._purge_batch_size,
+                             sleep_delay=self._purge_batch_sleep_delay)
         except Exception as e:
             LOG.exception('Failed to delete executions: %s' % (str(e)))
 
@@ -166,8 +223,36 @@ class GarbageCollectorService(object):
         assert timestamp < utc_now
 
         try:
-            purge_trigger_instances(logger=LOG, timestamp=timestamp)
+            purge_trigger_instances(logger=LOG, timestamp=timestamp,
+                                    batch_size=self._purge_batch_size,
+                                    sleep_delay=self._purge_batch_sleep_delay)
         except Exception as e:
             LOG.exception('Failed to trigger instances: %s' % (str(e)))
 
         return True
+
+    def _purge_models(self, name, ttl, purge_func):
+        """
+        Purge models which are older than ttl days using the provided purge function.
+        """
+        LOG.info('Performing garbage collection for %s' % (name))
+
+        utc_now = get_datetime_utc_now()
+        timestamp = (utc_now - datetime.timedelta(days=ttl))
+
+        # Another sanity check to make sure we don't delete new objects
+        if timestamp > (utc_now - datetime.timedelta(days=MINIMUM_TTL_DAYS)):
+            raise ValueError('Calculated timestamp would violate the minimum TTL constraint')
+
+        timestamp_str = isotime.format(dt=timestamp)
+        LOG.info('Deleting %s older than: %s' % (name, timestamp_str))
+
+        assert timestamp < utc_now
+
+        try:
+            purge_func(logger=LOG, timestamp=timestamp, batch_size=self._purge_batch_size,
+                       sleep_delay=self._purge_batch_sleep_delay)
+        except Exception as e:
+            LOG.exception('Failed to delete %s: %s' % (name, str(e)))
+
+        return True
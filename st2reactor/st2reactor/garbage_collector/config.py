@@ -18,6 +18,8 @@ from oslo_config import cfg
 import st2common.config as common_config
 from st2common.constants.system import VERSION_STRING
 from st2common.constants.garbage_collection import DEFAULT_COLLECTION_INTERVAL
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
 common_config.register_opts()
 
 CONF = cfg.CONF
@@ -59,8 +61,24 @@ def _register_garbage_collector_opts():
                          'deleted.')),
         cfg.IntOpt('trigger_instances_ttl', default=None,
                    help=('Trigger instances older than this value (days) will be automatically '
-                         'deleted.'))
+                         'deleted.')),
+        cfg.IntOpt('rule_enforcements_ttl', default=None,
+                   help=('Rule enforcements older than this value (days) will be automatically '
+                         'deleted.')),
+        cfg.IntOpt('traces_ttl', default=None,
+                   help='Traces older than this value (days) will be automatically deleted.')
     ]
     CONF.register_opts(ttl_opts, group='garbagecollector')
 
+    purge_opts = [
+        cfg.IntOpt('purge_batch_size', default=DEFAULT_PURGE_BATCH_SIZE,
+                   help='Maximum number of objects deleted in a single delete query.'),
+        cfg.FloatOpt('purge_batch_sleep_delay', default=DEFAULT_PURGE_BATCH_SLEEP_DELAY,
+                     help='How long to sleep (in seconds) between two delete queries.'),
+        cfg.BoolOpt('use_ttl_indexes', default=False,
+                    help=('Use MongoDB TTL indexes to expire old objects on the server instead '
+                          'of periodically deleting them. Only supported for trigger instances.'))
+    ]
+    CONF.register_opts(purge_opts, group='garbagecollector')
+
 register_opts()
@@ -17,6 +17,7 @@ from oslo_config import cfg
 
 import st2common.config as common_config
 from st2common.constants.system import VERSION_STRING
+from st2common.constants.timer import MISFIRE_POLICY_FIRE_ONCE
 common_config.register_opts()
 
 CONF = cfg.CONF
@@ -49,7 +50,16 @@ def _register_rules_engine_opts():
     timer_opts = [
         cfg.StrOpt('local_timezone', default='America/Los_Angeles',
                    help='Timezone pertaining to the location where st2 is run.'),
-        cfg.BoolOpt('enable', default=True, help='Specify to enable Timer.')
+        cfg.BoolOpt('enable', default=True, help='Specify to enable Timer.'),
+        cfg.StrOpt('misfire_policy', default=MISFIRE_POLICY_FIRE_ONCE,
+                   help='What to do with timer fire times which were missed (e.g. while the '
+                        'rules engine was not running): skip, fire_once, fire_all.'),
+        cfg.IntOpt('misfire_grace_time', default=60,
+                   help='Number of seconds a timer can be late before its fire time is '
+                        'considered missed.'),
+        cfg.IntOpt('max_catchup_runs', default=100,
+                   help='Maximum number of missed fire times fired for a single timer with '
+                        'the "fire_all" misfire policy.')
     ]
     CONF.register_opts(timer_opts, group='timer')
 
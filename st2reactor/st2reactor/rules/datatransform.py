@@ -17,6 +17,7 @@ import copy
 
 from st2common.constants.rules import TRIGGER_PAYLOAD_PREFIX
 from st2common.constants.system import SYSTEM_KV_PREFIX
+from st2common.services.action_results import get_payload_with_lazy_result
 from st2common.services.keyvalues import KeyValueLookup
 from st2common.util import jinja as jinja_utils
 
@@ -40,9 +41,8 @@ class Jinja2BasedTransformer(object):
         # contain renderable keys however those are often due to nature of the
         # events being posted e.g. ActionTrigger with template variables. Rendering
         # these values would lead to bugs in the data so best to avoid.
-        if prefix not in context:
-            context[prefix] = {}
-        context[prefix].update(data)
+        # Results referenced (instead of included) in the payload are retrieved on access.
+        context[prefix] = get_payload_with_lazy_result(data)
         return context
 
 
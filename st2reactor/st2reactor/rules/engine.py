@@ -14,6 +14,7 @@
 # limitations under the License.
 
 from st2common import log as logging
+from st2common.metrics import base as metrics
 from st2common.persistence.rule import Rule
 from st2common.services.triggers import get_trigger_db_by_ref
 from st2reactor.rules.enforcer import RuleEnforcer
@@ -24,6 +25,8 @@ LOG = logging.getLogger('st2reactor.rules.RulesEngine')
 
 class RulesEngine(object):
     def handle_trigger_instance(self, trigger_instance):
+        metrics.inc_counter('rules_engine.trigger_instances')
+
         # Find matching rules for trigger instance.
         matching_rules = self.get_matching_rules_for_trigger(trigger_instance)
 
@@ -42,7 +45,10 @@ class RulesEngine(object):
         matcher = RulesMatcher(trigger_instance=trigger_instance,
                                trigger=trigger, rules=rules)
 
-        matching_rules = matcher.get_matching_rules()
+        with metrics.Timer('rules_engine.match_time'):
+            matching_rules = matcher.get_matching_rules()
+
+        metrics.inc_counter('rules_engine.matched_rules', len(matching_rules))
         LOG.info('Matched %s rule(s) for trigger_instance %s (type=%s)', len(matching_rules),
                  trigger['name'], trigger['type'])
         return matching_rules
@@ -20,6 +20,7 @@ from st2common import log as logging
 import st2common.operators as criteria_operators
 from st2common.constants.rules import TRIGGER_PAYLOAD_PREFIX, RULE_TYPE_BACKSTOP
 from st2common.constants.system import SYSTEM_KV_PREFIX
+from st2common.services.action_results import get_payload_with_lazy_result
 from st2common.services.keyvalues import KeyValueLookup
 from st2common.util.templating import render_template_with_system_context
 
@@ -190,7 +191,8 @@ class PayloadLookup(object):
     def __init__(self, payload):
         self._context = {
             SYSTEM_KV_PREFIX: KeyValueLookup(),
-            TRIGGER_PAYLOAD_PREFIX: payload
+            # Results referenced (instead of included) in the payload are retrieved on access
+            TRIGGER_PAYLOAD_PREFIX: get_payload_with_lazy_result(payload)
         }
 
     def get_value(self, lookup_key):
@@ -55,6 +55,29 @@ def _register_sensor_container_opts(ignore_errors=False):
     ]
     st2cfg.do_register_opts(partition_opts, group='sensorcontainer', ignore_errors=ignore_errors)
 
+    dispatch_opts = [
+        cfg.BoolOpt('enable_dispatch_buffer', default=False,
+                    help='Buffer triggers dispatched by sensors and publish them in batches.'),
+        cfg.IntOpt('dispatch_batch_size', default=100,
+                   help='Maximum number of buffered triggers published in a single batch.'),
+        cfg.FloatOpt('dispatch_linger_time', default=0.05,
+                     help='How long (in seconds) to wait for more triggers before publishing '
+                          'a batch.'),
+        cfg.IntOpt('dispatch_buffer_size', default=10000,
+                   help='Maximum number of buffered triggers per sensor.'),
+        cfg.FloatOpt('dispatch_buffer_timeout', default=5,
+                     help='How long (in seconds) dispatch blocks when the buffer is full before '
+                          'an exception is raised.')
+    ]
+    st2cfg.do_register_opts(dispatch_opts, group='sensorcontainer', ignore_errors=ignore_errors)
+
+    process_opts = [
+        cfg.BoolOpt('multi_sensor_processes', default=False,
+                    help='Run all the sensors from the same pack in a single process where each '
+                         'sensor runs in a separate green thread.')
+    ]
+    st2cfg.do_register_opts(process_opts, group='sensorcontainer', ignore_errors=ignore_errors)
+
     sensor_test_opt = cfg.StrOpt('sensor-ref', help='Only run sensor with the provided reference. \
         Value is of the form pack.sensor-name.')
     st2cfg.do_register_cli_opts(sensor_test_opt, ignore_errors=ignore_errors)
@@ -15,7 +15,6 @@
 
 import uuid
 
-from apscheduler.schedulers.background import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
@@ -24,25 +23,50 @@ import dateutil.parser as date_parser
 import jsonschema
 
 from st2common import log as logging
+from st2common.constants.timer import MISFIRE_POLICY_FIRE_ONCE
 from st2common.constants.triggers import TIMER_TRIGGER_TYPES
 from st2common.models.api.trace import TraceContext
+from st2common.persistence.timer import TimerState
 import st2common.services.triggers as trigger_services
 from st2common.services.triggerwatcher import TriggerWatcher
 from st2common.transport.reactor import TriggerDispatcher
 from st2common.util import date as date_utils
 from st2common.util import schema as util_schema
+from st2reactor.timer.partitioner import TimerPartitioner
+from st2reactor.timer.scheduler import DEFAULT_MAX_CATCHUP_RUNS
+from st2reactor.timer.scheduler import DEFAULT_MISFIRE_GRACE_TIME
+from st2reactor.timer.scheduler import TimerScheduler
 
 LOG = logging.getLogger(__name__)
 
 
 class St2Timer(object):
     """
-    A timer interface that uses APScheduler 3.0.
+    A timer interface that uses APScheduler 3.0 triggers to compute the fire times.
+
+    Timers are partitioned across all the running timer engines and fired by a heap based
+    TimerScheduler. Next fire times are persisted in the database so the schedule is resumed
+    (and missed fire times are handled according to the misfire policy) after a restart or when
+    a timer moves to a different timer engine.
     """
-    def __init__(self, local_timezone=None):
+    def __init__(self, local_timezone=None, misfire_policy=MISFIRE_POLICY_FIRE_ONCE,
+                 misfire_grace_time=DEFAULT_MISFIRE_GRACE_TIME,
+                 max_catchup_runs=DEFAULT_MAX_CATCHUP_RUNS, partitioner=None):
         self._timezone = local_timezone
-        self._scheduler = BlockingScheduler(timezone=self._timezone)
-        self._jobs = {}
+        self._scheduler = TimerScheduler(fire_callback=self._emit_trigger_instance,
+                                         jobs_updated_callback=self._persist_fire_times,
+                                         misfire_policy=misfire_policy,
+                                         misfire_grace_time=misfire_grace_time,
+                                         max_catchup_runs=max_catchup_runs)
+        self._partitioner = partitioner or TimerPartitioner()
+        self._partitioner.on_rebalance = self._rebalance
+
+        # All the known timer triggers (including the ones owned by other timer engines)
+        self._triggers = {}
+
+        # Persisted (next_fire_time, last_fire_time) of the timers, loaded on start
+        self._fire_times = {}
+
         self._trigger_types = TIMER_TRIGGER_TYPES.keys()
         self._trigger_watcher = TriggerWatcher(create_handler=self._handle_create_trigger,
                                                update_handler=self._handle_update_trigger,
@@ -54,13 +78,22 @@ class St2Timer(object):
 
     def start(self):
         self._register_timer_trigger_types()
+        self._partitioner.start()
+        self._fire_times = self._load_fire_times()
         self._trigger_watcher.start()
         self._scheduler.start()
 
     def cleanup(self):
         self._scheduler.shutdown(wait=True)
+        self._partitioner.stop()
 
     def add_trigger(self, trigger):
+        self._triggers[trigger['id']] = trigger
+
+        if not self._partitioner.is_owner(trigger['id']):
+            LOG.debug('Timer %s is owned by a different timer engine.', trigger['id'])
+            return
+
         self._add_job_to_scheduler(trigger)
 
     def update_trigger(self, trigger):
@@ -69,15 +102,14 @@ class St2Timer(object):
 
     def remove_trigger(self, trigger):
         trigger_id = trigger['id']
+        self._triggers.pop(trigger_id, None)
+        self._fire_times.pop(trigger_id, None)
 
-        try:
-            job_id = self._jobs[trigger_id]
-        except KeyError:
-            LOG.info('Job not found: %s', trigger_id)
-            return
+        if self._partitioner.is_owner(trigger_id):
+            self._delete_fire_times(trigger_id)
 
-        self._scheduler.remove_job(job_id)
-        del self._jobs[trigger_id]
+        if not self._scheduler.remove_job(trigger_id):
+            LOG.info('Job not found: %s', trigger_id)
 
     def _add_job_to_scheduler(self, trigger):
         trigger_type_ref = trigger['type']
@@ -112,31 +144,38 @@ class St2Timer(object):
 
             time_type = CronTrigger(**cron)
 
+        next_fire_time, last_fire_time = self._get_fire_times(trigger['id'])
+
         utc_now = date_utils.get_datetime_utc_now()
-        if hasattr(time_type, 'run_date') and utc_now > time_type.run_date:
+        if hasattr(time_type, 'run_date') and utc_now > time_type.run_date and \
+                not next_fire_time:
+            # Note: Expired timer which was missed while the timer engine wasn't running has a
+            # persisted fire time and is handled by the misfire policy
             LOG.warning('Not scheduling expired timer: %s : %s',
                         trigger['parameters'], time_type.run_date)
         else:
-            self._add_job(trigger, time_type)
+            self._add_job(trigger, time_type, next_fire_time=next_fire_time,
+                          last_fire_time=last_fire_time)
         return time_type
 
-    def _add_job(self, trigger, time_type, replace=True):
+    def _add_job(self, trigger, time_type, next_fire_time=None, last_fire_time=None):
         try:
-            job = self._scheduler.add_job(self._emit_trigger_instance,
-                                          trigger=time_type,
-                                          args=[trigger],
-                                          replace_existing=replace)
+            job = self._scheduler.add_job(job_id=trigger['id'],
+                                          trigger=trigger,
+                                          time_type=time_type,
+                                          next_fire_time=next_fire_time,
+                                          last_fire_time=last_fire_time)
             LOG.info('Job %s scheduled.', job.id)
-            self._jobs[trigger['id']] = job.id
         except Exception as e:
             LOG.error('Exception scheduling timer: %s, %s',
                       trigger['parameters'], e, exc_info=True)
 
-    def _emit_trigger_instance(self, trigger):
+    def _emit_trigger_instance(self, trigger, fire_time=None):
         utc_now = date_utils.get_datetime_utc_now()
         # debug logging is reasonable for this one. A high resolution timer will end up
         # trashing standard logs.
-        LOG.debug('Timer fired at: %s. Trigger: %s', str(utc_now), trigger)
+        LOG.debug('Timer fired at: %s (scheduled for: %s). Trigger: %s', str(utc_now),
+                  str(fire_time), trigger)
 
         payload = {
             'executed_at': str(utc_now),
@@ -155,6 +194,69 @@ class St2Timer(object):
     def _register_timer_trigger_types(self):
         return trigger_services.add_trigger_models(TIMER_TRIGGER_TYPES.values())
 
+    def _rebalance(self):
+        """
+        Schedule the timers this timer engine has become owner of and stop the ones which have
+        moved to a different timer engine.
+        """
+        added, removed = 0, 0
+
+        for trigger_id, trigger in self._triggers.items():
+            is_owner = self._partitioner.is_owner(trigger_id)
+            is_scheduled = self._scheduler.get_job(trigger_id) is not None
+
+            if is_owner and not is_scheduled:
+                self._add_job_to_scheduler(trigger)
+                added += 1
+            elif not is_owner and is_scheduled:
+                self._scheduler.remove_job(trigger_id)
+                removed += 1
+
+        LOG.info('Timers rebalanced (added=%s, removed=%s).', added, removed)
+
+    ##########################################
+    # Methods for the persisted timer schedule
+    ##########################################
+
+    def _load_fire_times(self):
+        result = {}
+
+        for state_db in TimerState.get_all():
+            result[state_db.trigger_id] = (state_db.next_fire_time, state_db.last_fire_time)
+
+        LOG.debug('Loaded fire times for %s timers.', len(result))
+        return result
+
+    def _get_fire_times(self, trigger_id):
+        """
+        Return persisted (next_fire_time, last_fire_time) for the provided timer.
+        """
+        if trigger_id in self._fire_times:
+            return self._fire_times.pop(trigger_id)
+
+        # Timer which has moved from a different timer engine or has been created after start
+        state_dbs = TimerState.get_by_trigger_ids([trigger_id])
+        state_db = state_dbs.get(trigger_id, None)
+
+        if not state_db:
+            return None, None
+
+        return state_db.next_fire_time, state_db.last_fire_time
+
+    def _persist_fire_times(self, jobs):
+        fire_times = [(job.id, job.next_fire_time, job.last_fire_time) for job in jobs]
+
+        try:
+            TimerState.save_fire_times(fire_times)
+        except Exception:
+            LOG.exception('Failed to persist fire times of %s timers.', len(fire_times))
+
+    def _delete_fire_times(self, trigger_id):
+        try:
+            TimerState.delete_by_trigger_id(trigger_id)
+        except Exception:
+            LOG.exception('Failed to delete fire times of timer %s.', trigger_id)
+
     ##############################################
     # Event handler methods for the trigger events
     ##############################################
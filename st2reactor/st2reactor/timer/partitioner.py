@@ -0,0 +1,39 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from st2common.services.partitioner import GroupPartitioner
+from st2common.services.partitioner import DEFAULT_REFRESH_INTERVAL
+from st2common.util.hashring import DEFAULT_REPLICAS
+
+__all__ = [
+    'TimerPartitioner'
+]
+
+GROUP_ID = 'st2.timer'
+
+
+class TimerPartitioner(GroupPartitioner):
+    """
+    Partitions timer triggers across all the running timer engines (rules engine instances with
+    timer enabled).
+
+    Each timer is owned by exactly one member of the timer group.
+    """
+
+    def __init__(self, replicas=DEFAULT_REPLICAS, refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 coordinator=None, member_id=None):
+        super(TimerPartitioner, self).__init__(group_id=GROUP_ID, replicas=replicas,
+                                               refresh_interval=refresh_interval,
+                                               coordinator=coordinator, member_id=member_id)
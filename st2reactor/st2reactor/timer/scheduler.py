@@ -0,0 +1,254 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import itertools
+
+import eventlet
+
+from st2common import log as logging
+from st2common.constants.timer import MISFIRE_POLICIES
+from st2common.constants.timer import MISFIRE_POLICY_FIRE_ALL
+from st2common.constants.timer import MISFIRE_POLICY_FIRE_ONCE
+from st2common.util import date as date_utils
+
+__all__ = [
+    'TimerJob',
+    'TimerScheduler'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of seconds the scheduler sleeps between two ticks
+DEFAULT_TICK_INTERVAL = 1
+
+# Fire times which are at most this many seconds late are not considered missed
+DEFAULT_MISFIRE_GRACE_TIME = 60
+
+# Maximum number of missed fire times which are fired for a single timer with the "fire_all"
+# policy
+DEFAULT_MAX_CATCHUP_RUNS = 100
+
+
+class TimerJob(object):
+    """
+    A timer scheduled by the TimerScheduler.
+    """
+
+    def __init__(self, job_id, trigger, time_type, next_fire_time, last_fire_time=None):
+        self.id = job_id
+        self.trigger = trigger
+        self.time_type = time_type
+        self.next_fire_time = next_fire_time
+        self.last_fire_time = last_fire_time
+
+
+class TimerScheduler(object):
+    """
+    Scheduler which keeps all the timers in a single heap ordered by the next fire time.
+
+    On each tick, all the timers which are due are popped from the heap and fired in one go
+    after which the scheduler sleeps until the next timer is due (or for at most tick_interval
+    seconds). This means the cost of a tick is proportional to the number of timers which are
+    due and not to the number of scheduled timers.
+
+    Fire times are computed using APScheduler triggers (IntervalTrigger, CronTrigger,
+    DateTrigger).
+    """
+
+    def __init__(self, fire_callback, jobs_updated_callback=None,
+                 misfire_policy=MISFIRE_POLICY_FIRE_ONCE,
+                 misfire_grace_time=DEFAULT_MISFIRE_GRACE_TIME,
+                 max_catchup_runs=DEFAULT_MAX_CATCHUP_RUNS,
+                 tick_interval=DEFAULT_TICK_INTERVAL):
+        """
+        :param fire_callback: Function which is called with (trigger, fire_time) each time a
+                              timer fires.
+        :type fire_callback: ``callable``
+
+        :param jobs_updated_callback: Function which is called with a list of jobs whose fire
+                                      times have changed during a tick (e.g. to persist them).
+        :type jobs_updated_callback: ``callable``
+
+        :param misfire_policy: What to do with the missed fire times (see MISFIRE_POLICIES).
+        :type misfire_policy: ``str``
+        """
+        if misfire_policy not in MISFIRE_POLICIES:
+            raise ValueError('Invalid misfire policy "%s". Valid policies are: %s' %
+                             (misfire_policy, ', '.join(MISFIRE_POLICIES)))
+
+        self._fire_callback = fire_callback
+        self._jobs_updated_callback = jobs_updated_callback
+        self._misfire_policy = misfire_policy
+        self._misfire_grace_time = misfire_grace_time
+        self._max_catchup_runs = max_catchup_runs
+        self._tick_interval = tick_interval
+
+        # Heap of (next_fire_time, sequence, job) tuples. Removed and rescheduled jobs are not
+        # removed from the heap right away, stale entries are skipped when they are popped.
+        self._heap = []
+        self._jobs = {}
+        self._sequence = itertools.count()
+        self._running = False
+
+    @property
+    def jobs(self):
+        return self._jobs.values()
+
+    def get_job(self, job_id):
+        return self._jobs.get(job_id, None)
+
+    def add_job(self, job_id, trigger, time_type, next_fire_time=None, last_fire_time=None):
+        """
+        Schedule a timer. Existing job with the same id is replaced.
+
+        :param next_fire_time: Next fire time to resume the schedule from (e.g. persisted from a
+                               previous run). If not provided, it's computed from the current
+                               time.
+        :type next_fire_time: ``datetime.datetime``
+        """
+        if not next_fire_time:
+            next_fire_time = time_type.get_next_fire_time(None,
+                                                          date_utils.get_datetime_utc_now())
+
+        job = TimerJob(job_id=job_id, trigger=trigger, time_type=time_type,
+                       next_fire_time=next_fire_time, last_fire_time=last_fire_time)
+        self._jobs[job_id] = job
+
+        if next_fire_time:
+            self._push(job)
+        else:
+            LOG.info('Timer %s will never fire.', job_id)
+
+        return job
+
+    def remove_job(self, job_id):
+        return self._jobs.pop(job_id, None)
+
+    def start(self):
+        """
+        Run the scheduler loop. This method blocks until shutdown() is called.
+        """
+        self._running = True
+
+        while self._running:
+            try:
+                self.tick()
+            except Exception:
+                LOG.exception('Failed to process due timers.')
+
+            self._sleep()
+
+    def shutdown(self, wait=True):
+        self._running = False
+
+    def tick(self, now=None):
+        """
+        Fire all the timers which are due.
+
+        :return: Number of times the timers have fired.
+        :rtype: ``int``
+        """
+        now = now or date_utils.get_datetime_utc_now()
+        fired_count = 0
+        updated_jobs = []
+
+        while self._heap and self._heap[0][0] <= now:
+            _, _, job = heapq.heappop(self._heap)
+
+            if self._jobs.get(job.id, None) is not job:
+                # Job has been removed or replaced
+                continue
+
+            run_times, next_fire_time = self._get_run_times(job=job, now=now)
+
+            for run_time in run_times:
+                try:
+                    self._fire_callback(job.trigger, run_time)
+                except Exception:
+                    LOG.exception('Failed to fire timer %s.', job.id)
+                fired_count += 1
+
+            if run_times:
+                job.last_fire_time = run_times[-1]
+
+            job.next_fire_time = next_fire_time
+            updated_jobs.append(job)
+
+            if next_fire_time:
+                self._push(job)
+            else:
+                LOG.debug('Timer %s has no more fire times.', job.id)
+
+        if updated_jobs and self._jobs_updated_callback:
+            self._jobs_updated_callback(updated_jobs)
+
+        if fired_count:
+            LOG.debug('Fired %s timers (%s due).', fired_count, len(updated_jobs))
+
+        return fired_count
+
+    def _get_run_times(self, job, now):
+        """
+        Return the fire times which should be fired now (with the misfire policy applied) and
+        the next fire time of the job.
+
+        :rtype: ``tuple`` of (``list``, ``datetime.datetime``)
+        """
+        run_times = []
+        fire_time = job.next_fire_time
+        missed_by = (now - fire_time).total_seconds()
+
+        if missed_by > self._misfire_grace_time and \
+                self._misfire_policy != MISFIRE_POLICY_FIRE_ALL:
+            LOG.info('Timer %s missed its fire time %s by %s seconds (policy=%s).', job.id,
+                     fire_time, int(missed_by), self._misfire_policy)
+
+            if self._misfire_policy == MISFIRE_POLICY_FIRE_ONCE:
+                run_times.append(fire_time)
+
+            # Skip straight to the first fire time which is not in the past
+            fire_time = job.time_type.get_next_fire_time(None, now)
+            if fire_time and fire_time <= job.next_fire_time:
+                # One-off timer (DateTimer) which has already expired
+                fire_time = None
+
+        while fire_time and fire_time <= now and len(run_times) < self._max_catchup_runs:
+            run_times.append(fire_time)
+            # Note: "now" argument needs to be the previous fire time, otherwise CronTrigger
+            # skips straight to the first fire time after the current time
+            fire_time = job.time_type.get_next_fire_time(fire_time, fire_time)
+
+        if fire_time and fire_time <= now:
+            LOG.warn('Timer %s reached maximum number of catch-up runs (%s). Skipping the '
+                     'remaining missed fire times.', job.id, self._max_catchup_runs)
+            fire_time = job.time_type.get_next_fire_time(None, now)
+
+            if fire_time and fire_time <= run_times[-1]:
+                fire_time = None
+
+        return run_times, fire_time
+
+    def _push(self, job):
+        heapq.heappush(self._heap, (job.next_fire_time, next(self._sequence), job))
+
+    def _sleep(self):
+        timeout = self._tick_interval
+
+        if self._heap:
+            due_in = (self._heap[0][0] - date_utils.get_datetime_utc_now()).total_seconds()
+            timeout = max(0, min(timeout, due_in))
+
+        eventlet.sleep(timeout)
@@ -0,0 +1,111 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from st2common.services import coordination
+from st2reactor.container.consistent_hash_partitioner import ConsistentHashPartitioner
+from st2reactor.container.manager import SensorContainerManager
+from st2tests import config
+from st2tests import DbTestCase
+from st2tests.fixturesloader import FixturesLoader
+
+PACK = 'generic'
+FIXTURES_1 = {
+    'sensors': ['sensor1.yaml', 'sensor2.yaml', 'sensor3.yaml']
+}
+
+
+class ConsistentHashPartitionerTest(DbTestCase):
+
+    models = None
+
+    @classmethod
+    def setUpClass(cls):
+        super(ConsistentHashPartitionerTest, cls).setUpClass()
+        cls.models = FixturesLoader().save_fixtures_to_db(
+            fixtures_pack=PACK, fixtures_dict=FIXTURES_1)
+        config.parse_args()
+
+    def _get_partitioner(self, member_id):
+        return ConsistentHashPartitioner('node1', coordinator=mock.Mock(), member_id=member_id)
+
+    def test_owns_all_sensors_when_alone(self):
+        partitioner = self._get_partitioner('node1_1')
+        sensors = partitioner.get_sensors()
+        self.assertEqual(len(sensors), 3, 'Expected all sensors')
+
+        for sensor in sensors:
+            self.assertTrue(partitioner.is_sensor_owner(sensor))
+
+    @mock.patch.object(coordination, 'get_group_members',
+                       mock.MagicMock(return_value=['node1_1', 'node2_1', 'node3_1']))
+    def test_sensors_are_partitioned_between_members(self):
+        partitioners = [self._get_partitioner(member_id)
+                        for member_id in ['node1_1', 'node2_1', 'node3_1']]
+
+        sensor_refs = []
+        for partitioner in partitioners:
+            partitioner.refresh()
+            sensor_refs.extend([sensor.get_reference().ref
+                                for sensor in partitioner.get_sensors()])
+
+        # Each sensor is owned by exactly one node
+        self.assertEqual(len(sensor_refs), 3)
+        self.assertEqual(len(set(sensor_refs)), 3)
+
+    def test_rebalance_callback_on_membership_change(self):
+        on_rebalance = mock.Mock()
+        partitioner = self._get_partitioner('node1_1')
+        partitioner.on_rebalance = on_rebalance
+
+        with mock.patch.object(coordination, 'get_group_members',
+                               mock.MagicMock(return_value=['node1_1', 'node2_1'])):
+            self.assertTrue(partitioner.refresh())
+            self.assertFalse(partitioner.refresh())
+
+        self.assertEqual(on_rebalance.call_count, 1)
+        self.assertEqual(partitioner.members, ['node1_1', 'node2_1'])
+
+        # Node left, this member owns all the sensors again
+        with mock.patch.object(coordination, 'get_group_members',
+                               mock.MagicMock(return_value=[])):
+            self.assertTrue(partitioner.refresh())
+
+        self.assertEqual(on_rebalance.call_count, 2)
+        self.assertEqual(len(partitioner.get_sensors()), 3)
+
+    def test_manager_rebalances_sensors(self):
+        partitioner = self._get_partitioner('node1_1')
+        manager = SensorContainerManager(sensors_partitioner=partitioner)
+        manager._sensor_container = mock.Mock()
+
+        # Member joined, some of the sensors move to the new member
+        with mock.patch.object(coordination, 'get_group_members',
+                               mock.MagicMock(return_value=['node1_1', 'node2_1'])):
+            partitioner.refresh()
+
+        owned_refs = set([sensor.get_reference().ref for sensor in partitioner.get_sensors()])
+        self.assertEqual(set(manager._sensors.keys()), owned_refs)
+        self.assertEqual(manager._sensor_container.add_sensor.call_count, len(owned_refs))
+
+        # Member left, all the sensors move back
+        with mock.patch.object(coordination, 'get_group_members',
+                               mock.MagicMock(return_value=['node1_1'])):
+            partitioner.refresh()
+
+        self.assertEqual(len(manager._sensors), 3)
+        self.assertEqual(manager._sensor_container.add_sensor.call_count, 3)
+        self.assertEqual(manager._sensor_container.remove_sensor.call_count, 0)
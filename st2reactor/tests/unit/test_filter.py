@@ -18,8 +18,10 @@ import copy
 import mock
 
 from st2common.models.db.action import ActionDB
+from st2common.models.db.execution import ActionExecutionDB
 from st2common.models.db.rule import RuleDB, ActionExecutionSpecDB
 from st2common.models.db.trigger import TriggerDB, TriggerInstanceDB
+from st2common.persistence.execution import ActionExecution
 from st2common.util import reference
 from st2common.util import date as date_utils
 from st2reactor.rules.filter import RuleFilter
@@ -201,3 +203,15 @@ class FilterTest(DbTestCase):
         }
         f = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule)
         self.assertTrue(f.filter())
+
+    @mock.patch.object(ActionExecution, 'get_by_id', mock.MagicMock(
+        return_value=ActionExecutionDB(result={'stdout': 'done'})))
+    def test_criteria_on_referenced_result(self):
+        rule = MOCK_RULE_1
+        rule.criteria = {'trigger.result.stdout': {'type': 'equals', 'pattern': 'done'}}
+        trigger_instance = copy.deepcopy(MOCK_TRIGGER_INSTANCE)
+        trigger_instance.payload = {'execution_id': 'e1', 'result_ref': 'e1',
+                                    'result_preview': '{"stdout": "do', 'result_truncated': True}
+        f = RuleFilter(trigger_instance, MOCK_TRIGGER, rule)
+        self.assertTrue(f.filter(), 'Failed to pass evaluation.')
+        ActionExecution.get_by_id.assert_called_once_with('e1')
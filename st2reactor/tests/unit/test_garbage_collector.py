@@ -0,0 +1,43 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest2
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.constants.exit_codes import SUCCESS_EXIT_CODE
+from st2reactor.garbage_collector import base as garbage_collector
+from st2reactor.garbage_collector.base import GarbageCollectorService
+
+
+class GarbageCollectorServiceTestCase(unittest2.TestCase):
+
+    @mock.patch.object(garbage_collector.eventlet, 'sleep', mock.Mock())
+    @mock.patch.object(garbage_collector, 'ensure_ttl_index',
+                       mock.Mock(side_effect=Exception('Index options conflict')))
+    @mock.patch.object(GarbageCollectorService, '_register_signal_handlers', mock.Mock())
+    @mock.patch.object(GarbageCollectorService, '_main_loop')
+    def test_ttl_index_failure_falls_back_to_batch_purge(self, mock_main_loop):
+        service = GarbageCollectorService()
+        service._use_ttl_indexes = True
+        service._trigger_instances_ttl = 30
+
+        self.assertEqual(service.run(), SUCCESS_EXIT_CODE)
+
+        # Garbage collection still runs and trigger instances are purged in batches
+        self.assertEqual(mock_main_loop.call_count, 1)
+        self.assertFalse(service._use_ttl_indexes)
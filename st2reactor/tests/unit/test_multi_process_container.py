@@ -0,0 +1,78 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest2
+
+from st2reactor.container.multi_process_container import MultiSensorProcessContainer
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+
+def get_sensor(pack, class_name):
+    return {
+        'pack': pack,
+        'ref': '%s.%s' % (pack, class_name),
+        'file_path': '/tmp/%s.py' % (class_name),
+        'class_name': class_name,
+        'trigger_types': ['%s.trigger' % (pack)],
+        'poll_interval': None
+    }
+
+
+class MultiSensorProcessContainerTestCase(unittest2.TestCase):
+    def test_sensors_are_grouped_by_pack(self):
+        sensors = [
+            get_sensor('pack1', 'SensorA'),
+            get_sensor('pack1', 'SensorB'),
+            get_sensor('pack2', 'SensorC')
+        ]
+        container = MultiSensorProcessContainer(sensors=sensors, dispatcher=mock.Mock())
+
+        self.assertEqual(sorted(container._sensors.keys()), ['sensors:pack1', 'sensors:pack2'])
+
+        group = container._sensors['sensors:pack1']
+        self.assertEqual([sensor['ref'] for sensor in group['sensors']],
+                         ['pack1.SensorA', 'pack1.SensorB'])
+
+        args = container._get_sensor_process_args(sensor=group, python_path='python')
+        self.assertTrue(args[1].endswith('multi_sensor_wrapper.py'))
+        self.assertEqual(args[2], '--pack=pack1')
+        self.assertTrue(args[3].startswith('--sensors=['))
+
+    def test_add_and_remove_sensor_restarts_pack_process(self):
+        container = MultiSensorProcessContainer(sensors=[get_sensor('pack1', 'SensorA')],
+                                                dispatcher=mock.Mock())
+        container._processes['sensors:pack1'] = mock.Mock()
+        container._stop_sensor_process = mock.Mock()
+        container._spawn_sensor_process = mock.Mock()
+
+        self.assertTrue(container.add_sensor(get_sensor('pack1', 'SensorB')))
+        self.assertFalse(container.add_sensor(get_sensor('pack1', 'SensorB')))
+        container._stop_sensor_process.assert_called_once_with(sensor_id='sensors:pack1')
+
+        group = container._spawn_sensor_process.call_args[1]['sensor']
+        self.assertEqual([sensor['ref'] for sensor in group['sensors']],
+                         ['pack1.SensorA', 'pack1.SensorB'])
+
+        container._processes = {}
+        container._spawn_sensor_process.reset_mock()
+        self.assertTrue(container.remove_sensor(get_sensor('pack1', 'SensorA')))
+        self.assertTrue(container.remove_sensor(get_sensor('pack1', 'SensorB')))
+        self.assertFalse(container.remove_sensor(get_sensor('pack1', 'SensorB')))
+
+        # Process isn't respawned once there are no sensors left in the pack
+        self.assertEqual(container._spawn_sensor_process.call_count, 1)
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import time
 
 import eventlet
@@ -66,3 +67,65 @@ class ProcessContainerTests(unittest2.TestCase):
                 'timestamp': 1439441533,
                 'exit_code': 1
             })
+
+    def test_respawn_delay_is_exponential(self):
+        process_container = ProcessSensorContainer(None, poll_interval=0.1)
+        delays = [process_container._get_respawn_delay(respawn_count=count)
+                  for count in range(1, 8)]
+        self.assertEqual(delays, [2.5, 5, 10, 20, 40, 60, 60])
+
+    @patch('st2reactor.container.process_container.get_process_resource_usage',
+           Mock(return_value={'cpu_time': 1.5, 'rss': 1024}))
+    @patch.object(time, 'time', MagicMock(return_value=1439441533))
+    def test_get_sensor_stats(self):
+        process_container = ProcessSensorContainer(None, poll_interval=0.1)
+        process = Mock()
+        process.configure_mock(pid=1234)
+        process_container._processes['pack.StupidSensor'] = process
+        process_container._sensor_start_times['pack.StupidSensor'] = 1439441503
+        process_container._sensor_restart_counts['pack.StupidSensor'] = 2
+
+        stats = process_container.get_sensor_stats()
+        self.assertEqual(stats, {
+            'pack.StupidSensor': {
+                'pid': 1234,
+                'cpu_time': 1.5,
+                'rss': 1024,
+                'restarts': 2,
+                'uptime': 30
+            }
+        })
+
+    def test_sensor_exit_resets_respawn_count_after_successful_start(self):
+        process_container = ProcessSensorContainer(None, poll_interval=0.1,
+                                                   dispatcher=Mock())
+        process_container._respawn_sensor = Mock()
+        sensor = {'class_name': 'pack.StupidSensor'}
+        process = Mock()
+        process.poll.return_value = 1
+
+        process_container._sensors['pack.StupidSensor'] = sensor
+        process_container._processes['pack.StupidSensor'] = process
+        process_container._sensor_start_times['pack.StupidSensor'] = int(time.time()) - 60
+        process_container._sensor_respawn_counts['pack.StupidSensor'] = 3
+
+        process_container._poll_sensors_for_results(['pack.StupidSensor'])
+        eventlet.sleep(0)
+
+        self.assertEqual(process_container._sensor_respawn_counts['pack.StupidSensor'], 0)
+        self.assertEqual(process_container.running(), 0)
+        process_container._respawn_sensor.assert_called_once_with(
+            sensor_id='pack.StupidSensor', sensor=sensor, exit_code=1)
+
+    def test_wakes_up_on_child_exit(self):
+        process_container = ProcessSensorContainer(None, poll_interval=0.1)
+        self.assertTrue(process_container._setup_sigchld_handler())
+
+        try:
+            os.write(process_container._wakeup_write_fd, b'\x00')
+            with eventlet.Timeout(1):
+                process_container._wait_for_sensor_exit()
+        finally:
+            process_container._teardown_sigchld_handler()
+
+        self.assertEqual(process_container._wakeup_fd, None)
@@ -6,6 +6,7 @@ import mock
 import st2tests.config as tests_config
 from st2tests.base import TESTS_CONFIG_PATH
 from st2reactor.container.sensor_wrapper import SensorWrapper
+from st2reactor.container.multi_sensor_wrapper import MultiSensorWrapper
 from st2reactor.sensor.base import Sensor, PollingSensor
 
 CURRENT_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -103,3 +104,66 @@ class SensorWrapperTestCase(unittest2.TestCase):
                                 class_name='TestSensor',
                                 trigger_types=trigger_types,
                                 parent_args=parent_args)
+
+    def test_multi_sensor_wrapper_routes_triggers_to_sensors(self):
+        file_path = os.path.join(RESOURCES_DIR, 'test_sensor.py')
+        parent_args = ['--config-file', TESTS_CONFIG_PATH]
+        sensors = [
+            {'ref': 'core.TestSensor', 'file_path': file_path, 'class_name': 'TestSensor',
+             'trigger_types': ['trigger1'], 'poll_interval': None},
+            {'ref': 'core.TestPollingSensor', 'file_path': file_path,
+             'class_name': 'TestPollingSensor', 'trigger_types': ['trigger2'],
+             'poll_interval': 10}
+        ]
+
+        wrapper = MultiSensorWrapper(pack='core', sensors=sensors, parent_args=parent_args)
+        self.assertEqual(len(wrapper._wrappers), 2)
+
+        passive = wrapper._wrappers['core.TestSensor']
+        polling = wrapper._wrappers['core.TestPollingSensor']
+        self.assertIsInstance(passive._sensor_instance, Sensor)
+        self.assertIsInstance(polling._sensor_instance, PollingSensor)
+        self.assertEquals(polling._sensor_instance._poll_interval, 10)
+
+        # All the sensors share a single dispatcher
+        self.assertEqual(passive._sensor_service._dispatcher, wrapper._dispatcher)
+        self.assertEqual(polling._sensor_service._dispatcher, wrapper._dispatcher)
+
+        passive._sensor_instance.add_trigger = mock.Mock()
+        polling._sensor_instance.add_trigger = mock.Mock(side_effect=Exception('failure'))
+
+        wrapper._handle_create_trigger(trigger=Trigger(id='1', type='trigger1'))
+        self.assertEqual(passive._sensor_instance.add_trigger.call_count, 1)
+        self.assertEqual(polling._sensor_instance.add_trigger.call_count, 0)
+
+        # Failure in one sensor doesn't affect the other sensors
+        wrapper._handle_create_trigger(trigger=Trigger(id='2', type='trigger2'))
+        self.assertEqual(polling._sensor_instance.add_trigger.call_count, 1)
+        self.assertEqual(sorted(wrapper._triggers.keys()), ['1', '2'])
+
+    @mock.patch('st2reactor.container.multi_sensor_wrapper.eventlet.sleep', mock.Mock())
+    def test_multi_sensor_wrapper_restarts_failed_sensor(self):
+        file_path = os.path.join(RESOURCES_DIR, 'test_sensor.py')
+        parent_args = ['--config-file', TESTS_CONFIG_PATH]
+        sensors = [
+            {'ref': 'core.TestSensor', 'file_path': file_path, 'class_name': 'TestSensor',
+             'trigger_types': ['trigger1'], 'poll_interval': None}
+        ]
+
+        wrapper = MultiSensorWrapper(pack='core', sensors=sensors, parent_args=parent_args)
+        wrapper._handle_create_trigger(trigger=Trigger(id='1', type='trigger1'))
+
+        failing = wrapper._wrappers['core.TestSensor']
+        failing.run = mock.Mock(side_effect=Exception('failure'))
+        failing.stop = mock.Mock()
+
+        with mock.patch.object(MultiSensorWrapper, '_get_sensor_wrapper') as mock_get_wrapper:
+            restarted = mock.Mock()
+            mock_get_wrapper.return_value = restarted
+
+            self.assertTrue(wrapper._run_sensor(sensor_ref='core.TestSensor'))
+
+        self.assertEqual(failing.stop.call_count, 1)
+        self.assertEqual(restarted.run.call_count, 1)
+        self.assertEqual(wrapper._respawn_counts['core.TestSensor'], 1)
+        self.assertEqual(wrapper._wrappers['core.TestSensor'], restarted)
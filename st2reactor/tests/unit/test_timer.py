@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
 import bson
 import mock
 
@@ -20,7 +22,9 @@ from st2common.constants.triggers import TIMER_TRIGGER_TYPES
 from st2common.models.db.trigger import TriggerDB
 from st2common.models.system.common import ResourceReference
 from st2common.persistence.trigger import TriggerType
+from st2common.persistence.timer import TimerState
 from st2common.persistence.trigger import Trigger
+from st2common.util import date as date_utils
 from st2reactor.timer.base import St2Timer
 from st2tests.base import CleanDbTestCase
 
@@ -89,3 +93,61 @@ class St2TimerTestCase(CleanDbTestCase):
 
         self.assertEqual(dispatch_mock.call_args[1]['trace_context'].trace_tag,
                          '%s-%s' % (TIMER_TRIGGER_TYPES[type_]['name'], trigger_db.name))
+
+    def test_timer_owned_by_different_timer_engine_is_not_scheduled(self):
+        partitioner = mock.Mock()
+        partitioner.is_owner.return_value = False
+
+        timer = St2Timer(partitioner=partitioner)
+        timer._scheduler = mock.Mock()
+        timer._scheduler.get_job.return_value = None
+
+        type_ = TIMER_TRIGGER_TYPES.keys()[0]
+        trigger = {'id': 'trigger1', 'type': type_, 'name': 'test_trigger_1',
+                   'parameters': {'unit': 'seconds', 'delta': 10}}
+        timer.add_trigger(trigger)
+        self.assertFalse(timer._scheduler.add_job.called)
+
+        # Timer moves to this timer engine
+        partitioner.is_owner.return_value = True
+        timer._rebalance()
+        self.assertEqual(timer._scheduler.add_job.call_count, 1)
+        self.assertEqual(timer._scheduler.add_job.call_args[1]['job_id'], 'trigger1')
+
+        # Timer moves back to a different timer engine
+        partitioner.is_owner.return_value = False
+        timer._scheduler.get_job.return_value = mock.Mock()
+        timer._rebalance()
+        timer._scheduler.remove_job.assert_called_once_with('trigger1')
+
+    def test_persisted_fire_times_are_used(self):
+        timer = St2Timer()
+        timer._scheduler = mock.Mock()
+
+        next_fire_time = date_utils.get_datetime_utc_now() - datetime.timedelta(minutes=5)
+        last_fire_time = next_fire_time - datetime.timedelta(seconds=10)
+        TimerState.save_fire_times([('trigger1', next_fire_time, last_fire_time)])
+
+        type_ = TIMER_TRIGGER_TYPES.keys()[0]
+        trigger = {'id': 'trigger1', 'type': type_, 'name': 'test_trigger_1',
+                   'parameters': {'unit': 'seconds', 'delta': 10}}
+        timer.add_trigger(trigger)
+
+        call_kwargs = timer._scheduler.add_job.call_args[1]
+        self.assertEqual(call_kwargs['next_fire_time'], next_fire_time)
+        self.assertEqual(call_kwargs['last_fire_time'], last_fire_time)
+
+        # Persisted state is removed together with the trigger
+        timer.remove_trigger(trigger)
+        self.assertEqual(TimerState.get_by_trigger_ids(['trigger1']), {})
+
+    def test_fire_times_are_persisted(self):
+        timer = St2Timer()
+
+        next_fire_time = date_utils.get_datetime_utc_now()
+        job = mock.Mock(id='trigger1', next_fire_time=next_fire_time, last_fire_time=None)
+        timer._persist_fire_times([job])
+
+        state_db = TimerState.get_by_trigger_ids(['trigger1'])['trigger1']
+        self.assertEqual(state_db.next_fire_time, next_fire_time)
+        self.assertEqual(state_db.last_fire_time, None)
@@ -0,0 +1,165 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+import mock
+import pytz
+import unittest2
+
+from st2common.constants.timer import MISFIRE_POLICY_FIRE_ALL
+from st2common.constants.timer import MISFIRE_POLICY_FIRE_ONCE
+from st2common.constants.timer import MISFIRE_POLICY_SKIP
+from st2reactor.timer.scheduler import TimerScheduler
+
+NOW = datetime.datetime(2016, 3, 1, 12, 0, 0, tzinfo=pytz.utc)
+
+
+class TimerSchedulerTestCase(unittest2.TestCase):
+    def _get_scheduler(self, **kwargs):
+        fire_callback = mock.Mock()
+        scheduler = TimerScheduler(fire_callback=fire_callback, **kwargs)
+        return scheduler, fire_callback
+
+    def _get_fire_times(self, fire_callback):
+        return [call[0][1] for call in fire_callback.call_args_list]
+
+    def test_invalid_misfire_policy(self):
+        self.assertRaises(ValueError, TimerScheduler, fire_callback=mock.Mock(),
+                          misfire_policy='invalid')
+
+    def test_tick_fires_all_due_timers(self):
+        jobs_updated_callback = mock.Mock()
+        scheduler, fire_callback = self._get_scheduler(
+            jobs_updated_callback=jobs_updated_callback)
+
+        for index in range(0, 10):
+            time_type = IntervalTrigger(seconds=10, timezone=pytz.utc)
+            scheduler.add_job(job_id='timer%s' % (index), trigger={'id': index},
+                              time_type=time_type, next_fire_time=NOW)
+
+        not_due = IntervalTrigger(seconds=10, timezone=pytz.utc)
+        scheduler.add_job(job_id='not_due', trigger={}, time_type=not_due,
+                          next_fire_time=NOW + datetime.timedelta(seconds=5))
+
+        self.assertEqual(scheduler.tick(now=NOW), 10)
+        self.assertEqual(fire_callback.call_count, 10)
+
+        # Fire times of all the fired timers are reported in a single call
+        self.assertEqual(jobs_updated_callback.call_count, 1)
+        updated_jobs = jobs_updated_callback.call_args[0][0]
+        self.assertEqual(len(updated_jobs), 10)
+
+        for job in updated_jobs:
+            self.assertEqual(job.last_fire_time, NOW)
+            self.assertEqual(job.next_fire_time, NOW + datetime.timedelta(seconds=10))
+
+        # Nothing is due anymore
+        self.assertEqual(scheduler.tick(now=NOW), 0)
+
+    def test_removed_job_is_not_fired(self):
+        scheduler, fire_callback = self._get_scheduler()
+        time_type = IntervalTrigger(seconds=10, timezone=pytz.utc)
+        scheduler.add_job(job_id='timer1', trigger={}, time_type=time_type, next_fire_time=NOW)
+        scheduler.remove_job('timer1')
+
+        self.assertEqual(scheduler.tick(now=NOW), 0)
+        self.assertEqual(scheduler.get_job('timer1'), None)
+        self.assertFalse(fire_callback.called)
+
+    def test_misfire_policy_skip(self):
+        scheduler, fire_callback = self._get_scheduler(misfire_policy=MISFIRE_POLICY_SKIP)
+        time_type = IntervalTrigger(seconds=10, timezone=pytz.utc,
+                                    start_date=NOW - datetime.timedelta(hours=1))
+        scheduler.add_job(job_id='timer1', trigger={}, time_type=time_type,
+                          next_fire_time=NOW - datetime.timedelta(minutes=10))
+
+        scheduler.tick(now=NOW)
+
+        # Only the fire time which is due now is fired
+        self.assertEqual(self._get_fire_times(fire_callback), [NOW])
+        self.assertEqual(scheduler.get_job('timer1').next_fire_time,
+                         NOW + datetime.timedelta(seconds=10))
+
+    def test_misfire_policy_fire_once(self):
+        scheduler, fire_callback = self._get_scheduler(misfire_policy=MISFIRE_POLICY_FIRE_ONCE)
+        time_type = CronTrigger(minute='*', timezone=pytz.utc)
+        missed_fire_time = NOW - datetime.timedelta(minutes=10, seconds=30)
+        scheduler.add_job(job_id='timer1', trigger={}, time_type=time_type,
+                          next_fire_time=missed_fire_time)
+
+        scheduler.tick(now=NOW)
+
+        self.assertEqual(self._get_fire_times(fire_callback), [missed_fire_time, NOW])
+        self.assertEqual(scheduler.get_job('timer1').next_fire_time,
+                         NOW + datetime.timedelta(minutes=1))
+
+    def test_misfire_policy_fire_all(self):
+        scheduler, fire_callback = self._get_scheduler(misfire_policy=MISFIRE_POLICY_FIRE_ALL)
+        time_type = CronTrigger(minute='*', timezone=pytz.utc)
+        scheduler.add_job(job_id='timer1', trigger={}, time_type=time_type,
+                          next_fire_time=NOW - datetime.timedelta(minutes=3))
+
+        scheduler.tick(now=NOW)
+
+        expected = [NOW - datetime.timedelta(minutes=minutes) for minutes in [3, 2, 1, 0]]
+        self.assertEqual(self._get_fire_times(fire_callback), expected)
+
+    def test_misfire_policy_fire_all_max_catchup_runs(self):
+        scheduler, fire_callback = self._get_scheduler(misfire_policy=MISFIRE_POLICY_FIRE_ALL,
+                                                       max_catchup_runs=5)
+        time_type = IntervalTrigger(seconds=10, timezone=pytz.utc,
+                                    start_date=NOW - datetime.timedelta(hours=1))
+        scheduler.add_job(job_id='timer1', trigger={}, time_type=time_type,
+                          next_fire_time=NOW - datetime.timedelta(minutes=10))
+
+        scheduler.tick(now=NOW)
+
+        # 5 catch-up runs and the fire time which is due now
+        self.assertEqual(fire_callback.call_count, 6)
+        self.assertEqual(self._get_fire_times(fire_callback)[-1], NOW)
+
+    def test_missed_date_timer(self):
+        run_date = NOW - datetime.timedelta(minutes=5)
+
+        scheduler, fire_callback = self._get_scheduler(misfire_policy=MISFIRE_POLICY_SKIP)
+        scheduler.add_job(job_id='timer1', trigger={},
+                          time_type=DateTrigger(run_date, timezone=pytz.utc),
+                          next_fire_time=run_date)
+        scheduler.tick(now=NOW)
+        self.assertFalse(fire_callback.called)
+        self.assertEqual(scheduler.get_job('timer1').next_fire_time, None)
+
+        scheduler, fire_callback = self._get_scheduler(misfire_policy=MISFIRE_POLICY_FIRE_ONCE)
+        scheduler.add_job(job_id='timer1', trigger={},
+                          time_type=DateTrigger(run_date, timezone=pytz.utc),
+                          next_fire_time=run_date)
+        scheduler.tick(now=NOW)
+        scheduler.tick(now=NOW + datetime.timedelta(minutes=1))
+        self.assertEqual(self._get_fire_times(fire_callback), [run_date])
+
+    def test_fire_callback_exception_doesnt_affect_other_timers(self):
+        scheduler, fire_callback = self._get_scheduler()
+        fire_callback.side_effect = [Exception('failure'), None]
+
+        for index in range(0, 2):
+            time_type = IntervalTrigger(seconds=10, timezone=pytz.utc)
+            scheduler.add_job(job_id='timer%s' % (index), trigger={}, time_type=time_type,
+                              next_fire_time=NOW)
+
+        self.assertEqual(scheduler.tick(now=NOW), 2)
@@ -44,10 +44,27 @@ def format(gen):
 
 class StreamController(RestController):
     @jsexpose(content_type='text/event-stream')
-    def get_all(self):
+    def get_all(self, events=None, execution_ids=None, include_result=None):
+        """
+        Stream events.
+
+        Handles requests:
+
+            GET /stream?events=st2.execution__update&execution_ids=<id>&include_result=false
+
+        :param events: Comma delimited list of event names to send. Defaults to all.
+        :param execution_ids: Comma delimited list of action execution ids to send events for.
+        :param include_result: "false" to omit the result attribute of the execution and
+                               liveaction events.
+        """
+        events = events.split(',') if events else None
+        execution_ids = execution_ids.split(',') if execution_ids else None
+        include_result = str(include_result).lower() not in ['false', '0']
+
         def make_response():
-            res = Response(content_type='text/event-stream',
-                           app_iter=format(get_listener().generator()))
+            generator = get_listener().generator(events=events, execution_ids=execution_ids,
+                                                 include_result=include_result)
+            res = Response(content_type='text/event-stream', app_iter=format(generator))
             return res
 
         # Prohibit buffering response by eventlet
@@ -13,12 +13,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
 import eventlet
 
 from kombu import Connection, Queue
 from kombu.mixins import ConsumerMixin
 from oslo_config import cfg
 
+from st2common.metrics import base as metrics
 from st2common.models.api.action import LiveActionAPI
 from st2common.models.api.execution import ActionExecutionAPI
 from st2common.transport import announcement, liveaction, execution, publishers
@@ -79,25 +82,75 @@ class Listener(ConsumerMixin):
         return process
 
     def emit(self, event, body):
+        metrics.inc_counter('stream.events')
+
         pack = (event, body)
         for queue in self.queues:
             queue.put(pack)
 
-    def generator(self):
+    def generator(self, events=None, execution_ids=None, include_result=True):
+        """
+        :param events: Only send events with the provided names.
+        :type events: ``list``
+
+        :param execution_ids: Only send events for the action executions with the provided ids.
+        :type execution_ids: ``list``
+
+        :param include_result: False to remove (potentially large) result attribute from the
+                               action execution and liveaction events.
+        :type include_result: ``bool``
+        """
         queue = eventlet.Queue()
         self.queues.append(queue)
+        metrics.set_gauge('stream.clients', len(self.queues))
+
         try:
             while not self._stopped:
                 try:
-                    yield queue.get(timeout=cfg.CONF.stream.heartbeat)
+                    pack = queue.get(timeout=cfg.CONF.stream.heartbeat)
                 except eventlet.queue.Empty:
                     yield
+                    continue
+
+                if not self._should_process_event(pack=pack, events=events,
+                                                  execution_ids=execution_ids):
+                    continue
+
+                if not include_result:
+                    pack = self._get_pack_without_result(pack=pack)
+
+                yield pack
         finally:
             self.queues.remove(queue)
+            metrics.set_gauge('stream.clients', len(self.queues))
 
     def shutdown(self):
         self._stopped = True
 
+    def _should_process_event(self, pack, events=None, execution_ids=None):
+        event, body = pack
+
+        if events and event not in events:
+            return False
+
+        # Note: Only action execution events include the execution id
+        if execution_ids and getattr(body, 'id', None) not in execution_ids:
+            return False
+
+        return True
+
+    def _get_pack_without_result(self, pack):
+        event, body = pack
+
+        if getattr(body, 'result', None) is None:
+            return pack
+
+        # Body is shared by all the clients so we can't modify it
+        body = copy.copy(body)
+        del body.result
+
+        return (event, body)
+
 
 def listen(listener):
     try:
@@ -16,6 +16,7 @@
 import mock
 import pecan
 
+from st2common.models.api.execution import ActionExecutionAPI
 from st2stream.controllers.v1 import stream
 from st2stream import listener
 from base import FunctionalTest
@@ -32,3 +33,52 @@ class TestStreamController(FunctionalTest):
         self.assertIsInstance(resp._app_iter, mock.Mock)
         self.assertEqual(resp._status, '200 OK')
         self.assertIn(('Content-Type', 'text/event-stream; charset=UTF-8'), resp._headerlist)
+
+    @mock.patch.object(stream, 'format', mock.Mock())
+    @mock.patch.object(stream, 'get_listener')
+    def test_get_all_with_filters(self, mock_get_listener):
+        stream.StreamController().get_all(events='st2.execution__update',
+                                          execution_ids='id1,id2', include_result='false')
+        mock_get_listener.return_value.generator.assert_called_once_with(
+            events=['st2.execution__update'], execution_ids=['id1', 'id2'],
+            include_result=False)
+
+
+class TestListener(FunctionalTest):
+
+    def test_should_process_event(self):
+        stream_listener = listener.Listener(connection=None)
+        execution = mock.Mock(id='id1')
+        liveaction = mock.Mock(id='id3')
+
+        pack = ('st2.execution__update', execution)
+        self.assertTrue(stream_listener._should_process_event(pack))
+        self.assertTrue(stream_listener._should_process_event(
+            pack, events=['st2.execution__update'], execution_ids=['id1', 'id2']))
+        self.assertFalse(stream_listener._should_process_event(
+            pack, events=['st2.execution__create']))
+        self.assertFalse(stream_listener._should_process_event(pack, execution_ids=['id2']))
+
+        pack = ('st2.liveaction__update', liveaction)
+        self.assertFalse(stream_listener._should_process_event(pack, execution_ids=['id1']))
+
+        pack = ('st2.announcement__chatops', {'message': 'test'})
+        self.assertTrue(stream_listener._should_process_event(pack))
+        self.assertFalse(stream_listener._should_process_event(pack, execution_ids=['id1']))
+
+    def test_get_pack_without_result(self):
+        stream_listener = listener.Listener(connection=None)
+        execution = ActionExecutionAPI(id='id1', status='succeeded', result={'stdout': 'a' * 100})
+
+        pack = ('st2.execution__update', execution)
+        event, body = stream_listener._get_pack_without_result(pack)
+        self.assertEqual(event, 'st2.execution__update')
+        self.assertEqual(body.id, 'id1')
+        self.assertEqual(body.status, 'succeeded')
+        self.assertFalse(hasattr(body, 'result'))
+
+        # Original object which is shared by all the clients is not modified
+        self.assertEqual(execution.result, {'stdout': 'a' * 100})
+
+        pack = ('st2.announcement__chatops', {'message': 'test'})
+        self.assertEqual(stream_listener._get_pack_without_result(pack), pack)
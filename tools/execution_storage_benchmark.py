@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark which measures database and message bus write amplification of the action execution
+lifecycle for both of the execution storage modes (see "database.single_document_executions").
+
+Each simulated execution is requested and then goes through "scheduled", "running" and
+"succeeded" states (the last transition stores a result of the requested size).
+
+Note: The benchmark uses a separate "st2-benchmark" database which is dropped at the end. Write
+operations are counted using the server wide "opcounters" so it should be run against an idle
+MongoDB server. Messages are counted and not actually published.
+"""
+
+import time
+
+from oslo_config import cfg
+
+from st2common import config
+from st2common.models.api.action import ActionAPI
+from st2common.models.api.action import RunnerTypeAPI
+from st2common.models.db import db_ensure_indexes
+from st2common.models.db import db_setup
+from st2common.models.db import db_teardown
+from st2common.models.db.execution import ActionExecutionDB
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.persistence.action import Action
+from st2common.persistence.runner import RunnerType
+from st2common.services import action as action_service
+from st2common.transport.publishers import PoolPublisher
+from st2common.constants import action as action_constants
+
+DB_NAME = 'st2-benchmark'
+
+RUNNER_TYPE = {
+    'name': 'benchmark-runner',
+    'description': 'Runner used by the benchmark.',
+    'enabled': True,
+    'runner_parameters': {},
+    'runner_module': 'benchmark'
+}
+
+ACTION = {
+    'name': 'noop',
+    'description': 'Action used by the benchmark.',
+    'enabled': True,
+    'entry_point': '',
+    'pack': 'benchmark',
+    'runner_type': 'benchmark-runner',
+    'parameters': {}
+}
+
+ACTION_REF = 'benchmark.noop'
+
+TRANSITIONS = [
+    action_constants.LIVEACTION_STATUS_SCHEDULED,
+    action_constants.LIVEACTION_STATUS_RUNNING,
+    action_constants.LIVEACTION_STATUS_SUCCEEDED
+]
+
+
+class PublishCounter(object):
+    """
+    Replaces PoolPublisher publish methods with methods which only count the messages.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._original_methods = None
+
+    def __enter__(self):
+        self._original_methods = (PoolPublisher.publish, PoolPublisher.publish_many)
+
+        def publish(publisher, payload, exchange, routing_key=''):
+            self.count += 1
+
+        def publish_many(publisher, payloads, exchange, routing_key=''):
+            self.count += len(payloads)
+
+        PoolPublisher.publish = publish
+        PoolPublisher.publish_many = publish_many
+        return self
+
+    def __exit__(self, *args):
+        PoolPublisher.publish, PoolPublisher.publish_many = self._original_methods
+
+
+def _register_cli_opts():
+    cli_opts = [
+        cfg.IntOpt('executions', default=500,
+                   help='Number of executions to simulate in each of the modes.'),
+        cfg.IntOpt('result-size', default=10 * 1024,
+                   help='Size of the execution result (in bytes).')
+    ]
+    cfg.CONF.register_cli_opts(cli_opts)
+
+
+def _get_write_count(db):
+    opcounters = db.command('serverStatus')['opcounters']
+    return opcounters['insert'] + opcounters['update'] + opcounters['delete']
+
+
+def _get_storage_size(db):
+    size = 0
+    for model in [LiveActionDB, ActionExecutionDB]:
+        collection_name = model._get_collection_name()
+        if collection_name in db.collection_names():
+            size += db.command('collstats', collection_name)['size']
+    return size
+
+
+def _register_action():
+    RunnerType.add_or_update(RunnerTypeAPI.to_model(RunnerTypeAPI(**RUNNER_TYPE)))
+    Action.add_or_update(ActionAPI.to_model(ActionAPI(**ACTION)))
+
+
+def run_benchmark(connection, single_document, count, result_size):
+    cfg.CONF.set_override(name='single_document_executions', override=single_document,
+                          group='database')
+
+    connection.drop_database(DB_NAME)
+    db_ensure_indexes()
+    db = connection[DB_NAME]
+    _register_action()
+
+    result = {'stdout': 'x' * result_size}
+
+    with PublishCounter() as publish_counter:
+        writes_before = _get_write_count(db)
+        start_time = time.time()
+
+        for _ in range(0, count):
+            liveaction_db, _ = action_service.request(LiveActionDB(action=ACTION_REF))
+
+            for status in TRANSITIONS:
+                result_value = result if status == TRANSITIONS[-1] else None
+                liveaction_db = action_service.update_status(liveaction_db, status,
+                                                             result=result_value)
+
+        duration = time.time() - start_time
+        writes = _get_write_count(db) - writes_before
+
+    storage_size = _get_storage_size(db)
+
+    return {
+        'writes': float(writes) / count,
+        'messages': float(publish_counter.count) / count,
+        'storage': float(storage_size) / count,
+        'duration': duration
+    }
+
+
+def main():
+    _register_cli_opts()
+    config.parse_args()
+
+    count = cfg.CONF.executions
+    result_size = cfg.CONF.result_size
+
+    connection = db_setup(db_name=DB_NAME, db_host=cfg.CONF.database.host,
+                          db_port=cfg.CONF.database.port)
+
+    try:
+        results = {}
+        for single_document in [False, True]:
+            results[single_document] = run_benchmark(connection=connection,
+                                                     single_document=single_document,
+                                                     count=count, result_size=result_size)
+    finally:
+        connection.drop_database(DB_NAME)
+        db_teardown()
+
+    print('Executions: %s, result size: %s bytes, %s state transitions per execution' %
+          (count, result_size, len(TRANSITIONS)))
+    print('')
+    print('%-16s %16s %16s %20s %12s' % ('mode', 'db writes/exec', 'messages/exec',
+                                         'stored bytes/exec', 'duration'))
+    for single_document in [False, True]:
+        result = results[single_document]
+        print('%-16s %16.2f %16.2f %20.0f %11.2fs' % (
+            'single document' if single_document else 'default', result['writes'],
+            result['messages'], result['storage'], result['duration']))
+
+
+if __name__ == '__main__':
+    main()